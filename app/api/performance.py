@@ -13,6 +13,11 @@ from app.dependencies import require_admin_user, get_current_active_user
 from app.models.data_models import User
 from app.services.performance_monitor import get_performance_monitor
 from app.services.caching_service import get_caching_service
+from app.services.near_duplicate_store import get_near_duplicate_store
+from app.services.pdf_result_cache import get_pdf_result_cache
+from app.services.openai_rate_limiter import get_openai_rate_limiter
+from app.services.twilio_sender import get_twilio_sender_stats
+from app.services.analysis_coalescer import get_analysis_coalescer
 from app.database.connection_pool import get_pool_manager
 from app.database.query_optimizer import get_query_optimizer
 from app.utils.logging import get_logger
@@ -105,11 +110,13 @@ async def get_cache_metrics(
     Get cache performance metrics.
     
     Returns:
-        Dictionary with cache metrics
+        Dictionary with cache metrics, including PDF result cache hits and
+        the PDF bytes they saved from extraction
     """
     try:
         caching_service = get_caching_service()
         cache_stats = await caching_service.get_cache_stats()
+        cache_stats["pdf_results"] = get_pdf_result_cache().get_stats()
         
         return {
             "status": "success",
@@ -440,6 +447,119 @@ async def get_task_queue_analysis(
         raise HTTPException(status_code=500, detail="Failed to retrieve task queue analysis")
 
 
+@router.get("/webhook-ingestion")
+async def get_webhook_ingestion_stats(
+    current_user: User = Depends(get_current_active_user)
+) -> Dict[str, Any]:
+    """
+    Get webhook ingestion statistics.
+    
+    Returns:
+        Dictionary with MessageSid dedup counters (suppressed Twilio retries)
+        and validation cache hit/miss/eviction stats
+    """
+    try:
+        from app.api.optimized_webhook import webhook_processor
+        
+        return {
+            "status": "success",
+            "data": webhook_processor.get_ingestion_stats(),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error(f"Failed to get webhook ingestion stats: {e}")
+        raise HTTPException(status_code=500, detail="Failed to retrieve webhook ingestion stats")
+
+
+@router.get("/near-duplicates")
+async def get_near_duplicate_stats(
+    current_user: User = Depends(get_current_active_user)
+) -> Dict[str, Any]:
+    """
+    Get shared near-duplicate store statistics.
+    
+    Returns:
+        Dictionary with MinHash lookup hit rate and LSH false-match rate
+    """
+    try:
+        return {
+            "status": "success",
+            "data": get_near_duplicate_store().get_stats(),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error(f"Failed to get near-duplicate stats: {e}")
+        raise HTTPException(status_code=500, detail="Failed to retrieve near-duplicate stats")
+
+
+@router.get("/openai-rate-limit")
+async def get_openai_rate_limit_stats(
+    current_user: User = Depends(get_current_active_user)
+) -> Dict[str, Any]:
+    """
+    Get OpenAI rate limiter statistics.
+    
+    Returns:
+        Dictionary with learned request/token limits, available budget and waits
+    """
+    try:
+        return {
+            "status": "success",
+            "data": get_openai_rate_limiter().get_stats(),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error(f"Failed to get OpenAI rate limit stats: {e}")
+        raise HTTPException(status_code=500, detail="Failed to retrieve OpenAI rate limit stats")
+
+
+@router.get("/twilio-sender")
+async def get_twilio_sender_statistics(
+    current_user: User = Depends(get_current_active_user)
+) -> Dict[str, Any]:
+    """
+    Get outbound Twilio sender statistics.
+    
+    Returns:
+        Dictionary per Twilio account with queue depth, governor waits and 429 retries
+    """
+    try:
+        return {
+            "status": "success",
+            "data": get_twilio_sender_stats(),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error(f"Failed to get Twilio sender stats: {e}")
+        raise HTTPException(status_code=500, detail="Failed to retrieve Twilio sender stats")
+
+
+@router.get("/coalescing")
+async def get_coalescing_stats(
+    current_user: User = Depends(get_current_active_user)
+) -> Dict[str, Any]:
+    """
+    Get analysis request coalescing statistics.
+    
+    Returns:
+        Dictionary with in-process and cross-worker coalescing counts and saved OpenAI calls
+    """
+    try:
+        return {
+            "status": "success",
+            "data": get_analysis_coalescer().get_stats(),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error(f"Failed to get coalescing stats: {e}")
+        raise HTTPException(status_code=500, detail="Failed to retrieve coalescing stats")
+
+
 @router.post("/alerts/{alert_key}/resolve")
 async def resolve_performance_alert(
     alert_key: str,
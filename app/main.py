@@ -149,7 +149,9 @@ async def startup_event():
         # Pre-initialize core services to catch any initialization errors early
         logger.info("Pre-initializing core services...")
         try:
-            _ = service_container.get_pdf_service()
+            pdf_service = service_container.get_pdf_service()
+            if pdf_service.extraction_engine.config.process_pool:
+                await pdf_service.extraction_engine.start()
             logger.info("✅ PDF processing service initialized")
             
             _ = service_container.get_openai_service()
@@ -182,6 +184,11 @@ async def shutdown_event():
     logger.info("🛑 Application shutdown initiated...")
     
     try:
+        # Stop the analysis cache invalidation listener before Redis goes away
+        from app.services.caching_service import cleanup_caching_service
+        await cleanup_caching_service()
+        logger.info("✅ Caching service cleaned up")
+        
         # Cleanup Redis connection manager
         from app.services.redis_connection_manager import cleanup_redis_manager
         await cleanup_redis_manager()
@@ -198,6 +205,21 @@ async def shutdown_event():
         await cleanup_task_processor()
         logger.info("✅ Background task processor cleaned up")
         
+        # Stop the PDF extraction worker processes
+        from app.services.pdf_extraction_engine import cleanup_pdf_extraction_engine
+        await cleanup_pdf_extraction_engine()
+        logger.info("✅ PDF extraction engine cleaned up")
+        
+        # Close the PDF result cache file
+        from app.services.pdf_result_cache import cleanup_pdf_result_cache
+        await cleanup_pdf_result_cache()
+        logger.info("✅ PDF result cache cleaned up")
+        
+        # Close the pooled Twilio API clients
+        from app.services.twilio_sender import cleanup_twilio_senders
+        await cleanup_twilio_senders()
+        logger.info("✅ Twilio senders cleaned up")
+        
         # Cleanup connection pool
         from app.database.connection_pool import cleanup_pool_manager
         await cleanup_pool_manager()
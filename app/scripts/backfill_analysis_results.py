@@ -2,7 +2,9 @@ import argparse
 import asyncio
 from typing import Any, Dict, List
 
+from app.models.data_models import AppConfig
 from app.services.analysis_results import record_analysis_result
+from app.services.enhanced_ai_analysis import EnhancedAIAnalysisService
 
 
 # Placeholder DAOs. Replace with real data access.
@@ -14,10 +16,56 @@ async def get_legacy_whatsapp_interactions() -> List[Dict[str, Any]]:
     return []
 
 
-async def backfill(dry_run: bool = False) -> None:
+# Failed analyses come back as placeholders with confidence 0.1 (batch) or
+# 0.5 (default fallback); they are not verdicts and must not be stored.
+MIN_REANALYSIS_CONFIDENCE = 0.6
+
+
+def pending_reanalysis(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Rows that have job text but no verdict."""
+    return [row for row in rows if row.get("job_text") and row.get("verdict") is None]
+
+
+async def reanalyze(rows: List[Dict[str, Any]], chunk_size: int = 100) -> int:
+    """Fill score and verdict for rows that have job text but no verdict.
+
+    Ads go through analyze_job_ads_batch, which packs short ads into shared
+    completions paced by the OpenAI rate limiter. Rows whose analysis failed
+    keep no verdict, so the next run retries them.
+    """
+    pending = pending_reanalysis(rows)
+    if not pending:
+        return 0
+
+    filled = 0
+    service = EnhancedAIAnalysisService(AppConfig.from_env())
+    try:
+        for start in range(0, len(pending), chunk_size):
+            chunk = pending[start:start + chunk_size]
+            results = await service.analyze_job_ads_batch([row["job_text"] for row in chunk])
+            for row, result in zip(chunk, results):
+                if result.confidence < MIN_REANALYSIS_CONFIDENCE:
+                    continue
+                row["score"] = result.trust_score
+                row["verdict"] = result.classification.value
+                filled += 1
+    finally:
+        await service.cleanup()
+    return filled
+
+
+async def backfill(dry_run: bool = False, reanalyze_missing: bool = False, chunk_size: int = 100) -> None:
     web = await get_legacy_web_uploads()
     wa = await get_legacy_whatsapp_interactions()
 
+    reanalyzed = 0
+    if reanalyze_missing:
+        if dry_run:
+            # Only count the ads; analyzing them would spend OpenAI tokens
+            reanalyzed = len(pending_reanalysis(web + wa))
+        else:
+            reanalyzed = await reanalyze(web + wa, chunk_size)
+
     inserted_web = 0
     inserted_wa = 0
 
@@ -57,14 +105,16 @@ async def backfill(dry_run: bool = False) -> None:
             await record_analysis_result("whatsapp", payload, outcome)
         inserted_wa += 1
 
-    print({"web_upload": inserted_web, "whatsapp": inserted_wa})
+    print({"web_upload": inserted_web, "whatsapp": inserted_wa, "reanalyzed": reanalyzed})
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Backfill analysis_results from legacy sources")
     parser.add_argument("--dry-run", action="store_true", help="Do not write, only count")
+    parser.add_argument("--reanalyze", action="store_true", help="Analyze rows that have job text but no verdict")
+    parser.add_argument("--chunk-size", type=int, default=100, help="Ads handed to batch analysis at a time")
     args = parser.parse_args()
-    asyncio.run(backfill(dry_run=args.dry_run))
+    asyncio.run(backfill(dry_run=args.dry_run, reanalyze_missing=args.reanalyze, chunk_size=args.chunk_size))
 
 
 if __name__ == "__main__":
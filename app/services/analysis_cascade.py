@@ -0,0 +1,134 @@
+"""
+Confidence-gated cascade for job ad analysis.
+
+Most ads do not need the primary model. This module provides the
+AnalysisCascade class, which decides how far each analysis has to go:
+
+1. rules: a rule-based result at or above the rule confidence threshold is
+   returned without any model call
+2. cheap model: otherwise the cheaper fallback model analyzes the ad, and
+   its result is accepted when it is valid, at or above the cheap model
+   confidence threshold and agrees with the rule-based classification
+3. primary model: everything else is escalated to the primary model
+
+Every stage run is recorded with MetricsCollector.record_cascade_stage,
+with its latency, estimated tokens and cost and whether it was accepted or
+escalated, so the thresholds can be tuned against cost and latency.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Optional, Union
+
+from app.models.data_models import JobAnalysisResult
+from app.services.verdict_stream import EarlyVerdict
+
+STAGE_RULES = "rules"
+STAGE_CHEAP_MODEL = "cheap_model"
+STAGE_PRIMARY_MODEL = "primary_model"
+
+
+@dataclass
+class AnalysisCascadeConfig:
+    """Configuration for the analysis cascade."""
+    enabled: bool = False
+    rule_confidence_threshold: float = 0.9
+    cheap_model_confidence_threshold: float = 0.8
+    escalate_on_disagreement: bool = True
+    cheap_model_timeout: float = 4.0  # seconds; leaves time to escalate
+    cheap_model_cost_per_1k_tokens: float = 0.0015  # USD
+    primary_model_cost_per_1k_tokens: float = 0.03  # USD
+
+
+class AnalysisCascade:
+    """Decide whether each cascade stage's result is final or is escalated."""
+
+    def __init__(self, config: Optional[AnalysisCascadeConfig] = None):
+        """
+        Initialize the cascade.
+
+        Args:
+            config: Cascade configuration (loaded from environment if omitted)
+        """
+        self.config = config or self._load_config()
+
+    def _load_config(self) -> AnalysisCascadeConfig:
+        """Load configuration from environment variables."""
+        config = AnalysisCascadeConfig()
+        config.enabled = os.getenv('ANALYSIS_CASCADE_ENABLED', 'false').lower() == 'true'
+        config.rule_confidence_threshold = float(os.getenv('ANALYSIS_CASCADE_RULE_CONFIDENCE', '0.9'))
+        config.cheap_model_confidence_threshold = float(os.getenv('ANALYSIS_CASCADE_CHEAP_CONFIDENCE', '0.8'))
+        config.escalate_on_disagreement = os.getenv(
+            'ANALYSIS_CASCADE_ESCALATE_ON_DISAGREEMENT', 'true'
+        ).lower() == 'true'
+        config.cheap_model_timeout = float(os.getenv('ANALYSIS_CASCADE_CHEAP_TIMEOUT', '4.0'))
+        config.cheap_model_cost_per_1k_tokens = float(
+            os.getenv('ANALYSIS_CASCADE_CHEAP_COST_PER_1K_TOKENS', '0.0015')
+        )
+        config.primary_model_cost_per_1k_tokens = float(
+            os.getenv('ANALYSIS_CASCADE_PRIMARY_COST_PER_1K_TOKENS', '0.03')
+        )
+        return config
+
+    def accepts_rules(self, rule_result: Optional[JobAnalysisResult]) -> bool:
+        """
+        Check whether a rule-based result is final.
+
+        Args:
+            rule_result: Rule-based result, None if no rules were conclusive
+
+        Returns:
+            bool: True if no model call is needed
+        """
+        return rule_result is not None and rule_result.confidence >= self.config.rule_confidence_threshold
+
+    def escalation_reason(self, result: Union[JobAnalysisResult, EarlyVerdict],
+                          rule_result: Optional[JobAnalysisResult]) -> Optional[str]:
+        """
+        Check whether a cheap model verdict must be escalated to the primary model.
+
+        Works on an early verdict as well as a complete result, so a streamed
+        verdict is only reported when it is expected to stand.
+
+        Args:
+            result: Cheap model verdict
+            rule_result: Rule-based result, if any rules matched
+
+        Returns:
+            Optional[str]: 'low_confidence' or 'disagreement', None if the verdict is accepted
+        """
+        if result.confidence < self.config.cheap_model_confidence_threshold:
+            return "low_confidence"
+        if (self.config.escalate_on_disagreement and rule_result is not None
+                and rule_result.classification != result.classification):
+            return "disagreement"
+        return None
+
+    def stage_cost(self, stage: str, tokens: int) -> float:
+        """
+        Estimate the cost of a stage run.
+
+        Args:
+            stage: Cascade stage
+            tokens: Estimated prompt and completion tokens
+
+        Returns:
+            float: Estimated cost in USD
+        """
+        if stage == STAGE_CHEAP_MODEL:
+            return tokens / 1000 * self.config.cheap_model_cost_per_1k_tokens
+        if stage == STAGE_PRIMARY_MODEL:
+            return tokens / 1000 * self.config.primary_model_cost_per_1k_tokens
+        return 0.0
+
+
+# Global analysis cascade instance
+_analysis_cascade: Optional[AnalysisCascade] = None
+
+
+def get_analysis_cascade() -> AnalysisCascade:
+    """Get global analysis cascade instance."""
+    global _analysis_cascade
+    if _analysis_cascade is None:
+        _analysis_cascade = AnalysisCascade()
+    return _analysis_cascade
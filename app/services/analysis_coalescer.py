@@ -0,0 +1,263 @@
+"""
+Single-flight coalescing of concurrent identical analysis requests.
+
+When a scam ad goes viral, many users forward the same text within seconds.
+All of them miss the analysis cache because the first result has not been
+written yet, so each would pay for its own OpenAI call. This module provides
+the AnalysisCoalescer class, which lets those callers share one analysis:
+
+- requests are keyed on the digest of the canonical text (see
+  app.utils.text_normalization), so forwarded copies that differ only in
+  case, spacing, emoji or tracking links share one analysis
+- within a process, callers with the same key await the one in-flight
+  analysis instead of starting their own
+- across workers, the first caller takes a short Redis lock (SET NX with a
+  TTL) and publishes its result under the digest; callers in other workers
+  poll for that result until the lock is released, then fall back to
+  analyzing themselves
+- every caller served by another caller's analysis counts as a saved call
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+from app.models.data_models import JobAnalysisResult, JobClassification
+from app.services.redis_connection_manager import get_redis_manager
+from app.utils.logging import get_logger, get_correlation_id, log_with_context
+from app.utils.metrics import get_metrics_collector
+from app.utils.text_normalization import NormalizedText, text_digest
+
+logger = get_logger(__name__)
+
+# Delete the lock only if this caller still owns it
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+@dataclass
+class AnalysisCoalescerConfig:
+    """Configuration for analysis request coalescing."""
+    enabled: bool = True
+    distributed: bool = True
+    lock_ttl: int = 30  # seconds; bounds how long a crashed worker blocks others
+    result_ttl: int = 60  # seconds the shared result stays readable
+    wait_timeout: float = 20.0
+    poll_interval: float = 0.1
+    key_prefix: str = "singleflight"
+
+
+class AnalysisCoalescer:
+    """
+    Coalesce concurrent analyses of the same job text into one.
+
+    In-process followers share the leader's future, so they also share its
+    exception if the analysis fails. If the leader is cancelled, its
+    followers start over without it. Workers waiting on a Redis lock only
+    reuse a published result; if the holder fails they analyze themselves.
+    """
+
+    def __init__(self, config: Optional[AnalysisCoalescerConfig] = None):
+        """
+        Initialize the coalescer.
+
+        Args:
+            config: Coalescer configuration (loaded from environment if omitted)
+        """
+        self.config = config or self._load_config()
+        self.redis_manager = get_redis_manager()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        self.stats = {
+            'leaders': 0,
+            'local_joins': 0,
+            'remote_waits': 0,
+            'remote_hits': 0,
+            'remote_timeouts': 0,
+            'errors': 0
+        }
+
+    def _load_config(self) -> AnalysisCoalescerConfig:
+        """Load configuration from environment variables."""
+        config = AnalysisCoalescerConfig()
+        config.enabled = os.getenv('ANALYSIS_COALESCING_ENABLED', 'true').lower() == 'true'
+        config.distributed = os.getenv('ANALYSIS_COALESCING_DISTRIBUTED', 'true').lower() == 'true'
+        config.lock_ttl = int(os.getenv('ANALYSIS_COALESCING_LOCK_TTL', '30'))
+        config.wait_timeout = float(os.getenv('ANALYSIS_COALESCING_WAIT_TIMEOUT', '20.0'))
+        return config
+
+    async def run(
+        self,
+        job_text: Union[str, NormalizedText],
+        analyze: Callable[[], Awaitable[JobAnalysisResult]]
+    ) -> JobAnalysisResult:
+        """
+        Run analyze once for all concurrent callers with the same text.
+
+        Args:
+            job_text: Job advertisement text, or its normalization
+            analyze: Performs the analysis when this caller leads
+
+        Returns:
+            JobAnalysisResult: The shared analysis result
+        """
+        if not self.config.enabled:
+            return await analyze()
+
+        key = text_digest(job_text)
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            try:
+                result = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled() or asyncio.current_task().cancelling():
+                    raise
+                # The leader was cancelled, not this caller, so run without it
+                return await self.run(job_text, analyze)
+            self.stats['local_joins'] += 1
+            get_metrics_collector().increment_counter("analysis_coalesced", labels={"scope": "local"})
+            return result
+
+        future = asyncio.get_running_loop().create_future()
+        # Nobody may be waiting; don't warn about an unretrieved exception
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        self.stats['leaders'] += 1
+
+        try:
+            result = await self._lead(key, analyze)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
+
+    async def _lead(self, key: str, analyze: Callable[[], Awaitable[JobAnalysisResult]]) -> JobAnalysisResult:
+        """Analyze as this process's leader, coordinating with other workers."""
+        if not self.config.distributed or not self.redis_manager.is_available():
+            return await analyze()
+
+        lock_key = f"{self.config.key_prefix}:lock:{key}"
+        token = uuid.uuid4().hex
+        try:
+            acquired = await self.redis_manager.execute_command(
+                "set", lock_key, token, nx=True, ex=self.config.lock_ttl
+            )
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.warning(f"Failed to acquire analysis lock: {e}")
+            return await analyze()
+
+        if not acquired:
+            shared_result = await self._wait_for_holder(key, lock_key)
+            if shared_result is not None:
+                return shared_result
+            return await analyze()
+
+        try:
+            result = await analyze()
+            await self._publish(key, result)
+            return result
+        finally:
+            try:
+                await self.redis_manager.execute_command("eval", RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.warning(f"Failed to release analysis lock: {e}")
+
+    async def _wait_for_holder(self, key: str, lock_key: str) -> Optional[JobAnalysisResult]:
+        """Poll for the lock holder's result until it is published or the lock goes away."""
+        self.stats['remote_waits'] += 1
+        result_key = f"{self.config.key_prefix}:result:{key}"
+        deadline = time.monotonic() + self.config.wait_timeout
+
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.config.poll_interval)
+            try:
+                raw, holder = await self.redis_manager.execute_pipeline(
+                    [('get', result_key), ('exists', lock_key)], transaction=False
+                ) or (None, None)
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.warning(f"Failed to poll shared analysis result: {e}")
+                return None
+
+            if raw:
+                self.stats['remote_hits'] += 1
+                get_metrics_collector().increment_counter("analysis_coalesced", labels={"scope": "redis"})
+                record = json.loads(raw)
+                return JobAnalysisResult(
+                    trust_score=record['trust_score'],
+                    classification=JobClassification(record['classification']),
+                    reasons=record['reasons'],
+                    confidence=record['confidence']
+                )
+            if not holder:
+                return None  # holder failed or expired without a result
+
+        self.stats['remote_timeouts'] += 1
+        log_with_context(
+            logger,
+            logging.WARNING,
+            "Timed out waiting for another worker's analysis",
+            wait_timeout=self.config.wait_timeout,
+            correlation_id=get_correlation_id()
+        )
+        return None
+
+    async def _publish(self, key: str, result: JobAnalysisResult):
+        """Publish a result for callers waiting in other workers."""
+        record = {
+            'trust_score': result.trust_score,
+            'classification': result.classification.value,
+            'reasons': result.reasons,
+            'confidence': result.confidence
+        }
+        try:
+            await self.redis_manager.execute_command(
+                "setex", f"{self.config.key_prefix}:result:{key}", self.config.result_ttl, json.dumps(record)
+            )
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.warning(f"Failed to publish shared analysis result: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get coalescing statistics.
+
+        Returns:
+            Dictionary with leader and follower counts and saved OpenAI calls
+        """
+        stats = dict(self.stats)
+        stats['saved_calls'] = stats['local_joins'] + stats['remote_hits']
+        stats['in_flight'] = len(self._inflight)
+        stats['enabled'] = self.config.enabled
+        stats['distributed'] = self.config.distributed
+        return stats
+
+
+# Global analysis coalescer instance
+_analysis_coalescer: Optional[AnalysisCoalescer] = None
+
+
+def get_analysis_coalescer() -> AnalysisCoalescer:
+    """Get global analysis coalescer instance."""
+    global _analysis_coalescer
+    if _analysis_coalescer is None:
+        _analysis_coalescer = AnalysisCoalescer()
+    return _analysis_coalescer
@@ -8,6 +8,9 @@ resource management for the Reality Checker WhatsApp bot.
 
 import asyncio
 import json
+import math
+import os
+import socket
 import time
 import uuid
 from typing import Dict, List, Optional, Any, Callable, Union
@@ -18,8 +21,10 @@ import logging
 from concurrent.futures import ThreadPoolExecutor
 
 from app.services.redis_connection_manager import get_redis_manager, RedisConnectionManager
+from app.services.local_task_queue import LocalTaskQueue, LocalQueueEntry, LocalQueueFull
 from app.services.performance_monitor import get_performance_monitor
 from app.utils.logging import get_logger, get_correlation_id, log_with_context
+from app.utils.circuit_breaker import get_circuit_breaker_manager, CircuitState
 from app.config import get_config
 
 logger = get_logger(__name__)
@@ -32,6 +37,119 @@ class TaskPriority(Enum):
     HIGH = 3
 
 
+# Lua script that atomically claims the next task. Priority queues are passed
+# in the order they should be tried (chosen by the weighted scheduler) followed
+# by the worker's processing list, the queue depth counter and the lease ZSET,
+# so the first available task is moved into the processing list and leased to
+# the worker until ARGV[1] in one round-trip. ARGV[3..] name task types at
+# their concurrency cap in the claiming process; tasks of those types are
+# skipped (within the last ARGV[2] entries of each queue) and keep their place.
+CLAIM_TASK_SCRIPT = """
+local processing_key = KEYS[#KEYS - 2]
+local depth_key = KEYS[#KEYS - 1]
+local leases_key = KEYS[#KEYS]
+local capped = {}
+for i = 3, #ARGV do
+    capped[ARGV[i]] = true
+end
+for i = 1, #KEYS - 3 do
+    local task_data = false
+    if #ARGV < 3 then
+        task_data = redis.call('RPOPLPUSH', KEYS[i], processing_key)
+    else
+        local window = redis.call('LRANGE', KEYS[i], -tonumber(ARGV[2]), -1)
+        for j = #window, 1, -1 do
+            local ok, task = pcall(cjson.decode, window[j])
+            if not (ok and type(task) == 'table' and capped[task['task_type']]) then
+                task_data = window[j]
+                redis.call('LREM', KEYS[i], -1, task_data)
+                redis.call('LPUSH', processing_key, task_data)
+                break
+            end
+        end
+    end
+    if task_data then
+        redis.call('DECR', depth_key)
+        redis.call('ZADD', leases_key, ARGV[1], processing_key)
+        return task_data
+    end
+end
+return false
+"""
+
+# Lua script that promotes due tasks from the delayed ZSET into their priority
+# queues. KEYS: delayed set, LOW, NORMAL, HIGH queues (indexed by priority
+# value), wake-up list, queue depth counter. ARGV: current timestamp, batch
+# size, max wake-up tokens.
+PROMOTE_DELAYED_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+for _, task_data in ipairs(due) do
+    local priority = tonumber(cjson.decode(task_data)['priority']) or 2
+    local queue_key = KEYS[1 + priority] or KEYS[3]
+    redis.call('ZREM', KEYS[1], task_data)
+    redis.call('LPUSH', queue_key, task_data)
+end
+local tokens = math.min(#due, tonumber(ARGV[3]))
+if tokens > 0 then
+    for i = 1, tokens do
+        redis.call('LPUSH', KEYS[5], 1)
+    end
+    redis.call('LTRIM', KEYS[5], 0, tonumber(ARGV[3]) - 1)
+    redis.call('INCRBY', KEYS[6], #due)
+end
+return #due
+"""
+
+
+# Lua script that reclaims tasks whose lease expired because their worker
+# died or stalled. KEYS: lease ZSET, LOW, NORMAL, HIGH queues (indexed by
+# priority value), dead letter list, wake-up list, queue depth counter.
+# ARGV: current timestamp, max leases per run, max wake-up tokens, failure
+# timestamp, status TTL, reap counter TTL. A task reaped max_attempts times is
+# treated as poison and dead-lettered instead of requeued.
+REAP_EXPIRED_LEASES_SCRIPT = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+local requeued = 0
+local dead = 0
+for _, processing_key in ipairs(expired) do
+    redis.call('ZREM', KEYS[1], processing_key)
+    local task_data = redis.call('RPOP', processing_key)
+    while task_data do
+        local ok, task = pcall(cjson.decode, task_data)
+        local task_id = ok and task['task_id'] or nil
+        local reaps = 1
+        if task_id then
+            local reap_key = 'task_queue:reaped:' .. task_id
+            reaps = redis.call('INCR', reap_key)
+            redis.call('EXPIRE', reap_key, ARGV[6])
+        end
+        if task_id and reaps < (tonumber(task['max_attempts']) or 3) then
+            local queue_key = KEYS[1 + (tonumber(task['priority']) or 2)] or KEYS[3]
+            redis.call('RPUSH', queue_key, task_data)
+            redis.call('SETEX', 'task_queue:status:' .. task_id, ARGV[5], 'pending')
+            requeued = requeued + 1
+        else
+            local task_json = ok and task_data or cjson.encode(task_data)
+            redis.call('LPUSH', KEYS[5], '{"task": ' .. task_json .. ', "error": "Task lease expired", "failed_at": "' .. ARGV[4] .. '"}')
+            if task_id then
+                redis.call('SETEX', 'task_queue:status:' .. task_id, ARGV[5], 'dead_letter')
+            end
+            dead = dead + 1
+        end
+        task_data = redis.call('RPOP', processing_key)
+    end
+end
+if requeued > 0 then
+    for i = 1, math.min(requeued, tonumber(ARGV[3])) do
+        redis.call('LPUSH', KEYS[6], 1)
+    end
+    redis.call('LTRIM', KEYS[6], 0, tonumber(ARGV[3]) - 1)
+    redis.call('INCRBY', KEYS[7], requeued)
+end
+return {requeued, dead}
+"""
+
+
 class TaskStatus(Enum):
     """Task processing status."""
     PENDING = "pending"
@@ -53,6 +171,25 @@ class TaskQueueConfig:
     dead_letter_threshold: int = 5
     priority_levels: int = 3
     queue_check_interval: float = 0.1
+    blocking_consumption: bool = True
+    blocking_pop_timeout: float = 1.0
+    delayed_promotion_interval: float = 0.5
+    delayed_batch_size: int = 100
+    fallback_queue_size: int = 500
+    fallback_journal_path: Optional[str] = None
+    fallback_put_timeout: float = 0.5
+    priority_weights: Dict[str, int] = field(default_factory=lambda: {'high': 6, 'normal': 3, 'low': 1})
+    task_type_concurrency: Dict[str, int] = field(default_factory=dict)
+    concurrency_defer_delay: float = 0.1
+    claim_scan_depth: int = 50
+    visibility_timeout: float = 30.0
+    lease_reaper_interval: float = 5.0
+    autoscale_enabled: bool = True
+    min_workers: int = 1
+    max_workers: int = 10
+    autoscale_interval: float = 5.0
+    autoscale_target_drain_time: float = 10.0
+    autoscale_cooldown: float = 30.0
     health_check_interval: int = 30
     metrics_interval: int = 60
 
@@ -106,7 +243,10 @@ class TaskResult:
 class QueueStatus:
     """Current status of task queues."""
     pending_tasks: Dict[TaskPriority, int] = field(default_factory=dict)
+    delayed_tasks: int = 0
+    fallback_tasks: int = 0
     processing_tasks: int = 0
+    in_flight_by_type: Dict[str, int] = field(default_factory=dict)
     completed_tasks: int = 0
     failed_tasks: int = 0
     dead_letter_tasks: int = 0
@@ -116,6 +256,51 @@ class QueueStatus:
     last_processed: Optional[datetime] = None
 
 
+class WeightedPriorityScheduler:
+    """
+    Smooth weighted round-robin over priority levels.
+    
+    Each call picks the priority to try first so that, under sustained load,
+    claims are shared between HIGH, NORMAL and LOW in proportion to their
+    weights. The remaining priorities follow in strict order, so workers never
+    idle while any queue has work.
+    """
+    
+    def __init__(self, weights: Dict[str, int], priority_order: tuple):
+        """
+        Initialize the scheduler.
+        
+        Args:
+            weights: Weight per priority name (``high``, ``normal``, ``low``)
+            priority_order: Priorities in strict fallback order
+        """
+        self.priority_order = priority_order
+        self.weights = {
+            priority: max(0, int(weights.get(priority.name.lower(), 0)))
+            for priority in priority_order
+        }
+        self.total_weight = sum(self.weights.values())
+        self._current = {priority: 0 for priority in priority_order}
+    
+    def next_order(self) -> tuple:
+        """
+        Get the order in which priority queues should be tried for one claim.
+        
+        Returns:
+            Tuple of priorities, preferred priority first
+        """
+        if self.total_weight <= 0:
+            return self.priority_order
+        
+        for priority, weight in self.weights.items():
+            self._current[priority] += weight
+        
+        preferred = max(self.priority_order, key=lambda priority: self._current[priority])
+        self._current[preferred] -= self.total_weight
+        
+        return (preferred,) + tuple(p for p in self.priority_order if p != preferred)
+
+
 class BackgroundTaskProcessor:
     """
     Background task processor with priority queues, retry logic, and dead letter queue.
@@ -124,6 +309,13 @@ class BackgroundTaskProcessor:
     processing asynchronously while maintaining high availability and reliability.
     """
     
+    PRIORITY_ORDER = (TaskPriority.HIGH, TaskPriority.NORMAL, TaskPriority.LOW)
+    WAKEUP_KEY = "task_queue:wakeup"
+    DELAYED_KEY = "task_queue:delayed"
+    DEPTH_KEY = "task_queue:depth"
+    LEASES_KEY = "task_queue:leases"
+    DEAD_LETTER_KEY = "task_queue:dead_letter"
+    
     def __init__(self, config: Optional[TaskQueueConfig] = None):
         """
         Initialize the background task processor.
@@ -135,21 +327,58 @@ class BackgroundTaskProcessor:
         self.redis_manager = get_redis_manager()
         self.performance_monitor = get_performance_monitor()
         
+        # Identifier used to namespace processing lists so several uvicorn
+        # workers can share the same Redis queues. A restarted container
+        # usually has the same hostname and PID, so a random suffix keeps it
+        # from taking over (and releasing) the leases of its crashed
+        # predecessor, whose in-flight tasks the lease reaper then requeues.
+        host_id = os.getenv('TASK_WORKER_INSTANCE_ID') or f"{socket.gethostname()}:{os.getpid()}"
+        self.instance_id = f"{host_id}:{uuid.uuid4().hex[:12]}"
+        
         # Task handlers registry
         self.task_handlers: Dict[str, Callable] = {}
         
-        # Worker management
+        # Worker management; the pool starts at worker_count and is resized
+        # between min_workers and max_workers by the autoscaler
+        self.min_workers = max(1, min(self.config.min_workers, self.config.worker_count))
+        self.max_workers = max(self.config.max_workers, self.config.worker_count)
         self.workers: List[asyncio.Task] = []
-        self.worker_pool = ThreadPoolExecutor(max_workers=self.config.worker_count)
+        self._workers_by_id: Dict[str, asyncio.Task] = {}
+        self._retiring_workers: set = set()
+        self._last_scale_time = 0.0
+        self.worker_pool = ThreadPoolExecutor(max_workers=self.max_workers)
         self.is_running = False
         self.shutdown_event = asyncio.Event()
         
+        # Bounded, journaled queue used while Redis is unavailable
+        self.local_queue = LocalTaskQueue(
+            max_size=self.config.fallback_queue_size,
+            journal_path=self.config.fallback_journal_path
+        )
+        self._draining = False
+        # Set while Redis is unavailable, so the depth counter is re-read once it is back
+        self._depth_stale = False
+        
+        # Fair scheduling across priorities and per-type concurrency caps
+        self.priority_scheduler = WeightedPriorityScheduler(self.config.priority_weights, self.PRIORITY_ORDER)
+        self.task_type_in_flight: Dict[str, int] = {}
+        
         # Metrics and monitoring
         self.metrics = {
             'tasks_queued': 0,
             'tasks_processed': 0,
             'tasks_failed': 0,
             'tasks_retried': 0,
+            'tasks_delayed': 0,
+            'tasks_promoted': 0,
+            'tasks_fallback_queued': 0,
+            'tasks_drained': 0,
+            'tasks_deferred': 0,
+            'scale_ups': 0,
+            'leases_reaped': 0,
+            'tasks_reaped_requeued': 0,
+            'tasks_reaped_dead_lettered': 0,
+            'scale_downs': 0,
             'average_processing_time': 0.0,
             'queue_depth': 0
         }
@@ -157,13 +386,14 @@ class BackgroundTaskProcessor:
         # Background tasks
         self._health_check_task: Optional[asyncio.Task] = None
         self._metrics_task: Optional[asyncio.Task] = None
+        self._delayed_promoter_task: Optional[asyncio.Task] = None
+        self._autoscaler_task: Optional[asyncio.Task] = None
+        self._lease_reaper_task: Optional[asyncio.Task] = None
         
         logger.info("BackgroundTaskProcessor initialized")
     
     def _load_config(self) -> TaskQueueConfig:
         """Load configuration from environment variables."""
-        import os
-        
         config = TaskQueueConfig()
         config.max_queue_size = int(os.getenv('TASK_QUEUE_MAX_SIZE', '1000'))
         config.worker_count = int(os.getenv('TASK_QUEUE_WORKERS', '5'))
@@ -172,9 +402,45 @@ class BackgroundTaskProcessor:
         config.retry_attempts = int(os.getenv('TASK_RETRY_ATTEMPTS', '3'))
         config.retry_backoff = float(os.getenv('TASK_RETRY_BACKOFF', '2.0'))
         config.dead_letter_threshold = int(os.getenv('TASK_DEAD_LETTER_THRESHOLD', '5'))
+        config.blocking_consumption = os.getenv('TASK_QUEUE_BLOCKING_POP', 'true').lower() == 'true'
+        config.blocking_pop_timeout = float(os.getenv('TASK_QUEUE_BLOCKING_TIMEOUT', '1.0'))
+        config.delayed_promotion_interval = float(os.getenv('TASK_DELAYED_PROMOTION_INTERVAL', '0.5'))
+        config.delayed_batch_size = int(os.getenv('TASK_DELAYED_BATCH_SIZE', '100'))
+        config.fallback_queue_size = int(os.getenv('TASK_FALLBACK_QUEUE_SIZE', '500'))
+        config.fallback_journal_path = os.getenv('TASK_FALLBACK_JOURNAL_PATH', 'data/task_queue_fallback.db') or None
+        config.fallback_put_timeout = float(os.getenv('TASK_FALLBACK_PUT_TIMEOUT', '0.5'))
+        config.priority_weights = self._parse_int_mapping(
+            os.getenv('TASK_PRIORITY_WEIGHTS', 'high=6,normal=3,low=1')
+        )
+        config.task_type_concurrency = self._parse_int_mapping(
+            os.getenv('TASK_TYPE_CONCURRENCY', 'process_media_message=2')
+        )
+        config.concurrency_defer_delay = float(os.getenv('TASK_CONCURRENCY_DEFER_DELAY', '0.1'))
+        config.claim_scan_depth = int(os.getenv('TASK_CLAIM_SCAN_DEPTH', '50'))
+        config.visibility_timeout = float(os.getenv('TASK_VISIBILITY_TIMEOUT', '30.0'))
+        config.lease_reaper_interval = float(os.getenv('TASK_LEASE_REAPER_INTERVAL', '5.0'))
+        config.autoscale_enabled = os.getenv('TASK_AUTOSCALE_ENABLED', 'true').lower() == 'true'
+        config.min_workers = int(os.getenv('TASK_QUEUE_MIN_WORKERS', '2'))
+        config.max_workers = int(os.getenv('TASK_QUEUE_MAX_WORKERS', '20'))
+        config.autoscale_interval = float(os.getenv('TASK_AUTOSCALE_INTERVAL', '5.0'))
+        config.autoscale_target_drain_time = float(os.getenv('TASK_AUTOSCALE_TARGET_DRAIN_TIME', '10.0'))
+        config.autoscale_cooldown = float(os.getenv('TASK_AUTOSCALE_COOLDOWN', '30.0'))
         
         return config
     
+    @staticmethod
+    def _parse_int_mapping(value: str) -> Dict[str, int]:
+        """Parse a ``name=value,name=value`` environment string into a dict."""
+        mapping: Dict[str, int] = {}
+        for item in value.split(','):
+            name, _, number = item.partition('=')
+            if name.strip() and number.strip():
+                try:
+                    mapping[name.strip()] = int(number)
+                except ValueError:
+                    logger.warning(f"Ignoring invalid setting '{item.strip()}'")
+        return mapping
+    
     def register_handler(self, task_type: str, handler: Callable):
         """
         Register a task handler for a specific task type.
@@ -196,14 +462,26 @@ class BackgroundTaskProcessor:
         self.is_running = True
         self.shutdown_event.clear()
         
+        # Reload tasks journaled during a previous outage and drain them once
+        # Redis is back
+        await self.local_queue.open()
+        self.redis_manager.add_recovery_callback(self._on_redis_recovered)
+        
         # Start worker tasks
         for i in range(self.config.worker_count):
-            worker_task = asyncio.create_task(self._worker_loop(f"worker-{i}"))
-            self.workers.append(worker_task)
+            self._spawn_worker(f"worker-{i}")
         
         # Start monitoring tasks
         self._health_check_task = asyncio.create_task(self._health_check_loop())
         self._metrics_task = asyncio.create_task(self._metrics_loop())
+        self._delayed_promoter_task = asyncio.create_task(self._delayed_promoter_loop())
+        if self.config.autoscale_enabled:
+            self._autoscaler_task = asyncio.create_task(self._autoscaler_loop())
+        if self.config.blocking_consumption:
+            self._lease_reaper_task = asyncio.create_task(self._lease_reaper_loop())
+        
+        if len(self.local_queue) and self.redis_manager.is_available():
+            asyncio.create_task(self._drain_local_queue())
         
         logger.info(f"✅ BackgroundTaskProcessor started with {self.config.worker_count} workers")
     
@@ -221,10 +499,22 @@ class BackgroundTaskProcessor:
             self._health_check_task.cancel()
         if self._metrics_task:
             self._metrics_task.cancel()
+        if self._delayed_promoter_task:
+            self._delayed_promoter_task.cancel()
+        if self._autoscaler_task:
+            self._autoscaler_task.cancel()
+        if self._lease_reaper_task:
+            self._lease_reaper_task.cancel()
         
         # Wait for workers to finish current tasks
         if self.workers:
             await asyncio.gather(*self.workers, return_exceptions=True)
+        self._workers_by_id.clear()
+        self._retiring_workers.clear()
+        
+        # Unfinished fallback tasks stay in the journal for the next start
+        self.redis_manager.remove_recovery_callback(self._on_redis_recovered)
+        self.local_queue.close()
         
         # Shutdown thread pool
         self.worker_pool.shutdown(wait=True)
@@ -235,6 +525,9 @@ class BackgroundTaskProcessor:
         """
         Queue a task for background processing.
         
+        All Redis writes for the task are sent in a single pipelined round-trip
+        and the capacity check uses the cached queue depth counter.
+        
         Args:
             task: Task to queue
             
@@ -252,36 +545,26 @@ class BackgroundTaskProcessor:
             if current_depth >= self.config.max_queue_size:
                 raise Exception(f"Task queue is full (depth: {current_depth})")
             
-            # Set task ID if not provided
-            if not task.task_id:
-                task.task_id = str(uuid.uuid4())
-            
-            # Set correlation ID
-            task.correlation_id = correlation_id
-            
-            # Serialize task
-            task_data = json.dumps(task.to_dict())
-            
-            # Queue task in Redis with priority
-            queue_key = self._get_queue_key(task.priority)
+            self._prepare_task(task, correlation_id)
             
             if self.redis_manager.is_available():
                 # Use Redis for persistent queuing
-                await self.redis_manager.execute_command('lpush', queue_key, task_data)
-                
-                # Set task status
-                await self._set_task_status(task.task_id, TaskStatus.PENDING)
-                
-                # Update metrics
-                await self.redis_manager.execute_command('incr', 'task_queue:metrics:queued')
+                queue_depth = await self._enqueue_pipelined([task])
+            elif self.is_running:
+                # Fall back to the bounded local queue served by the workers
+                logger.warning("Redis unavailable, queuing task locally")
+                self._depth_stale = True
+                queue_depth = await self._enqueue_local([task])
             else:
-                # Fallback to in-memory processing if Redis is unavailable
+                # No workers to serve a queue, process immediately; the task
+                # never enters the queue, so the depth is unchanged
                 logger.warning("Redis unavailable, processing task immediately")
+                self._depth_stale = True
                 asyncio.create_task(self._process_task_immediate(task))
+                queue_depth = current_depth
             
             # Update local metrics
             self.metrics['tasks_queued'] += 1
-            self.metrics['queue_depth'] = current_depth + 1
             
             log_with_context(
                 logger,
@@ -290,7 +573,7 @@ class BackgroundTaskProcessor:
                 task_id=task.task_id,
                 task_type=task.task_type,
                 priority=task.priority.name,
-                queue_depth=current_depth + 1,
+                queue_depth=queue_depth,
                 correlation_id=correlation_id
             )
             
@@ -307,18 +590,276 @@ class BackgroundTaskProcessor:
             )
             raise
     
+    async def queue_tasks(self, tasks: List[ProcessingTask]) -> List[str]:
+        """
+        Queue several tasks for background processing in one Redis round-trip.
+        
+        Args:
+            tasks: Tasks to queue
+            
+        Returns:
+            Task IDs in the same order as the given tasks
+            
+        Raises:
+            Exception: If the batch does not fit in the queue or Redis fails
+        """
+        if not tasks:
+            return []
+        
+        correlation_id = get_correlation_id()
+        
+        try:
+            current_depth = await self._get_queue_depth()
+            if current_depth + len(tasks) > self.config.max_queue_size:
+                raise Exception(
+                    f"Task queue is full (depth: {current_depth}, batch: {len(tasks)})"
+                )
+            
+            for task in tasks:
+                self._prepare_task(task, task.correlation_id or correlation_id)
+            
+            if self.redis_manager.is_available():
+                queue_depth = await self._enqueue_pipelined(tasks)
+            elif self.is_running:
+                logger.warning("Redis unavailable, queuing tasks locally")
+                self._depth_stale = True
+                queue_depth = await self._enqueue_local(tasks)
+            else:
+                logger.warning("Redis unavailable, processing tasks immediately")
+                self._depth_stale = True
+                for task in tasks:
+                    asyncio.create_task(self._process_task_immediate(task))
+                queue_depth = current_depth
+            
+            self.metrics['tasks_queued'] += len(tasks)
+            
+            log_with_context(
+                logger,
+                logging.INFO,
+                "Task batch queued",
+                task_count=len(tasks),
+                queue_depth=queue_depth,
+                correlation_id=correlation_id
+            )
+            
+            return [task.task_id for task in tasks]
+            
+        except Exception as e:
+            log_with_context(
+                logger,
+                logging.ERROR,
+                "Failed to queue task batch",
+                task_count=len(tasks),
+                error=str(e),
+                correlation_id=correlation_id
+            )
+            raise
+    
+    def _prepare_task(self, task: ProcessingTask, correlation_id: Optional[str]):
+        """Assign task ID and correlation ID before serialization."""
+        # Set task ID if not provided
+        if not task.task_id:
+            task.task_id = str(uuid.uuid4())
+        
+        # Set correlation ID
+        task.correlation_id = correlation_id
+    
+    async def _enqueue_pipelined(self, tasks: List[ProcessingTask]) -> int:
+        """
+        Write tasks, their statuses and counters to Redis in one pipeline.
+        
+        Args:
+            tasks: Prepared tasks to enqueue
+            
+        Returns:
+            Queue depth after enqueueing
+            
+        Raises:
+            Exception: If the pipeline could not be executed
+        """
+        ready: Dict[TaskPriority, List[str]] = {}
+        delayed: Dict[str, float] = {}
+        
+        for task in tasks:
+            task_data = json.dumps(task.to_dict())
+            if self._is_delayed(task):
+                # Park future tasks in the delayed set until they are due
+                delayed[task_data] = task.scheduled_at.timestamp()
+            else:
+                ready.setdefault(task.priority, []).append(task_data)
+        
+        ready_count = sum(len(items) for items in ready.values())
+        
+        commands: List[tuple] = []
+        for priority, items in ready.items():
+            commands.append(('lpush', self._get_queue_key(priority), *items))
+        if delayed:
+            commands.append(('zadd', self.DELAYED_KEY, delayed))
+        for task in tasks:
+            commands.append(('setex', f'task_queue:status:{task.task_id}', 3600, TaskStatus.PENDING.value))
+        commands.append(('incrby', 'task_queue:metrics:queued', len(tasks)))
+        
+        depth_index = None
+        if ready_count:
+            commands.append(('incrby', self.DEPTH_KEY, ready_count))
+            depth_index = len(commands) - 1
+            
+            # Wake up blocked workers
+            if self.config.blocking_consumption:
+                commands.extend(self._wakeup_commands(ready_count))
+        
+        results = await self.redis_manager.execute_pipeline(commands)
+        if results is None:
+            raise Exception("Redis pipeline failed while queuing tasks")
+        
+        if depth_index is not None:
+            self.metrics['queue_depth'] = max(0, int(results[depth_index]))
+        self.metrics['tasks_delayed'] += len(delayed)
+        
+        return self.metrics['queue_depth']
+    
+    async def _enqueue_local(self, tasks: List[ProcessingTask]) -> int:
+        """
+        Put tasks on the local fallback queue, waiting briefly when it is full.
+        
+        Args:
+            tasks: Prepared tasks to enqueue
+            
+        Returns:
+            Local queue depth after enqueueing
+            
+        Raises:
+            LocalQueueFull: If the local queue stays full past the put timeout
+        """
+        for task in tasks:
+            await self.local_queue.put(
+                task.task_id,
+                task.priority.value,
+                json.dumps(task.to_dict()),
+                due_at=task.scheduled_at.timestamp() if self._is_delayed(task) else None,
+                timeout=self.config.fallback_put_timeout
+            )
+            self.metrics['tasks_fallback_queued'] += 1
+        
+        return len(self.local_queue)
+    
+    async def _get_local_task(self) -> tuple:
+        """
+        Wait for the next task on the local fallback queue.
+        
+        Returns:
+            Tuple of (task, queue entry), or (None, None) if nothing is due
+        """
+        entry = await self.local_queue.get(
+            timeout=self.config.queue_check_interval,
+            priority_order=[priority.value for priority in self.priority_scheduler.next_order()]
+        )
+        if entry is None:
+            return None, None
+        
+        try:
+            return ProcessingTask.from_dict(json.loads(entry.task_data)), entry
+        except Exception as e:
+            logger.error(f"Dropping unreadable local task {entry.task_id}: {e}")
+            await self.local_queue.ack([entry])
+            return None, None
+    
+    async def _on_redis_recovered(self):
+        """Drain the local fallback queue when Redis leaves fallback mode."""
+        if self.is_running:
+            await self._drain_local_queue()
+    
+    async def _drain_local_queue(self) -> int:
+        """
+        Move tasks from the local fallback queue back into Redis.
+        
+        Tasks are sent in pipelined batches of ``batch_size`` and removed from
+        the journal only after Redis accepted them.
+        
+        Returns:
+            Number of tasks moved to Redis
+        """
+        if self._draining:
+            return 0
+        
+        self._draining = True
+        drained = 0
+        
+        try:
+            while len(self.local_queue) and self.redis_manager.is_available():
+                entries = self.local_queue.pop_batch(max(1, self.config.batch_size))
+                
+                try:
+                    tasks = [ProcessingTask.from_dict(json.loads(entry.task_data)) for entry in entries]
+                    await self._enqueue_pipelined(tasks)
+                except Exception as e:
+                    self.local_queue.restore(entries)
+                    logger.error(f"Failed to drain local task queue: {e}")
+                    break
+                
+                await self.local_queue.ack(entries)
+                drained += len(entries)
+            
+            if drained:
+                self.metrics['tasks_drained'] += drained
+                logger.info(f"Drained {drained} tasks from local fallback queue to Redis")
+        finally:
+            self._draining = False
+        
+        return drained
+    
     async def _worker_loop(self, worker_id: str):
         """Main worker loop for processing tasks."""
         logger.info(f"Worker {worker_id} started")
         
-        while self.is_running and not self.shutdown_event.is_set():
+        while (self.is_running and not self.shutdown_event.is_set()
+               and worker_id not in self._retiring_workers):
             try:
-                # Get next task from queues (priority order)
-                task = await self._get_next_task()
-                
-                if task:
-                    await self._process_task(task, worker_id)
+                task_data = local_entry = None
+                if not self.redis_manager.is_available():
+                    # Serve the local fallback queue while Redis is down
+                    task, local_entry = await self._get_local_task()
+                elif self.config.blocking_consumption:
+                    # Claim next task atomically, blocking while queues are empty
+                    task, task_data = await self._claim_next_task(worker_id)
                 else:
+                    # Get next task from queues (priority order)
+                    task, task_data = await self._get_next_task(), None
+                
+                if task and not self._acquire_type_slot(task.task_type):
+                    # Task type reached its cap since the claim, hand it back
+                    await self._defer_task(task, worker_id, task_data, local_entry)
+                    await asyncio.sleep(self.config.concurrency_defer_delay)
+                elif task:
+                    # Keep the lease alive while long tasks (e.g. PDFs) run
+                    heartbeat = (
+                        asyncio.create_task(self._lease_heartbeat(worker_id))
+                        if task_data is not None else None
+                    )
+                    retry_queued = True
+                    try:
+                        await self._process_task(task, worker_id)
+                    except LocalQueueFull:
+                        # The retry did not fit on the local queue, keep the original
+                        retry_queued = False
+                        logger.warning(f"Local task queue full, keeping task {task.task_id} for retry")
+                    finally:
+                        if heartbeat:
+                            heartbeat.cancel()
+                        was_capped = self._release_type_slot(task.task_type)
+                        if task_data is not None and retry_queued:
+                            await self._acknowledge_task(worker_id, task_data)
+                            if was_capped:
+                                # Wake a worker for tasks skipped while the type was capped
+                                await self.redis_manager.execute_pipeline(self._wakeup_commands(1))
+                        if local_entry is not None:
+                            if retry_queued:
+                                await self.local_queue.ack([local_entry])
+                            else:
+                                local_entry.task_data = json.dumps(task.to_dict())
+                                retry_at = task.scheduled_at.timestamp() if task.scheduled_at else time.time()
+                                self.local_queue.requeue(local_entry, retry_at)
+                elif not self.config.blocking_consumption and self.redis_manager.is_available():
                     # No tasks available, wait briefly
                     await asyncio.sleep(self.config.queue_check_interval)
                     
@@ -330,13 +871,460 @@ class BackgroundTaskProcessor:
         
         logger.info(f"Worker {worker_id} stopped")
     
+    def _spawn_worker(self, worker_id: str):
+        """Start a worker coroutine and track it by ID."""
+        worker_task = asyncio.create_task(self._worker_loop(worker_id))
+        worker_task.add_done_callback(lambda _: self._on_worker_exit(worker_id, worker_task))
+        self.workers.append(worker_task)
+        self._workers_by_id[worker_id] = worker_task
+    
+    def _on_worker_exit(self, worker_id: str, worker_task: asyncio.Task):
+        """Forget a worker once its loop has returned."""
+        self._retiring_workers.discard(worker_id)
+        if self._workers_by_id.get(worker_id) is worker_task:
+            del self._workers_by_id[worker_id]
+        if self.is_running and worker_task in self.workers:
+            self.workers.remove(worker_task)
+    
+    def get_active_worker_count(self) -> int:
+        """Get the number of workers that are running and not being retired."""
+        return len([
+            worker_id for worker_id, worker_task in self._workers_by_id.items()
+            if not worker_task.done() and worker_id not in self._retiring_workers
+        ])
+    
+    def _get_openai_circuit_state(self) -> Optional[CircuitState]:
+        """Get the OpenAI circuit breaker state without creating the breaker."""
+        status = get_circuit_breaker_manager().get_all_status().get('openai_api')
+        return CircuitState(status['state']) if status else None
+    
+    def _compute_desired_workers(self) -> tuple:
+        """
+        Compute the worker count needed to drain the backlog in time.
+        
+        Busy workers are kept, and enough extra workers are added to clear the
+        queued backlog within ``autoscale_target_drain_time`` at the current
+        processing-time EWMA. An open OpenAI circuit pins the pool to its
+        minimum and a half-open circuit blocks growth, so a failing or
+        rate-limited API is not hit harder.
+        
+        Returns:
+            Tuple of (desired worker count, reason)
+        """
+        current = self.get_active_worker_count()
+        backlog = self.get_cached_queue_depth() + len(self.local_queue)
+        busy = sum(self.task_type_in_flight.values())
+        avg_time = self.metrics['average_processing_time'] or 1.0
+        
+        needed = busy + math.ceil(backlog * avg_time / max(0.1, self.config.autoscale_target_drain_time))
+        desired = max(self.min_workers, min(self.max_workers, needed))
+        reason = "backlog" if desired > current else "idle"
+        
+        circuit_state = self._get_openai_circuit_state()
+        if circuit_state == CircuitState.OPEN:
+            desired, reason = self.min_workers, "openai_circuit_open"
+        elif circuit_state == CircuitState.HALF_OPEN and desired > current:
+            desired, reason = current, "openai_circuit_half_open"
+        
+        return desired, reason
+    
+    async def _autoscale(self) -> int:
+        """
+        Run one autoscaling step.
+        
+        Scale-ups happen immediately; scale-downs retire one worker per step
+        and only after ``autoscale_cooldown`` seconds without a scaling change.
+        Retired workers finish their current task before exiting.
+        
+        Returns:
+            Change in worker count
+        """
+        current = self.get_active_worker_count()
+        desired, reason = self._compute_desired_workers()
+        now = time.monotonic()
+        
+        if desired > current:
+            delta = desired - current
+            await self._scale_up(delta)
+            self.metrics['scale_ups'] += 1
+        elif desired < current and now - self._last_scale_time >= self.config.autoscale_cooldown:
+            delta = -1
+            self._scale_down(1)
+            self.metrics['scale_downs'] += 1
+        else:
+            return 0
+        
+        self._last_scale_time = now
+        
+        self.performance_monitor.record_metric(
+            "task_worker_scaling",
+            current + delta,
+            "count",
+            {
+                "direction": "up" if delta > 0 else "down",
+                "reason": reason,
+                "previous_workers": str(current),
+                "queue_depth": str(self.get_cached_queue_depth()),
+                "avg_processing_time": str(round(self.metrics['average_processing_time'], 3))
+            }
+        )
+        
+        log_with_context(
+            logger,
+            logging.INFO,
+            "Task worker pool scaled",
+            previous_workers=current,
+            workers=current + delta,
+            reason=reason
+        )
+        
+        return delta
+    
+    async def _scale_up(self, count: int):
+        """Start count additional workers using the lowest free worker IDs."""
+        # Cancel pending retirements first, those workers are still running
+        while self._retiring_workers and count > 0:
+            self._retiring_workers.pop()
+            count -= 1
+        
+        new_ids: List[str] = []
+        index = 0
+        while len(new_ids) < count:
+            worker_id = f"worker-{index}"
+            if worker_id not in self._workers_by_id:
+                new_ids.append(worker_id)
+            index += 1
+        
+        for worker_id in new_ids:
+            self._spawn_worker(worker_id)
+    
+    def _scale_down(self, count: int):
+        """Ask the highest-numbered workers to exit after their current task."""
+        candidates = sorted(
+            (worker_id for worker_id in self._workers_by_id if worker_id not in self._retiring_workers),
+            key=lambda worker_id: int(worker_id.rsplit('-', 1)[-1]),
+            reverse=True
+        )
+        for worker_id in candidates[:count]:
+            self._retiring_workers.add(worker_id)
+    
+    async def _autoscaler_loop(self):
+        """Background loop resizing the worker pool."""
+        while self.is_running and not self.shutdown_event.is_set():
+            try:
+                await asyncio.sleep(self.config.autoscale_interval)
+                await self._autoscale()
+                self.performance_monitor.record_metric(
+                    "task_workers_active",
+                    self.get_active_worker_count(),
+                    "count"
+                )
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Task worker autoscaler error: {e}")
+    
+    def _acquire_type_slot(self, task_type: str) -> bool:
+        """
+        Reserve an in-flight slot for a task type.
+        
+        Args:
+            task_type: Type of the task about to run
+            
+        Returns:
+            False if the type is already at its configured concurrency cap
+        """
+        limit = self.config.task_type_concurrency.get(task_type)
+        in_flight = self.task_type_in_flight.get(task_type, 0)
+        if limit is not None and in_flight >= limit:
+            return False
+        
+        self.task_type_in_flight[task_type] = in_flight + 1
+        return True
+    
+    def _release_type_slot(self, task_type: str) -> bool:
+        """
+        Release an in-flight slot reserved by _acquire_type_slot.
+        
+        Returns:
+            True if the type was at its concurrency cap before the release
+        """
+        was_capped = task_type in self._capped_task_types()
+        remaining = self.task_type_in_flight.get(task_type, 0) - 1
+        if remaining > 0:
+            self.task_type_in_flight[task_type] = remaining
+        else:
+            self.task_type_in_flight.pop(task_type, None)
+        return was_capped
+    
+    def _capped_task_types(self) -> List[str]:
+        """Get the task types whose in-flight count has reached their cap."""
+        return [
+            task_type for task_type, limit in self.config.task_type_concurrency.items()
+            if self.task_type_in_flight.get(task_type, 0) >= limit
+        ]
+    
+    async def _defer_task(self, task: ProcessingTask, worker_id: str,
+                          task_data: Optional[str], local_entry: Optional[LocalQueueEntry]):
+        """
+        Hand back a claimed task whose type is at its concurrency cap.
+        
+        Claims skip capped types, so this only happens when the cap filled
+        between the claim and the slot reservation. The task goes back to the
+        claim end of its queue (or onto the local queue), keeping its place
+        instead of a round trip through the delayed set.
+        """
+        self.metrics['tasks_deferred'] += 1
+        
+        if local_entry is not None:
+            due_at = time.time() + self.config.concurrency_defer_delay
+            self.local_queue.requeue(local_entry, due_at)
+            return
+        
+        commands = [
+            ('rpush', self._get_queue_key(task.priority), task_data or json.dumps(task.to_dict())),
+            ('incr', self.DEPTH_KEY)
+        ]
+        if task_data is not None:
+            processing_key = self._get_processing_key(worker_id)
+            commands += [
+                ('lrem', processing_key, 1, task_data),
+                ('zrem', self.LEASES_KEY, processing_key)
+            ]
+        await self.redis_manager.execute_pipeline(commands)
+    
+    async def _claim_next_task(self, worker_id: str) -> tuple:
+        """
+        Claim the next task using an atomic move into the worker's processing list.
+        
+        Queues are checked in the order chosen by the weighted priority
+        scheduler with a single script call. When all
+        queues are empty the worker blocks on the wake-up list instead of polling,
+        so an idle worker costs one Redis call per blocking timeout.
+        
+        Args:
+            worker_id: Worker claiming the task
+            
+        Returns:
+            Tuple of (task, raw task data) or (None, None) if nothing was claimed
+        """
+        if not self.redis_manager.is_available():
+            return None, None
+        
+        task_data = await self._claim_task_data(worker_id)
+        
+        if task_data is None:
+            # Block until a producer signals new work or the timeout elapses
+            timeout = self._get_blocking_timeout()
+            wait_started = time.monotonic()
+            woken = await self.redis_manager.execute_command(
+                'brpop',
+                [self.WAKEUP_KEY],
+                timeout=timeout
+            )
+            if woken is None:
+                if time.monotonic() - wait_started < timeout / 2:
+                    # Blocking pop failed fast (e.g. Redis error), avoid spinning
+                    await asyncio.sleep(self.config.queue_check_interval)
+                return None, None
+            
+            task_data = await self._claim_task_data(worker_id)
+            if task_data is None:
+                # Spurious wake-up; yield so shutdown can be observed
+                await asyncio.sleep(0)
+                return None, None
+        
+        try:
+            task = ProcessingTask.from_dict(json.loads(task_data))
+        except Exception as e:
+            logger.error(f"Discarding malformed task claimed by {worker_id}: {e}")
+            await self._acknowledge_task(worker_id, task_data)
+            return None, None
+        
+        # Tasks scheduled for the future belong in the delayed set
+        if self._is_delayed(task):
+            await self._schedule_delayed_task(task, task_data)
+            await self._acknowledge_task(worker_id, task_data)
+            return None, None
+        
+        return task, task_data
+    
+    async def _claim_task_data(self, worker_id: str) -> Optional[str]:
+        """Atomically move the next scheduled task into the worker's processing list."""
+        queue_keys = [self._get_queue_key(priority) for priority in self.priority_scheduler.next_order()]
+        keys = queue_keys + [self._get_processing_key(worker_id), self.DEPTH_KEY, self.LEASES_KEY]
+        
+        task_data = await self.redis_manager.execute_command(
+            'eval', CLAIM_TASK_SCRIPT, len(keys), *keys, time.time() + self.config.visibility_timeout,
+            self.config.claim_scan_depth, *self._capped_task_types()
+        )
+        return task_data if isinstance(task_data, (str, bytes)) else None
+    
+    async def _acknowledge_task(self, worker_id: str, task_data: str):
+        """Remove a finished task from the worker's processing list and release its lease."""
+        processing_key = self._get_processing_key(worker_id)
+        results = await self.redis_manager.execute_pipeline([
+            ('lrem', processing_key, 1, task_data),
+            ('zrem', self.LEASES_KEY, processing_key)
+        ])
+        if results is not None and not results[0]:
+            # The lease expired and the reaper already requeued this task
+            logger.warning(f"Task acknowledged by {worker_id} after its lease expired")
+    
+    async def _lease_heartbeat(self, worker_id: str):
+        """Extend the worker's lease every third of the visibility timeout."""
+        processing_key = self._get_processing_key(worker_id)
+        interval = max(0.1, self.config.visibility_timeout / 3)
+        
+        while True:
+            await asyncio.sleep(interval)
+            # XX: never recreate a lease the reaper has already taken back
+            await self.redis_manager.execute_command(
+                'zadd', self.LEASES_KEY, {processing_key: time.time() + self.config.visibility_timeout}, xx=True
+            )
+    
+    async def reap_expired_leases(self) -> tuple:
+        """
+        Requeue or dead-letter tasks whose lease expired.
+        
+        A lease expires when the worker holding it stopped heartbeating, e.g.
+        because its process was killed during a rolling restart. Reaping is a
+        single script call, so several processes can run the reaper safely.
+        
+        Returns:
+            Tuple of (tasks requeued, tasks dead-lettered)
+        """
+        if not self.redis_manager.is_available():
+            return 0, 0
+        
+        keys = (
+            [self.LEASES_KEY]
+            + [self._get_queue_key(priority) for priority in TaskPriority]
+            + [self.DEAD_LETTER_KEY, self.WAKEUP_KEY, self.DEPTH_KEY]
+        )
+        result = await self.redis_manager.execute_command(
+            'eval',
+            REAP_EXPIRED_LEASES_SCRIPT,
+            len(keys),
+            *keys,
+            time.time(),
+            self.config.delayed_batch_size,
+            max(1, len(self._workers_by_id) or self.config.worker_count),
+            datetime.now(timezone.utc).isoformat(),
+            3600,
+            86400
+        )
+        if not isinstance(result, (list, tuple)) or len(result) != 2:
+            return 0, 0
+        
+        requeued, dead_lettered = int(result[0]), int(result[1])
+        if requeued or dead_lettered:
+            self.metrics['leases_reaped'] += 1
+            self.metrics['tasks_reaped_requeued'] += requeued
+            self.metrics['tasks_reaped_dead_lettered'] += dead_lettered
+            
+            log_with_context(
+                logger,
+                logging.WARNING,
+                "Reclaimed tasks from expired leases",
+                requeued=requeued,
+                dead_lettered=dead_lettered
+            )
+        
+        return requeued, dead_lettered
+    
+    async def _lease_reaper_loop(self):
+        """Background loop reclaiming tasks from expired leases."""
+        while self.is_running and not self.shutdown_event.is_set():
+            try:
+                await asyncio.sleep(self.config.lease_reaper_interval)
+                await self.reap_expired_leases()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Lease reaper error: {e}")
+    
+    def _wakeup_commands(self, task_count: int) -> List[tuple]:
+        """Build commands pushing wake-up tokens for workers blocked on empty queues."""
+        max_tokens = max(1, len(self._workers_by_id) or self.config.worker_count)
+        tokens = [1] * min(task_count, max_tokens)
+        # Bound the token list; spare tokens only cause a cheap empty claim
+        return [
+            ('lpush', self.WAKEUP_KEY, *tokens),
+            ('ltrim', self.WAKEUP_KEY, 0, max_tokens - 1)
+        ]
+    
+    def _get_blocking_timeout(self) -> float:
+        """Get blocking pop timeout kept below the Redis command timeout."""
+        command_timeout = getattr(getattr(self.redis_manager, 'config', None), 'command_timeout', None)
+        timeout = self.config.blocking_pop_timeout
+        if isinstance(command_timeout, (int, float)):
+            timeout = min(timeout, max(0.1, command_timeout / 2))
+        return timeout
+    
+    def _is_delayed(self, task: ProcessingTask) -> bool:
+        """Check if a task is scheduled for future execution."""
+        return bool(task.scheduled_at and task.scheduled_at > datetime.now(timezone.utc))
+    
+    async def _schedule_delayed_task(self, task: ProcessingTask, task_data: str):
+        """Store a task in the delayed set scored by its due time."""
+        await self.redis_manager.execute_command(
+            'zadd', self.DELAYED_KEY, {task_data: task.scheduled_at.timestamp()}
+        )
+        self.metrics['tasks_delayed'] += 1
+    
+    async def _promote_due_tasks(self) -> int:
+        """
+        Move due tasks from the delayed set into their priority queues.
+        
+        Returns:
+            Number of tasks promoted
+        """
+        if not self.redis_manager.is_available():
+            return 0
+        
+        keys = (
+            [self.DELAYED_KEY]
+            + [self._get_queue_key(priority) for priority in TaskPriority]
+            + [self.WAKEUP_KEY, self.DEPTH_KEY]
+        )
+        promoted = await self.redis_manager.execute_command(
+            'eval',
+            PROMOTE_DELAYED_SCRIPT,
+            len(keys),
+            *keys,
+            time.time(),
+            self.config.delayed_batch_size,
+            max(1, self.config.worker_count)
+        )
+        promoted = promoted if isinstance(promoted, int) else 0
+        self.metrics['tasks_promoted'] += promoted
+        return promoted
+    
+    async def _delayed_promoter_loop(self):
+        """Background loop promoting delayed and retrying tasks once they are due."""
+        while self.is_running and not self.shutdown_event.is_set():
+            try:
+                promoted = await self._promote_due_tasks()
+                
+                # Keep draining without sleeping while full batches are due
+                if promoted < self.config.delayed_batch_size:
+                    await asyncio.sleep(self.config.delayed_promotion_interval)
+                else:
+                    await asyncio.sleep(0)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Delayed task promotion error: {e}")
+                await asyncio.sleep(5.0)
+    
     async def _get_next_task(self) -> Optional[ProcessingTask]:
         """Get the next task from priority queues."""
         if not self.redis_manager.is_available():
             return None
         
-        # Check queues in priority order (HIGH -> NORMAL -> LOW)
-        for priority in [TaskPriority.HIGH, TaskPriority.NORMAL, TaskPriority.LOW]:
+        # Check queues in weighted fair order
+        for priority in self.priority_scheduler.next_order():
             queue_key = self._get_queue_key(priority)
             
             try:
@@ -344,13 +1332,13 @@ class BackgroundTaskProcessor:
                 task_data = await self.redis_manager.execute_command('rpop', queue_key)
                 
                 if task_data:
+                    await self.redis_manager.execute_command('decr', self.DEPTH_KEY)
                     task_dict = json.loads(task_data)
                     task = ProcessingTask.from_dict(task_dict)
                     
-                    # Check if task is scheduled for future execution
-                    if task.scheduled_at and task.scheduled_at > datetime.now(timezone.utc):
-                        # Re-queue for later
-                        await self.redis_manager.execute_command('lpush', queue_key, task_data)
+                    # Tasks scheduled for the future belong in the delayed set
+                    if self._is_delayed(task):
+                        await self._schedule_delayed_task(task, task_data)
                         continue
                     
                     return task
@@ -507,7 +1495,7 @@ class BackgroundTaskProcessor:
         
         await self.redis_manager.execute_command(
             'lpush',
-            'task_queue:dead_letter',
+            self.DEAD_LETTER_KEY,
             json.dumps(dead_letter_data)
         )
         
@@ -558,8 +1546,40 @@ class BackgroundTaskProcessor:
         """Get Redis key for priority queue."""
         return f"task_queue:{priority.name.lower()}"
     
+    def _get_processing_key(self, worker_id: str) -> str:
+        """Get Redis key for a worker's in-flight processing list."""
+        return f"task_queue:processing:{self.instance_id}:{worker_id}"
+    
+    def get_cached_queue_depth(self) -> int:
+        """
+        Get total queue depth without a Redis round-trip.
+        
+        The value is refreshed from the Redis depth counter on every enqueue
+        and resynchronized from the queue lengths by the health check loop.
+        
+        Returns:
+            Cached queue depth
+        """
+        return self.metrics['queue_depth']
+    
     async def _get_queue_depth(self) -> int:
-        """Get total queue depth across all priorities."""
+        """
+        Get cached total queue depth, refreshed by enqueues and health checks.
+        
+        Nothing updates the cache while Redis is unavailable, so the first
+        call after Redis is back re-reads the Redis depth counter.
+        """
+        if self._depth_stale and self.redis_manager.is_available():
+            try:
+                depth = await self.redis_manager.execute_command('get', self.DEPTH_KEY)
+                self.metrics['queue_depth'] = max(0, int(depth or 0))
+                self._depth_stale = False
+            except Exception as e:
+                logger.warning(f"Failed to refresh queue depth: {e}")
+        return self.get_cached_queue_depth()
+    
+    async def _count_queue_depth(self) -> int:
+        """Count total queue depth across all priorities in Redis."""
         if not self.redis_manager.is_available():
             return 0
         
@@ -597,9 +1617,15 @@ class BackgroundTaskProcessor:
     async def _perform_health_check(self):
         """Perform health check on task processing system."""
         try:
-            # Check queue depths
-            queue_depth = await self._get_queue_depth()
+            # Check queue depths and resync the cached depth counter
+            queue_depth = await self._count_queue_depth()
             self.metrics['queue_depth'] = queue_depth
+            if self.redis_manager.is_available():
+                await self.redis_manager.execute_command('set', self.DEPTH_KEY, queue_depth)
+                
+                # Catch up on fallback tasks if a recovery notification was missed
+                if len(self.local_queue):
+                    await self._drain_local_queue()
             
             # Check for stuck tasks (processing for too long)
             # This would require additional Redis tracking
@@ -710,8 +1736,14 @@ class BackgroundTaskProcessor:
                     depth = await self.redis_manager.execute_command('llen', queue_key)
                     status.pending_tasks[priority] = depth or 0
                 
-                # Get processing count (approximate)
-                status.processing_tasks = len([w for w in self.workers if not w.done()])
+                # Get delayed/retrying task count
+                delayed = await self.redis_manager.execute_command('zcard', self.DELAYED_KEY)
+                status.delayed_tasks = delayed if isinstance(delayed, int) else 0
+                
+            # Tasks currently executing in this process, by type
+            status.processing_tasks = sum(self.task_type_in_flight.values())
+            status.in_flight_by_type = dict(self.task_type_in_flight)
+            status.fallback_tasks = len(self.local_queue)
             
             # Update from local metrics
             status.queue_depth = self.metrics['queue_depth']
@@ -3,30 +3,44 @@ Caching service for performance optimization.
 
 This module provides intelligent caching for frequently accessed data,
 analysis results, and computed values to improve application performance.
+
+Analysis results are cached in two tiers:
+- L1: a bounded in-process LRU with TTL holding JobAnalysisResult objects,
+  including short-lived negative entries for known misses
+- L2: Redis (through the graceful error handler), shared by all workers
+Writes and deletes publish the key on a Redis pub/sub channel so the other
+workers drop their L1 copy (positive or negative) and re-read L2.
 """
 
 import json
 import hashlib
-from typing import Any, Optional, Dict, List, Callable
+import os
+import uuid
+from dataclasses import dataclass, replace
+from typing import Any, Optional, Dict, List, Callable, Tuple, Union
 from datetime import datetime, timedelta
 from functools import wraps
 import asyncio
 
 from app.utils.logging import get_logger
+from app.utils.ttl_cache import BoundedTTLCache
 from app.models.data_models import JobAnalysisResult, JobClassification
 from app.services.redis_connection_manager import get_redis_manager
+from app.utils.text_normalization import NormalizedText, normalize_job_text, text_digest
 
 logger = get_logger(__name__)
 
+# L1 marker for a key known to be missing from L2
+NEGATIVE_ENTRY = object()
+
 
 class CacheKey:
     """Cache key generator with consistent naming."""
     
     @staticmethod
-    def analysis_result(job_text: str) -> str:
-        """Generate cache key for analysis results."""
-        text_hash = hashlib.md5(job_text.encode()).hexdigest()
-        return f"analysis:{text_hash}"
+    def analysis_result(job_text: Union[str, NormalizedText]) -> str:
+        """Generate cache key for analysis results from the canonical job text."""
+        return f"analysis:{text_digest(job_text)}"
     
     @staticmethod
     def user_stats(phone_number: str) -> str:
@@ -54,13 +68,29 @@ class CacheKey:
         return f"user_interactions:{user_id}:{page}"
 
 
+@dataclass
+class AnalysisCacheConfig:
+    """Configuration for the in-process (L1) analysis result cache."""
+    enabled: bool = True
+    max_size: int = 5000
+    ttl: float = 300.0  # seconds; bounds staleness if an invalidation is missed
+    negative_ttl: float = 5.0
+    invalidation_channel: str = "cache:invalidate:analysis"
+    reconnect_delay: float = 5.0
+
+
 class CachingService:
     """
     Intelligent caching service with TTL management and cache warming.
     """
     
-    def __init__(self):
-        """Initialize caching service."""
+    def __init__(self, analysis_config: Optional[AnalysisCacheConfig] = None):
+        """
+        Initialize caching service.
+        
+        Args:
+            analysis_config: L1 analysis cache configuration (loaded from environment if omitted)
+        """
         self.redis_manager = None
         self.graceful_handler = None
         self.default_ttl = 300  # 5 minutes
@@ -71,6 +101,29 @@ class CachingService:
             "deletes": 0,
             "errors": 0
         }
+        
+        # In-process tier for analysis results, invalidated across workers over pub/sub
+        self.analysis_config = analysis_config or self._load_analysis_config()
+        self.analysis_l1 = BoundedTTLCache(self.analysis_config.max_size, self.analysis_config.ttl)
+        self.instance_id = uuid.uuid4().hex
+        self._invalidation_task: Optional[asyncio.Task] = None
+        self.tier_stats = {
+            "l1_hits": 0,
+            "l1_negative_hits": 0,
+            "l2_hits": 0,
+            "l2_misses": 0,
+            "invalidations_published": 0,
+            "invalidations_received": 0
+        }
+    
+    def _load_analysis_config(self) -> AnalysisCacheConfig:
+        """Load L1 analysis cache configuration from environment variables."""
+        config = AnalysisCacheConfig()
+        config.enabled = os.getenv('ANALYSIS_L1_CACHE_ENABLED', 'true').lower() == 'true'
+        config.max_size = int(os.getenv('ANALYSIS_L1_CACHE_SIZE', '5000'))
+        config.ttl = float(os.getenv('ANALYSIS_L1_CACHE_TTL', '300'))
+        config.negative_ttl = float(os.getenv('ANALYSIS_L1_NEGATIVE_TTL', '5'))
+        return config
     
     def _get_redis_manager(self):
         """Lazy initialization of Redis manager to avoid circular imports."""
@@ -109,25 +162,56 @@ class CachingService:
                 redis_manager = self._get_redis_manager()
                 result = await redis_manager.execute_command("get", key)
             
-            if result is not None:
-                self.cache_stats["hits"] += 1
-                logger.debug(f"Cache hit: {key}")
-                # Parse JSON if it's a string
-                if isinstance(result, str):
-                    try:
-                        return json.loads(result)
-                    except json.JSONDecodeError:
-                        return result
-                return result
-            else:
-                self.cache_stats["misses"] += 1
-                logger.debug(f"Cache miss: {key}")
-                return None
+            return self._decode(key, result)
         except Exception as e:
             self.cache_stats["errors"] += 1
             logger.warning(f"Cache get error for key '{key}': {e}")
             return None
     
+    async def get_with_ttl(self, key: str) -> Tuple[Optional[Any], Optional[float]]:
+        """
+        Get a value and its remaining Redis TTL in one round trip.
+        
+        Falls back to get() without a TTL when Redis cannot take a pipeline.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Tuple of (cached value or None, remaining seconds or None if unknown)
+        """
+        try:
+            redis_manager = self._get_redis_manager()
+            if redis_manager.is_available():
+                results = await redis_manager.execute_pipeline(
+                    [("get", key), ("pttl", key)], transaction=False
+                )
+                if results is not None:
+                    result, pttl = results
+                    remaining = pttl / 1000 if pttl is not None and pttl >= 0 else None
+                    return self._decode(key, result), remaining
+        except Exception as e:
+            logger.warning(f"Cache pipeline get error for key '{key}': {e}")
+        
+        return await self.get(key), None
+    
+    def _decode(self, key: str, result: Any) -> Optional[Any]:
+        """Count a Redis read as a hit or miss and parse a JSON value."""
+        if result is None:
+            self.cache_stats["misses"] += 1
+            logger.debug(f"Cache miss: {key}")
+            return None
+        
+        self.cache_stats["hits"] += 1
+        logger.debug(f"Cache hit: {key}")
+        # Parse JSON if it's a string
+        if isinstance(result, str):
+            try:
+                return json.loads(result)
+            except json.JSONDecodeError:
+                return result
+        return result
+    
     async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
         """
         Set value in cache with graceful fallback.
@@ -176,6 +260,7 @@ class CachingService:
         Returns:
             True if successful, False otherwise
         """
+        self.analysis_l1.pop(key)
         try:
             redis_manager = self._get_redis_manager()
             result = await redis_manager.execute_command("delete", key)
@@ -267,7 +352,7 @@ class CachingService:
     
     async def cache_analysis_result(
         self, 
-        job_text: str, 
+        job_text: Union[str, NormalizedText], 
         result: JobAnalysisResult,
         ttl: int = 3600  # 1 hour
     ) -> bool:
@@ -275,7 +360,7 @@ class CachingService:
         Cache analysis result for job text.
         
         Args:
-            job_text: Job advertisement text
+            job_text: Job advertisement text, or its normalization
             result: Analysis result
             ttl: Time to live in seconds
             
@@ -284,7 +369,8 @@ class CachingService:
         """
         try:
             # Validate inputs
-            if not job_text or not job_text.strip():
+            normalized = normalize_job_text(job_text)
+            if not normalized.canonical:
                 logger.warning("Cannot cache analysis result: empty job text")
                 return False
             
@@ -292,12 +378,7 @@ class CachingService:
                 logger.warning("Cannot cache analysis result: empty result")
                 return False
             
-            # Limit job text length for cache key generation
-            if len(job_text) > 10000:  # 10KB limit
-                logger.warning("Job text too long for caching, truncating")
-                job_text = job_text[:10000]
-            
-            cache_key = CacheKey.analysis_result(job_text)
+            cache_key = CacheKey.analysis_result(normalized)
             
             # Convert result to cacheable format
             cacheable_result = {
@@ -308,40 +389,162 @@ class CachingService:
                 "cached_at": datetime.utcnow().isoformat()
             }
             
-            return await self.set(cache_key, cacheable_result, ttl)
+            stored = await self.set(cache_key, cacheable_result, ttl)
+            if stored and self.analysis_config.enabled:
+                self.analysis_l1.set(cache_key, self._copy_result(result), min(ttl, self.analysis_config.ttl))
+                # Other workers may hold a negative entry for this key
+                await self._publish_invalidation(cache_key)
+            return stored
             
         except Exception as e:
             logger.error(f"Error caching analysis result: {e}")
             return False
     
-    async def get_cached_analysis_result(self, job_text: str) -> Optional[JobAnalysisResult]:
+    async def get_cached_analysis_result(self, job_text: Union[str, NormalizedText]) -> Optional[JobAnalysisResult]:
         """
         Get cached analysis result for job text.
         
         Args:
-            job_text: Job advertisement text
+            job_text: Job advertisement text, or its normalization
             
         Returns:
             Cached analysis result or None
         """
         cache_key = CacheKey.analysis_result(job_text)
-        cached_data = await self.get(cache_key)
+        
+        if self.analysis_config.enabled:
+            entry = self.analysis_l1.get(cache_key)
+            if entry is NEGATIVE_ENTRY:
+                self.tier_stats["l1_negative_hits"] += 1
+                return None
+            if entry is not None:
+                self.tier_stats["l1_hits"] += 1
+                return self._copy_result(entry)
+        
+        cached_data, remaining_ttl = await self.get_with_ttl(cache_key)
         
         if cached_data:
             try:
-                return JobAnalysisResult(
+                result = JobAnalysisResult(
                     trust_score=cached_data["trust_score"],
                     classification=JobClassification(cached_data["classification"]),
                     reasons=cached_data["reasons"],
                     confidence=cached_data["confidence"]
                 )
+                self.tier_stats["l2_hits"] += 1
+                if self.analysis_config.enabled:
+                    # L1 must not outlive the Redis entry it copies
+                    l1_ttl = self.analysis_config.ttl
+                    if remaining_ttl is not None:
+                        l1_ttl = min(remaining_ttl, l1_ttl)
+                    self.analysis_l1.set(cache_key, self._copy_result(result), l1_ttl)
+                return result
             except Exception as e:
                 logger.warning(f"Error deserializing cached analysis result: {e}")
                 # Invalidate corrupted cache entry
                 await self.delete(cache_key)
         
+        self.tier_stats["l2_misses"] += 1
+        if self.analysis_config.enabled:
+            self.analysis_l1.set(cache_key, NEGATIVE_ENTRY, self.analysis_config.negative_ttl)
         return None
     
+    async def invalidate_analysis_result(self, job_text: Union[str, NormalizedText]) -> bool:
+        """
+        Remove a cached analysis result from every tier and every worker.
+        
+        Args:
+            job_text: Job advertisement text, or its normalization
+            
+        Returns:
+            True if the Redis entry was deleted
+        """
+        cache_key = CacheKey.analysis_result(job_text)
+        deleted = await self.delete(cache_key)
+        await self._publish_invalidation(cache_key)
+        return deleted
+    
+    @staticmethod
+    def _copy_result(result: JobAnalysisResult) -> JobAnalysisResult:
+        """Copy a result so callers never mutate the L1 entry."""
+        return replace(result, reasons=list(result.reasons))
+    
+    async def _publish_invalidation(self, cache_key: str):
+        """Tell the other workers to drop their L1 entry for cache_key."""
+        try:
+            redis_manager = self._get_redis_manager()
+            if not redis_manager.is_available():
+                return
+            message = f"{self.instance_id}:{cache_key}"
+            await redis_manager.execute_command("publish", self.analysis_config.invalidation_channel, message)
+            self.tier_stats["invalidations_published"] += 1
+        except Exception as e:
+            logger.warning(f"Failed to publish analysis cache invalidation: {e}")
+    
+    def handle_invalidation(self, message: Union[str, bytes]):
+        """
+        Apply an invalidation message from another worker.
+        
+        Args:
+            message: "<instance id>:<cache key>" as published by _publish_invalidation
+        """
+        if isinstance(message, bytes):
+            message = message.decode()
+        instance_id, _, cache_key = message.partition(":")
+        if instance_id == self.instance_id or not cache_key:
+            return
+        self.analysis_l1.pop(cache_key)
+        self.tier_stats["invalidations_received"] += 1
+    
+    def start_invalidation_listener(self):
+        """Start listening for analysis cache invalidations from other workers."""
+        if not self.analysis_config.enabled or self._invalidation_task is not None:
+            return
+        self._invalidation_task = asyncio.create_task(self._invalidation_loop())
+    
+    async def stop_invalidation_listener(self):
+        """Stop the invalidation listener."""
+        if self._invalidation_task is None:
+            return
+        self._invalidation_task.cancel()
+        try:
+            await self._invalidation_task
+        except asyncio.CancelledError:
+            pass
+        self._invalidation_task = None
+    
+    async def _invalidation_loop(self):
+        """Subscribe to the invalidation channel, resubscribing after Redis errors."""
+        while True:
+            pubsub = None
+            try:
+                connection = await self._get_redis_manager().get_connection()
+                if connection is None:
+                    await asyncio.sleep(self.analysis_config.reconnect_delay)
+                    continue
+                
+                pubsub = connection.pubsub()
+                await pubsub.subscribe(self.analysis_config.invalidation_channel)
+                # Invalidations sent while unsubscribed were missed
+                self.analysis_l1.clear()
+                logger.info("Subscribed to analysis cache invalidations")
+                
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message and message.get("type") == "message":
+                        self.handle_invalidation(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Analysis cache invalidation listener error: {e}")
+                await asyncio.sleep(self.analysis_config.reconnect_delay)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.close()
+                    except Exception:
+                        pass
+    
     async def warm_cache(self, analytics_service=None, metrics_collector=None):
         """
         Warm up cache with frequently accessed data.
@@ -396,6 +599,41 @@ class CachingService:
         else:
             stats["hit_rate"] = 0
         
+        # Per-tier analysis result cache stats
+        l1_stats = self.analysis_l1.get_stats()
+        analysis_lookups = (
+            self.tier_stats["l1_hits"] + self.tier_stats["l1_negative_hits"]
+            + self.tier_stats["l2_hits"] + self.tier_stats["l2_misses"]
+        )
+        stats["analysis_tiers"] = {
+            "l1": {
+                "enabled": self.analysis_config.enabled,
+                "size": l1_stats["size"],
+                "max_size": l1_stats["max_size"],
+                "hits": self.tier_stats["l1_hits"],
+                "negative_hits": self.tier_stats["l1_negative_hits"],
+                "evictions": l1_stats["evictions"],
+                "expirations": l1_stats["expirations"],
+                "hit_rate": (
+                    (self.tier_stats["l1_hits"] + self.tier_stats["l1_negative_hits"]) / analysis_lookups * 100
+                    if analysis_lookups else 0
+                )
+            },
+            "l2": {
+                "hits": self.tier_stats["l2_hits"],
+                "misses": self.tier_stats["l2_misses"],
+                "hit_rate": (
+                    self.tier_stats["l2_hits"] / (self.tier_stats["l2_hits"] + self.tier_stats["l2_misses"]) * 100
+                    if self.tier_stats["l2_hits"] + self.tier_stats["l2_misses"] else 0
+                )
+            },
+            "invalidations_published": self.tier_stats["invalidations_published"],
+            "invalidations_received": self.tier_stats["invalidations_received"],
+            "invalidation_listener_running": (
+                self._invalidation_task is not None and not self._invalidation_task.done()
+            )
+        }
+        
         # Add Redis stats if available
         try:
             redis_manager = self._get_redis_manager()
@@ -501,4 +739,11 @@ async def init_caching_service():
     """Initialize global caching service."""
     caching_service = get_caching_service()
     await caching_service.warm_cache()
-    return caching_service
\ No newline at end of file
+    caching_service.start_invalidation_listener()
+    return caching_service
+
+
+async def cleanup_caching_service():
+    """Stop background work of the global caching service."""
+    if _caching_service is not None:
+        await _caching_service.stop_invalidation_listener()
\ No newline at end of file
@@ -16,26 +16,40 @@ import logging
 import json
 import asyncio
 import time
-from typing import Dict, List, Optional, Any, Tuple, Set
+from typing import Dict, List, Optional, Any, Tuple, Set, Union, Callable, Awaitable
 from datetime import datetime
 import statistics
 from collections import defaultdict
-import re
 
+import openai
 from openai import AsyncOpenAI
-import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 
 from app.models.data_models import JobAnalysisResult, JobClassification, AppConfig
-from app.services.openai_analysis import OpenAIAnalysisService
+from app.services.openai_analysis import OpenAIAnalysisService, ANALYSIS_SYSTEM_PROMPT, SCAM_ANALYSIS_GUIDELINES
+from app.services.openai_rate_limiter import get_openai_rate_limiter, estimate_tokens
+from app.services.similarity_index import HashedSimilarityIndex
+from app.services.near_duplicate_store import get_near_duplicate_store
+from app.services.scam_rule_engine import ScamRuleEngine
+from app.services.prompt_budget import count_tokens
+from app.services.analysis_cascade import (
+    get_analysis_cascade, STAGE_RULES, STAGE_CHEAP_MODEL, STAGE_PRIMARY_MODEL
+)
+from app.services.verdict_stream import EarlyVerdict, VerdictStreamParser
 from app.utils.logging import get_logger, get_correlation_id, log_with_context
 from app.utils.metrics import get_metrics_collector
 from app.utils.error_tracking import get_error_tracker, AlertSeverity
+from app.utils.text_normalization import NormalizedText, normalize_job_text
 
 
 logger = get_logger(__name__)
 
+# Ads longer than this are analyzed on their own instead of packed into a batch
+BATCH_MAX_AD_CHARS = 2000
+# Completion tokens budgeted per ad in a batch request
+BATCH_TOKENS_PER_AD = 250
+# Extra client timeout per additional ad in a batch request
+BATCH_TIMEOUT_PER_AD = 3.0
+
 
 class EnhancedAIAnalysisService(OpenAIAnalysisService):
     """
@@ -71,25 +85,49 @@ class EnhancedAIAnalysisService(OpenAIAnalysisService):
         self.analysis_history: Dict[str, List[JobAnalysisResult]] = {}
         self.analysis_history_max_size = 1000  # Maximum number of job ads to keep in history
         
-        # Initialize rule-based detection patterns
-        self.scam_patterns = self._initialize_scam_patterns()
+        # Compiled, hot-reloadable rule-based detection patterns
+        self.rule_engine = ScamRuleEngine()
+        
+        # Confidence gates between rules, the fallback model and the primary model
+        self.cascade = get_analysis_cascade()
+        
+        # Incremental index over analysis_history for similarity detection
+        self.similarity_index = HashedSimilarityIndex()
+        self.similarity_threshold = config.similarity_threshold if hasattr(config, "similarity_threshold") else 0.75
+        
+        # MinHash fingerprints shared with the other workers through Redis
+        self.near_duplicate_store = get_near_duplicate_store()
         
-        # Initialize vectorizer for similarity detection
-        self.vectorizer = TfidfVectorizer(stop_words='english')
-        self.vectorizer_fitted = False
-        self.job_ad_vectors = {}
+        # Request and token buckets shared by all OpenAI calls in this process
+        self.rate_limiter = get_openai_rate_limiter()
+        self.batch_analysis_size = config.batch_analysis_size if hasattr(config, "batch_analysis_size") else 5
         
         # Initialize feedback tracking
         self.feedback_data = defaultdict(list)
         
         logger.info("EnhancedAIAnalysisService initialized with multiple model support")    
 
-    async def analyze_job_ad(self, job_text: str) -> JobAnalysisResult:
+    async def analyze_job_ad(self, job_text: str,
+                             normalized: Optional[NormalizedText] = None,
+                             on_verdict: Optional[Callable[[EarlyVerdict], Awaitable[None]]] = None
+                             ) -> JobAnalysisResult:
         """
         Analyze a job advertisement with enhanced capabilities.
         
+        The model is prompted with job_text; history, near-duplicate, rule and
+        coalescing lookups use its canonical form.
+        
+        When on_verdict is given, the primary model's completion is streamed
+        and on_verdict is awaited with the trust score and classification
+        (already combined with rule-based detection) as soon as they arrive,
+        before the reasons are generated. It is not called when the result
+        comes from history, rules, a fallback or another caller's coalesced
+        request; the returned result is always the complete analysis.
+        
         Args:
             job_text: The job advertisement text to analyze
+            normalized: Canonical form of job_text, if the caller already has it
+            on_verdict: Coroutine function called once with an early verdict
             
         Returns:
             JobAnalysisResult: Analysis result with trust score, classification, and reasons
@@ -105,97 +143,19 @@ class EnhancedAIAnalysisService(OpenAIAnalysisService):
         # Start timing the analysis
         start_time = time.time()
         
+        normalized = normalize_job_text(normalized or job_text)
+        
         try:
-            # Check for similar job ads in history first
-            similar_result = await self._check_similar_job_ads(job_text)
-            if similar_result:
-                log_with_context(
-                    logger,
-                    logging.INFO,
-                    "Using cached analysis for similar job ad",
-                    similarity_score=similar_result[1],
-                    correlation_id=correlation_id
-                )
-                
-                # Record metrics for cached analysis
-                duration = time.time() - start_time
-                metrics.record_service_call("openai", "analyze_job_ad_cached", True, duration)
-                
-                # Return the cached result with adjusted confidence
-                cached_result = similar_result[0]
-                return JobAnalysisResult(
-                    trust_score=cached_result.trust_score,
-                    classification=cached_result.classification,
-                    reasons=cached_result.reasons,
-                    confidence=cached_result.confidence * 0.9  # Slightly reduce confidence for cached results
-                )
-            
-            # Apply rule-based pre-analysis
-            rule_based_result = self._apply_rule_based_detection(job_text)
-            
-            # If rule-based detection has high confidence, use it directly
-            if rule_based_result and rule_based_result.confidence > 0.9:
-                log_with_context(
-                    logger,
-                    logging.INFO,
-                    "Using rule-based analysis result",
-                    trust_score=rule_based_result.trust_score,
-                    classification=rule_based_result.classification_text,
-                    confidence=rule_based_result.confidence,
-                    correlation_id=correlation_id
-                )
-                
-                # Record metrics for rule-based analysis
-                duration = time.time() - start_time
-                metrics.record_service_call("rule_based", "analyze_job_ad", True, duration)
-                
-                # Add to history
-                self._add_to_analysis_history(job_text, rule_based_result)
-                
-                return rule_based_result
-            
-            # Proceed with AI analysis
-            log_with_context(
-                logger,
-                logging.INFO,
-                "Starting enhanced AI analysis",
-                model=self.model,
-                text_length=len(job_text),
-                correlation_id=correlation_id
+            known_result, rule_based_result = await self._find_known_analysis(normalized, start_time)
+            if known_result:
+                return known_result
+            
+            # Identical ads arriving together share one model call
+            result = await self.coalescer.run(
+                normalized,
+                lambda: self._analyze_with_models(job_text, rule_based_result, normalized, on_verdict)
             )
             
-            # Try primary model first
-            try:
-                result = await self._analyze_with_model(job_text, self.models["primary"])
-                
-                # Validate the result
-                if not self._validate_analysis_result(result):
-                    log_with_context(
-                        logger,
-                        logging.WARNING,
-                        "Primary model result validation failed, trying fallback model",
-                        model=self.models["primary"],
-                        correlation_id=correlation_id
-                    )
-                    result = await self._analyze_with_model(job_text, self.models["fallback"])
-            except Exception as e:
-                log_with_context(
-                    logger,
-                    logging.ERROR,
-                    "Primary model analysis failed, trying fallback model",
-                    model=self.models["primary"],
-                    error=str(e),
-                    correlation_id=correlation_id
-                )
-                result = await self._analyze_with_model(job_text, self.models["fallback"])
-            
-            # If we have a rule-based result, combine it with AI result
-            if rule_based_result:
-                result = self._combine_analysis_results(result, rule_based_result)
-            
-            # Add to analysis history
-            self._add_to_analysis_history(job_text, result)
-            
             # Record successful metrics
             duration = time.time() - start_time
             metrics.record_service_call("openai", "analyze_job_ad_enhanced", True, duration)
@@ -220,7 +180,7 @@ class EnhancedAIAnalysisService(OpenAIAnalysisService):
             
             # Try fallback mechanisms
             try:
-                fallback_result = await self._get_fallback_analysis(job_text, str(e))
+                fallback_result = await self._get_fallback_analysis(normalized, str(e))
                 if fallback_result:
                     log_with_context(
                         logger,
@@ -250,6 +210,13 @@ class EnhancedAIAnalysisService(OpenAIAnalysisService):
         """
         Analyze multiple job advertisements in batch.
         
+        Ads with a known verdict (similar history, shared near-duplicate or
+        confident rule-based detection) skip the model. The remaining short
+        ads are packed batch_analysis_size at a time into one completion
+        request with per-ad JSON results; long ads, and ads a batch response
+        left out or got wrong, are analyzed individually. All requests run
+        concurrently, paced by the shared OpenAI rate limiter.
+        
         Args:
             job_texts: List of job advertisement texts to analyze
             
@@ -257,6 +224,7 @@ class EnhancedAIAnalysisService(OpenAIAnalysisService):
             List[JobAnalysisResult]: List of analysis results
         """
         correlation_id = get_correlation_id()
+        metrics = get_metrics_collector()
         
         log_with_context(
             logger,
@@ -266,32 +234,79 @@ class EnhancedAIAnalysisService(OpenAIAnalysisService):
             correlation_id=correlation_id
         )
         
-        # Create tasks for concurrent analysis
-        tasks = [self.analyze_job_ad(text) for text in job_texts]
-        
-        # Execute analyses concurrently with rate limiting
-        results = []
-        batch_size = 5  # Process 5 at a time to avoid rate limits
-        
-        for i in range(0, len(tasks), batch_size):
-            batch_tasks = tasks[i:i+batch_size]
-            batch_results = await asyncio.gather(*batch_tasks, return_exceptions=True)
-            
-            for result in batch_results:
-                if isinstance(result, Exception):
-                    # Create a placeholder result for failed analyses
-                    results.append(JobAnalysisResult(
-                        trust_score=50,
-                        classification=JobClassification.SUSPICIOUS,
-                        reasons=["Analysis failed", "Could not determine legitimacy", "Manual review recommended"],
-                        confidence=0.1
-                    ))
+        results: List[Optional[JobAnalysisResult]] = [None] * len(job_texts)
+        rule_based_results: Dict[int, Optional[JobAnalysisResult]] = {}
+        normalized_texts = [normalize_job_text(job_text) for job_text in job_texts]
+        packed, individual = [], []
+        
+        for index, job_text in enumerate(job_texts):
+            try:
+                known_result, rule_based_results[index] = await self._find_known_analysis(
+                    normalized_texts[index], time.time()
+                )
+            except Exception:
+                known_result, rule_based_results[index] = None, None
+            
+            if known_result:
+                results[index] = known_result
+            elif len(job_text) <= BATCH_MAX_AD_CHARS:
+                packed.append(index)
+            else:
+                individual.append(index)
+        
+        async def analyze_individually(index: int):
+            results[index] = await self.analyze_job_ad(job_texts[index], normalized_texts[index])
+        
+        async def analyze_packed(indices: List[int]):
+            try:
+                batch_results = await self._analyze_batch_with_model(
+                    [job_texts[index] for index in indices], self.models["primary"]
+                )
+            except Exception as e:
+                log_with_context(
+                    logger,
+                    logging.WARNING,
+                    "Batch completion failed, analyzing ads individually",
+                    batch_size=len(indices),
+                    error=str(e),
+                    correlation_id=correlation_id
+                )
+                batch_results = [None] * len(indices)
+            
+            metrics.increment_counter("openai_batch_request")
+            retry = []
+            for index, result in zip(indices, batch_results):
+                if result and self._validate_analysis_result(result):
+                    results[index] = await self._finish_analysis(
+                        normalized_texts[index], result, rule_based_results[index]
+                    )
+                    metrics.increment_counter("openai_batch_items")
                 else:
-                    results.append(result)
+                    retry.append(index)
             
-            # Add a small delay between batches to avoid rate limits
-            if i + batch_size < len(tasks):
-                await asyncio.sleep(1)
+            await asyncio.gather(*(analyze_individually(index) for index in retry), return_exceptions=True)
+        
+        # A lone short ad gains nothing from the batch prompt
+        batch_size = self.batch_analysis_size
+        groups = [packed[i:i+batch_size] for i in range(0, len(packed), batch_size)]
+        if groups and len(groups[-1]) == 1:
+            individual.extend(groups.pop())
+        
+        await asyncio.gather(
+            *(analyze_packed(indices) for indices in groups),
+            *(analyze_individually(index) for index in individual),
+            return_exceptions=True
+        )
+        
+        for index, result in enumerate(results):
+            if result is None:
+                # Create a placeholder result for failed analyses
+                results[index] = JobAnalysisResult(
+                    trust_score=50,
+                    classification=JobClassification.SUSPICIOUS,
+                    reasons=["Analysis failed", "Could not determine legitimacy", "Manual review recommended"],
+                    confidence=0.1
+                )
         
         log_with_context(
             logger,
@@ -299,6 +314,7 @@ class EnhancedAIAnalysisService(OpenAIAnalysisService):
             "Batch analysis completed",
             successful_analyses=sum(1 for r in results if r.confidence > 0.5),
             total_analyses=len(results),
+            batch_requests=len(groups),
             correlation_id=correlation_id
         )
         
@@ -325,8 +341,10 @@ class EnhancedAIAnalysisService(OpenAIAnalysisService):
             correlation_id=correlation_id
         )
         
+        normalized = normalize_job_text(job_text)
+        
         # First send a preliminary rule-based result
-        rule_based_result = self._apply_rule_based_detection(job_text)
+        rule_based_result = self._apply_rule_based_detection(normalized)
         if rule_based_result:
             await callback({
                 "type": "preliminary",
@@ -339,7 +357,7 @@ class EnhancedAIAnalysisService(OpenAIAnalysisService):
             })
         
         # Then check for similar job ads
-        similar_result = await self._check_similar_job_ads(job_text)
+        similar_result = await self._check_similar_job_ads(normalized)
         if similar_result:
             await callback({
                 "type": "similar",
@@ -412,7 +430,7 @@ class EnhancedAIAnalysisService(OpenAIAnalysisService):
             final_result = self.parse_analysis_response(full_response)
             
             # Add to history
-            self._add_to_analysis_history(job_text, final_result)
+            self._add_to_analysis_history(normalized, final_result)
             
             # Send the final result
             await callback({
@@ -751,17 +769,207 @@ class EnhancedAIAnalysisService(OpenAIAnalysisService):
 
     # Private helper methods
     
-    async def _analyze_with_model(self, job_text: str, model: str) -> JobAnalysisResult:
+    async def _analyze_with_models(self, job_text: str,
+                                   rule_based_result: Optional[JobAnalysisResult],
+                                   normalized: Optional[NormalizedText] = None,
+                                   on_verdict: Optional[Callable[[EarlyVerdict], Awaitable[None]]] = None
+                                   ) -> JobAnalysisResult:
+        """
+        Analyze with the models of the cascade.
+        
+        With the cascade enabled, the fallback model analyzes the ad first
+        and the primary model is only called when its result is escalated
+        (see AnalysisCascade). Otherwise the primary model analyzes the ad
+        and the fallback model is used if it fails. When the primary model
+        fails after an escalation, the fallback model's result is used.
+        
+        Args:
+            job_text: The job advertisement text to analyze
+            rule_based_result: Rule-based result to combine with the AI result
+            normalized: Canonical form of job_text, if already computed
+            on_verdict: Called once with the early verdict of the model whose
+                result is expected to stand, if streaming
+            
+        Returns:
+            JobAnalysisResult: Final analysis result
+        """
+        correlation_id = get_correlation_id()
+        
+        report_verdict = None
+        if on_verdict:
+            async def report_verdict(verdict: EarlyVerdict):
+                # Report the verdict _finish_analysis will produce, not the raw model one
+                if rule_based_result:
+                    trust_score, classification = self._combine_verdict(
+                        verdict.trust_score, verdict.classification, verdict.confidence, rule_based_result
+                    )
+                    verdict = EarlyVerdict(
+                        trust_score=trust_score,
+                        classification=classification,
+                        confidence=min(0.95, (verdict.confidence + rule_based_result.confidence) / 2)
+                    )
+                await on_verdict(verdict)
+        
+        cheap_result = None
+        if self.cascade.config.enabled and self.models["fallback"] != self.models["primary"]:
+            cheap_result, accepted, verdict_reported = await self._run_cheap_model_stage(
+                job_text, rule_based_result, report_verdict
+            )
+            if accepted:
+                return await self._finish_analysis(normalized or job_text, cheap_result, rule_based_result)
+            if verdict_reported:
+                # The user already has a verdict; a different final one is sent in full
+                report_verdict = None
+        
+        # Proceed with AI analysis
+        log_with_context(
+            logger,
+            logging.INFO,
+            "Starting enhanced AI analysis",
+            model=self.model,
+            text_length=len(job_text),
+            escalated=cheap_result is not None,
+            correlation_id=correlation_id
+        )
+        
+        # Try primary model first
+        metrics = get_metrics_collector()
+        stage_start = time.time()
+        try:
+            result, tokens = await self._complete_analysis(job_text, self.models["primary"], report_verdict)
+            
+            # Validate the result
+            valid = self._validate_analysis_result(result)
+            metrics.record_cascade_stage(
+                STAGE_PRIMARY_MODEL, "accepted" if valid else "failed", time.time() - stage_start,
+                tokens, self.cascade.stage_cost(STAGE_PRIMARY_MODEL, tokens)
+            )
+            if not valid:
+                log_with_context(
+                    logger,
+                    logging.WARNING,
+                    "Primary model result validation failed, trying fallback model",
+                    model=self.models["primary"],
+                    correlation_id=correlation_id
+                )
+                result = cheap_result or await self._analyze_with_model(job_text, self.models["fallback"])
+        except Exception as e:
+            metrics.record_cascade_stage(STAGE_PRIMARY_MODEL, "failed", time.time() - stage_start)
+            log_with_context(
+                logger,
+                logging.ERROR,
+                "Primary model analysis failed, trying fallback model",
+                model=self.models["primary"],
+                error=str(e),
+                correlation_id=correlation_id
+            )
+            result = cheap_result or await self._analyze_with_model(job_text, self.models["fallback"])
+        
+        return await self._finish_analysis(normalized or job_text, result, rule_based_result)
+    
+    async def _run_cheap_model_stage(self, job_text: str, rule_based_result: Optional[JobAnalysisResult],
+                                     on_verdict: Optional[Callable[[EarlyVerdict], Awaitable[None]]] = None
+                                     ) -> Tuple[Optional[JobAnalysisResult], bool, bool]:
+        """
+        Analyze with the fallback model as the cascade's cheap stage.
+        
+        A streamed verdict is only passed on to on_verdict when it already
+        clears the cascade's gates, so users are not sent a verdict that is
+        about to be escalated.
+        
+        Args:
+            job_text: The job advertisement text to analyze
+            rule_based_result: Rule-based result the verdict is checked against
+            on_verdict: Called with the early verdict, if streaming
+            
+        Returns:
+            Tuple of the result (None if the model failed), whether it was
+            accepted and whether its verdict was reported
+        """
+        correlation_id = get_correlation_id()
+        metrics = get_metrics_collector()
+        model = self.models["fallback"]
+        verdict_reported = False
+        
+        report_verdict = None
+        if on_verdict:
+            async def report_verdict(verdict: EarlyVerdict):
+                nonlocal verdict_reported
+                if self.cascade.escalation_reason(verdict, rule_based_result) is None:
+                    verdict_reported = True
+                    await on_verdict(verdict)
+        
+        stage_start = time.time()
+        try:
+            result, tokens = await self._complete_analysis(
+                job_text, model, report_verdict, timeout=self.cascade.config.cheap_model_timeout
+            )
+        except Exception as e:
+            metrics.record_cascade_stage(STAGE_CHEAP_MODEL, "failed", time.time() - stage_start)
+            log_with_context(
+                logger,
+                logging.WARNING,
+                "Cheap model analysis failed, escalating to primary model",
+                model=model,
+                error=str(e),
+                correlation_id=correlation_id
+            )
+            return None, False, verdict_reported
+        
+        reason = self.cascade.escalation_reason(result, rule_based_result)
+        if reason is None and not self._validate_analysis_result(result):
+            reason = "invalid"
+        metrics.record_cascade_stage(
+            STAGE_CHEAP_MODEL, "escalated" if reason else "accepted", time.time() - stage_start,
+            tokens, self.cascade.stage_cost(STAGE_CHEAP_MODEL, tokens)
+        )
+        if reason:
+            metrics.increment_counter("cascade_escalation", labels={"reason": reason})
+            log_with_context(
+                logger,
+                logging.INFO,
+                "Escalating analysis to primary model",
+                model=model,
+                reason=reason,
+                confidence=result.confidence,
+                classification=result.classification_text,
+                correlation_id=correlation_id
+            )
+        
+        return result, reason is None, verdict_reported
+    
+    async def _analyze_with_model(self, job_text: str, model: str,
+                                  on_verdict: Optional[Callable[[EarlyVerdict], Awaitable[None]]] = None
+                                  ) -> JobAnalysisResult:
         """
         Analyze job ad with a specific model.
         
         Args:
             job_text: The job advertisement text to analyze
             model: The model to use for analysis
+            on_verdict: If given, stream the completion and report its early verdict
             
         Returns:
             JobAnalysisResult: Analysis result
         """
+        result, _ = await self._complete_analysis(job_text, model, on_verdict)
+        return result
+    
+    async def _complete_analysis(self, job_text: str, model: str,
+                                 on_verdict: Optional[Callable[[EarlyVerdict], Awaitable[None]]] = None,
+                                 timeout: float = 6.0) -> Tuple[JobAnalysisResult, int]:
+        """
+        Analyze job ad with a specific model and estimate the tokens used.
+        
+        Args:
+            job_text: The job advertisement text to analyze
+            model: The model to use for analysis
+            on_verdict: If given, stream the completion and report its early verdict
+            timeout: OpenAI client timeout in seconds
+            
+        Returns:
+            Tuple of the analysis result and the estimated prompt and completion tokens
+        """
         correlation_id = get_correlation_id()
         
         log_with_context(
@@ -775,43 +983,325 @@ class EnhancedAIAnalysisService(OpenAIAnalysisService):
         
         prompt = self.build_analysis_prompt(job_text)
         
-        response = await asyncio.wait_for(
-            self.client.chat.completions.create(
+        if on_verdict:
+            analysis_text = await self._request_streaming_completion(
+                model, prompt, max_tokens=800, timeout=timeout, on_verdict=on_verdict
+            )
+        else:
+            analysis_text = await self._request_completion(
+                model,
+                prompt,
+                max_tokens=800,  # Reduced from 1000 for faster response
+                timeout=timeout  # Reduced from 8.0 seconds
+            )
+        result = self.parse_analysis_response(analysis_text)
+        
+        log_with_context(
+            logger,
+            logging.INFO,
+            "Model analysis completed",
+            model=model,
+            trust_score=result.trust_score,
+            classification=result.classification_text,
+            confidence=result.confidence,
+            correlation_id=correlation_id
+        )
+        
+        tokens = count_tokens(ANALYSIS_SYSTEM_PROMPT) + count_tokens(prompt) + count_tokens(analysis_text)
+        return result, tokens
+    
+    async def _analyze_batch_with_model(self, job_texts: List[str], model: str) -> List[Optional[JobAnalysisResult]]:
+        """
+        Analyze several job ads with one completion request.
+        
+        Args:
+            job_texts: Job advertisement texts to analyze together
+            model: The model to use for analysis
+        
+        Returns:
+            List of results in input order, None where the response had no
+            valid entry for an ad
+        """
+        prompt = self._build_batch_analysis_prompt(job_texts)
+        get_metrics_collector().record_prompt_tokens(
+            "batch", count_tokens(ANALYSIS_SYSTEM_PROMPT) + count_tokens(prompt)
+        )
+        
+        analysis_text = await self._request_completion(
+            model,
+            prompt,
+            max_tokens=BATCH_TOKENS_PER_AD * len(job_texts),
+            timeout=6.0 + BATCH_TIMEOUT_PER_AD * (len(job_texts) - 1)
+        )
+        return self._parse_batch_analysis_response(analysis_text, len(job_texts))
+    
+    async def _request_completion(self, model: str, prompt: str, max_tokens: int, timeout: float) -> str:
+        """
+        Send one analysis completion request through the OpenAI rate limiter.
+        
+        The request reserves its prompt estimate plus max_tokens before it is
+        sent; the rate-limit headers of the response then adjust the limiter,
+        and a 429 pauses every caller until the limit resets.
+        
+        Args:
+            model: The model to use
+            prompt: User prompt
+            max_tokens: Completion token limit
+            timeout: OpenAI client timeout in seconds
+        
+        Returns:
+            str: Stripped response content
+        
+        Raises:
+            Exception: If the request fails or the response is empty
+        """
+        reserved = estimate_tokens(ANALYSIS_SYSTEM_PROMPT + prompt) + max_tokens
+        await self.rate_limiter.acquire(reserved)
+        
+        try:
+            raw_response = await asyncio.wait_for(
+                self.client.chat.completions.with_raw_response.create(
+                    model=model,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": ANALYSIS_SYSTEM_PROMPT
+                        },
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ],
+                    temperature=0.3,
+                    max_tokens=max_tokens,
+                    timeout=timeout
+                ),
+                timeout=timeout + 2.0
+            )
+        except openai.RateLimitError as e:
+            self.rate_limiter.record_rate_limited(e.response.headers)
+            raise
+        
+        self.rate_limiter.update_from_headers(raw_response.headers)
+        response = raw_response.parse()
+        self.rate_limiter.record_usage(getattr(response.usage, "total_tokens", None))
+        
+        if not response.choices or not response.choices[0].message.content:
+            raise Exception(f"Empty response from model: {model}")
+        
+        return response.choices[0].message.content.strip()
+    
+    async def _request_streaming_completion(self, model: str, prompt: str, max_tokens: int, timeout: float,
+                                            on_verdict: Callable[[EarlyVerdict], Awaitable[None]]) -> str:
+        """
+        Stream one analysis completion, reporting its verdict as soon as it parses.
+        
+        Rate limiting works as in _request_completion, except that streamed
+        responses carry no usage, so the reservation stands as the estimate.
+        The timeout covers the whole stream, not just the first chunk.
+        
+        Args:
+            model: The model to use
+            prompt: User prompt
+            max_tokens: Completion token limit
+            timeout: OpenAI client timeout in seconds
+            on_verdict: Awaited once with the early verdict
+        
+        Returns:
+            str: Stripped response content
+        
+        Raises:
+            Exception: If the request fails or the response is empty
+        """
+        reserved = estimate_tokens(ANALYSIS_SYSTEM_PROMPT + prompt) + max_tokens
+        await self.rate_limiter.acquire(reserved)
+        
+        parser = VerdictStreamParser()
+        
+        async def consume_stream():
+            raw_response = await self.client.chat.completions.with_raw_response.create(
                 model=model,
                 messages=[
                     {
                         "role": "system",
-                        "content": "You are an expert job market analyst specializing in identifying employment scams. Analyze job postings carefully and provide structured responses."
+                        "content": ANALYSIS_SYSTEM_PROMPT
                     },
                     {
-                        "role": "user", 
+                        "role": "user",
                         "content": prompt
                     }
                 ],
                 temperature=0.3,
-                max_tokens=800,  # Reduced from 1000 for faster response
-                timeout=6.0      # Reduced from 8.0 seconds
-            ),
-            timeout=8.0          # Reduced from 10.0 seconds
-        )
+                max_tokens=max_tokens,
+                stream=True,
+                timeout=timeout
+            )
+            self.rate_limiter.update_from_headers(raw_response.headers)
+            
+            async for chunk in raw_response.parse():
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                verdict = parser.feed(chunk.choices[0].delta.content)
+                if verdict:
+                    await on_verdict(verdict)
         
-        if not response.choices or not response.choices[0].message.content:
+        try:
+            await asyncio.wait_for(consume_stream(), timeout=timeout + 2.0)
+        except openai.RateLimitError as e:
+            self.rate_limiter.record_rate_limited(e.response.headers)
+            raise
+        
+        analysis_text = parser.text.strip()
+        if not analysis_text:
             raise Exception(f"Empty response from model: {model}")
+        
+        return analysis_text
+    
+    async def _find_known_analysis(
+        self, job_text: Union[str, NormalizedText], start_time: float
+    ) -> Tuple[Optional[JobAnalysisResult], Optional[JobAnalysisResult]]:
+        """
+        Look for a verdict that does not need an AI call.
+        
+        Checks the local analysis history, then the shared near-duplicate
+        store, then rule-based detection, which is used on its own when its
+        confidence reaches the cascade's rule threshold. A shared verdict is
+        only reused when rule-based detection does not classify the ad
+        differently, since near-duplicates can differ in the detail (such
+        as the pay) that decides the verdict.
+        
+        Args:
+            job_text: The job advertisement text to analyze, or its normalization
+            start_time: When the analysis started, for duration metrics
             
-        analysis_text = response.choices[0].message.content.strip()
-        result = self.parse_analysis_response(analysis_text)
+        Returns:
+            Tuple of the known result (None if AI analysis is needed) and the
+            rule-based result to combine with the AI result
+        """
+        correlation_id = get_correlation_id()
+        metrics = get_metrics_collector()
+        normalized = normalize_job_text(job_text)
         
-        log_with_context(
-            logger,
-            logging.INFO,
-            "Model analysis completed",
-            model=model,
-            trust_score=result.trust_score,
-            classification=result.classification_text,
-            confidence=result.confidence,
-            correlation_id=correlation_id
+        # Check for similar job ads in history first
+        similar_result = await self._check_similar_job_ads(normalized)
+        if similar_result:
+            log_with_context(
+                logger,
+                logging.INFO,
+                "Using cached analysis for similar job ad",
+                similarity_score=similar_result[1],
+                correlation_id=correlation_id
+            )
+            
+            # Record metrics for cached analysis
+            duration = time.time() - start_time
+            metrics.record_service_call("openai", "analyze_job_ad_cached", True, duration)
+            
+            # Return the cached result with adjusted confidence
+            cached_result = similar_result[0]
+            return JobAnalysisResult(
+                trust_score=cached_result.trust_score,
+                classification=cached_result.classification,
+                reasons=cached_result.reasons,
+                confidence=cached_result.confidence * 0.9  # Slightly reduce confidence for cached results
+            ), None
+        
+        # Rules run before the shared lookup so they can veto its verdict
+        rule_start = time.time()
+        rule_based_result = self._apply_rule_based_detection(normalized)
+        rule_duration = time.time() - rule_start
+        
+        # Then look for a near-duplicate verdict from any worker
+        shared_result = await self.near_duplicate_store.lookup(normalized.canonical)
+        if shared_result and rule_based_result and rule_based_result.classification != shared_result[0].classification:
+            metrics.increment_counter("near_duplicate_rejected")
+            log_with_context(
+                logger,
+                logging.INFO,
+                "Rejected shared analysis contradicted by rule-based detection",
+                similarity_score=shared_result[1],
+                shared_classification=shared_result[0].classification_text,
+                rule_classification=rule_based_result.classification_text,
+                correlation_id=correlation_id
+            )
+            shared_result = None
+        if shared_result:
+            metrics.increment_counter("near_duplicate_hit")
+            log_with_context(
+                logger,
+                logging.INFO,
+                "Using shared analysis for near-duplicate job ad",
+                similarity_score=shared_result[1],
+                correlation_id=correlation_id
+            )
+            
+            duration = time.time() - start_time
+            metrics.record_service_call("openai", "analyze_job_ad_near_duplicate", True, duration)
+            
+            prior_result = shared_result[0]
+            self._add_to_analysis_history(normalized, prior_result)
+            return JobAnalysisResult(
+                trust_score=prior_result.trust_score,
+                classification=prior_result.classification,
+                reasons=prior_result.reasons,
+                confidence=prior_result.confidence * 0.9
+            ), None
+        
+        # Apply rule-based pre-analysis
+        rules_accepted = self.cascade.accepts_rules(rule_based_result)
+        metrics.record_cascade_stage(
+            STAGE_RULES, "accepted" if rules_accepted else "escalated", rule_duration
         )
         
+        # If rule-based detection has high confidence, use it directly
+        if rules_accepted:
+            log_with_context(
+                logger,
+                logging.INFO,
+                "Using rule-based analysis result",
+                trust_score=rule_based_result.trust_score,
+                classification=rule_based_result.classification_text,
+                confidence=rule_based_result.confidence,
+                correlation_id=correlation_id
+            )
+            
+            # Record metrics for rule-based analysis
+            duration = time.time() - start_time
+            metrics.record_service_call("rule_based", "analyze_job_ad", True, duration)
+            
+            # Add to history
+            self._add_to_analysis_history(normalized, rule_based_result)
+            
+            return rule_based_result, rule_based_result
+        
+        return None, rule_based_result
+    
+    async def _finish_analysis(self, job_text: Union[str, NormalizedText], result: JobAnalysisResult,
+                               rule_based_result: Optional[JobAnalysisResult]) -> JobAnalysisResult:
+        """
+        Combine an AI result with rule-based detection and remember it.
+        
+        Args:
+            job_text: The analyzed job advertisement text, or its normalization
+            result: Result from the AI model
+            rule_based_result: Rule-based result, if any rules matched
+            
+        Returns:
+            JobAnalysisResult: Final analysis result
+        """
+        # If we have a rule-based result, combine it with AI result
+        if rule_based_result:
+            result = self._combine_analysis_results(result, rule_based_result)
+        
+        normalized = normalize_job_text(job_text)
+        
+        # Add to analysis history
+        self._add_to_analysis_history(normalized, result)
+        
+        # Share confident verdicts so other workers skip near-duplicates
+        if result.confidence >= self.min_confidence_to_cache:
+            await self.near_duplicate_store.record(normalized.canonical, result)
+        
         return result
     
     def _validate_analysis_result(self, result: JobAnalysisResult) -> bool:
@@ -846,21 +1336,23 @@ class EnhancedAIAnalysisService(OpenAIAnalysisService):
         
         return True
     
-    async def _get_fallback_analysis(self, job_text: str, error_message: str) -> Optional[JobAnalysisResult]:
+    async def _get_fallback_analysis(self, job_text: Union[str, NormalizedText],
+                                     error_message: str) -> Optional[JobAnalysisResult]:
         """
         Get fallback analysis when primary analysis fails.
         
         Args:
-            job_text: The job advertisement text to analyze
+            job_text: The job advertisement text to analyze, or its normalization
             error_message: Error message from the failed analysis
             
         Returns:
             Optional[JobAnalysisResult]: Fallback analysis result or None
         """
         correlation_id = get_correlation_id()
+        normalized = normalize_job_text(job_text)
         
         # Try rule-based detection first
-        rule_based_result = self._apply_rule_based_detection(job_text)
+        rule_based_result = self._apply_rule_based_detection(normalized)
         if rule_based_result and rule_based_result.confidence > 0.7:
             log_with_context(
                 logger,
@@ -874,7 +1366,7 @@ class EnhancedAIAnalysisService(OpenAIAnalysisService):
             return rule_based_result
         
         # Try similar job ads
-        similar_result = await self._check_similar_job_ads(job_text)
+        similar_result = await self._check_similar_job_ads(normalized)
         if similar_result and similar_result[1] > 0.8:  # High similarity threshold for fallback
             log_with_context(
                 logger,
@@ -895,7 +1387,7 @@ class EnhancedAIAnalysisService(OpenAIAnalysisService):
                     model=self.models["fallback"],
                     correlation_id=correlation_id
                 )
-                return await self._analyze_with_model(job_text, self.models["fallback"])
+                return await self._analyze_with_model(normalized.original, self.models["fallback"])
             except Exception as e:
                 log_with_context(
                     logger,
@@ -925,106 +1417,27 @@ class EnhancedAIAnalysisService(OpenAIAnalysisService):
             confidence=0.5
         )
     
-    def _initialize_scam_patterns(self) -> Dict[str, Any]:
-        """
-        Initialize rule-based scam detection patterns.
-        
-        Returns:
-            Dict[str, Any]: Dictionary of scam patterns and their weights
-        """
-        return {
-            "high_risk_indicators": [
-                # Unrealistic salary promises
-                {"pattern": r"\$\d{2,3},\d{3}\+?\s*(?:per\s+week|weekly|/week)", "weight": 0.8, "description": "Unrealistic weekly salary"},
-                {"pattern": r"\$\d{3,4}\+?\s*(?:per\s+day|daily|/day)", "weight": 0.9, "description": "Unrealistic daily salary"},
-                {"pattern": r"earn\s+\$\d{3,4}\+?\s*(?:per\s+hour|hourly|/hour)", "weight": 0.7, "description": "Unrealistic hourly wage"},
-                
-                # Work from home red flags
-                {"pattern": r"(?:work\s+from\s+home|remote).{0,50}(?:no\s+experience|entry\s+level).{0,50}\$\d{3,4}", "weight": 0.6, "description": "High-paying remote work with no experience"},
-                {"pattern": r"(?:make\s+money|earn\s+cash).{0,30}(?:from\s+home|remotely)", "weight": 0.5, "description": "Generic money-making claims"},
-                
-                # Urgency and pressure tactics
-                {"pattern": r"(?:urgent|immediate|asap|right\s+away|start\s+today)", "weight": 0.4, "description": "Excessive urgency"},
-                {"pattern": r"(?:limited\s+time|act\s+now|don't\s+miss|hurry)", "weight": 0.4, "description": "Pressure tactics"},
-                
-                # Vague job descriptions
-                {"pattern": r"(?:data\s+entry|typing|customer\s+service).{0,50}(?:no\s+experience|easy\s+work)", "weight": 0.3, "description": "Vague job description"},
-                {"pattern": r"(?:flexible\s+schedule|work\s+when\s+you\s+want|be\s+your\s+own\s+boss)", "weight": 0.3, "description": "Too-good-to-be-true flexibility"},
-                
-                # Payment and fee red flags
-                {"pattern": r"(?:pay\s+fee|upfront\s+cost|investment\s+required|starter\s+kit)", "weight": 0.9, "description": "Upfront payment required"},
-                {"pattern": r"(?:training\s+fee|processing\s+fee|background\s+check\s+fee)", "weight": 0.8, "description": "Training or processing fees"},
-                
-                # Contact and communication red flags
-                {"pattern": r"(?:text\s+only|no\s+phone\s+calls|email\s+only)", "weight": 0.4, "description": "Limited communication methods"},
-                {"pattern": r"(?:whatsapp|telegram|signal)\s+(?:only|preferred)", "weight": 0.5, "description": "Unusual communication platforms"},
-                
-                # Grammatical and spelling issues (common in scams)
-                {"pattern": r"(?:recieve|recive|seperate|seprate|definately|definatly)", "weight": 0.2, "description": "Poor spelling/grammar"},
-                {"pattern": r"(?:alot|a\s+lot\s+of\s+money|guarenteed|guarentee)", "weight": 0.2, "description": "Poor spelling/grammar"},
-            ],
-            
-            "medium_risk_indicators": [
-                # Generic company names
-                {"pattern": r"(?:global|international|worldwide|universal)\s+(?:company|corporation|inc|llc)", "weight": 0.3, "description": "Generic company name"},
-                
-                # Unusual benefits
-                {"pattern": r"(?:free\s+car|company\s+car|travel\s+benefits|housing\s+provided)", "weight": 0.4, "description": "Unusual benefits for entry-level"},
-                
-                # MLM indicators
-                {"pattern": r"(?:build\s+your\s+team|recruit\s+others|network\s+marketing|multi\s*level)", "weight": 0.6, "description": "MLM indicators"},
-                
-                # Cryptocurrency/investment related
-                {"pattern": r"(?:bitcoin|crypto|forex|trading|investment).{0,50}(?:training|opportunity)", "weight": 0.5, "description": "Cryptocurrency/investment schemes"},
-            ],
-            
-            "positive_indicators": [
-                # Legitimate job indicators
-                {"pattern": r"(?:bachelor|degree|certification|license)\s+(?:required|preferred)", "weight": -0.3, "description": "Education requirements"},
-                {"pattern": r"(?:benefits|health\s+insurance|401k|pto|vacation)", "weight": -0.2, "description": "Standard benefits"},
-                {"pattern": r"(?:interview|references|background\s+check|drug\s+test)", "weight": -0.3, "description": "Standard hiring process"},
-                {"pattern": r"(?:job\s+description|responsibilities|qualifications|requirements)", "weight": -0.2, "description": "Structured job posting"},
-                
-                # Legitimate company indicators
-                {"pattern": r"(?:equal\s+opportunity|eeo|diversity|inclusion)", "weight": -0.2, "description": "EEO statements"},
-                {"pattern": r"(?:www\.|https?://)[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", "weight": -0.1, "description": "Company website"},
-            ]
-        }
+    @property
+    def scam_patterns(self) -> Dict[str, Any]:
+        """Rule-based scam detection patterns of the active rule set."""
+        return self.rule_engine.patterns
     
-    def _apply_rule_based_detection(self, job_text: str) -> Optional[JobAnalysisResult]:
+    def _apply_rule_based_detection(self, job_text: Union[str, NormalizedText]) -> Optional[JobAnalysisResult]:
         """
         Apply rule-based detection patterns to analyze job text.
         
         Args:
-            job_text: The job advertisement text to analyze
+            job_text: The job advertisement text to analyze, or its normalization
             
         Returns:
             Optional[JobAnalysisResult]: Rule-based analysis result or None
         """
-        if not job_text or len(job_text.strip()) < 20:
+        canonical_text = normalize_job_text(job_text).canonical
+        if len(canonical_text) < 20:
             return None
         
-        text_lower = job_text.lower()
-        total_score = 0.0
-        matched_patterns = []
-        
-        # Check high-risk indicators
-        for pattern_info in self.scam_patterns["high_risk_indicators"]:
-            if re.search(pattern_info["pattern"], text_lower, re.IGNORECASE):
-                total_score += pattern_info["weight"]
-                matched_patterns.append(pattern_info["description"])
-        
-        # Check medium-risk indicators
-        for pattern_info in self.scam_patterns["medium_risk_indicators"]:
-            if re.search(pattern_info["pattern"], text_lower, re.IGNORECASE):
-                total_score += pattern_info["weight"]
-                matched_patterns.append(pattern_info["description"])
-        
-        # Check positive indicators
-        for pattern_info in self.scam_patterns["positive_indicators"]:
-            if re.search(pattern_info["pattern"], text_lower, re.IGNORECASE):
-                total_score += pattern_info["weight"]
-                matched_patterns.append(pattern_info["description"])
+        # Score all rules in one call to the compiled rule set
+        total_score, matched_patterns = self.rule_engine.match(canonical_text)
         
         # Normalize score and determine classification
         if total_score >= 0.8:
@@ -1078,75 +1491,58 @@ class EnhancedAIAnalysisService(OpenAIAnalysisService):
             confidence=confidence
         )
     
-    async def _check_similar_job_ads(self, job_text: str) -> Optional[Tuple[JobAnalysisResult, float]]:
+    async def _check_similar_job_ads(
+        self, job_text: Union[str, NormalizedText]
+    ) -> Optional[Tuple[JobAnalysisResult, float]]:
         """
         Check for similar job ads in analysis history.
         
         Args:
-            job_text: The job advertisement text to check
+            job_text: The job advertisement text to check, or its normalization
             
         Returns:
             Optional[Tuple[JobAnalysisResult, float]]: Tuple of (similar_result, similarity_score) or None
         """
-        if not self.analysis_history or len(job_text.strip()) < 50:
+        canonical_text = normalize_job_text(job_text).canonical
+        if not self.analysis_history or len(canonical_text) < 50:
             return None
         
         try:
-            # Prepare texts for comparison
-            texts = [job_text]
-            results = []
-            
-            # Add historical job texts
-            for historical_text, analysis_results in self.analysis_history.items():
-                if analysis_results:
-                    texts.append(historical_text)
-                    results.append(analysis_results[-1])  # Get latest result
-            
-            if len(texts) < 2:
+            # Query the incremental index (no refit, no scan of the history texts)
+            matches = self.similarity_index.query(canonical_text, k=1, min_similarity=self.similarity_threshold)
+            if not matches:
                 return None
             
-            # Vectorize texts using TF-IDF
-            if not self.vectorizer_fitted:
-                # Fit vectorizer with all available texts
-                self.vectorizer.fit(texts)
-                self.vectorizer_fitted = True
-            
-            # Transform texts to vectors
-            vectors = self.vectorizer.transform(texts)
-            
-            # Calculate similarity between new job and historical jobs
-            similarity_scores = cosine_similarity(vectors[0:1], vectors[1:]).flatten()
-            
-            # Find most similar job
-            max_similarity_idx = np.argmax(similarity_scores)
-            max_similarity = similarity_scores[max_similarity_idx]
-            
-            # Return result if similarity is high enough
-            if max_similarity > 0.75:  # 75% similarity threshold
-                return (results[max_similarity_idx], max_similarity)
+            historical_text, max_similarity = matches[0]
+            analysis_results = self.analysis_history.get(historical_text)
+            if not analysis_results:
+                return None
             
-            return None
+            # Return the latest result for the most similar job
+            return (analysis_results[-1], max_similarity)
             
         except Exception as e:
             logger.error(f"Error checking similar job ads: {e}")
             return None
     
-    def _add_to_analysis_history(self, job_text: str, result: JobAnalysisResult, is_feedback: bool = False) -> None:
+    def _add_to_analysis_history(self, job_text: Union[str, NormalizedText], result: JobAnalysisResult,
+                                 is_feedback: bool = False) -> None:
         """
         Add analysis result to history for future similarity checking.
         
         Args:
-            job_text: The analyzed job advertisement text
+            job_text: The analyzed job advertisement text, or its normalization
             result: The analysis result
             is_feedback: Whether this is a feedback-corrected result
         """
         try:
-            # Create a hash key for the job text (first 1000 chars)
-            text_key = job_text[:1000]
+            # Key history on the canonical text (first 1000 chars)
+            text_key = normalize_job_text(job_text).canonical[:1000]
             
-            # Initialize list if not exists
+            # Initialize list and index entry if not exists
             if text_key not in self.analysis_history:
                 self.analysis_history[text_key] = []
+                self.similarity_index.add(text_key, text_key)
             
             # Add result to history
             self.analysis_history[text_key].append(result)
@@ -1162,9 +1558,7 @@ class EnhancedAIAnalysisService(OpenAIAnalysisService):
                 # Remove oldest entry
                 oldest_key = next(iter(self.analysis_history))
                 del self.analysis_history[oldest_key]
-                
-                # Mark vectorizer as needing refit
-                self.vectorizer_fitted = False
+                self.similarity_index.remove(oldest_key)
                 
         except Exception as e:
             logger.error(f"Error adding to analysis history: {e}")
@@ -1180,28 +1574,13 @@ class EnhancedAIAnalysisService(OpenAIAnalysisService):
         Returns:
             JobAnalysisResult: Combined analysis result
         """
-        # Weight the results based on confidence
-        ai_weight = ai_result.confidence * 0.7  # AI gets 70% weight
-        rule_weight = rule_result.confidence * 0.3  # Rules get 30% weight
-        
-        total_weight = ai_weight + rule_weight
-        
-        if total_weight == 0:
+        if ai_result.confidence == 0 and rule_result.confidence == 0:
             return ai_result  # Fallback to AI result
         
-        # Calculate weighted trust score
-        combined_trust_score = int(
-            (ai_result.trust_score * ai_weight + rule_result.trust_score * rule_weight) / total_weight
+        combined_trust_score, classification = self._combine_verdict(
+            ai_result.trust_score, ai_result.classification, ai_result.confidence, rule_result
         )
         
-        # Determine classification based on combined trust score
-        if combined_trust_score >= 65:
-            classification = JobClassification.LEGIT
-        elif combined_trust_score >= 35:
-            classification = JobClassification.SUSPICIOUS
-        else:
-            classification = JobClassification.LIKELY_SCAM
-        
         # Combine reasons (prefer AI reasons but include rule-based insights)
         combined_reasons = ai_result.reasons.copy()
         
@@ -1222,6 +1601,131 @@ class EnhancedAIAnalysisService(OpenAIAnalysisService):
             confidence=combined_confidence
         )
     
+    def _combine_verdict(self, trust_score: int, classification: JobClassification, confidence: float,
+                         rule_result: JobAnalysisResult) -> Tuple[int, JobClassification]:
+        """
+        Weight an AI verdict against a rule-based result.
+        
+        Args:
+            trust_score: Trust score from the AI model
+            classification: Classification from the AI model
+            confidence: Confidence of the AI model
+            rule_result: Result from rule-based analysis
+            
+        Returns:
+            Tuple of the combined trust score and its classification
+        """
+        # Weight the results based on confidence
+        ai_weight = confidence * 0.7  # AI gets 70% weight
+        rule_weight = rule_result.confidence * 0.3  # Rules get 30% weight
+        
+        total_weight = ai_weight + rule_weight
+        
+        if total_weight == 0:
+            return trust_score, classification  # Fallback to AI verdict
+        
+        # Calculate weighted trust score
+        combined_trust_score = int(
+            (trust_score * ai_weight + rule_result.trust_score * rule_weight) / total_weight
+        )
+        
+        # Determine classification based on combined trust score
+        if combined_trust_score >= 65:
+            classification = JobClassification.LEGIT
+        elif combined_trust_score >= 35:
+            classification = JobClassification.SUSPICIOUS
+        else:
+            classification = JobClassification.LIKELY_SCAM
+        
+        return combined_trust_score, classification
+    
+    def _build_batch_analysis_prompt(self, job_texts: List[str]) -> str:
+        """
+        Build one prompt that asks for a separate assessment of each job ad.
+        
+        Args:
+            job_texts: Job advertisement texts, numbered from 1 in the prompt
+            
+        Returns:
+            str: Formatted batch analysis prompt
+        """
+        advertisements = "\n\n".join(
+            f"JOB ADVERTISEMENT {number}:\n{job_text.strip()}"
+            for number, job_text in enumerate(job_texts, 1)
+        )
+        return f"""
+Analyze each of the following {len(job_texts)} job advertisements independently for potential scam indicators and provide a structured assessment of each one.
+
+{advertisements}
+
+For every advertisement, produce a JSON object containing exactly these fields:
+
+1. "id": The number of the job advertisement
+2. "trust_score": An integer from 0-100 (0 = definitely a scam, 100 = completely legitimate)
+3. "classification": One of exactly these three strings: "Legit", "Suspicious", or "Likely Scam"
+4. "reasons": An array of exactly 3 specific reasons supporting your classification
+5. "confidence": A decimal from 0.0-1.0 indicating your confidence in the analysis
+
+{SCAM_ANALYSIS_GUIDELINES}
+
+Respond ONLY with valid JSON in this exact format, with one entry per advertisement:
+{{
+    "results": [
+        {{
+            "id": 1,
+            "trust_score": 85,
+            "classification": "Legit",
+            "reasons": [
+                "Company has verifiable online presence and contact information",
+                "Job description is detailed and matches industry standards",
+                "Salary range is realistic for the position and location"
+            ],
+            "confidence": 0.9
+        }}
+    ]
+}}
+"""
+    
+    def _parse_batch_analysis_response(self, response_text: str, count: int) -> List[Optional[JobAnalysisResult]]:
+        """
+        Parse a batch analysis response into per-ad results.
+        
+        Entries are matched to ads by their "id"; a malformed entry only loses
+        the result for its own ad.
+        
+        Args:
+            response_text: Raw response text from OpenAI API
+            count: Number of ads in the batch prompt
+            
+        Returns:
+            List of results in input order, None for missing or invalid entries
+        """
+        results: List[Optional[JobAnalysisResult]] = [None] * count
+        
+        start_idx = response_text.find('{')
+        end_idx = response_text.rfind('}') + 1
+        try:
+            data = json.loads(response_text[start_idx:end_idx]) if start_idx != -1 else {}
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse batch JSON response: {e}")
+            return results
+        
+        entries = data.get("results") if isinstance(data, dict) else None
+        if not isinstance(entries, list):
+            logger.error("Batch response has no results list")
+            return results
+        
+        for entry in entries:
+            try:
+                number = entry["id"]
+                if not isinstance(number, int) or not 1 <= number <= count or results[number - 1]:
+                    raise ValueError(f"Invalid or duplicate id: {number}")
+                results[number - 1] = self._result_from_data(entry)
+            except (ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Invalid batch response entry: {e}")
+        
+        return results
+    
     def _build_remote_work_prompt(self, job_text: str) -> str:
         """
         Build specialized prompt for remote work analysis.
@@ -1352,17 +1856,13 @@ Pay special attention to these high salary job red flags:
                 self.feedback_data.clear()
                 logger.info("Cleared feedback data cache")
             
-            # Clear job ad vectors cache
-            if self.job_ad_vectors:
-                self.job_ad_vectors.clear()
-                logger.info("Cleared job ad vectors cache")
-            
-            # Reset vectorizer state
-            self.vectorizer_fitted = False
+            # Clear similarity index
+            if len(self.similarity_index):
+                self.similarity_index.clear()
+                logger.info("Cleared similarity index")
             
             # Clear any references to prevent memory leaks
             self.client = None
-            self.vectorizer = None
             
             log_with_context(
                 logger,
@@ -0,0 +1,400 @@
+"""
+Local fallback task queue for Redis outages.
+
+This module provides the LocalTaskQueue class, a bounded in-process priority
+queue backed by a SQLite journal. BackgroundTaskProcessor uses it while Redis
+is unavailable so tasks keep their priority semantics, concurrency stays
+bounded by the worker pool, and queued work survives a process restart.
+
+Several worker processes on one host share the journal file. Each process
+holds a slot lock for its lifetime and journals its rows under that slot, so
+on open it only replays its own slot and slots whose process has exited.
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import IO, Deque, Dict, List, Optional, Sequence, Tuple
+
+from app.utils.logging import get_logger
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, assume a single process per journal
+    fcntl = None
+
+logger = get_logger(__name__)
+
+# Most processes that can share one journal file at a time
+MAX_JOURNAL_SLOTS = 64
+
+
+class LocalQueueFull(Exception):
+    """Raised when the local fallback queue stays full past the put timeout."""
+
+
+@dataclass(order=True)
+class LocalQueueEntry:
+    """Serialized task held by the local fallback queue."""
+    sort_key: Tuple[float, int] = field(init=False, repr=False)
+    task_id: str = field(compare=False)
+    priority: int = field(compare=False)
+    task_data: str = field(compare=False)
+    due_at: Optional[float] = field(default=None, compare=False)
+    sequence: int = field(default=0, compare=False)
+    journal_id: Optional[int] = field(default=None, compare=False)
+
+    def __post_init__(self):
+        self.sort_key = (self.due_at or 0.0, self.sequence)
+
+
+class LocalTaskQueue:
+    """
+    Bounded priority queue with an optional SQLite journal.
+
+    Entries are popped highest priority first (larger priority value wins),
+    FIFO within a priority. Entries with a future due time wait in a heap until
+    they are due. Journal rows are removed only when a task is acknowledged,
+    so tasks popped but not finished are replayed after a crash.
+    """
+
+    def __init__(self, max_size: int = 500, journal_path: Optional[str] = None):
+        """
+        Initialize the local task queue.
+
+        Args:
+            max_size: Maximum number of queued (not in-flight) tasks
+            journal_path: SQLite journal file, or None for memory only
+        """
+        self.max_size = max_size
+        self.journal_path = journal_path
+
+        self._ready: Dict[int, Deque[LocalQueueEntry]] = {}
+        self._delayed: List[LocalQueueEntry] = []
+        self._sequence = itertools.count()
+        self._condition = asyncio.Condition()
+
+        self._journal: Optional[sqlite3.Connection] = None
+        self._journal_lock = threading.Lock()
+        self._slot: Optional[int] = None
+        self._slot_file: Optional[IO] = None
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._ready.values()) + len(self._delayed)
+
+    async def open(self) -> int:
+        """
+        Open the journal and reload tasks left by exited processes.
+
+        Returns:
+            Number of tasks restored from the journal
+        """
+        if not self.journal_path or self._journal is not None:
+            return 0
+
+        rows = await asyncio.to_thread(self._open_journal)
+        for journal_id, task_id, priority, task_data, due_at in rows:
+            self._push(LocalQueueEntry(
+                task_id=task_id,
+                priority=priority,
+                task_data=task_data,
+                due_at=due_at,
+                sequence=next(self._sequence),
+                journal_id=journal_id
+            ))
+
+        if rows:
+            logger.warning(f"Restored {len(rows)} tasks from local queue journal {self.journal_path}")
+        return len(rows)
+
+    def close(self):
+        """Close the journal connection and release its slot."""
+        with self._journal_lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            if self._slot_file is not None:
+                self._slot_file.close()
+                self._slot_file = None
+                self._slot = None
+
+    async def put(self, task_id: str, priority: int, task_data: str,
+                  due_at: Optional[float] = None, timeout: float = 0.0):
+        """
+        Add a task, waiting up to timeout for space when the queue is full.
+
+        Args:
+            task_id: Task identifier
+            priority: Priority value (higher is more urgent)
+            task_data: Serialized task
+            due_at: Epoch timestamp before which the task must not run
+            timeout: Seconds to wait for space before giving up
+
+        Raises:
+            LocalQueueFull: If no space became available within timeout
+        """
+        async with self._condition:
+            if len(self) >= self.max_size:
+                try:
+                    await asyncio.wait_for(
+                        self._condition.wait_for(lambda: len(self) < self.max_size),
+                        timeout=timeout
+                    )
+                except asyncio.TimeoutError:
+                    raise LocalQueueFull(f"Local task queue is full (size: {len(self)})")
+
+            entry = LocalQueueEntry(
+                task_id=task_id,
+                priority=priority,
+                task_data=task_data,
+                due_at=due_at if due_at and due_at > time.time() else None,
+                sequence=next(self._sequence)
+            )
+
+            if self._journal is not None:
+                entry.journal_id = await asyncio.to_thread(self._journal_insert, entry)
+
+            self._push(entry)
+            self._condition.notify_all()
+
+    async def get(self, timeout: float,
+                  priority_order: Optional[Sequence[int]] = None) -> Optional[LocalQueueEntry]:
+        """
+        Pop the next due task, waiting up to timeout.
+
+        Args:
+            timeout: Seconds to wait for a task
+            priority_order: Priorities to try in order (default: highest first)
+
+        Returns:
+            Queue entry or None if nothing became due in time
+        """
+        async with self._condition:
+            entry = self._pop_ready(priority_order)
+            if entry is None:
+                try:
+                    await asyncio.wait_for(
+                        self._condition.wait_for(self._has_ready),
+                        timeout=timeout
+                    )
+                except asyncio.TimeoutError:
+                    return None
+                entry = self._pop_ready(priority_order)
+
+            if entry is not None:
+                self._condition.notify_all()
+            return entry
+
+    def pop_batch(self, max_items: int) -> List[LocalQueueEntry]:
+        """
+        Remove up to max_items entries regardless of due time, for draining.
+
+        Args:
+            max_items: Maximum number of entries to remove
+
+        Returns:
+            Entries in priority order followed by delayed entries
+        """
+        batch: List[LocalQueueEntry] = []
+        for priority in sorted(self._ready, reverse=True):
+            entries = self._ready[priority]
+            while entries and len(batch) < max_items:
+                batch.append(entries.popleft())
+
+        while self._delayed and len(batch) < max_items:
+            batch.append(heapq.heappop(self._delayed))
+
+        return batch
+
+    def restore(self, entries: List[LocalQueueEntry]):
+        """Put entries back in their original order after a failed drain (they are still journaled)."""
+        ready: Dict[int, List[LocalQueueEntry]] = {}
+        for entry in entries:
+            if entry.due_at is not None and entry.due_at > time.time():
+                heapq.heappush(self._delayed, entry)
+            else:
+                ready.setdefault(entry.priority, []).append(entry)
+
+        for priority, items in ready.items():
+            self._ready.setdefault(priority, deque()).extendleft(reversed(items))
+
+    def requeue(self, entry: LocalQueueEntry, due_at: float):
+        """
+        Put a popped entry back to run at due_at, keeping its journal row.
+
+        Used to defer work without going through put, so it never blocks on a
+        full queue.
+        """
+        entry.due_at = due_at
+        entry.sequence = next(self._sequence)
+        entry.sort_key = (due_at, entry.sequence)
+        heapq.heappush(self._delayed, entry)
+
+    async def ack(self, entries: List[LocalQueueEntry]):
+        """
+        Remove finished or handed-off entries from the journal.
+
+        Entries are matched by journal row rather than task ID, so a retry
+        re-queued under the same task ID is not lost.
+
+        Args:
+            entries: Entries previously returned by get or pop_batch
+        """
+        journal_ids = [entry.journal_id for entry in entries if entry.journal_id is not None]
+        if self._journal is not None and journal_ids:
+            await asyncio.to_thread(self._journal_delete, journal_ids)
+
+        async with self._condition:
+            self._condition.notify_all()
+
+    def _push(self, entry: LocalQueueEntry):
+        """Place an entry in the ready deques or the delayed heap."""
+        if entry.due_at is not None and entry.due_at > time.time():
+            heapq.heappush(self._delayed, entry)
+        else:
+            self._ready.setdefault(entry.priority, deque()).append(entry)
+
+    def _promote_due(self):
+        """Move delayed entries whose due time has passed to the ready deques."""
+        now = time.time()
+        while self._delayed and self._delayed[0].due_at <= now:
+            entry = heapq.heappop(self._delayed)
+            self._ready.setdefault(entry.priority, deque()).append(entry)
+
+    def _has_ready(self) -> bool:
+        """Check whether any entry can be popped now."""
+        self._promote_due()
+        return any(self._ready.values())
+
+    def _pop_ready(self, priority_order: Optional[Sequence[int]] = None) -> Optional[LocalQueueEntry]:
+        """Pop the first ready entry following priority_order."""
+        self._promote_due()
+        order = list(priority_order or ())
+        order += sorted((p for p in self._ready if p not in order), reverse=True)
+        for priority in order:
+            if self._ready.get(priority):
+                return self._ready[priority].popleft()
+        return None
+
+    def _open_journal(self) -> List[Tuple[int, str, int, str, Optional[float]]]:
+        """
+        Create the journal table and claim rows this process should replay.
+
+        Rows of this process's slot, of slots no live process holds and rows
+        written before slots existed are claimed in one write transaction, so
+        two processes opening at once never replay the same row.
+
+        Returns:
+            Claimed rows in insertion order
+        """
+        directory = os.path.dirname(self.journal_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._journal_lock:
+            self._slot, self._slot_file = self._acquire_slot()
+            if self._slot is None:
+                logger.error(f"No free slot in local queue journal {self.journal_path}, running without it")
+                return []
+
+            self._journal = sqlite3.connect(self.journal_path, check_same_thread=False, isolation_level=None)
+            self._journal.execute("PRAGMA journal_mode=WAL")
+            self._journal.execute("PRAGMA synchronous=NORMAL")
+            self._journal.execute(
+                "CREATE TABLE IF NOT EXISTS pending_tasks ("
+                "seq INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "task_id TEXT NOT NULL, "
+                "priority INTEGER NOT NULL, "
+                "task_data TEXT NOT NULL, "
+                "due_at REAL, "
+                "slot INTEGER)"
+            )
+            columns = [row[1] for row in self._journal.execute("PRAGMA table_info(pending_tasks)")]
+            if "slot" not in columns:
+                self._journal.execute("ALTER TABLE pending_tasks ADD COLUMN slot INTEGER")
+
+            self._journal.execute("BEGIN IMMEDIATE")
+            try:
+                slots = [row[0] for row in self._journal.execute("SELECT DISTINCT slot FROM pending_tasks")]
+                orphaned = [slot for slot in slots if slot is not None and not self._slot_in_use(slot)]
+                self._journal.execute(
+                    f"UPDATE pending_tasks SET slot = ? WHERE slot IS NULL "
+                    f"OR slot IN ({', '.join('?' * len(orphaned)) or 'NULL'})",
+                    (self._slot, *orphaned)
+                )
+                cursor = self._journal.execute(
+                    "SELECT seq, task_id, priority, task_data, due_at FROM pending_tasks "
+                    "WHERE slot = ? ORDER BY seq",
+                    (self._slot,)
+                )
+                rows = cursor.fetchall()
+                self._journal.execute("COMMIT")
+            except Exception:
+                self._journal.execute("ROLLBACK")
+                raise
+            return rows
+
+    def _slot_lock_path(self, slot: int) -> str:
+        """Get the lock file guarding a journal slot."""
+        return f"{self.journal_path}.slot{slot}.lock"
+
+    def _acquire_slot(self) -> Tuple[Optional[int], Optional[IO]]:
+        """
+        Lock the first free journal slot for the lifetime of this queue.
+
+        The operating system drops the lock when the process exits, which is
+        how other processes tell that the slot's rows are orphaned.
+
+        Returns:
+            Tuple of (slot, open lock file), or (None, None) if all slots are taken
+        """
+        if fcntl is None:
+            return 0, None
+
+        for slot in range(MAX_JOURNAL_SLOTS):
+            lock_file = open(self._slot_lock_path(slot), "a")
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return slot, lock_file
+            except OSError:
+                lock_file.close()
+        return None, None
+
+    def _slot_in_use(self, slot: int) -> bool:
+        """Check whether another live queue holds a journal slot."""
+        if slot == self._slot:
+            return False
+        if fcntl is None or not os.path.exists(self._slot_lock_path(slot)):
+            return False
+
+        with open(self._slot_lock_path(slot), "a") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return True
+            return False
+
+    def _journal_insert(self, entry: LocalQueueEntry) -> int:
+        """Append an entry to the journal under this process's slot and return its row ID."""
+        with self._journal_lock:
+            cursor = self._journal.execute(
+                "INSERT INTO pending_tasks (task_id, priority, task_data, due_at, slot) VALUES (?, ?, ?, ?, ?)",
+                (entry.task_id, entry.priority, entry.task_data, entry.due_at, self._slot)
+            )
+            return cursor.lastrowid
+
+    def _journal_delete(self, journal_ids: List[int]):
+        """Delete acknowledged rows from the journal."""
+        with self._journal_lock:
+            if self._journal is None:
+                return
+            self._journal.executemany(
+                "DELETE FROM pending_tasks WHERE seq = ?",
+                [(journal_id,) for journal_id in journal_ids]
+            )
@@ -8,7 +8,7 @@ analysis workflow for both text and media messages from WhatsApp users.
 
 import logging
 import asyncio
-from typing import Optional
+from typing import Optional, Tuple
 
 from app.models.data_models import TwilioWebhookRequest, JobAnalysisResult, AppConfig, AnalysisResult, MessageType
 from app.services.pdf_processing import (
@@ -18,8 +18,11 @@ from app.services.pdf_processing import (
 from app.services.enhanced_ai_analysis import EnhancedAIAnalysisService
 from app.services.twilio_response import TwilioResponseService
 from app.services.user_management import UserManagementService
+from app.services.verdict_stream import EarlyVerdict
 from app.utils.logging import get_logger, get_correlation_id, log_with_context, sanitize_phone_number
 from app.utils.error_handling import handle_error, get_fallback_response, ErrorCategory
+from app.utils.metrics import get_metrics_collector
+from app.utils.text_normalization import normalize_job_text
 import time
 
 
@@ -140,6 +143,7 @@ class MessageHandlerService:
         start_time = time.time()
         analysis_result = None
         error_message = None
+        early_verdict: Optional[Tuple[EarlyVerdict, asyncio.Task]] = None
         
         log_with_context(
             logger,
@@ -235,8 +239,20 @@ class MessageHandlerService:
                 from_number=sanitize_phone_number(from_number),
                 correlation_id=correlation_id
             )
+            # Send the verdict as soon as it streams in; the findings follow it
+            on_verdict = None
+            if getattr(self.config, "enable_streaming_analysis", False):
+                async def on_verdict(verdict: EarlyVerdict):
+                    nonlocal early_verdict
+                    early_verdict = (verdict, asyncio.create_task(
+                        self._send_early_verdict(from_number, verdict, start_time)
+                    ))
+            
+            # Normalize once; cache, dedup and rule stages reuse the canonical form
             analysis_result = await asyncio.wait_for(
-                self.openai_service.analyze_job_ad(text),
+                self.openai_service.analyze_job_ad(
+                    text, normalized=normalize_job_text(text), on_verdict=on_verdict
+                ),
                 timeout=12.0  # 12 second timeout for entire analysis
             )
             
@@ -248,12 +264,10 @@ class MessageHandlerService:
                 from_number=sanitize_phone_number(from_number),
                 trust_score=analysis_result.trust_score,
                 classification=analysis_result.classification_text,
+                early_verdict_sent=early_verdict is not None,
                 correlation_id=correlation_id
             )
-            success = await asyncio.wait_for(
-                self.twilio_service.send_analysis_result(from_number, analysis_result),
-                timeout=5.0  # 5 second timeout for Twilio API
-            )
+            success = await self._send_analysis_reply(from_number, analysis_result, start_time, early_verdict)
             
             # Record successful interaction (non-blocking)
             response_time = time.time() - start_time
@@ -274,16 +288,21 @@ class MessageHandlerService:
                 logging.ERROR,
                 "Analysis timed out",
                 from_number=sanitize_phone_number(from_number),
+                early_verdict_sent=early_verdict is not None,
                 correlation_id=correlation_id
             )
             error_message = "Analysis timeout"
-            success = await self._send_custom_error_message(
-                from_number,
-                "⏱️ *Analysis Taking Too Long*\n\n"
-                "The job analysis is taking longer than expected. "
-                "This might be due to high demand or complex content.\n\n"
-                "Please try again in a few minutes, or send a shorter job description."
-            )
+            if early_verdict and await early_verdict[1]:
+                # The user already has a verdict, an apology would contradict it
+                success = True
+            else:
+                success = await self._send_custom_error_message(
+                    from_number,
+                    "⏱️ *Analysis Taking Too Long*\n\n"
+                    "The job analysis is taking longer than expected. "
+                    "This might be due to high demand or complex content.\n\n"
+                    "Please try again in a few minutes, or send a shorter job description."
+                )
             
             # Record timeout interaction (non-blocking)
             response_time = time.time() - start_time
@@ -324,6 +343,82 @@ class MessageHandlerService:
             
             return success
     
+    async def _send_early_verdict(self, from_number: str, verdict: EarlyVerdict, start_time: float) -> bool:
+        """
+        Send a streamed verdict ahead of the findings and record its latency.
+        
+        Args:
+            from_number: Recipient's WhatsApp number
+            verdict: Trust score and classification parsed from the stream
+            start_time: When the message was received
+            
+        Returns:
+            bool: True if the verdict was sent
+        """
+        try:
+            success = await asyncio.wait_for(
+                self.twilio_service.send_verdict(from_number, verdict),
+                timeout=5.0  # 5 second timeout for Twilio API
+            )
+        except Exception as e:
+            log_with_context(
+                logger,
+                logging.WARNING,
+                "Early verdict could not be sent",
+                from_number=sanitize_phone_number(from_number),
+                error=str(e) or type(e).__name__,
+                correlation_id=get_correlation_id()
+            )
+            return False
+        
+        if success:
+            get_metrics_collector().record_time_to_first_verdict("text", True, time.time() - start_time)
+        return success
+    
+    async def _send_analysis_reply(self, from_number: str, analysis_result: JobAnalysisResult, start_time: float,
+                                   early_verdict: Optional[Tuple[EarlyVerdict, asyncio.Task]] = None) -> bool:
+        """
+        Send the analysis result, or only its findings if its verdict already went out.
+        
+        The full result is sent when no early verdict was delivered. When the
+        final trust score or classification differs from a delivered early
+        verdict (e.g. validation failed and the fallback model answered), it
+        is sent as a revision of that verdict rather than a second verdict.
+        
+        Args:
+            from_number: Recipient's WhatsApp number
+            analysis_result: Complete analysis result
+            start_time: When the message was received
+            early_verdict: The streamed verdict and the task sending it, if any
+            
+        Returns:
+            bool: True if the reply was sent
+        """
+        verdict_sent = False
+        if early_verdict:
+            verdict, delivery = early_verdict
+            verdict_sent = await delivery
+            if verdict_sent:
+                unchanged = (verdict.trust_score, verdict.classification) == (
+                    analysis_result.trust_score, analysis_result.classification
+                )
+                send = (
+                    self.twilio_service.send_analysis_details if unchanged
+                    else self.twilio_service.send_verdict_revision
+                )
+                return await asyncio.wait_for(
+                    send(from_number, analysis_result),
+                    timeout=5.0  # 5 second timeout for Twilio API
+                )
+        
+        success = await asyncio.wait_for(
+            self.twilio_service.send_analysis_result(from_number, analysis_result),
+            timeout=5.0  # 5 second timeout for Twilio API
+        )
+        if success and not verdict_sent:
+            get_metrics_collector().record_time_to_first_verdict("text", False, time.time() - start_time)
+        return success
+    
     async def handle_media_message(self, media_url: str, media_content_type: Optional[str], from_number: str) -> bool:
         """
         Handle media message processing with PDF download and extraction.
@@ -411,7 +506,7 @@ class MessageHandlerService:
                 correlation_id=correlation_id
             )
             try:
-                extracted_text = await self.pdf_service.process_pdf_url(media_url)
+                document = await self.pdf_service.load_pdf_url(media_url)
             except (PDFDownloadError, PDFExtractionError, PDFValidationError, PDFProcessingError) as e:
                 log_with_context(
                     logger,
@@ -428,19 +523,31 @@ class MessageHandlerService:
                 await self._send_custom_error_message(from_number, user_message)
                 return False
             
-            # Analyze extracted text with timeout protection
-            log_with_context(
-                logger,
-                logging.INFO,
-                "Starting OpenAI analysis for PDF content",
-                from_number=sanitize_phone_number(from_number),
-                text_length=len(extracted_text),
-                correlation_id=correlation_id
-            )
-            analysis_result = await asyncio.wait_for(
-                self.openai_service.analyze_job_ad(extracted_text),
-                timeout=12.0  # 12 second timeout for entire analysis
-            )
+            extracted_text = document.text.original
+            if document.analysis_result is not None:
+                # A copy of this PDF was analyzed before
+                analysis_result = document.analysis_result
+                log_with_context(
+                    logger,
+                    logging.INFO,
+                    "Reusing cached analysis for repeated PDF",
+                    from_number=sanitize_phone_number(from_number),
+                    correlation_id=correlation_id
+                )
+            else:
+                # Analyze extracted text with timeout protection
+                log_with_context(
+                    logger,
+                    logging.INFO,
+                    "Starting OpenAI analysis for PDF content",
+                    from_number=sanitize_phone_number(from_number),
+                    text_length=len(extracted_text),
+                    correlation_id=correlation_id
+                )
+                analysis_result = await asyncio.wait_for(
+                    self.openai_service.analyze_job_ad(extracted_text, normalized=document.text),
+                    timeout=12.0  # 12 second timeout for entire analysis
+                )
             
             # Send analysis result back to user
             log_with_context(
@@ -457,6 +564,10 @@ class MessageHandlerService:
                 timeout=5.0  # 5 second timeout for Twilio API
             )
             
+            # The next copy of this PDF skips the analysis
+            if document.analysis_result is None:
+                await self.pdf_service.cache_analysis_result(document, analysis_result)
+            
             # Record successful interaction (non-blocking)
             response_time = time.time() - start_time
             asyncio.create_task(self._record_interaction_safe(
@@ -677,19 +788,9 @@ class MessageHandlerService:
                 from_number = f"whatsapp:{from_number}"
                 logger.info(f"Added whatsapp: prefix to number: {sanitize_phone_number(from_number)}")
             
-            # Use asyncio.wait_for to add timeout to Twilio API call
-            import asyncio
-            
-            def send_twilio_message():
-                return self.twilio_service.client.messages.create(
-                    body=message,
-                    from_=f"whatsapp:{self.config.twilio_phone_number}",
-                    to=from_number
-                )
-            
-            # Add 3-second timeout and run in thread pool to prevent blocking
+            # Add 3-second timeout to Twilio API call
             twilio_message = await asyncio.wait_for(
-                asyncio.to_thread(send_twilio_message),
+                self.twilio_service.create_message(from_number, message),
                 timeout=3.0
             )
             
@@ -868,7 +969,9 @@ class MessageHandlerService:
                 correlation_id=correlation_id
             )
             
-            analysis_result = await self.openai_service.analyze_job_ad(content_to_analyze)
+            analysis_result = await self.openai_service.analyze_job_ad(
+                content_to_analyze, normalized=normalize_job_text(content_to_analyze)
+            )
             
             try:
                 # Record the interaction in the database
@@ -8,6 +8,8 @@ useful for testing the bot logic without needing a real WhatsApp setup.
 import logging
 from typing import Optional
 from app.models.data_models import JobAnalysisResult, AppConfig
+from app.services.twilio_sender import TwilioMessage
+from app.services.verdict_stream import EarlyVerdict
 from app.utils.logging import get_logger, get_correlation_id, log_with_context
 
 logger = get_logger(__name__)
@@ -63,6 +65,82 @@ class MockTwilioResponseService:
         
         return True
         
+    async def send_verdict(self, to_number: str, verdict: EarlyVerdict) -> bool:
+        """
+        Mock sending an early verdict to user.
+        
+        Args:
+            to_number: Recipient's WhatsApp number
+            verdict: Trust score and classification parsed from the stream
+            
+        Returns:
+            bool: Always True for mock service
+        """
+        message_body = (
+            f"*Job Analysis Result*\n\n"
+            f"*Trust Score:* {verdict.trust_score}/100\n"
+            f"*Classification:* {verdict.classification_text}\n\n"
+            "_Key findings follow in the next message._"
+        )
+        return self._record_message(to_number, "verdict", message_body, verdict)
+    
+    async def send_analysis_details(self, to_number: str, result: JobAnalysisResult) -> bool:
+        """
+        Mock sending the key findings that follow an early verdict.
+        
+        Args:
+            to_number: Recipient's WhatsApp number
+            result: Complete analysis result
+            
+        Returns:
+            bool: Always True for mock service
+        """
+        message_body = "*Key Findings:*\n" + "".join(
+            f"{i}. {reason}\n" for i, reason in enumerate(result.reasons, 1)
+        ) + f"\n*Confidence:* {result.confidence:.1%}"
+        return self._record_message(to_number, "analysis_details", message_body, result)
+    
+    async def create_message(self, to_number: str, body: str) -> TwilioMessage:
+        """
+        Mock sending one WhatsApp message.
+        
+        Args:
+            to_number: Recipient's WhatsApp number
+            body: Message text
+            
+        Returns:
+            TwilioMessage: Message with a mock SID
+        """
+        self._record_message(to_number, "message", body, None)
+        return TwilioMessage(sid=f"MOCK{len(self.sent_messages):030d}", status="queued")
+    
+    def _record_message(self, to_number: str, message_type: str, message_body: str, result) -> bool:
+        """Store and print a message that would have been sent."""
+        correlation_id = get_correlation_id()
+        
+        self.sent_messages.append({
+            "to": to_number,
+            "type": message_type,
+            "body": message_body,
+            "result": result,
+            "timestamp": correlation_id
+        })
+        
+        log_with_context(
+            logger,
+            logging.INFO,
+            f"MOCK: {message_type} would be sent",
+            to_number=to_number[-4:] + "****",  # Mask phone number
+            correlation_id=correlation_id
+        )
+        
+        print(f"\n📱 MOCK WhatsApp Message to {to_number[-4:]}****:")
+        print("=" * 50)
+        print(message_body)
+        print("=" * 50)
+        
+        return True
+        
     async def send_error_message(self, to_number: str, error_type: str = "general") -> bool:
         """
         Mock sending error message to user.
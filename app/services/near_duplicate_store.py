@@ -0,0 +1,333 @@
+"""
+Shared near-duplicate verdict store for job advertisements.
+
+Scam ads are re-posted with tiny edits (a new phone number, an emoji, a
+changed salary), so an exact text hash misses them and the in-process
+similarity index only knows what one worker has seen. This module provides
+the NearDuplicateStore class, which keeps MinHash fingerprints of analyzed
+ads in Redis so every worker can reuse a prior verdict:
+
+- text is reduced to lowercase letter-only words (digits, phone numbers,
+  URLs, punctuation and emoji drop out) and split into word shingles
+- a MinHash signature estimates the Jaccard similarity of two shingle sets
+- the signature is split into LSH bands; each band is one Redis sorted set
+  keyed by the band hash, so a lookup is one pipelined read of the bands
+  plus one pipelined read of the candidate verdicts
+- candidates are verified against the full signature, and bucket collisions
+  below the threshold are counted as false matches
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.models.data_models import JobAnalysisResult, JobClassification
+from app.services.redis_connection_manager import get_redis_manager
+from app.utils.logging import get_logger, get_correlation_id, log_with_context
+
+logger = get_logger(__name__)
+
+# Letter-only words: digits, punctuation and emoji never reach the shingles
+WORD_PATTERN = re.compile(r"[^\W\d_]+")
+URL_PATTERN = re.compile(r"(?:https?://|www\.)\S+", re.IGNORECASE)
+
+# Universal hashing (a * x + b) mod p over 32-bit shingle hashes
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+# Fixed seed so every worker derives the same permutations
+FINGERPRINT_SEED = 1
+
+
+@dataclass
+class NearDuplicateConfig:
+    """Configuration for the shared near-duplicate store."""
+    enabled: bool = True
+    num_permutations: int = 128
+    bands: int = 32
+    shingle_size: int = 3
+    min_words: int = 8
+    similarity_threshold: float = 0.7
+    ttl: int = 86400  # seconds
+    max_candidates_per_band: int = 8
+    key_prefix: str = "neardup"
+
+
+class NearDuplicateStore:
+    """
+    MinHash-LSH store of analysis verdicts shared through Redis.
+
+    Band buckets are sorted sets scored by expiry time, so expired
+    fingerprints are trimmed on write and skipped on read without a scan.
+    """
+
+    def __init__(self, config: Optional[NearDuplicateConfig] = None):
+        """
+        Initialize the near-duplicate store.
+
+        Args:
+            config: Store configuration (loaded from environment if omitted)
+        """
+        self.config = config or self._load_config()
+        if self.config.num_permutations % self.config.bands:
+            raise ValueError("num_permutations must be a multiple of bands")
+        self.rows_per_band = self.config.num_permutations // self.config.bands
+        self.redis_manager = get_redis_manager()
+
+        random_state = np.random.RandomState(FINGERPRINT_SEED)
+        self._a = random_state.randint(1, int(MAX_HASH), size=self.config.num_permutations).astype(np.uint64)
+        self._b = random_state.randint(0, int(MAX_HASH), size=self.config.num_permutations).astype(np.uint64)
+
+        self.stats = {
+            'lookups': 0,
+            'hits': 0,
+            'misses': 0,
+            'candidates': 0,
+            'false_matches': 0,
+            'records': 0,
+            'skipped_short': 0,
+            'errors': 0
+        }
+
+    def _load_config(self) -> NearDuplicateConfig:
+        """Load configuration from environment variables."""
+        config = NearDuplicateConfig()
+        config.enabled = os.getenv('NEAR_DUPLICATE_ENABLED', 'true').lower() == 'true'
+        config.similarity_threshold = float(os.getenv('NEAR_DUPLICATE_THRESHOLD', '0.7'))
+        config.ttl = int(os.getenv('NEAR_DUPLICATE_TTL', '86400'))
+        return config
+
+    def shingles(self, text: str) -> List[str]:
+        """
+        Split normalized text into overlapping word shingles.
+
+        Args:
+            text: Job advertisement text
+
+        Returns:
+            List of shingles (empty if the text is too short to fingerprint)
+        """
+        words = WORD_PATTERN.findall(URL_PATTERN.sub(" ", text.lower()))
+        if len(words) < self.config.min_words:
+            return []
+
+        size = self.config.shingle_size
+        return [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+
+    def fingerprint(self, text: str) -> Optional[np.ndarray]:
+        """
+        Compute the MinHash signature of text.
+
+        Args:
+            text: Job advertisement text
+
+        Returns:
+            uint32 signature array, or None if the text is too short
+        """
+        shingles = set(self.shingles(text))
+        if not shingles:
+            return None
+
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode('utf-8')) for shingle in shingles),
+            dtype=np.uint64,
+            count=len(shingles)
+        )
+        permuted = ((hashes[:, None] * self._a + self._b) % MERSENNE_PRIME) & MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def band_keys(self, signature: np.ndarray) -> List[str]:
+        """Redis bucket keys of each LSH band of a signature."""
+        rows = self.rows_per_band
+        return [
+            f"{self.config.key_prefix}:band:{band}:"
+            f"{hashlib.blake2b(signature[band * rows:(band + 1) * rows].tobytes(), digest_size=8).hexdigest()}"
+            for band in range(self.config.bands)
+        ]
+
+    @staticmethod
+    def fingerprint_id(signature: np.ndarray) -> str:
+        """Stable identifier of a signature (identical fingerprints share it)."""
+        return hashlib.blake2b(signature.tobytes(), digest_size=12).hexdigest()
+
+    @staticmethod
+    def estimate_similarity(signature: np.ndarray, other: np.ndarray) -> float:
+        """Estimate Jaccard similarity as the fraction of equal MinHash values."""
+        return float(np.count_nonzero(signature == other)) / len(signature)
+
+    async def lookup(self, job_text: str) -> Optional[Tuple[JobAnalysisResult, float]]:
+        """
+        Find a prior verdict for a near-duplicate of job_text.
+
+        Args:
+            job_text: Job advertisement text
+
+        Returns:
+            Tuple of (prior result, estimated similarity) or None
+        """
+        if not self.config.enabled:
+            return None
+
+        signature = self.fingerprint(job_text)
+        if signature is None:
+            self.stats['skipped_short'] += 1
+            return None
+
+        self.stats['lookups'] += 1
+        match = None
+        try:
+            match = await self._find_match(signature)
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.warning(f"Near-duplicate lookup failed: {e}")
+
+        if match is None:
+            self.stats['misses'] += 1
+            return None
+
+        self.stats['hits'] += 1
+        log_with_context(
+            logger,
+            logging.DEBUG,
+            "Near-duplicate verdict found",
+            similarity=match[1],
+            correlation_id=get_correlation_id()
+        )
+        return match
+
+    async def _find_match(self, signature: np.ndarray) -> Optional[Tuple[JobAnalysisResult, float]]:
+        """Read the band buckets, then verify candidates against the full signature."""
+        if not self.redis_manager.is_available():
+            return None
+
+        now = time.time()
+        buckets = await self.redis_manager.execute_pipeline([
+            ('zrevrangebyscore', key, '+inf', now, 0, self.config.max_candidates_per_band)
+            for key in self.band_keys(signature)
+        ], transaction=False)
+        if not buckets:
+            return None
+
+        candidate_ids = list(dict.fromkeys(member for bucket in buckets if bucket for member in bucket))
+        if not candidate_ids:
+            return None
+
+        records = await self.redis_manager.execute_pipeline([
+            ('get', f"{self.config.key_prefix}:fp:{candidate_id}") for candidate_id in candidate_ids
+        ], transaction=False)
+        if not records:
+            return None
+
+        best: Optional[Tuple[Dict[str, Any], float]] = None
+        for raw in records:
+            if not raw:
+                continue  # verdict expired before its bucket entry was trimmed
+            record = json.loads(raw)
+            similarity = self.estimate_similarity(
+                signature, np.frombuffer(bytes.fromhex(record['signature']), dtype=np.uint32)
+            )
+            self.stats['candidates'] += 1
+            if similarity < self.config.similarity_threshold:
+                self.stats['false_matches'] += 1
+            elif best is None or similarity > best[1]:
+                best = (record, similarity)
+
+        if best is None:
+            return None
+
+        record, similarity = best
+        return (
+            JobAnalysisResult(
+                trust_score=record['trust_score'],
+                classification=JobClassification(record['classification']),
+                reasons=record['reasons'],
+                confidence=record['confidence']
+            ),
+            similarity
+        )
+
+    async def record(self, job_text: str, result: JobAnalysisResult, ttl: Optional[int] = None) -> bool:
+        """
+        Store a verdict so near-duplicates of job_text can reuse it.
+
+        Args:
+            job_text: Analyzed job advertisement text
+            result: Analysis result
+            ttl: Time to live in seconds (default: configured TTL)
+
+        Returns:
+            True if the verdict was stored
+        """
+        if not self.config.enabled or not self.redis_manager.is_available():
+            return False
+
+        signature = self.fingerprint(job_text)
+        if signature is None:
+            return False
+
+        ttl = ttl or self.config.ttl
+        now = time.time()
+        fingerprint_id = self.fingerprint_id(signature)
+        record = {
+            'signature': signature.tobytes().hex(),
+            'trust_score': result.trust_score,
+            'classification': result.classification.value,
+            'reasons': result.reasons,
+            'confidence': result.confidence,
+            'cached_at': datetime.utcnow().isoformat()
+        }
+
+        commands = [('setex', f"{self.config.key_prefix}:fp:{fingerprint_id}", ttl, json.dumps(record))]
+        for key in self.band_keys(signature):
+            commands.append(('zadd', key, {fingerprint_id: now + ttl}))
+            commands.append(('zremrangebyscore', key, '-inf', now))
+            commands.append(('expire', key, ttl))
+
+        try:
+            stored = await self.redis_manager.execute_pipeline(commands, transaction=False) is not None
+        except Exception as e:
+            stored = False
+            logger.warning(f"Failed to record near-duplicate verdict: {e}")
+
+        if stored:
+            self.stats['records'] += 1
+        else:
+            self.stats['errors'] += 1
+        return stored
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get store statistics.
+
+        Returns:
+            Dictionary with lookup counters, hit rate and false-match rate
+        """
+        stats = dict(self.stats)
+        stats['hit_rate'] = stats['hits'] / stats['lookups'] if stats['lookups'] else 0.0
+        stats['false_match_rate'] = (
+            stats['false_matches'] / stats['candidates'] if stats['candidates'] else 0.0
+        )
+        stats['similarity_threshold'] = self.config.similarity_threshold
+        stats['enabled'] = self.config.enabled
+        return stats
+
+
+# Global near-duplicate store instance
+_near_duplicate_store: Optional[NearDuplicateStore] = None
+
+
+def get_near_duplicate_store() -> NearDuplicateStore:
+    """Get global near-duplicate store instance."""
+    global _near_duplicate_store
+    if _near_duplicate_store is None:
+        _near_duplicate_store = NearDuplicateStore()
+    return _near_duplicate_store
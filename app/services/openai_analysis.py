@@ -20,10 +20,34 @@ from app.utils.metrics import get_metrics_collector
 from app.utils.error_tracking import get_error_tracker, AlertSeverity
 from app.utils.circuit_breaker import get_circuit_breaker, CircuitBreakerConfig, CircuitBreakerError
 from app.services.caching_service import get_caching_service
+from app.services.analysis_coalescer import get_analysis_coalescer
+from app.services.prompt_budget import get_prompt_budgeter, count_tokens
+from app.utils.text_normalization import NormalizedText, normalize_job_text
 
 
 logger = get_logger(__name__)
 
+ANALYSIS_SYSTEM_PROMPT = (
+    "You are an expert job market analyst specializing in identifying employment scams. "
+    "Analyze job postings carefully and provide structured responses."
+)
+
+# Shared by the single-ad and batch analysis prompts
+SCAM_ANALYSIS_GUIDELINES = """Consider these scam indicators:
+- Unrealistic salary promises or "get rich quick" schemes
+- Requests for upfront payments, fees, or personal financial information
+- Vague job descriptions or responsibilities
+- Poor grammar, spelling, or unprofessional communication
+- Pressure tactics or urgency without legitimate business reasons
+- Requests to work from home immediately without proper vetting
+- Contact information that seems unprofessional or suspicious
+- Company information that's hard to verify or doesn't exist
+
+Classification guidelines:
+- "Legit": 70-100 trust score, legitimate job posting with verifiable details
+- "Suspicious": 30-69 trust score, some red flags but could be legitimate
+- "Likely Scam": 0-29 trust score, multiple scam indicators present"""
+
 
 class OpenAIAnalysisService:
     """
@@ -57,6 +81,9 @@ class OpenAIAnalysisService:
         # Cache configuration for cost optimization
         self.cache_ttl = 86400  # 24 hours
         self.min_confidence_to_cache = 0.7  # Only cache high-confidence results
+        
+        # Concurrent analyses of the same text share one OpenAI call
+        self.coalescer = get_analysis_coalescer()
     
     async def _make_openai_request(self, prompt: str):
         """
@@ -75,7 +102,7 @@ class OpenAIAnalysisService:
                 messages=[
                     {
                         "role": "system",
-                        "content": "You are an expert job market analyst specializing in identifying employment scams. Analyze job postings carefully and provide structured responses."
+                        "content": ANALYSIS_SYSTEM_PROMPT
                     },
                     {
                         "role": "user", 
@@ -89,12 +116,14 @@ class OpenAIAnalysisService:
             timeout=10.0  # Total timeout including network
         )
         
-    async def analyze_job_ad(self, job_text: str) -> JobAnalysisResult:
+    async def analyze_job_ad(self, job_text: str,
+                             normalized: Optional[NormalizedText] = None) -> JobAnalysisResult:
         """
         Analyze a job advertisement for potential scam indicators.
         
         Args:
             job_text: The job advertisement text to analyze
+            normalized: Canonical form of job_text, if the caller already has it
             
         Returns:
             JobAnalysisResult: Analysis result with trust score, classification, and reasons
@@ -116,11 +145,11 @@ class OpenAIAnalysisService:
         
         correlation_id = get_correlation_id()
         metrics = get_metrics_collector()
-        error_tracker = get_error_tracker()
         
-        # Check cache first to save costs
+        # Check cache first to save costs (keyed on the canonical text)
+        normalized = normalize_job_text(normalized or job_text)
         caching_service = get_caching_service()
-        cached_result = await caching_service.get_cached_analysis_result(sanitized_text)
+        cached_result = await caching_service.get_cached_analysis_result(normalized)
         
         if cached_result:
             metrics.increment_counter("openai_cache_hit")
@@ -146,6 +175,31 @@ class OpenAIAnalysisService:
             correlation_id=correlation_id
         )
         
+        # Identical texts arriving together share one OpenAI call
+        return await self.coalescer.run(
+            normalized,
+            lambda: self._analyze_uncached(sanitized_text, normalized)
+        )
+    
+    async def _analyze_uncached(self, sanitized_text: str, normalized: NormalizedText) -> JobAnalysisResult:
+        """
+        Analyze sanitized job text with OpenAI and cache a confident result.
+        
+        Args:
+            sanitized_text: Validated, sanitized job advertisement text
+            normalized: Canonical form of the job text, used as the cache key
+            
+        Returns:
+            JobAnalysisResult: Analysis result
+            
+        Raises:
+            Exception: If OpenAI API call fails or response is invalid
+        """
+        correlation_id = get_correlation_id()
+        metrics = get_metrics_collector()
+        error_tracker = get_error_tracker()
+        caching_service = get_caching_service()
+        
         # Start timing the analysis
         import time
         start_time = time.time()
@@ -244,7 +298,7 @@ class OpenAIAnalysisService:
                 if result.confidence >= self.min_confidence_to_cache:
                     try:
                         await caching_service.cache_analysis_result(
-                            sanitized_text, 
+                            normalized, 
                             result, 
                             ttl=self.cache_ttl
                         )
@@ -409,50 +463,65 @@ class OpenAIAnalysisService:
         """
         Build the analysis prompt for OpenAI GPT-4.
         
+        Job text over the prompt budget is compressed first (see
+        PromptBudgeter); the prompt's token estimate is reported to the
+        metrics collector.
+        
         Args:
             job_text: The job advertisement text to analyze
             
         Returns:
             str: Formatted prompt for scam detection analysis
         """
+        budgeted = get_prompt_budgeter().fit(job_text)
+        if budgeted.compressed:
+            log_with_context(
+                logger,
+                logging.INFO,
+                "Job text compressed to fit the prompt budget",
+                original_tokens=budgeted.original_tokens,
+                tokens=budgeted.tokens,
+                duplicates_removed=budgeted.duplicates_removed,
+                footers_removed=budgeted.footers_removed,
+                segments_dropped=budgeted.segments_dropped,
+                correlation_id=get_correlation_id()
+            )
+        
+        prompt = self._format_analysis_prompt(budgeted.text)
+        get_metrics_collector().record_prompt_tokens(
+            "analysis",
+            count_tokens(ANALYSIS_SYSTEM_PROMPT) + count_tokens(prompt),
+            budgeted.original_tokens - budgeted.tokens
+        )
+        return prompt
+    
+    def _format_analysis_prompt(self, job_text: str) -> str:
+        """Format the analysis prompt around (budgeted) job text."""
         return f"""
 Analyze the following job advertisement for potential scam indicators and provide a structured assessment.
 
 JOB ADVERTISEMENT:
 {job_text}
 
-Please analyze this job posting and respond with a JSON object containing exactly these fields:
+Please analyze this job posting and respond with a JSON object containing exactly these fields, in this order:
 
 1. "trust_score": An integer from 0-100 (0 = definitely a scam, 100 = completely legitimate)
 2. "classification": One of exactly these three strings: "Legit", "Suspicious", or "Likely Scam"
-3. "reasons": An array of exactly 3 specific reasons supporting your classification
-4. "confidence": A decimal from 0.0-1.0 indicating your confidence in the analysis
-
-Consider these scam indicators:
-- Unrealistic salary promises or "get rich quick" schemes
-- Requests for upfront payments, fees, or personal financial information
-- Vague job descriptions or responsibilities
-- Poor grammar, spelling, or unprofessional communication
-- Pressure tactics or urgency without legitimate business reasons
-- Requests to work from home immediately without proper vetting
-- Contact information that seems unprofessional or suspicious
-- Company information that's hard to verify or doesn't exist
+3. "confidence": A decimal from 0.0-1.0 indicating your confidence in the analysis
+4. "reasons": An array of exactly 3 specific reasons supporting your classification
 
-Classification guidelines:
-- "Legit": 70-100 trust score, legitimate job posting with verifiable details
-- "Suspicious": 30-69 trust score, some red flags but could be legitimate
-- "Likely Scam": 0-29 trust score, multiple scam indicators present
+{SCAM_ANALYSIS_GUIDELINES}
 
 Respond ONLY with valid JSON in this exact format:
 {{
     "trust_score": 85,
     "classification": "Legit",
+    "confidence": 0.9,
     "reasons": [
         "Company has verifiable online presence and contact information",
         "Job description is detailed and matches industry standards",
         "Salary range is realistic for the position and location"
-    ],
-    "confidence": 0.9
+    ]
 }}
 """
     
@@ -483,43 +552,7 @@ Respond ONLY with valid JSON in this exact format:
             json_text = response_text[start_idx:end_idx]
             data = json.loads(json_text)
             
-            # Validate required fields
-            required_fields = ['trust_score', 'classification', 'reasons', 'confidence']
-            missing_fields = [field for field in required_fields if field not in data]
-            if missing_fields:
-                raise ValueError(f"Missing required fields: {missing_fields}")
-            
-            # Validate and convert classification
-            classification_str = data['classification']
-            try:
-                classification = JobClassification(classification_str)
-            except ValueError:
-                raise ValueError(f"Invalid classification: {classification_str}")
-            
-            # Validate trust score
-            trust_score = int(data['trust_score'])
-            if not (0 <= trust_score <= 100):
-                raise ValueError(f"Trust score must be 0-100, got: {trust_score}")
-            
-            # Validate reasons
-            reasons = data['reasons']
-            if not isinstance(reasons, list) or len(reasons) != 3:
-                raise ValueError("Reasons must be a list of exactly 3 items")
-            
-            if not all(isinstance(reason, str) and reason.strip() for reason in reasons):
-                raise ValueError("All reasons must be non-empty strings")
-            
-            # Validate confidence
-            confidence = float(data['confidence'])
-            if not (0.0 <= confidence <= 1.0):
-                raise ValueError(f"Confidence must be 0.0-1.0, got: {confidence}")
-            
-            return JobAnalysisResult(
-                trust_score=trust_score,
-                classification=classification,
-                reasons=reasons,
-                confidence=confidence
-            )
+            return self._result_from_data(data)
             
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse JSON response: {e}")
@@ -535,6 +568,57 @@ Respond ONLY with valid JSON in this exact format:
             logger.error(f"Unexpected error parsing response: {e}")
             raise Exception("Failed to process analysis results")
     
+    def _result_from_data(self, data: dict) -> JobAnalysisResult:
+        """
+        Validate a decoded analysis object and convert it to a result.
+        
+        Args:
+            data: Decoded JSON object with the analysis fields
+            
+        Returns:
+            JobAnalysisResult: Validated analysis result
+            
+        Raises:
+            ValueError: If a field is missing or out of range
+        """
+        # Validate required fields
+        required_fields = ['trust_score', 'classification', 'reasons', 'confidence']
+        missing_fields = [field for field in required_fields if field not in data]
+        if missing_fields:
+            raise ValueError(f"Missing required fields: {missing_fields}")
+        
+        # Validate and convert classification
+        classification_str = data['classification']
+        try:
+            classification = JobClassification(classification_str)
+        except ValueError:
+            raise ValueError(f"Invalid classification: {classification_str}")
+        
+        # Validate trust score
+        trust_score = int(data['trust_score'])
+        if not (0 <= trust_score <= 100):
+            raise ValueError(f"Trust score must be 0-100, got: {trust_score}")
+        
+        # Validate reasons
+        reasons = data['reasons']
+        if not isinstance(reasons, list) or len(reasons) != 3:
+            raise ValueError("Reasons must be a list of exactly 3 items")
+        
+        if not all(isinstance(reason, str) and reason.strip() for reason in reasons):
+            raise ValueError("All reasons must be non-empty strings")
+        
+        # Validate confidence
+        confidence = float(data['confidence'])
+        if not (0.0 <= confidence <= 1.0):
+            raise ValueError(f"Confidence must be 0.0-1.0, got: {confidence}")
+        
+        return JobAnalysisResult(
+            trust_score=trust_score,
+            classification=classification,
+            reasons=reasons,
+            confidence=confidence
+        )
+    
     async def health_check(self) -> dict:
         """
         Check the health of the OpenAI service.
@@ -0,0 +1,300 @@
+"""
+Adaptive client-side rate limiter for OpenAI API calls.
+
+This module provides the OpenAIRateLimiter class, a pair of token buckets
+(requests per minute and tokens per minute) that every completion request
+acquires from before it is sent. The buckets start from configured limits and
+then follow the API's own rate-limit response headers:
+
+- x-ratelimit-limit-* resize the buckets to the account's real limits
+- x-ratelimit-remaining-* pull the local levels down to what the server
+  reports, which accounts for other processes sharing the API key
+- a 429 (or an exhausted bucket) pauses all callers until the reset time
+  from retry-after or x-ratelimit-reset-*
+
+Like the API, the limiter charges a request its prompt estimate plus
+max_tokens up front; actual usage is only recorded for reporting, since the
+server does not refund unused completion tokens either.
+"""
+
+import asyncio
+import logging
+import math
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional
+
+from app.utils.logging import get_logger, log_with_context
+
+logger = get_logger(__name__)
+
+# "1s", "6m0s", "20ms", "1h2m3.5s" as sent in x-ratelimit-reset-* headers
+DURATION_PART_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+# Pause used after a 429 that carries no reset information
+DEFAULT_RATE_LIMIT_PAUSE = 1.0
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Parse an OpenAI reset duration header into seconds.
+
+    Args:
+        value: Header value such as "6m0s", "20ms" or "1.5" (plain seconds)
+
+    Returns:
+        Duration in seconds, or None if the value is missing or malformed
+    """
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+
+    parts = DURATION_PART_PATTERN.findall(value)
+    if not parts or "".join(number + unit for number, unit in parts) != value.strip():
+        return None
+    return sum(float(number) * DURATION_UNITS[unit] for number, unit in parts)
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of text (about four characters per token)."""
+    return math.ceil(len(text) / 4)
+
+
+def _header_int(headers: Mapping[str, str], name: str) -> Optional[int]:
+    """Read an integer header, ignoring missing or malformed values."""
+    try:
+        value = headers.get(name)
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class _Bucket:
+    """Token bucket refilled continuously at capacity per minute."""
+
+    __slots__ = ("capacity", "level", "updated_at")
+
+    def __init__(self, capacity: float, now: float):
+        self.capacity = capacity
+        self.level = capacity
+        self.updated_at = now
+
+    def refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated_at) * self.capacity / 60.0)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount (capped at capacity) is available."""
+        deficit = min(amount, self.capacity) - self.level
+        return max(0.0, deficit) * 60.0 / self.capacity
+
+    def take(self, amount: float):
+        self.level -= min(amount, self.capacity)
+
+
+@dataclass
+class OpenAIRateLimitConfig:
+    """Configuration for the OpenAI rate limiter."""
+    enabled: bool = True
+    requests_per_minute: int = 500  # used until the API reports its limits
+    tokens_per_minute: int = 30000
+
+
+class OpenAIRateLimiter:
+    """
+    Adaptive request and token buckets shared by all OpenAI callers.
+
+    Waiters are served in arrival order: one waiter at a time sleeps until both
+    buckets can cover its reservation, so a large batch request is not starved
+    by a stream of small ones.
+    """
+
+    def __init__(
+        self,
+        config: Optional[OpenAIRateLimitConfig] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep
+    ):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            config: Limiter configuration (loaded from environment if omitted)
+            clock: Monotonic time source (injectable for tests)
+            sleep: Async sleep function (injectable for tests)
+        """
+        self.config = config or self._load_config()
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = asyncio.Lock()
+
+        now = clock()
+        self.requests = _Bucket(float(self.config.requests_per_minute), now)
+        self.tokens = _Bucket(float(self.config.tokens_per_minute), now)
+        self._paused_until = 0.0
+
+        self.stats = {
+            'acquired': 0,
+            'tokens_reserved': 0,
+            'tokens_used': 0,
+            'waits': 0,
+            'wait_seconds': 0.0,
+            'rate_limited': 0
+        }
+
+    def _load_config(self) -> OpenAIRateLimitConfig:
+        """Load configuration from environment variables."""
+        config = OpenAIRateLimitConfig()
+        config.enabled = os.getenv('OPENAI_RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+        config.requests_per_minute = int(os.getenv('OPENAI_RATE_LIMIT_RPM', '500'))
+        config.tokens_per_minute = int(os.getenv('OPENAI_RATE_LIMIT_TPM', '30000'))
+        return config
+
+    async def acquire(self, tokens: int) -> float:
+        """
+        Wait until one request and tokens can be spent, then reserve them.
+
+        Args:
+            tokens: Estimated tokens of the request (prompt plus max_tokens)
+
+        Returns:
+            Seconds spent waiting
+        """
+        if not self.config.enabled:
+            return 0.0
+
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = self._clock()
+                self.requests.refill(now)
+                self.tokens.refill(now)
+                delay = max(
+                    self._paused_until - now,
+                    self.requests.wait_time(1),
+                    self.tokens.wait_time(tokens)
+                )
+                if delay <= 0:
+                    break
+                await self._sleep(delay)
+                waited += delay
+
+            self.requests.take(1)
+            self.tokens.take(tokens)
+
+        self.stats['acquired'] += 1
+        self.stats['tokens_reserved'] += tokens
+        if waited:
+            self.stats['waits'] += 1
+            self.stats['wait_seconds'] += waited
+        return waited
+
+    def record_usage(self, tokens: Optional[int]):
+        """
+        Record the tokens a completed request actually used.
+
+        Args:
+            tokens: Total tokens from the response usage (None if unknown)
+        """
+        if tokens is not None:
+            self.stats['tokens_used'] += tokens
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """
+        Adapt the buckets to the rate-limit headers of a response.
+
+        Args:
+            headers: Response headers (case-insensitive mapping or lowercase keys)
+        """
+        if not self.config.enabled:
+            return
+
+        now = self._clock()
+        for bucket, kind in ((self.requests, 'requests'), (self.tokens, 'tokens')):
+            limit = _header_int(headers, f'x-ratelimit-limit-{kind}')
+            if limit and limit != bucket.capacity:
+                bucket.refill(now)
+                bucket.capacity = float(limit)
+                bucket.level = min(bucket.level, bucket.capacity)
+
+            remaining = _header_int(headers, f'x-ratelimit-remaining-{kind}')
+            if remaining is not None:
+                bucket.refill(now)
+                bucket.level = min(bucket.level, float(remaining))
+                if remaining <= 0:
+                    reset = parse_reset_duration(headers.get(f'x-ratelimit-reset-{kind}'))
+                    if reset:
+                        self._paused_until = max(self._paused_until, now + reset)
+
+    def record_rate_limited(self, headers: Optional[Mapping[str, str]] = None):
+        """
+        Pause all callers after a 429 response.
+
+        Args:
+            headers: Headers of the 429 response, if available
+        """
+        if not self.config.enabled:
+            return
+
+        headers = headers or {}
+        now = self._clock()
+        pause = (
+            parse_reset_duration(headers.get('retry-after'))
+            or max(
+                parse_reset_duration(headers.get('x-ratelimit-reset-requests')) or 0.0,
+                parse_reset_duration(headers.get('x-ratelimit-reset-tokens')) or 0.0
+            )
+            or DEFAULT_RATE_LIMIT_PAUSE
+        )
+
+        self.requests.refill(now)
+        self.tokens.refill(now)
+        self.requests.level = min(self.requests.level, 0.0)
+        self.tokens.level = min(self.tokens.level, 0.0)
+        self._paused_until = max(self._paused_until, now + pause)
+        self.stats['rate_limited'] += 1
+
+        log_with_context(
+            logger,
+            logging.WARNING,
+            "OpenAI rate limit hit, pausing requests",
+            pause_seconds=pause
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get limiter statistics.
+
+        Returns:
+            Dictionary with current limits, levels and wait counters
+        """
+        now = self._clock()
+        self.requests.refill(now)
+        self.tokens.refill(now)
+        return {
+            'enabled': self.config.enabled,
+            'requests_per_minute': self.requests.capacity,
+            'tokens_per_minute': self.tokens.capacity,
+            'requests_available': self.requests.level,
+            'tokens_available': self.tokens.level,
+            'paused_for_seconds': max(0.0, self._paused_until - now),
+            **self.stats
+        }
+
+
+# Global OpenAI rate limiter instance
+_openai_rate_limiter: Optional[OpenAIRateLimiter] = None
+
+
+def get_openai_rate_limiter() -> OpenAIRateLimiter:
+    """Get global OpenAI rate limiter instance."""
+    global _openai_rate_limiter
+    if _openai_rate_limiter is None:
+        _openai_rate_limiter = OpenAIRateLimiter()
+    return _openai_rate_limiter
@@ -0,0 +1,209 @@
+"""
+Process-pool PDF text extraction engine.
+
+pdfplumber is pure Python, so extracting text in the default thread executor
+holds the GIL against the event loop and every other to_thread call, and a
+pathological document can keep a thread busy indefinitely. This module
+provides the PDFExtractionEngine class, which runs extraction in a
+dedicated pool of worker processes instead:
+
+- every job runs under a CPU time limit inside its worker, and the whole
+  document under a wall-clock timeout
+- documents with more pages than one job covers are fanned out over the
+  pool as page ranges, and the page texts are put back in order
+- workers are replaced after a configured number of jobs, so memory leaked
+  by pdfminer's caches cannot build up
+- extraction stops once char_budget characters of text are gathered: a
+  document whose first job fills the budget is not fanned out, and fanned
+  out jobs stop at the budget still missing
+
+Workers are recycled a pool at a time: once a pool has run max_workers *
+max_jobs_per_worker jobs it is retired, finishing the jobs it already has,
+and new jobs go to a fresh pool. ProcessPoolExecutor's own
+max_tasks_per_child can deadlock on Python 3.11 when jobs are queued while a
+worker exits. Workers are started with the spawn method and only import
+app.utils.pdf_text_extraction.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from app.utils.logging import get_logger, get_correlation_id, log_with_context
+from app.utils.pdf_text_extraction import PDFExtractionTimeoutError, extract_page_range, take_within_budget
+
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class PDFExtractionConfig:
+    """Configuration for PDF text extraction."""
+    process_pool: bool = False
+    max_workers: int = 2
+    max_jobs_per_worker: int = 50  # jobs before a worker is replaced
+    pages_per_job: int = 8  # larger documents are split into page ranges
+    cpu_time_limit: float = 10.0  # CPU seconds per job
+    timeout: float = 20.0  # wall-clock seconds per document
+    char_budget: int = 20000  # characters of text to extract, 0 for every page
+
+
+class PDFExtractionEngine:
+    """Extract PDF text in a recycled pool of worker processes."""
+
+    def __init__(self, config: Optional[PDFExtractionConfig] = None):
+        """
+        Initialize the extraction engine.
+
+        The worker pool is started on first use.
+
+        Args:
+            config: Extraction configuration (loaded from environment if omitted)
+        """
+        self.config = config or self._load_config()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_jobs = 0
+
+    def _load_config(self) -> PDFExtractionConfig:
+        """Load configuration from environment variables."""
+        config = PDFExtractionConfig()
+        config.process_pool = os.getenv('PDF_EXTRACTION_PROCESS_POOL', 'false').lower() == 'true'
+        config.max_workers = int(os.getenv('PDF_EXTRACTION_WORKERS', str(min(4, os.cpu_count() or 1))))
+        config.max_jobs_per_worker = int(os.getenv('PDF_EXTRACTION_MAX_JOBS_PER_WORKER', '50'))
+        config.pages_per_job = int(os.getenv('PDF_EXTRACTION_PAGES_PER_JOB', '8'))
+        config.cpu_time_limit = float(os.getenv('PDF_EXTRACTION_CPU_TIME_LIMIT', '10.0'))
+        config.timeout = float(os.getenv('PDF_EXTRACTION_TIMEOUT', '20.0'))
+        config.char_budget = int(os.getenv('PDF_EXTRACTION_CHAR_BUDGET', '20000'))
+        return config
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Get the worker pool, starting a new one if needed."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.config.max_workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            self._executor_jobs = 0
+            logger.info(f"PDF extraction pool started: {self.config.max_workers} workers")
+        return self._executor
+
+    def _submit(self, fn, *args) -> asyncio.Future:
+        """Submit a job, retiring the current pool once it has run its share of jobs."""
+        if self._executor is not None and \
+                self._executor_jobs >= self.config.max_workers * self.config.max_jobs_per_worker:
+            # Workers finish the jobs already queued and exit; new jobs go to a new pool
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        executor = self._get_executor()
+        self._executor_jobs += 1
+        return asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
+    async def start(self):
+        """Start the worker pool ahead of the first document."""
+        executor = self._get_executor()
+        loop = asyncio.get_running_loop()
+        # Spawned workers start on demand; one no-op job per worker starts them all
+        await asyncio.gather(*(
+            loop.run_in_executor(executor, os.getpid) for _ in range(self.config.max_workers)
+        ))
+
+    async def shutdown(self):
+        """Stop the worker pool."""
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+    async def extract_pages(self, pdf_content: bytes) -> List[str]:
+        """
+        Extract the text of a PDF's pages, up to the character budget.
+
+        The first job covers the first pages_per_job pages and reports the
+        page count; if it did not fill the budget, the remaining pages are
+        extracted in parallel ranges.
+
+        Args:
+            pdf_content: Raw PDF content as bytes
+
+        Returns:
+            List[str]: Raw text per extracted page, in page order
+
+        Raises:
+            PDFExtractionTimeoutError: If a job exceeds its CPU time limit or the
+                document exceeds the wall-clock timeout
+        """
+        deadline = time.monotonic() + self.config.timeout
+        pages_per_job = max(1, self.config.pages_per_job)
+        char_budget = self.config.char_budget
+
+        page_texts, page_count = await self._run_job(pdf_content, 0, pages_per_job, char_budget, deadline)
+        if page_count <= pages_per_job or len(page_texts) < pages_per_job:
+            return page_texts
+
+        if char_budget > 0:
+            # Any range may be the one that completes the budget
+            char_budget = max(1, char_budget - sum(len(page_text.strip()) for page_text in page_texts))
+        jobs = [
+            asyncio.ensure_future(self._run_job(pdf_content, start, start + pages_per_job, char_budget, deadline))
+            for start in range(pages_per_job, page_count, pages_per_job)
+        ]
+        log_with_context(
+            logger,
+            logging.DEBUG,
+            "Fanning out PDF extraction",
+            page_count=page_count,
+            jobs=len(jobs) + 1,
+            correlation_id=get_correlation_id()
+        )
+        try:
+            for texts, _ in await asyncio.gather(*jobs):
+                page_texts.extend(texts)
+        except BaseException:
+            for job in jobs:
+                job.cancel()
+            raise
+        return take_within_budget(page_texts, self.config.char_budget)
+
+    async def _run_job(self, pdf_content: bytes, start: int, end: int, char_budget: int,
+                       deadline: float) -> Tuple[List[str], int]:
+        """Run one page range job in the pool before the document's deadline."""
+        job = self._submit(extract_page_range, pdf_content, start, end, self.config.cpu_time_limit, char_budget)
+        executor = self._executor
+        try:
+            return await asyncio.wait_for(job, timeout=max(deadline - time.monotonic(), 0))
+        except asyncio.TimeoutError:
+            # A queued job is cancelled; a running one is ended by its CPU time limit
+            raise PDFExtractionTimeoutError(
+                f"PDF extraction exceeded its wall-clock timeout of {self.config.timeout}s"
+            )
+        except BrokenProcessPool:
+            # A worker died (e.g. out of memory); the next document gets a new pool
+            if self._executor is executor:
+                self._executor = None
+                executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+
+# Global PDF extraction engine instance
+_pdf_extraction_engine: Optional[PDFExtractionEngine] = None
+
+
+def get_pdf_extraction_engine() -> PDFExtractionEngine:
+    """Get global PDF extraction engine instance."""
+    global _pdf_extraction_engine
+    if _pdf_extraction_engine is None:
+        _pdf_extraction_engine = PDFExtractionEngine()
+    return _pdf_extraction_engine
+
+
+async def cleanup_pdf_extraction_engine():
+    """Stop the global PDF extraction engine's worker pool."""
+    global _pdf_extraction_engine
+    if _pdf_extraction_engine:
+        await _pdf_extraction_engine.shutdown()
+        _pdf_extraction_engine = None
@@ -3,24 +3,50 @@ PDF Processing Service for the Reality Checker WhatsApp bot.
 
 This module handles downloading PDF files from URLs and extracting text content
 for job ad analysis. Includes validation, error handling, and size limits.
+
+Downloads share one pooled HTTP/2 client per service, so repeated downloads
+from Twilio media hosts reuse connections instead of redoing TLS handshakes.
+Bodies are streamed into a spooled temporary file and aborted as soon as the
+size cap is crossed or the first bytes are not a PDF header, whatever the
+Content-Length header claims.
+
+Text extraction runs in the default thread executor, or in the process-pool
+PDFExtractionEngine when PDF_EXTRACTION_PROCESS_POOL is set. Both paths
+share the engine's wall-clock timeout and extract pages lazily, stopping
+once the engine's character budget of text has been gathered.
+
+Extracted text and analysis results are cached by the SHA-256 of the PDF
+bytes (see PDFResultCache), so a PDF forwarded by many users is extracted
+once and, once analyzed, not analyzed again.
 """
 
 import asyncio
 import logging
-from typing import Optional
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
 from io import BytesIO
 
 import httpx
 import pdfplumber
 from pdfplumber.pdf import PDF
 
-from app.models.data_models import AppConfig
+from app.models.data_models import AppConfig, JobAnalysisResult
+from app.services.pdf_extraction_engine import get_pdf_extraction_engine
+from app.services.pdf_result_cache import get_pdf_result_cache, pdf_content_digest
 from app.utils.logging import get_logger, get_correlation_id, log_with_context
+from app.utils.metrics import get_metrics_collector
+from app.utils.pdf_text_extraction import PDFExtractionTimeoutError, iter_page_texts, take_within_budget
 from app.utils.security import SecurityValidator
+from app.utils.text_normalization import NormalizedText, normalize_job_text
 
 
 logger = get_logger(__name__)
 
+PDF_MAGIC = b'%PDF-'
+
 
 class PDFProcessingError(Exception):
     """Base exception for PDF processing errors."""
@@ -42,6 +68,26 @@ class PDFValidationError(PDFProcessingError):
     pass
 
 
+@dataclass
+class PDFDownloadConfig:
+    """Configuration for the pooled PDF download client."""
+    http2: bool = True
+    max_connections: int = 20
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 60.0  # seconds an idle connection is kept
+    spool_max_memory: int = 1024 * 1024  # bytes held in memory before spilling to disk
+
+
+@dataclass
+class PDFDocument:
+    """A processed PDF: its validated text and, if it was seen before, its analysis."""
+    digest: str  # SHA-256 of the PDF bytes
+    size: int
+    text: NormalizedText
+    analysis_result: Optional[JobAnalysisResult] = None
+    cached: bool = False
+
+
 class PDFProcessingService:
     """
     Service for processing PDF files from WhatsApp media messages.
@@ -60,6 +106,44 @@ class PDFProcessingService:
         self.config = config
         self.max_size_bytes = config.max_pdf_size_mb * 1024 * 1024
         self.timeout = httpx.Timeout(30.0)  # 30 second timeout
+        self.download_config = self._load_download_config()
+        self._client: Optional[httpx.AsyncClient] = None
+        self.extraction_engine = get_pdf_extraction_engine()
+        self.result_cache = get_pdf_result_cache()
+    
+    def _load_download_config(self) -> PDFDownloadConfig:
+        """Load download client configuration from environment variables."""
+        download_config = PDFDownloadConfig()
+        download_config.http2 = os.getenv('PDF_DOWNLOAD_HTTP2', 'true').lower() == 'true'
+        download_config.max_connections = int(os.getenv('PDF_DOWNLOAD_MAX_CONNECTIONS', '20'))
+        download_config.max_keepalive_connections = int(os.getenv('PDF_DOWNLOAD_MAX_KEEPALIVE_CONNECTIONS', '20'))
+        download_config.spool_max_memory = int(os.getenv('PDF_DOWNLOAD_SPOOL_MAX_MEMORY_BYTES', str(1024 * 1024)))
+        return download_config
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the service's pooled download client, creating it on first use."""
+        if self._client is None:
+            limits = httpx.Limits(
+                max_connections=self.download_config.max_connections,
+                max_keepalive_connections=self.download_config.max_keepalive_connections,
+                keepalive_expiry=self.download_config.keepalive_expiry
+            )
+            try:
+                self._client = httpx.AsyncClient(
+                    timeout=self.timeout, follow_redirects=True, limits=limits,
+                    http2=self.download_config.http2
+                )
+            except ImportError:
+                # http2=True needs the h2 package (httpx[http2])
+                logger.warning("HTTP/2 support is not installed, downloading PDFs over HTTP/1.1")
+                self._client = httpx.AsyncClient(timeout=self.timeout, follow_redirects=True, limits=limits)
+        return self._client
+    
+    async def cleanup(self):
+        """Close the pooled download client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
         
     async def download_pdf(self, media_url: str) -> bytes:
         """
@@ -140,85 +224,41 @@ class PDFProcessingService:
                     correlation_id=correlation_id
                 )
             
-            async with httpx.AsyncClient(timeout=self.timeout, follow_redirects=True) as client:
-                # For Twilio CDN URLs, try without auth first, then with auth if it fails
-                if 'twiliocdn.com' in media_url.lower():
-                    try:
-                        # Try without authentication first for CDN URLs
-                        response = await client.get(media_url, headers=headers)
-                        response.raise_for_status()
-                    except httpx.HTTPStatusError as e:
-                        if e.response.status_code == 401 or e.response.status_code == 403:
-                            # If unauthorized, try with authentication
-                            log_with_context(
-                                logger,
-                                logging.DEBUG,
-                                "CDN URL requires authentication, retrying with auth",
-                                status_code=e.response.status_code,
-                                correlation_id=correlation_id
-                            )
-                            response = await client.get(media_url, auth=auth, headers=headers)
-                            response.raise_for_status()
-                        else:
-                            raise
-                else:
-                    # For API URLs, always use authentication
-                    response = await client.get(media_url, auth=auth, headers=headers)
-                    response.raise_for_status()
-                
-                # Check content length header if available
-                content_length = response.headers.get('content-length')
-                if content_length and int(content_length) > self.max_size_bytes:
-                    log_with_context(
-                        logger,
-                        logging.WARNING,
-                        "PDF file too large (content-length header)",
-                        content_length=int(content_length),
-                        max_size_bytes=self.max_size_bytes,
-                        correlation_id=correlation_id
-                    )
-                    raise PDFDownloadError(
-                        f"PDF file too large: {content_length} bytes "
-                        f"(max: {self.max_size_bytes} bytes)"
-                    )
-                
-                pdf_content = response.content
-                
-                # Check actual content size
-                if len(pdf_content) > self.max_size_bytes:
-                    log_with_context(
-                        logger,
-                        logging.WARNING,
-                        "PDF file too large (actual content)",
-                        actual_size=len(pdf_content),
-                        max_size_bytes=self.max_size_bytes,
-                        correlation_id=correlation_id
-                    )
-                    raise PDFDownloadError(
-                        f"PDF file too large: {len(pdf_content)} bytes "
-                        f"(max: {self.max_size_bytes} bytes)"
-                    )
-                
-                # Basic PDF header validation
-                if not pdf_content.startswith(b'%PDF-'):
-                    log_with_context(
-                        logger,
-                        logging.WARNING,
-                        "Downloaded file is not a valid PDF",
-                        file_header=pdf_content[:20].hex() if len(pdf_content) >= 20 else pdf_content.hex(),
-                        correlation_id=correlation_id
-                    )
-                    raise PDFDownloadError("Downloaded file is not a valid PDF")
-                
-                log_with_context(
-                    logger,
-                    logging.INFO,
-                    "Successfully downloaded PDF",
-                    file_size=len(pdf_content),
-                    correlation_id=correlation_id
-                )
-                return pdf_content
+            client = self._get_client()
+            
+            # For Twilio CDN URLs, try without auth first, then with auth if it fails
+            if 'twiliocdn.com' in media_url.lower():
+                try:
+                    # Try without authentication first for CDN URLs
+                    pdf_content = await self._stream_pdf(client, media_url, None, headers)
+                except httpx.HTTPStatusError as e:
+                    if e.response.status_code == 401 or e.response.status_code == 403:
+                        # If unauthorized, try with authentication
+                        log_with_context(
+                            logger,
+                            logging.DEBUG,
+                            "CDN URL requires authentication, retrying with auth",
+                            status_code=e.response.status_code,
+                            correlation_id=correlation_id
+                        )
+                        pdf_content = await self._stream_pdf(client, media_url, auth, headers)
+                    else:
+                        raise
+            else:
+                # For API URLs, always use authentication
+                pdf_content = await self._stream_pdf(client, media_url, auth, headers)
+            
+            log_with_context(
+                logger,
+                logging.INFO,
+                "Successfully downloaded PDF",
+                file_size=len(pdf_content),
+                correlation_id=correlation_id
+            )
+            return pdf_content
                 
+        except PDFDownloadError:
+            raise
         except httpx.HTTPStatusError as e:
             log_with_context(
                 logger,
@@ -302,6 +342,97 @@ class PDFProcessingService:
             )
             raise PDFDownloadError(f"Unexpected error downloading PDF: {e}")
     
+    async def _stream_pdf(self, client: httpx.AsyncClient, media_url: str,
+                          auth: Optional[httpx.Auth], headers: Dict[str, str]) -> bytes:
+        """
+        Stream a PDF body into a spooled buffer, enforcing the size cap and header.
+        
+        The download is aborted as soon as more than max_size_bytes arrive or
+        the first bytes are not a PDF header, so an oversized or wrong file
+        is never fully buffered even when Content-Length is missing or wrong.
+        
+        Args:
+            client: Pooled HTTP client
+            media_url: URL to download the PDF from
+            auth: Authentication for the request, if any
+            headers: Request headers
+            
+        Returns:
+            bytes: Raw PDF content
+            
+        Raises:
+            httpx.HTTPStatusError: If the server returns an error status
+            PDFDownloadError: If the file is too large or not a PDF
+        """
+        correlation_id = get_correlation_id()
+        
+        async with client.stream("GET", media_url, auth=auth, headers=headers) as response:
+            if response.is_error:
+                # Error bodies are small; read them so the error handler can log them
+                await response.aread()
+            response.raise_for_status()
+            
+            # Check content length header if available
+            content_length = response.headers.get('content-length')
+            if content_length and int(content_length) > self.max_size_bytes:
+                log_with_context(
+                    logger,
+                    logging.WARNING,
+                    "PDF file too large (content-length header)",
+                    content_length=int(content_length),
+                    max_size_bytes=self.max_size_bytes,
+                    correlation_id=correlation_id
+                )
+                raise PDFDownloadError(
+                    f"PDF file too large: {content_length} bytes "
+                    f"(max: {self.max_size_bytes} bytes)"
+                )
+            
+            with tempfile.SpooledTemporaryFile(max_size=self.download_config.spool_max_memory) as spool:
+                size = 0
+                file_header = b''
+                async for chunk in response.aiter_bytes():
+                    size += len(chunk)
+                    # Check actual content size as it arrives
+                    if size > self.max_size_bytes:
+                        log_with_context(
+                            logger,
+                            logging.WARNING,
+                            "PDF file too large (actual content)",
+                            bytes_received=size,
+                            max_size_bytes=self.max_size_bytes,
+                            correlation_id=correlation_id
+                        )
+                        raise PDFDownloadError(
+                            f"PDF file too large: more than {self.max_size_bytes} bytes "
+                            f"(max: {self.max_size_bytes} bytes)"
+                        )
+                    
+                    # Basic PDF header validation on the first bytes
+                    if len(file_header) < 20:
+                        file_header += chunk[:20 - len(file_header)]
+                        if len(file_header) >= len(PDF_MAGIC) and not file_header.startswith(PDF_MAGIC):
+                            self._reject_non_pdf(file_header)
+                    
+                    spool.write(chunk)
+                
+                if not file_header.startswith(PDF_MAGIC):
+                    self._reject_non_pdf(file_header)
+                
+                spool.seek(0)
+                return spool.read()
+    
+    def _reject_non_pdf(self, file_header: bytes):
+        """Log and raise for a download that does not start with a PDF header."""
+        log_with_context(
+            logger,
+            logging.WARNING,
+            "Downloaded file is not a valid PDF",
+            file_header=file_header.hex(),
+            correlation_id=get_correlation_id()
+        )
+        raise PDFDownloadError("Downloaded file is not a valid PDF")
+    
     async def extract_text(self, pdf_content: bytes) -> str:
         """
         Extract text content from PDF bytes.
@@ -328,21 +459,49 @@ class PDFProcessingService:
             correlation_id=correlation_id
         )
         
+        engine = "process" if self.extraction_engine.config.process_pool else "thread"
+        started = time.perf_counter()
         try:
-            # Run PDF processing in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            text = await loop.run_in_executor(None, self._extract_text_sync, pdf_content)
+            if engine == "process":
+                page_texts = await self.extraction_engine.extract_pages(pdf_content)
+                if not page_texts:
+                    raise PDFExtractionError("PDF contains no pages")
+                text = self._join_page_texts(page_texts)
+            else:
+                # Run PDF processing in thread pool to avoid blocking; a thread
+                # that outlives the timeout is abandoned, not stopped
+                loop = asyncio.get_event_loop()
+                text = await asyncio.wait_for(
+                    loop.run_in_executor(None, self._extract_text_sync, pdf_content),
+                    timeout=self.extraction_engine.config.timeout
+                )
             
+            get_metrics_collector().record_pdf_extraction(engine, "success", time.perf_counter() - started)
             log_with_context(
                 logger,
                 logging.INFO,
                 "Successfully extracted text from PDF",
                 text_length=len(text),
+                engine=engine,
                 correlation_id=correlation_id
             )
             return text
             
+        except (PDFExtractionTimeoutError, asyncio.TimeoutError) as e:
+            get_metrics_collector().record_pdf_extraction(engine, "timeout", time.perf_counter() - started)
+            log_with_context(
+                logger,
+                logging.ERROR,
+                "PDF text extraction timed out",
+                error=str(e),
+                engine=engine,
+                pdf_size=len(pdf_content),
+                correlation_id=correlation_id
+            )
+            raise PDFExtractionError("PDF text extraction timed out")
+            
         except Exception as e:
+            get_metrics_collector().record_pdf_extraction(engine, "failed", time.perf_counter() - started)
             log_with_context(
                 logger,
                 logging.ERROR,
@@ -357,6 +516,8 @@ class PDFProcessingService:
         """
         Synchronous text extraction from PDF content.
         
+        Pages are extracted until the engine's character budget is reached.
+        
         Args:
             pdf_content: Raw PDF content as bytes
             
@@ -364,22 +525,35 @@ class PDFProcessingService:
             str: Extracted text content
         """
         pdf_buffer = BytesIO(pdf_content)
-        text_parts = []
+        char_budget = self.extraction_engine.config.char_budget
         
         with pdfplumber.open(pdf_buffer) as pdf:
             if not pdf.pages:
                 raise PDFExtractionError("PDF contains no pages")
-                
-            for page_num, page in enumerate(pdf.pages, 1):
-                try:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_parts.append(page_text.strip())
-                    logger.debug(f"Extracted text from page {page_num}: {len(page_text or '')} chars")
-                except Exception as e:
-                    logger.warning(f"Failed to extract text from page {page_num}: {e}")
-                    continue
+            
+            page_texts = take_within_budget(iter_page_texts(pdf), char_budget)
+            if len(page_texts) < len(pdf.pages):
+                logger.debug(
+                    f"Stopped PDF extraction after {len(page_texts)} of {len(pdf.pages)} pages: "
+                    f"{char_budget} char budget reached"
+                )
         
+        return self._join_page_texts(page_texts)
+    
+    def _join_page_texts(self, page_texts: List[Optional[str]]) -> str:
+        """
+        Join per-page text into the document text.
+        
+        Args:
+            page_texts: Raw text per page, in page order
+            
+        Returns:
+            str: Text of the pages with text, separated by blank lines
+            
+        Raises:
+            PDFExtractionError: If no page has any text
+        """
+        text_parts = [page_text.strip() for page_text in page_texts if page_text]
         full_text = '\n\n'.join(text_parts)
         
         if not full_text.strip():
@@ -466,6 +640,22 @@ class PDFProcessingService:
         Returns:
             str: Validated text content ready for analysis
             
+        Raises:
+            PDFProcessingError: If any step of the processing fails
+        """
+        document = await self.load_pdf_url(media_url)
+        return document.text.original
+    
+    async def load_pdf_url(self, media_url: str) -> PDFDocument:
+        """
+        Download a PDF and get its validated text, from the cache if it was seen before.
+        
+        Args:
+            media_url: URL to download the PDF from
+            
+        Returns:
+            PDFDocument: Content digest, text and any cached analysis result
+            
         Raises:
             PDFProcessingError: If any step of the processing fails
         """
@@ -475,14 +665,10 @@ class PDFProcessingService:
             # Download PDF content
             pdf_content = await self.download_pdf(media_url)
             
-            # Extract text from PDF
-            text_content = await self.extract_text(pdf_content)
-            
-            # Validate extracted content
-            self.validate_pdf_content(text_content)
+            document = await self.load_pdf_content(pdf_content)
             
             logger.info("PDF processing completed successfully")
-            return text_content
+            return document
             
         except PDFProcessingError:
             # Re-raise PDF processing errors as-is
@@ -491,6 +677,56 @@ class PDFProcessingService:
             logger.error(f"Unexpected error in PDF processing: {e}")
             raise PDFProcessingError(f"PDF processing failed: {e}")
     
+    async def load_pdf_content(self, pdf_content: bytes) -> PDFDocument:
+        """
+        Get the validated text of PDF bytes, extracting it only on a cache miss.
+        
+        Args:
+            pdf_content: Raw PDF content as bytes
+            
+        Returns:
+            PDFDocument: Content digest, text and any cached analysis result
+            
+        Raises:
+            PDFExtractionError: If text extraction fails
+            PDFValidationError: If the text is not sufficient for analysis
+        """
+        digest = pdf_content_digest(pdf_content)
+        cached = await self.result_cache.lookup(digest, len(pdf_content))
+        if cached is not None:
+            log_with_context(
+                logger,
+                logging.INFO,
+                "Reusing cached PDF text",
+                pdf_size=len(pdf_content),
+                has_analysis_result=cached.result is not None,
+                correlation_id=get_correlation_id()
+            )
+            return PDFDocument(digest, len(pdf_content), cached.text, cached.result, cached=True)
+        
+        # Extract text from PDF
+        text_content = await self.extract_text(pdf_content)
+        
+        # Validate extracted content
+        self.validate_pdf_content(text_content)
+        
+        text = normalize_job_text(text_content)
+        await self.result_cache.store_text(digest, text)
+        return PDFDocument(digest, len(pdf_content), text)
+    
+    async def cache_analysis_result(self, document: PDFDocument, result: JobAnalysisResult) -> bool:
+        """
+        Cache the analysis of a PDF so the next copy of it is not analyzed again.
+        
+        Args:
+            document: Processed PDF
+            result: Analysis result for its text
+            
+        Returns:
+            bool: True if the result was cached
+        """
+        return await self.result_cache.store_result(document.digest, result)
+    
     async def process_pdf_bytes(self, pdf_content: bytes, filename: str = "upload.pdf") -> str:
         """
         Process PDF content from bytes (for web uploads).
@@ -528,11 +764,8 @@ class PDFProcessingService:
             if not pdf_content.startswith(b'%PDF-'):
                 raise PDFValidationError("Uploaded file is not a valid PDF")
             
-            # Extract text from PDF
-            text_content = await self.extract_text(pdf_content)
-            
-            # Validate extracted content
-            self.validate_pdf_content(text_content)
+            document = await self.load_pdf_content(pdf_content)
+            text_content = document.text.original
             
             log_with_context(
                 logger,
@@ -0,0 +1,367 @@
+"""
+Content-addressed cache of PDF extraction and analysis results.
+
+The same scam PDF is forwarded to many WhatsApp users, and each copy used to
+be parsed by pdfplumber and analyzed from scratch. This module provides the
+PDFResultCache class, which keys both results on the SHA-256 of the PDF
+bytes, so a repeated document skips extraction and, once analyzed, the
+analysis as well:
+
+- the extracted text, with its canonical form and digest, so the analysis
+  does not normalize it again
+- the final JobAnalysisResult, if it was confident enough to reuse
+
+Entries are stored in Redis, shared by all workers, and written through to
+a bounded SQLite file. The file is read when Redis is unavailable or misses,
+so repeated PDFs keep hitting during a Redis outage and after a restart.
+Twilio media URLs are unique per message, so the PDF is still downloaded;
+the digest is taken from the downloaded bytes.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from app.models.data_models import JobAnalysisResult, JobClassification
+from app.services.redis_connection_manager import get_redis_manager
+from app.utils.logging import get_logger
+from app.utils.text_normalization import NormalizedText
+
+logger = get_logger(__name__)
+
+
+def pdf_content_digest(pdf_content: bytes) -> str:
+    """Get the SHA-256 hex digest of PDF bytes."""
+    return hashlib.sha256(pdf_content).hexdigest()
+
+
+@dataclass
+class PDFResultCacheConfig:
+    """Configuration for the PDF result cache."""
+    enabled: bool = True
+    text_ttl: int = 604800  # seconds; extracted text never goes stale
+    result_ttl: int = 86400  # seconds
+    min_confidence: float = 0.7  # results below this are not reused
+    disk_path: Optional[str] = 'data/pdf_result_cache.db'
+    disk_max_entries: int = 10000
+    key_prefix: str = "pdf"
+
+
+@dataclass
+class CachedPDF:
+    """Cached results for one PDF."""
+    text: NormalizedText
+    result: Optional[JobAnalysisResult] = None
+
+
+class PDFResultCache:
+    """
+    Cache of extracted text and analysis results keyed by PDF content digest.
+
+    The text and the result are separate keys with their own TTLs, read in
+    one MGET. The SQLite file keeps one row per digest and is trimmed to
+    disk_max_entries, least recently used first.
+    """
+
+    def __init__(self, config: Optional[PDFResultCacheConfig] = None):
+        """
+        Initialize the PDF result cache.
+
+        The SQLite file is opened on first use.
+
+        Args:
+            config: Cache configuration (loaded from environment if omitted)
+        """
+        self.config = config or self._load_config()
+        self.redis_manager = get_redis_manager()
+
+        self._disk: Optional[sqlite3.Connection] = None
+        self._disk_lock = threading.Lock()
+        self._disk_failed = False
+
+        self.stats = {
+            'lookups': 0,
+            'text_hits': 0,
+            'result_hits': 0,
+            'misses': 0,
+            'disk_hits': 0,
+            'bytes_saved': 0,
+            'text_stores': 0,
+            'result_stores': 0,
+            'skipped_low_confidence': 0,
+            'errors': 0
+        }
+
+    def _load_config(self) -> PDFResultCacheConfig:
+        """Load configuration from environment variables."""
+        config = PDFResultCacheConfig()
+        config.enabled = os.getenv('PDF_RESULT_CACHE_ENABLED', 'true').lower() == 'true'
+        config.text_ttl = int(os.getenv('PDF_RESULT_CACHE_TEXT_TTL', '604800'))
+        config.result_ttl = int(os.getenv('PDF_RESULT_CACHE_RESULT_TTL', '86400'))
+        config.min_confidence = float(os.getenv('PDF_RESULT_CACHE_MIN_CONFIDENCE', '0.7'))
+        config.disk_path = os.getenv('PDF_RESULT_CACHE_DISK_PATH', 'data/pdf_result_cache.db') or None
+        config.disk_max_entries = int(os.getenv('PDF_RESULT_CACHE_DISK_MAX_ENTRIES', '10000'))
+        return config
+
+    def _keys(self, digest: str) -> Tuple[str, str]:
+        return f"{self.config.key_prefix}:text:{digest}", f"{self.config.key_prefix}:result:{digest}"
+
+    async def lookup(self, digest: str, pdf_size: int) -> Optional[CachedPDF]:
+        """
+        Look up the cached results for a PDF.
+
+        Args:
+            digest: SHA-256 hex digest of the PDF bytes
+            pdf_size: Size of the PDF in bytes, counted as saved on a hit
+
+        Returns:
+            CachedPDF with the text and, if cached, the analysis result, or None
+        """
+        if not self.config.enabled:
+            return None
+        self.stats['lookups'] += 1
+
+        entry = await self._redis_lookup(digest)
+        if entry is None and self.config.disk_path:
+            entry = await asyncio.to_thread(self._disk_lookup, digest)
+            if entry is not None:
+                self.stats['disk_hits'] += 1
+
+        if entry is None:
+            self.stats['misses'] += 1
+            return None
+
+        self.stats['text_hits'] += 1
+        if entry.result is not None:
+            self.stats['result_hits'] += 1
+        self.stats['bytes_saved'] += pdf_size
+        return entry
+
+    async def store_text(self, digest: str, text: NormalizedText) -> bool:
+        """
+        Cache the extracted text of a PDF.
+
+        Args:
+            digest: SHA-256 hex digest of the PDF bytes
+            text: Extracted text with its canonical form
+
+        Returns:
+            True if the text was stored in Redis or on disk
+        """
+        if not self.config.enabled:
+            return False
+
+        record = json.dumps({'original': text.original, 'canonical': text.canonical, 'digest': text.digest})
+        text_key, _ = self._keys(digest)
+        stored = await self._redis_set(text_key, self.config.text_ttl, record)
+        if self.config.disk_path:
+            stored = await asyncio.to_thread(self._disk_store, digest, 'text', record, self.config.text_ttl) or stored
+
+        if stored:
+            self.stats['text_stores'] += 1
+        return stored
+
+    async def store_result(self, digest: str, result: JobAnalysisResult) -> bool:
+        """
+        Cache the analysis result of a PDF whose text is cached.
+
+        Args:
+            digest: SHA-256 hex digest of the PDF bytes
+            result: Analysis result
+
+        Returns:
+            True if the result was stored in Redis or on disk
+        """
+        if not self.config.enabled:
+            return False
+        if result.confidence < self.config.min_confidence:
+            self.stats['skipped_low_confidence'] += 1
+            return False
+
+        record = json.dumps({
+            'trust_score': result.trust_score,
+            'classification': result.classification.value,
+            'reasons': result.reasons,
+            'confidence': result.confidence,
+            'cached_at': datetime.utcnow().isoformat()
+        })
+        _, result_key = self._keys(digest)
+        stored = await self._redis_set(result_key, self.config.result_ttl, record)
+        if self.config.disk_path:
+            stored = await asyncio.to_thread(self._disk_store, digest, 'result', record, self.config.result_ttl) or stored
+
+        if stored:
+            self.stats['result_stores'] += 1
+        return stored
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hit counters, hit rates and PDF bytes not re-parsed
+        """
+        stats = dict(self.stats)
+        stats['hit_rate'] = stats['text_hits'] / stats['lookups'] if stats['lookups'] else 0.0
+        stats['result_hit_rate'] = stats['result_hits'] / stats['lookups'] if stats['lookups'] else 0.0
+        stats['enabled'] = self.config.enabled
+        stats['disk_enabled'] = bool(self.config.disk_path) and not self._disk_failed
+        return stats
+
+    def close(self):
+        """Close the SQLite file."""
+        with self._disk_lock:
+            if self._disk is not None:
+                self._disk.close()
+                self._disk = None
+
+    async def _redis_lookup(self, digest: str) -> Optional[CachedPDF]:
+        """Read the text and result keys in one round trip."""
+        if not self.redis_manager.is_available():
+            return None
+        try:
+            values = await self.redis_manager.execute_command("mget", *self._keys(digest))
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.warning(f"PDF result cache Redis lookup failed: {e}")
+            return None
+        if not values or values[0] is None:
+            return None
+        return self._decode(values[0], values[1])
+
+    async def _redis_set(self, key: str, ttl: int, record: str) -> bool:
+        if not self.redis_manager.is_available():
+            return False
+        try:
+            return await self.redis_manager.execute_command("setex", key, ttl, record) is not None
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.warning(f"PDF result cache Redis write failed: {e}")
+            return False
+
+    def _decode(self, text_record, result_record) -> Optional[CachedPDF]:
+        """Build a CachedPDF from stored records, dropping a corrupt result."""
+        try:
+            text = NormalizedText(**json.loads(text_record))
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.warning(f"Ignoring corrupt cached PDF text: {e}")
+            return None
+
+        result = None
+        if result_record is not None:
+            try:
+                data = json.loads(result_record)
+                result = JobAnalysisResult(
+                    trust_score=data['trust_score'],
+                    classification=JobClassification(data['classification']),
+                    reasons=data['reasons'],
+                    confidence=data['confidence']
+                )
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.warning(f"Ignoring corrupt cached PDF analysis result: {e}")
+        return CachedPDF(text=text, result=result)
+
+    def _open_disk(self) -> Optional[sqlite3.Connection]:
+        """Open the SQLite file on first use; called with the disk lock held."""
+        if self._disk is None and not self._disk_failed:
+            try:
+                directory = os.path.dirname(self.config.disk_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._disk = sqlite3.connect(self.config.disk_path, check_same_thread=False, isolation_level=None)
+                self._disk.execute("PRAGMA journal_mode=WAL")
+                self._disk.execute("PRAGMA synchronous=NORMAL")
+                self._disk.execute(
+                    "CREATE TABLE IF NOT EXISTS pdf_results ("
+                    "digest TEXT PRIMARY KEY, "
+                    "text TEXT, "
+                    "text_expires_at REAL, "
+                    "result TEXT, "
+                    "result_expires_at REAL, "
+                    "accessed_at REAL NOT NULL)"
+                )
+                self._disk.execute("CREATE INDEX IF NOT EXISTS pdf_results_accessed ON pdf_results (accessed_at)")
+            except sqlite3.Error as e:
+                # Keep serving from Redis rather than retrying the file on every PDF
+                self._disk_failed = True
+                self._disk = None
+                logger.warning(f"PDF result cache file {self.config.disk_path} unavailable: {e}")
+        return self._disk
+
+    def _disk_lookup(self, digest: str) -> Optional[CachedPDF]:
+        """Read an unexpired entry from the SQLite file and mark it used."""
+        now = time.time()
+        with self._disk_lock:
+            disk = self._open_disk()
+            if disk is None:
+                return None
+            try:
+                row = disk.execute(
+                    "SELECT text, text_expires_at, result, result_expires_at FROM pdf_results WHERE digest = ?",
+                    (digest,)
+                ).fetchone()
+                if row is None or row[0] is None or row[1] <= now:
+                    return None
+                disk.execute("UPDATE pdf_results SET accessed_at = ? WHERE digest = ?", (now, digest))
+            except sqlite3.Error as e:
+                self.stats['errors'] += 1
+                logger.warning(f"PDF result cache file lookup failed: {e}")
+                return None
+
+        text, _, result, result_expires_at = row
+        return self._decode(text, result if result is not None and result_expires_at > now else None)
+
+    def _disk_store(self, digest: str, column: str, record: str, ttl: int) -> bool:
+        """Write the text or result column of an entry and trim the file."""
+        now = time.time()
+        with self._disk_lock:
+            disk = self._open_disk()
+            if disk is None:
+                return False
+            try:
+                disk.execute(
+                    f"INSERT INTO pdf_results (digest, {column}, {column}_expires_at, accessed_at) "
+                    f"VALUES (?, ?, ?, ?) ON CONFLICT (digest) DO UPDATE SET "
+                    f"{column} = excluded.{column}, {column}_expires_at = excluded.{column}_expires_at, "
+                    f"accessed_at = excluded.accessed_at",
+                    (digest, record, now + ttl, now)
+                )
+                disk.execute(
+                    "DELETE FROM pdf_results WHERE digest IN ("
+                    "SELECT digest FROM pdf_results ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.config.disk_max_entries,)
+                )
+                return True
+            except sqlite3.Error as e:
+                self.stats['errors'] += 1
+                logger.warning(f"PDF result cache file write failed: {e}")
+                return False
+
+
+# Global PDF result cache instance
+_pdf_result_cache: Optional[PDFResultCache] = None
+
+
+def get_pdf_result_cache() -> PDFResultCache:
+    """Get global PDF result cache instance."""
+    global _pdf_result_cache
+    if _pdf_result_cache is None:
+        _pdf_result_cache = PDFResultCache()
+    return _pdf_result_cache
+
+
+async def cleanup_pdf_result_cache():
+    """Close the global PDF result cache's SQLite file."""
+    global _pdf_result_cache
+    if _pdf_result_cache:
+        _pdf_result_cache.close()
+        _pdf_result_cache = None
@@ -0,0 +1,272 @@
+"""
+Token budgeting for job text in analysis prompts.
+
+Long ads, and PDF text in particular, used to be forwarded to the model
+verbatim, so prompt tokens and latency grew with the input. This module
+provides the PromptBudgeter class, which fits job text into a token budget
+before build_analysis_prompt formats it. Text within the budget is returned
+unchanged. Longer text is reduced in stages, stopping as soon as it fits:
+
+1. repeated segments (page headers, footers and boilerplate repeated through
+   extracted PDFs) are kept only once
+2. legal footers (copyright, privacy, equal-opportunity and e-mail
+   disclaimers) are dropped unless they mention payment or pay
+3. the remaining segments are ranked by signal (salary, contact and payment
+   details score highest, then urgency and the opening lines that name the
+   role and company) and the best ones are kept, in their original order,
+   with "[...]" marking each gap
+
+Tokens are counted with count_tokens, a local estimate of the model
+tokenizer that needs no network or extra dependency.
+"""
+
+import os
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Set
+
+from app.utils.text_normalization import canonicalize
+
+# Words, up-to-three-digit number groups, punctuation and line breaks,
+# the units the model tokenizer mostly splits on
+TOKEN_PIECE_PATTERN = re.compile(r"[A-Za-z]+|\d{1,3}|[^\W\d_A-Za-z]+|[^\w\s]|_|\n+")
+
+# Long lines (typical of PDF extraction) are split into sentences, then words
+SENTENCE_BREAK_PATTERN = re.compile(r"(?<=[.!?;])\s+")
+MAX_SEGMENT_TOKENS = 120
+
+GAP_MARKER = "[...]"
+
+LEGAL_FOOTER_PATTERN = re.compile(
+    r"all rights reserved|©|\(c\)\s*\d{4}|copyright|privacy (?:policy|notice|statement)"
+    r"|terms (?:and|&) conditions|terms of (?:use|service)|cookie (?:policy|settings)|unsubscribe"
+    r"|equal (?:opportunity|employment)|without regard to|reasonable accommodation|e-verify"
+    r"|disclaimer|(?:message|e-?mail)[^.]{0,40}(?:confidential|intended (?:only )?for)"
+)
+
+# (pattern, weight): payment requests are the strongest scam signal, then the
+# pay being offered and how to get in touch. The first OFFER_SIGNALS patterns
+# keep a segment even when it reads like a legal footer
+OFFER_SIGNALS = 2
+SIGNAL_PATTERNS = (
+    (re.compile(
+        r"\bfees?\b|deposit|upfront|up-front|wire\b|transfer|gift ?cards?|bitcoin|crypto|western union"
+        r"|money ?gram|money order|cheque|\bchecks?\b|bank|invest|starter kit|pay (?:for|us|a)|refund"
+    ), 4.0),
+    (re.compile(
+        r"[$€£₹]|salary|\bpay\b|paid|wage|earn|income|commission|bonus|compensation|stipend"
+        r"|per (?:hour|day|week|month|year|annum)|/(?:hr|hour|day|wk|week|month|year)\b|\d+k\b"
+    ), 3.0),
+    (re.compile(
+        r"@|https?://|www\.|whatsapp|telegram|signal|wechat|\bcall\b|phone|\btext\b|contact|e-?mail"
+        r"|apply|\bdm\b|message (?:me|us)|reach (?:me|us)|\+?\d[\d ().-]{6,}\d"
+    ), 3.0),
+    (re.compile(r"urgent|immediate|asap|today|\bnow\b|hurry|limited|guarantee|no experience"), 1.0),
+)
+# The opening segments usually name the role and the company
+LEADING_SEGMENTS = 3
+LEADING_SEGMENT_WEIGHT = 2.0
+
+
+def count_tokens(text: str) -> int:
+    """
+    Estimate how many model tokens text will use.
+
+    ASCII words of up to eight letters count as one token and longer ones as
+    one per eight letters; digits count per group of three, punctuation per
+    character and line breaks per run. Other scripts count per character.
+
+    Args:
+        text: Text to count
+
+    Returns:
+        Estimated token count
+    """
+    tokens = 0
+    for piece in TOKEN_PIECE_PATTERN.findall(text):
+        if piece[0].isascii() and piece[0].isalpha():
+            tokens += (len(piece) + 7) // 8
+        elif piece[0].isalpha():
+            tokens += len(piece)
+        else:
+            tokens += 1
+    return tokens
+
+
+@dataclass
+class PromptBudgetConfig:
+    """Configuration for job text token budgeting."""
+    enabled: bool = True
+    job_text_token_budget: int = 1500
+
+
+@dataclass
+class BudgetedText:
+    """Job text fitted to the prompt budget."""
+    text: str
+    original_tokens: int
+    tokens: int
+    duplicates_removed: int = 0
+    footers_removed: int = 0
+    segments_dropped: int = 0
+
+    @property
+    def compressed(self) -> bool:
+        """Whether the text was changed to fit the budget."""
+        return self.tokens < self.original_tokens
+
+
+@dataclass
+class _Segment:
+    index: int
+    text: str
+    tokens: int
+    score: float = 0.0
+
+
+class PromptBudgeter:
+    """Fit job text into a token budget, keeping its highest-signal segments."""
+
+    def __init__(self, config: Optional[PromptBudgetConfig] = None):
+        """
+        Initialize the budgeter.
+
+        Args:
+            config: Budget configuration (loaded from environment if omitted)
+        """
+        self.config = config or self._load_config()
+
+    def _load_config(self) -> PromptBudgetConfig:
+        """Load configuration from environment variables."""
+        config = PromptBudgetConfig()
+        config.enabled = os.getenv('PROMPT_BUDGET_ENABLED', 'true').lower() == 'true'
+        config.job_text_token_budget = int(os.getenv('PROMPT_JOB_TEXT_TOKEN_BUDGET', '1500'))
+        return config
+
+    def fit(self, text: str) -> BudgetedText:
+        """
+        Fit job text into the configured token budget.
+
+        Args:
+            text: Job advertisement text
+
+        Returns:
+            BudgetedText with the text to prompt with and its token counts
+        """
+        original_tokens = count_tokens(text)
+        budget = self.config.job_text_token_budget
+        if not self.config.enabled or original_tokens <= budget:
+            return BudgetedText(text, original_tokens, original_tokens)
+
+        segments = self._segment(text)
+        result = BudgetedText(text, original_tokens, original_tokens)
+
+        # 1. Repeated boilerplate
+        seen: Set[str] = set()
+        unique = []
+        for segment in segments:
+            key = canonicalize(segment.text)
+            if key in seen:
+                continue
+            seen.add(key)
+            unique.append(segment)
+        result.duplicates_removed = len(segments) - len(unique)
+        segments = unique
+        if self._total(segments) <= budget:
+            return self._finish(result, segments, segments)
+
+        # 2. Legal footers that say nothing about payment or pay
+        kept = [
+            segment for segment in segments
+            if not LEGAL_FOOTER_PATTERN.search(segment.text.lower())
+            or any(pattern.search(segment.text.lower()) for pattern, _ in SIGNAL_PATTERNS[:OFFER_SIGNALS])
+        ]
+        result.footers_removed = len(segments) - len(kept)
+        segments = kept
+        if self._total(segments) <= budget:
+            return self._finish(result, segments, segments)
+
+        # 3. Highest-signal segments that fit, gap markers included
+        for segment in segments:
+            segment.score = self._score(segment)
+        marker_tokens = count_tokens(GAP_MARKER) + 1
+        selected: List[_Segment] = []
+        used = 0
+        for segment in sorted(segments, key=lambda s: (-s.score, s.index)):
+            cost = segment.tokens + 1 + marker_tokens
+            if used + cost <= budget:
+                selected.append(segment)
+                used += cost
+        selected.sort(key=lambda s: s.index)
+        result.segments_dropped = len(segments) - len(selected)
+        return self._finish(result, segments, selected)
+
+    def _segment(self, text: str) -> List[_Segment]:
+        """Split text into lines, breaking long lines into sentences and word runs."""
+        pieces: List[str] = []
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            if count_tokens(line) <= MAX_SEGMENT_TOKENS:
+                pieces.append(line)
+                continue
+            for sentence in SENTENCE_BREAK_PATTERN.split(line):
+                if count_tokens(sentence) <= MAX_SEGMENT_TOKENS:
+                    pieces.append(sentence)
+                    continue
+                words: List[str] = []
+                tokens = 0
+                for word in sentence.split():
+                    word_tokens = count_tokens(word)
+                    if words and tokens + word_tokens > MAX_SEGMENT_TOKENS:
+                        pieces.append(" ".join(words))
+                        words, tokens = [], 0
+                    words.append(word)
+                    tokens += word_tokens
+                if words:
+                    pieces.append(" ".join(words))
+        return [_Segment(index, piece, count_tokens(piece)) for index, piece in enumerate(pieces)]
+
+    def _score(self, segment: _Segment) -> float:
+        """Score a segment by the scam-relevant details it carries."""
+        lowered = segment.text.lower()
+        score = sum(weight for pattern, weight in SIGNAL_PATTERNS if pattern.search(lowered))
+        if segment.index < LEADING_SEGMENTS:
+            score += LEADING_SEGMENT_WEIGHT
+        return score
+
+    def _total(self, segments: List[_Segment]) -> int:
+        """Token count of segments joined by line breaks."""
+        return sum(segment.tokens + 1 for segment in segments)
+
+    def _finish(self, result: BudgetedText, segments: List[_Segment],
+                kept: List[_Segment]) -> BudgetedText:
+        """Join kept segments, marking where dropped segments were."""
+        lines: List[str] = []
+        previous = None
+        positions = {segment.index: position for position, segment in enumerate(segments)}
+        for segment in kept:
+            position = positions[segment.index]
+            if (previous is None and position > 0) or (previous is not None and position != previous + 1):
+                lines.append(GAP_MARKER)
+            lines.append(segment.text)
+            previous = position
+        if kept and previous != len(segments) - 1:
+            lines.append(GAP_MARKER)
+
+        result.text = "\n".join(lines)
+        result.tokens = count_tokens(result.text)
+        return result
+
+
+# Global prompt budgeter instance
+_prompt_budgeter: Optional[PromptBudgeter] = None
+
+
+def get_prompt_budgeter() -> PromptBudgeter:
+    """Get global prompt budgeter instance."""
+    global _prompt_budgeter
+    if _prompt_budgeter is None:
+        _prompt_budgeter = PromptBudgeter()
+    return _prompt_budgeter
@@ -8,7 +8,7 @@ circuit breaker pattern, and comprehensive monitoring for the Reality Checker ap
 import asyncio
 import time
 import json
-from typing import Optional, Dict, Any, List, Union
+from typing import Optional, Dict, Any, List, Union, Callable, Awaitable
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime, timedelta, timezone
@@ -27,6 +27,12 @@ from app.config import get_config
 logger = get_logger(__name__)
 
 
+# Commands that block server-side until data arrives or their timeout expires
+BLOCKING_COMMANDS = frozenset({
+    'blpop', 'brpop', 'brpoplpush', 'blmove', 'blmpop', 'bzpopmin', 'bzpopmax'
+})
+
+
 class CircuitBreakerState(Enum):
     """Circuit breaker states."""
     CLOSED = "closed"      # Normal operation
@@ -183,6 +189,7 @@ class RedisConnectionManager:
         self._health_check_task: Optional[asyncio.Task] = None
         self._last_health_check = 0.0
         self._fallback_mode = False
+        self._recovery_callbacks: List[Callable[[], Awaitable[None]]] = []
         
     def _load_config(self) -> RedisConfig:
         """Load Redis configuration from environment."""
@@ -357,6 +364,7 @@ class RedisConnectionManager:
                 if self._fallback_mode:
                     self._fallback_mode = False
                     logger.info("✅ Recovered from Redis fallback mode")
+                    self._notify_recovery()
                 
             except Exception as e:
                 logger.warning(f"Primary Redis health check failed: {e}")
@@ -369,6 +377,29 @@ class RedisConnectionManager:
                     self._fallback_mode = True
                     logger.warning("⚠️ Enabling Redis fallback mode due to health check failure")
     
+    def add_recovery_callback(self, callback: Callable[[], Awaitable[None]]):
+        """
+        Register a coroutine function to run when Redis leaves fallback mode.
+        
+        Args:
+            callback: Async function called without arguments on recovery
+        """
+        if callback not in self._recovery_callbacks:
+            self._recovery_callbacks.append(callback)
+    
+    def remove_recovery_callback(self, callback: Callable[[], Awaitable[None]]):
+        """Unregister a recovery callback."""
+        if callback in self._recovery_callbacks:
+            self._recovery_callbacks.remove(callback)
+    
+    def _notify_recovery(self):
+        """Schedule registered recovery callbacks without blocking the health check."""
+        for callback in list(self._recovery_callbacks):
+            try:
+                asyncio.create_task(callback())
+            except Exception as e:
+                logger.error(f"Failed to schedule Redis recovery callback: {e}")
+    
     async def get_connection(self) -> Optional[Redis]:
         """
         Get Redis connection with circuit breaker protection.
@@ -453,12 +484,15 @@ class RedisConnectionManager:
             
             # Update success metrics
             self.metrics.successful_requests += 1
-            self.metrics.average_response_time = (
-                self.metrics.average_response_time * 0.9 + latency * 0.1
-            )
             
-            # Record Redis operation performance metrics
-            await self._record_redis_operation_metric(command, latency, True)
+            # Blocking commands wait by design, so their latency is not a health signal
+            if command.lower() not in BLOCKING_COMMANDS:
+                self.metrics.average_response_time = (
+                    self.metrics.average_response_time * 0.9 + latency * 0.1
+                )
+                
+                # Record Redis operation performance metrics
+                await self._record_redis_operation_metric(command, latency, True)
             
             return result
             
@@ -484,6 +518,66 @@ class RedisConnectionManager:
             await self._record_redis_operation_metric(command, latency, False, str(e))
             return None
     
+    async def execute_pipeline(self, commands: List[tuple], transaction: bool = True) -> Optional[List[Any]]:
+        """
+        Execute several Redis commands in a single round-trip.
+        
+        Args:
+            commands: Sequence of (command, *args) tuples
+            transaction: Wrap the commands in MULTI/EXEC when True
+            
+        Returns:
+            List of command results in order, or None if failed
+        """
+        if self._fallback_mode or not commands:
+            return None
+        
+        start_time = time.time()
+        self.metrics.total_requests += 1
+        
+        try:
+            client = await self.get_connection()
+            if not client:
+                return None
+            
+            pipe = client.pipeline(transaction=transaction)
+            for command, *args in commands:
+                getattr(pipe, command.lower())(*args)
+            
+            results = await asyncio.wait_for(
+                pipe.execute(),
+                timeout=self.config.command_timeout
+            )
+            
+            latency = time.time() - start_time
+            self.metrics.successful_requests += 1
+            self.metrics.average_response_time = (
+                self.metrics.average_response_time * 0.9 + latency * 0.1
+            )
+            await self._record_redis_operation_metric('pipeline', latency, True)
+            
+            return results
+            
+        except asyncio.TimeoutError:
+            latency = time.time() - start_time
+            error_msg = f"Redis pipeline of {len(commands)} commands timed out after {self.config.command_timeout}s"
+            logger.warning(error_msg)
+            self.metrics.failed_requests += 1
+            self._fallback_mode = True
+            
+            await self._record_redis_operation_metric('pipeline', latency, False, error_msg)
+            return None
+        except Exception as e:
+            latency = time.time() - start_time
+            error_msg = f"Redis pipeline failed: {e}"
+            logger.warning(error_msg)
+            self.metrics.failed_requests += 1
+            self.metrics.last_error = str(e)
+            self.metrics.last_error_time = datetime.now(timezone.utc)
+            
+            await self._record_redis_operation_metric('pipeline', latency, False, str(e))
+            return None
+    
     async def _record_redis_operation_metric(self, operation: str, latency: float, success: bool, error_message: Optional[str] = None):
         """
         Record Redis operation metrics with performance monitor.
@@ -0,0 +1,360 @@
+"""
+Compiled rule engine for rule-based job ad scam detection.
+
+This module provides the ScamRuleEngine class used by
+EnhancedAIAnalysisService._apply_rule_based_detection. A rule set is
+compiled once into a CompiledRuleSet:
+
+- every pattern is compiled to a regex object up front; patterns are matched
+  against lowercased text, so IGNORECASE (which disables the regex engine's
+  literal search optimizations) is only kept for patterns with uppercase
+  literals
+- every pattern gets a literal prefilter: a set of substrings, one of which
+  any match must contain, derived from the parsed regex. Most rules are
+  rejected by a substring check and their regex never runs
+
+Rule sets are plain dictionaries (the DEFAULT_SCAM_PATTERNS layout) and can be
+loaded from a JSON file, which is re-read when it changes, without a restart.
+"""
+
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass
+from re import _constants as sre_constants
+from re import _parser as sre_parse
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+
+from app.utils.logging import get_logger, log_with_context
+
+logger = get_logger(__name__)
+
+# Rule categories, in scoring and reporting order
+RULE_CATEGORIES = ("high_risk_indicators", "medium_risk_indicators", "positive_indicators")
+
+DEFAULT_SCAM_PATTERNS: Dict[str, List[Dict[str, Any]]] = {
+    "high_risk_indicators": [
+        # Unrealistic salary promises
+        {"pattern": r"\$\d{2,3},\d{3}\+?\s*(?:per\s+week|weekly|/week)", "weight": 0.8, "description": "Unrealistic weekly salary"},
+        {"pattern": r"\$\d{3,4}\+?\s*(?:per\s+day|daily|/day)", "weight": 0.9, "description": "Unrealistic daily salary"},
+        {"pattern": r"earn\s+\$\d{3,4}\+?\s*(?:per\s+hour|hourly|/hour)", "weight": 0.7, "description": "Unrealistic hourly wage"},
+
+        # Work from home red flags
+        {"pattern": r"(?:work\s+from\s+home|remote).{0,50}(?:no\s+experience|entry\s+level).{0,50}\$\d{3,4}", "weight": 0.6, "description": "High-paying remote work with no experience"},
+        {"pattern": r"(?:make\s+money|earn\s+cash).{0,30}(?:from\s+home|remotely)", "weight": 0.5, "description": "Generic money-making claims"},
+
+        # Urgency and pressure tactics
+        {"pattern": r"(?:urgent|immediate|asap|right\s+away|start\s+today)", "weight": 0.4, "description": "Excessive urgency"},
+        {"pattern": r"(?:limited\s+time|act\s+now|don't\s+miss|hurry)", "weight": 0.4, "description": "Pressure tactics"},
+
+        # Vague job descriptions
+        {"pattern": r"(?:data\s+entry|typing|customer\s+service).{0,50}(?:no\s+experience|easy\s+work)", "weight": 0.3, "description": "Vague job description"},
+        {"pattern": r"(?:flexible\s+schedule|work\s+when\s+you\s+want|be\s+your\s+own\s+boss)", "weight": 0.3, "description": "Too-good-to-be-true flexibility"},
+
+        # Payment and fee red flags
+        {"pattern": r"(?:pay\s+fee|upfront\s+cost|investment\s+required|starter\s+kit)", "weight": 0.9, "description": "Upfront payment required"},
+        {"pattern": r"(?:training\s+fee|processing\s+fee|background\s+check\s+fee)", "weight": 0.8, "description": "Training or processing fees"},
+
+        # Contact and communication red flags
+        {"pattern": r"(?:text\s+only|no\s+phone\s+calls|email\s+only)", "weight": 0.4, "description": "Limited communication methods"},
+        {"pattern": r"(?:whatsapp|telegram|signal)\s+(?:only|preferred)", "weight": 0.5, "description": "Unusual communication platforms"},
+
+        # Grammatical and spelling issues (common in scams)
+        {"pattern": r"(?:recieve|recive|seperate|seprate|definately|definatly)", "weight": 0.2, "description": "Poor spelling/grammar"},
+        {"pattern": r"(?:alot|a\s+lot\s+of\s+money|guarenteed|guarentee)", "weight": 0.2, "description": "Poor spelling/grammar"},
+    ],
+
+    "medium_risk_indicators": [
+        # Generic company names
+        {"pattern": r"(?:global|international|worldwide|universal)\s+(?:company|corporation|inc|llc)", "weight": 0.3, "description": "Generic company name"},
+
+        # Unusual benefits
+        {"pattern": r"(?:free\s+car|company\s+car|travel\s+benefits|housing\s+provided)", "weight": 0.4, "description": "Unusual benefits for entry-level"},
+
+        # MLM indicators
+        {"pattern": r"(?:build\s+your\s+team|recruit\s+others|network\s+marketing|multi\s*level)", "weight": 0.6, "description": "MLM indicators"},
+
+        # Cryptocurrency/investment related
+        {"pattern": r"(?:bitcoin|crypto|forex|trading|investment).{0,50}(?:training|opportunity)", "weight": 0.5, "description": "Cryptocurrency/investment schemes"},
+    ],
+
+    "positive_indicators": [
+        # Legitimate job indicators
+        {"pattern": r"(?:bachelor|degree|certification|license)\s+(?:required|preferred)", "weight": -0.3, "description": "Education requirements"},
+        {"pattern": r"(?:benefits|health\s+insurance|401k|pto|vacation)", "weight": -0.2, "description": "Standard benefits"},
+        {"pattern": r"(?:interview|references|background\s+check|drug\s+test)", "weight": -0.3, "description": "Standard hiring process"},
+        {"pattern": r"(?:job\s+description|responsibilities|qualifications|requirements)", "weight": -0.2, "description": "Structured job posting"},
+
+        # Legitimate company indicators
+        {"pattern": r"(?:equal\s+opportunity|eeo|diversity|inclusion)", "weight": -0.2, "description": "EEO statements"},
+        {"pattern": r"(?:www\.|https?://)[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", "weight": -0.1, "description": "Company website"},
+    ]
+}
+
+
+def required_literals(pattern: str) -> Optional[Tuple[str, ...]]:
+    """
+    Derive substrings of which every match of pattern contains at least one.
+
+    Args:
+        pattern: Regular expression source
+
+    Returns:
+        Tuple of literals (the alternative set whose shortest literal is
+        longest), or None if the pattern has no required literal
+    """
+    return _required_literals(sre_parse.parse(pattern))
+
+
+def _required_literals(items) -> Optional[Tuple[str, ...]]:
+    """Walk a parsed regex sequence and pick its most selective literal set."""
+    candidates: List[Tuple[str, ...]] = []
+    run: List[str] = []
+
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            run.append(chr(av))
+            continue
+
+        if run:
+            candidates.append(("".join(run),))
+            run = []
+
+        if op is sre_constants.SUBPATTERN:
+            literals = _required_literals(av[3])
+            if literals:
+                candidates.append(literals)
+        elif op is sre_constants.BRANCH:
+            branch_literals = [_required_literals(branch) for branch in av[1]]
+            if all(branch_literals):
+                candidates.append(tuple(dict.fromkeys(
+                    literal for literals in branch_literals for literal in literals
+                )))
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT) and av[0] >= 1:
+            literals = _required_literals(av[2])
+            if literals:
+                candidates.append(literals)
+
+    if run:
+        candidates.append(("".join(run),))
+
+    if not candidates:
+        return None
+    return max(candidates, key=lambda literals: (min(map(len, literals)), -len(literals)))
+
+
+def _needs_ignorecase(items) -> bool:
+    """Check whether a parsed regex can only match uppercase text without IGNORECASE."""
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            if chr(av).isupper():
+                return True
+        elif op is sre_constants.IN:
+            chars = set()
+            for item_op, item_av in av:
+                if item_op is sre_constants.LITERAL:
+                    chars.add(chr(item_av))
+                elif item_op is sre_constants.RANGE:
+                    chars.update(map(chr, range(item_av[0], min(item_av[1], 0x7f) + 1)))
+            if any(char.isupper() and char.lower() not in chars for char in chars):
+                return True
+        elif op is sre_constants.SUBPATTERN:
+            if _needs_ignorecase(av[3]):
+                return True
+        elif op is sre_constants.BRANCH:
+            if any(_needs_ignorecase(branch) for branch in av[1]):
+                return True
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            if _needs_ignorecase(av[2]):
+                return True
+        elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            if _needs_ignorecase(av[1]):
+                return True
+    return False
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """A compiled pattern with its literal prefilter."""
+    regex: Pattern
+    literals: Optional[Tuple[str, ...]]
+    weight: float
+    description: str
+
+
+class CompiledRuleSet:
+    """An immutable, validated and compiled set of scam detection rules."""
+
+    def __init__(self, patterns: Dict[str, List[Dict[str, Any]]]):
+        """
+        Validate and compile a rule set.
+
+        Args:
+            patterns: Mapping of rule category to pattern dicts with
+                "pattern", "weight" and "description" keys
+
+        Raises:
+            ValueError: If a category, rule or regex is invalid
+        """
+        unknown = set(patterns) - set(RULE_CATEGORIES)
+        if unknown:
+            raise ValueError(f"Unknown rule categories: {', '.join(sorted(unknown))}")
+
+        rules = []
+        for category in RULE_CATEGORIES:
+            for pattern_info in patterns.get(category, []):
+                try:
+                    parsed = sre_parse.parse(pattern_info["pattern"])
+                    ignorecase = _needs_ignorecase(parsed)
+                    literals = _required_literals(parsed)
+                    if literals and ignorecase:
+                        literals = tuple(literal.lower() for literal in literals)
+                    rules.append(CompiledRule(
+                        regex=re.compile(pattern_info["pattern"], re.IGNORECASE if ignorecase else 0),
+                        literals=literals,
+                        weight=float(pattern_info["weight"]),
+                        description=str(pattern_info["description"])
+                    ))
+                except (KeyError, TypeError, ValueError, re.error) as e:
+                    raise ValueError(f"Invalid {category} rule {pattern_info!r}: {e}") from e
+
+        self.patterns = patterns
+        self.rules: Tuple[CompiledRule, ...] = tuple(rules)
+
+    def match(self, text_lower: str) -> Tuple[float, List[str]]:
+        """
+        Score lowercased text against every rule.
+
+        Args:
+            text_lower: Lowercased job advertisement text
+
+        Returns:
+            Tuple of (total weight, matched rule descriptions in rule order)
+        """
+        total_score = 0.0
+        matched = []
+        for rule in self.rules:
+            if rule.literals is not None and not any(literal in text_lower for literal in rule.literals):
+                continue
+            if rule.regex.search(text_lower):
+                total_score += rule.weight
+                matched.append(rule.description)
+        return total_score, matched
+
+
+@dataclass
+class ScamRuleEngineConfig:
+    """Configuration for the scam rule engine."""
+    patterns_path: Optional[str] = None
+    reload_interval: float = 5.0  # seconds between pattern file change checks
+
+
+class ScamRuleEngine:
+    """
+    Hot-reloadable rule engine over a CompiledRuleSet.
+
+    When a patterns file is configured, its modification time is checked at
+    most once per reload_interval during matching. A changed file is compiled
+    into a new rule set that replaces the current one in a single assignment;
+    an invalid file is logged and the current rule set stays active.
+    """
+
+    def __init__(self, config: Optional[ScamRuleEngineConfig] = None):
+        """
+        Initialize the rule engine.
+
+        Args:
+            config: Engine configuration (loaded from environment if omitted)
+        """
+        self.config = config or self._load_config()
+        self.rule_set = CompiledRuleSet(DEFAULT_SCAM_PATTERNS)
+
+        self._loaded_mtime: Optional[float] = None
+        self._next_reload_check = 0.0
+        self.stats = {'reloads': 0, 'reload_errors': 0}
+
+        if self.config.patterns_path:
+            self._check_for_changes()
+
+    def _load_config(self) -> ScamRuleEngineConfig:
+        """Load configuration from environment variables."""
+        config = ScamRuleEngineConfig()
+        config.patterns_path = os.getenv('SCAM_PATTERNS_PATH') or None
+        config.reload_interval = float(os.getenv('SCAM_PATTERNS_RELOAD_INTERVAL', '5.0'))
+        return config
+
+    @property
+    def patterns(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Source patterns of the active rule set."""
+        return self.rule_set.patterns
+
+    def reload(self, patterns: Dict[str, List[Dict[str, Any]]]):
+        """
+        Compile and activate a new rule set.
+
+        Args:
+            patterns: Rule set in the DEFAULT_SCAM_PATTERNS layout
+
+        Raises:
+            ValueError: If the rule set is invalid (the active set is kept)
+        """
+        self.rule_set = CompiledRuleSet(patterns)
+        self.stats['reloads'] += 1
+        log_with_context(
+            logger,
+            logging.INFO,
+            "Scam detection rules reloaded",
+            rule_count=len(self.rule_set.rules)
+        )
+
+    def match(self, job_text: str) -> Tuple[float, List[str]]:
+        """
+        Score job text against the active rule set.
+
+        Args:
+            job_text: Job advertisement text
+
+        Returns:
+            Tuple of (total weight, matched rule descriptions)
+        """
+        if self.config.patterns_path and time.monotonic() >= self._next_reload_check:
+            self._check_for_changes()
+        return self.rule_set.match(job_text.lower())
+
+    def _check_for_changes(self):
+        """Reload the patterns file if its modification time changed."""
+        self._next_reload_check = time.monotonic() + self.config.reload_interval
+        try:
+            mtime = os.stat(self.config.patterns_path).st_mtime
+            if mtime == self._loaded_mtime:
+                return
+            # Record the version first so a broken file is reported once, not on every check
+            self._loaded_mtime = mtime
+            with open(self.config.patterns_path, 'r', encoding='utf-8') as patterns_file:
+                patterns = json.load(patterns_file)
+            self.reload(patterns)
+        except (OSError, ValueError) as e:
+            self.stats['reload_errors'] += 1
+            log_with_context(
+                logger,
+                logging.ERROR,
+                "Failed to reload scam detection rules, keeping active rule set",
+                patterns_path=self.config.patterns_path,
+                error=str(e)
+            )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get rule engine statistics.
+
+        Returns:
+            Dictionary with rule count and reload counters
+        """
+        return {
+            'rules': len(self.rule_set.rules),
+            'prefiltered_rules': sum(rule.literals is not None for rule in self.rule_set.rules),
+            'patterns_path': self.config.patterns_path,
+            **self.stats
+        }
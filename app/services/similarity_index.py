@@ -0,0 +1,258 @@
+"""
+Incremental similarity index for near-duplicate job advertisement lookup.
+
+This module provides the HashedSimilarityIndex class. Documents are turned into
+L2-normalized hashed term-frequency vectors (the hashing trick, so there is no
+vocabulary to fit or refit) and stored column-wise, like a CSC sparse matrix:
+each feature keeps typed arrays of (slot, generation, weight) postings.
+
+- add appends one posting per document feature
+- remove bumps the slot generation, which invalidates its postings lazily;
+  a posting list is compacted once half of it is stale
+- query gathers the postings of the query features and scores every document
+  with a single numpy bincount, so no Python loop runs per historical document
+
+Add and remove cost depends on document length only, not on index size.
+"""
+
+import math
+import re
+import zlib
+from array import array
+from collections import Counter
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+# Same tokenization as scikit-learn's default text vectorizers
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+# Posting lists shorter than this are never compacted
+MIN_COMPACTION_SIZE = 32
+
+SparseVector = Dict[int, float]
+
+
+class _PostingList:
+    """Append-only postings of one feature: slot, slot generation and weight."""
+
+    __slots__ = ("slots", "generations", "weights", "stale")
+
+    def __init__(self):
+        self.slots = array('i')
+        self.generations = array('i')
+        self.weights = array('f')
+        self.stale = 0
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+
+class HashedSimilarityIndex:
+    """
+    Cosine-similarity index over hashed sparse text vectors.
+
+    Vectors use sublinear term frequency (1 + log tf) and are L2-normalized, so
+    the dot product of two vectors is their cosine similarity.
+    """
+
+    def __init__(self, n_features: int = 2 ** 20):
+        """
+        Initialize the similarity index.
+
+        Args:
+            n_features: Size of the hashed feature space
+        """
+        self.n_features = n_features
+
+        self._slots: Dict[Hashable, int] = {}
+        self._features: Dict[Hashable, Tuple[int, ...]] = {}
+        self._keys: List[Optional[Hashable]] = []
+        self._free_slots: List[int] = []
+        self._generations = np.zeros(64, dtype=np.int32)
+        self._postings: Dict[int, _PostingList] = {}
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._slots
+
+    def vectorize(self, text: str) -> SparseVector:
+        """
+        Convert text into a normalized hashed feature vector.
+
+        Args:
+            text: Text to vectorize
+
+        Returns:
+            Mapping of feature index to weight (empty if no usable tokens)
+        """
+        counts = Counter(
+            zlib.crc32(token.encode('utf-8')) % self.n_features
+            for token in TOKEN_PATTERN.findall(text.lower())
+            if token not in ENGLISH_STOP_WORDS
+        )
+        if not counts:
+            return {}
+
+        weights = {feature: 1.0 + math.log(count) for feature, count in counts.items()}
+        norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+        return {feature: weight / norm for feature, weight in weights.items()}
+
+    def add(self, key: Hashable, text: str):
+        """
+        Add or replace a document.
+
+        Args:
+            key: Document identifier
+            text: Document text
+        """
+        if key in self._slots:
+            self.remove(key)
+
+        slot = self._allocate_slot()
+        generation = int(self._generations[slot])
+        vector = self.vectorize(text)
+
+        for feature, weight in vector.items():
+            postings = self._postings.get(feature)
+            if postings is None:
+                postings = self._postings[feature] = _PostingList()
+            postings.slots.append(slot)
+            postings.generations.append(generation)
+            postings.weights.append(weight)
+
+        self._slots[key] = slot
+        self._keys[slot] = key
+        self._features[key] = tuple(vector)
+
+    def remove(self, key: Hashable) -> bool:
+        """
+        Remove a document.
+
+        Args:
+            key: Document identifier
+
+        Returns:
+            True if the document was indexed
+        """
+        slot = self._slots.pop(key, None)
+        if slot is None:
+            return False
+
+        # Invalidate the slot's postings and recycle it
+        self._generations[slot] += 1
+        self._keys[slot] = None
+        self._free_slots.append(slot)
+
+        for feature in self._features.pop(key):
+            postings = self._postings[feature]
+            postings.stale += 1
+            if postings.stale == len(postings):
+                del self._postings[feature]
+            elif len(postings) >= MIN_COMPACTION_SIZE and postings.stale * 2 > len(postings):
+                self._compact(postings)
+        return True
+
+    def clear(self):
+        """Remove all documents."""
+        self._slots.clear()
+        self._features.clear()
+        self._keys.clear()
+        self._free_slots.clear()
+        self._generations = np.zeros(64, dtype=np.int32)
+        self._postings.clear()
+
+    def query(self, text: str, k: int = 1, min_similarity: float = 0.0) -> List[Tuple[Hashable, float]]:
+        """
+        Find the documents most similar to text.
+
+        Args:
+            text: Query text
+            k: Maximum number of results
+            min_similarity: Minimum cosine similarity of returned documents
+
+        Returns:
+            List of (key, similarity) pairs, most similar first
+        """
+        query_vector = self.vectorize(text)
+        if not query_vector or not self._slots:
+            return []
+
+        slot_parts = []
+        weight_parts = []
+        for feature, weight in query_vector.items():
+            postings = self._postings.get(feature)
+            if postings is None:
+                continue
+            slots, generations, weights = self._view(postings)
+            if postings.stale:
+                live = self._generations[slots] == generations
+                slots, weights = slots[live], weights[live]
+            slot_parts.append(slots)
+            weight_parts.append(weights * weight)
+
+        if not slot_parts:
+            return []
+
+        scores = np.bincount(
+            np.concatenate(slot_parts),
+            weights=np.concatenate(weight_parts),
+            minlength=len(self._keys)
+        )
+        candidates = np.flatnonzero(scores >= max(min_similarity, 1e-9))
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
+
+        return [(self._keys[slot], min(float(scores[slot]), 1.0)) for slot in candidates]
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get index statistics.
+
+        Returns:
+            Dictionary with document, feature, posting and stale posting counts
+        """
+        return {
+            'documents': len(self._slots),
+            'features': len(self._postings),
+            'postings': sum(len(postings) for postings in self._postings.values()),
+            'stale_postings': sum(postings.stale for postings in self._postings.values())
+        }
+
+    def _allocate_slot(self) -> int:
+        """Reuse a free slot or append one, growing the generation array as needed."""
+        if self._free_slots:
+            return self._free_slots.pop()
+
+        slot = len(self._keys)
+        self._keys.append(None)
+        if slot >= len(self._generations):
+            self._generations = np.concatenate([self._generations, np.zeros_like(self._generations)])
+        return slot
+
+    @staticmethod
+    def _view(postings: _PostingList) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Zero-copy numpy views of a posting list (valid until it is next modified)."""
+        return (
+            np.frombuffer(postings.slots, dtype=np.int32),
+            np.frombuffer(postings.generations, dtype=np.int32),
+            np.frombuffer(postings.weights, dtype=np.float32)
+        )
+
+    def _compact(self, postings: _PostingList):
+        """Drop stale postings in place."""
+        slots, generations, weights = self._view(postings)
+        live = self._generations[slots] == generations
+        live_slots = slots[live].tobytes()
+        live_generations = generations[live].tobytes()
+        live_weights = weights[live].tobytes()
+        del slots, generations, weights
+
+        postings.slots = array('i', live_slots)
+        postings.generations = array('i', live_generations)
+        postings.weights = array('f', live_weights)
+        postings.stale = 0
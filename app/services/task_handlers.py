@@ -259,15 +259,8 @@ class NotificationTaskHandler:
                 from_number = f"whatsapp:{from_number}"
             
             # Send message with timeout
-            def send_message():
-                return twilio_service.client.messages.create(
-                    body=message,
-                    from_=f"whatsapp:{twilio_service.config.twilio_phone_number}",
-                    to=from_number
-                )
-            
             twilio_message = await asyncio.wait_for(
-                asyncio.to_thread(send_message),
+                twilio_service.create_message(from_number, message),
                 timeout=5.0  # 5 second timeout
             )
             
@@ -362,6 +355,7 @@ def register_default_handlers(task_processor):
     """Register default task handlers with the task processor."""
     # Message processing handlers
     task_processor.register_handler('process_message', message_handler.handle_message_processing)
+    task_processor.register_handler('process_media_message', message_handler.handle_message_processing)
     
     # Notification handlers
     task_processor.register_handler('timeout_notification', notification_handler.handle_timeout_notification)
@@ -407,7 +401,9 @@ async def create_message_processing_task(
     
     return ProcessingTask(
         task_id=f"msg_{twilio_request.MessageSid}",
-        task_type='process_message',
+        # Media messages (PDF download and extraction) get their own type so
+        # they can be capped separately from quick text analyses
+        task_type='process_media_message' if twilio_request.NumMedia else 'process_message',
         payload=payload,
         priority=priority,
         correlation_id=correlation_id,
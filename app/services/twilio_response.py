@@ -2,7 +2,9 @@
 Twilio response service for sending WhatsApp messages.
 
 This module handles sending formatted responses back to users via Twilio's
-WhatsApp API, including analysis results and error messages.
+WhatsApp API, including analysis results and error messages. Messages are
+sent by the account's shared TwilioSender, which posts them asynchronously
+on a pooled HTTP client under a per-number send rate.
 """
 
 import asyncio
@@ -13,6 +15,8 @@ from twilio.rest import Client
 from twilio.base.exceptions import TwilioException
 
 from app.models.data_models import JobAnalysisResult, AppConfig
+from app.services.twilio_sender import TwilioMessage, get_twilio_sender
+from app.services.verdict_stream import EarlyVerdict
 from app.config import get_config
 from app.utils.logging import get_logger, get_correlation_id, log_with_context, sanitize_phone_number
 from app.utils.metrics import get_metrics_collector
@@ -36,6 +40,23 @@ class TwilioResponseService:
             self.config.twilio_account_sid,
             self.config.twilio_auth_token
         )
+        self.sender = get_twilio_sender(self.config.twilio_account_sid, self.config.twilio_auth_token)
+    
+    async def create_message(self, to_number: str, body: str) -> TwilioMessage:
+        """
+        Send one WhatsApp message from the configured number.
+        
+        Args:
+            to_number: Recipient's WhatsApp number (format: whatsapp:+1234567890)
+            body: Message text
+            
+        Returns:
+            TwilioMessage: The message accepted by Twilio
+            
+        Raises:
+            TwilioException: If Twilio rejects the message or the outbound queue is full
+        """
+        return await self.sender.send(f"whatsapp:{self.config.twilio_phone_number}", to_number, body)
     
     async def send_analysis_result(self, to_number: str, result: JobAnalysisResult) -> bool:
         """
@@ -57,15 +78,8 @@ class TwilioResponseService:
         try:
             message_body = self._format_analysis_message(result)
             
-            # Use asyncio.to_thread to prevent blocking
             message = await asyncio.wait_for(
-                asyncio.to_thread(
-                    lambda: self.client.messages.create(
-                        body=message_body,
-                        from_=f"whatsapp:{self.config.twilio_phone_number}",
-                        to=to_number
-                    )
-                ),
+                self.create_message(to_number, message_body),
                 timeout=3.0
             )
             
@@ -148,6 +162,111 @@ class TwilioResponseService:
             )
             return False
     
+    async def send_verdict(self, to_number: str, verdict: EarlyVerdict) -> bool:
+        """
+        Send an early verdict while the rest of the analysis is still streaming.
+        
+        Args:
+            to_number: Recipient's WhatsApp number (format: whatsapp:+1234567890)
+            verdict: Trust score and classification parsed from the stream
+            
+        Returns:
+            bool: True if message sent successfully, False otherwise
+        """
+        return await self._send_message(to_number, self._format_verdict_message(verdict), "send_verdict")
+    
+    async def send_analysis_details(self, to_number: str, result: JobAnalysisResult) -> bool:
+        """
+        Send the key findings that follow an early verdict.
+        
+        Args:
+            to_number: Recipient's WhatsApp number (format: whatsapp:+1234567890)
+            result: Complete analysis result
+            
+        Returns:
+            bool: True if message sent successfully, False otherwise
+        """
+        return await self._send_message(to_number, self._format_findings(result), "send_analysis_details")
+    
+    async def send_verdict_revision(self, to_number: str, result: JobAnalysisResult) -> bool:
+        """
+        Send the final verdict as a correction of an early verdict it differs from.
+        
+        Args:
+            to_number: Recipient's WhatsApp number (format: whatsapp:+1234567890)
+            result: Complete analysis result
+            
+        Returns:
+            bool: True if message sent successfully, False otherwise
+        """
+        return await self._send_message(to_number, self._format_revision_message(result), "send_verdict_revision")
+    
+    async def _send_message(self, to_number: str, message_body: str, operation: str) -> bool:
+        """
+        Send one WhatsApp message, recording metrics and errors under operation.
+        
+        Args:
+            to_number: Recipient's WhatsApp number (format: whatsapp:+1234567890)
+            message_body: Message text
+            operation: Operation name for metrics and logs
+            
+        Returns:
+            bool: True if message sent successfully, False otherwise
+        """
+        correlation_id = get_correlation_id()
+        metrics = get_metrics_collector()
+        error_tracker = get_error_tracker()
+        
+        start_time = time.time()
+        
+        try:
+            message = await asyncio.wait_for(
+                self.create_message(to_number, message_body),
+                timeout=3.0
+            )
+            
+            duration = time.time() - start_time
+            metrics.record_service_call("twilio", operation, True, duration)
+            error_tracker.track_service_call("twilio", operation, True, duration)
+            
+            log_with_context(
+                logger,
+                logging.INFO,
+                "Message sent successfully",
+                message_sid=message.sid,
+                operation=operation,
+                to_number=sanitize_phone_number(to_number),
+                duration_seconds=duration,
+                correlation_id=correlation_id
+            )
+            return True
+            
+        except Exception as e:
+            duration = time.time() - start_time
+            metrics.record_service_call("twilio", operation, False, duration)
+            error_tracker.track_service_call("twilio", operation, False, duration)
+            if not isinstance(e, asyncio.TimeoutError):
+                error_tracker.track_error(
+                    type(e).__name__,
+                    str(e),
+                    "twilio_service",
+                    correlation_id,
+                    {"operation": operation, "duration": duration},
+                    severity=AlertSeverity.HIGH
+                )
+            
+            log_with_context(
+                logger,
+                logging.ERROR,
+                "Failed to send message",
+                operation=operation,
+                to_number=sanitize_phone_number(to_number),
+                error=str(e) or type(e).__name__,
+                duration_seconds=duration,
+                correlation_id=correlation_id
+            )
+            return False
+    
     async def send_error_message(self, to_number: str, error_type: str = "general") -> bool:
         """
         Send error message to user via WhatsApp.
@@ -168,15 +287,8 @@ class TwilioResponseService:
         try:
             message_body = self._get_error_message(error_type)
             
-            # Use asyncio.to_thread to prevent blocking
             message = await asyncio.wait_for(
-                asyncio.to_thread(
-                    lambda: self.client.messages.create(
-                        body=message_body,
-                        from_=f"whatsapp:{self.config.twilio_phone_number}",
-                        to=to_number
-                    )
-                ),
+                self.create_message(to_number, message_body),
                 timeout=3.0
             )
             
@@ -274,15 +386,8 @@ class TwilioResponseService:
                 to_number = f"whatsapp:{to_number}"
                 logger.info(f"Added whatsapp: prefix to number: {sanitize_phone_number(to_number)}")
             
-            # Use asyncio.to_thread to prevent blocking
             message = await asyncio.wait_for(
-                asyncio.to_thread(
-                    lambda: self.client.messages.create(
-                        body=message_body,
-                        from_=f"whatsapp:{self.config.twilio_phone_number}",
-                        to=to_number
-                    )
-                ),
+                self.create_message(to_number, message_body),
                 timeout=3.0
             )
             
@@ -386,6 +491,51 @@ class TwilioResponseService:
         Returns:
             str: Formatted message string
         """
+        message = self._format_verdict_header(result.trust_score, result.classification_text)
+        message += self._format_findings(result)
+        message += "\n\n"
+        message += self._get_recommendation(result.classification_text)
+        
+        return message
+    
+    def _format_verdict_message(self, verdict: EarlyVerdict) -> str:
+        """
+        Format an early verdict, sent before the key findings are ready.
+        
+        Args:
+            verdict: Trust score and classification parsed from the stream
+            
+        Returns:
+            str: Formatted message string
+        """
+        message = self._format_verdict_header(verdict.trust_score, verdict.classification_text)
+        message += self._get_recommendation(verdict.classification_text)
+        message += "\n\n_Key findings follow in the next message._"
+        
+        return message
+    
+    def _format_revision_message(self, result: JobAnalysisResult) -> str:
+        """
+        Format a final verdict that replaces the early verdict sent before it.
+        
+        Args:
+            result: Complete analysis result
+            
+        Returns:
+            str: Formatted message string
+        """
+        message = "🔄 *Verdict Revised*\n\n"
+        message += "The full analysis changed the verdict above to:\n"
+        message += f"*Trust Score:* {result.trust_score}/100\n"
+        message += f"*Classification:* {result.classification_text}\n\n"
+        message += self._format_findings(result)
+        message += "\n\n"
+        message += self._get_recommendation(result.classification_text)
+        
+        return message
+    
+    def _format_verdict_header(self, trust_score: int, classification_text: str) -> str:
+        """Format the title, trust score and classification lines."""
         # Determine emoji based on classification
         emoji_map = {
             "Legit": "✅",
@@ -393,28 +543,32 @@ class TwilioResponseService:
             "Likely Scam": "🚨"
         }
         
-        emoji = emoji_map.get(result.classification_text, "❓")
+        emoji = emoji_map.get(classification_text, "❓")
         
         message = f"{emoji} *Job Analysis Result*\n\n"
-        message += f"*Trust Score:* {result.trust_score}/100\n"
-        message += f"*Classification:* {result.classification_text}\n\n"
-        message += "*Key Findings:*\n"
+        message += f"*Trust Score:* {trust_score}/100\n"
+        message += f"*Classification:* {classification_text}\n\n"
+        return message
+    
+    def _format_findings(self, result: JobAnalysisResult) -> str:
+        """Format the key findings and confidence of an analysis result."""
+        message = "*Key Findings:*\n"
         
         for i, reason in enumerate(result.reasons, 1):
             message += f"{i}. {reason}\n"
         
-        message += f"\n*Confidence:* {result.confidence:.1%}\n\n"
-        
-        # Add recommendation based on classification
-        if result.classification_text == "Legit":
-            message += "💡 This job appears legitimate, but always verify details independently."
-        elif result.classification_text == "Suspicious":
-            message += "💡 Exercise caution. Research the company and verify all details before proceeding."
-        else:  # Likely Scam
-            message += "💡 Strong indicators suggest this may be a scam. Avoid sharing personal information."
-        
+        message += f"\n*Confidence:* {result.confidence:.1%}"
         return message
     
+    def _get_recommendation(self, classification_text: str) -> str:
+        """Get the recommendation line for a classification."""
+        if classification_text == "Legit":
+            return "💡 This job appears legitimate, but always verify details independently."
+        elif classification_text == "Suspicious":
+            return "💡 Exercise caution. Research the company and verify all details before proceeding."
+        else:  # Likely Scam
+            return "💡 Strong indicators suggest this may be a scam. Avoid sharing personal information."
+    
     def _get_error_message(self, error_type: str) -> str:
         """
         Get appropriate error message based on error type.
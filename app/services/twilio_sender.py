@@ -0,0 +1,321 @@
+"""
+Async outbound WhatsApp sender for the Twilio Messages API.
+
+The Twilio SDK is synchronous, so every reply used to hold a default
+executor thread for the whole API call, and a burst of replies went out as
+fast as threads allowed, regardless of the sending number's rate. This
+module provides the TwilioSender class, which posts messages on a pooled
+httpx client instead:
+
+- a token bucket per sender number holds each number to its send rate,
+  with a burst allowance; waiters for one number are served in order
+- at most max_concurrency requests per account are in flight
+- a 429 is retried with jittered exponential backoff (at least Retry-After)
+  and pauses the sender number, so messages queued behind it back off too
+- at most max_queue_size messages are queued or being sent; beyond that a
+  send fails at once rather than waiting behind a backlog that would outlast
+  its caller's timeout
+
+Errors are raised as the SDK's TwilioRestException, so callers handle them
+as before.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import httpx
+from twilio.base.exceptions import TwilioException, TwilioRestException
+
+from app.services.openai_rate_limiter import parse_reset_duration
+from app.utils.logging import get_logger, log_with_context, sanitize_phone_number
+
+logger = get_logger(__name__)
+
+TWILIO_API_URL = "https://api.twilio.com/2010-04-01"
+
+
+class OutboundQueueFullError(TwilioException):
+    """Raised when too many messages are already queued for sending."""
+    pass
+
+
+@dataclass
+class TwilioMessage:
+    """A message accepted by Twilio."""
+    sid: str
+    status: Optional[str] = None
+
+
+@dataclass
+class TwilioSenderConfig:
+    """Configuration for the outbound Twilio sender."""
+    messages_per_second: float = 20.0  # per sender number
+    burst: int = 5  # messages an idle sender number may send at once
+    max_concurrency: int = 20  # requests in flight per account
+    max_queue_size: int = 60  # messages queued or being sent; about what can be sent in a reply timeout
+    max_retries: int = 3  # retries after a 429
+    backoff_base: float = 0.25  # seconds, doubled per retry
+    backoff_max: float = 4.0  # seconds
+    timeout: float = 10.0  # seconds per request
+    keepalive_expiry: float = 60.0  # seconds an idle connection is kept
+
+
+class _SenderBucket:
+    """Token bucket for one sender number, refilled at rate per second."""
+
+    __slots__ = ("rate", "capacity", "level", "updated_at", "paused_until", "lock")
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.level = capacity
+        self.updated_at = now
+        self.paused_until = 0.0
+        self.lock = asyncio.Lock()
+
+    def refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until one message may be sent."""
+        return max(self.paused_until - now, (1.0 - self.level) / self.rate, 0.0)
+
+
+class TwilioSender:
+    """
+    Rate-governed async sender for one Twilio account.
+
+    A message takes a token from its sender number's bucket before every
+    attempt, so retries are governed like first attempts.
+    """
+
+    def __init__(
+        self,
+        account_sid: str,
+        auth_token: str,
+        config: Optional[TwilioSenderConfig] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+        jitter: Callable[[float, float], float] = random.uniform
+    ):
+        """
+        Initialize the sender.
+
+        The HTTP client is created on first use.
+
+        Args:
+            account_sid: Twilio account SID
+            auth_token: Twilio auth token
+            config: Sender configuration (loaded from environment if omitted)
+            clock: Monotonic time source (injectable for tests)
+            sleep: Async sleep function (injectable for tests)
+            jitter: Backoff jitter function returning a value in [a, b] (injectable for tests)
+        """
+        self.account_sid = account_sid
+        self.auth_token = auth_token
+        self.config = config or self._load_config()
+        self._clock = clock
+        self._sleep = sleep
+        self._jitter = jitter
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._buckets: Dict[str, _SenderBucket] = {}
+        self._in_flight = asyncio.Semaphore(self.config.max_concurrency)
+        self._queued = 0
+
+        self.stats = {
+            'sent': 0,
+            'failed': 0,
+            'rate_limited': 0,
+            'queue_full': 0,
+            'waits': 0,
+            'wait_seconds': 0.0,
+            'max_queued': 0
+        }
+
+    def _load_config(self) -> TwilioSenderConfig:
+        """Load configuration from environment variables."""
+        config = TwilioSenderConfig()
+        config.messages_per_second = float(os.getenv('TWILIO_SEND_RATE_PER_SECOND', '20.0'))
+        config.burst = int(os.getenv('TWILIO_SEND_BURST', '5'))
+        config.max_concurrency = int(os.getenv('TWILIO_SEND_MAX_CONCURRENCY', '20'))
+        config.max_queue_size = int(os.getenv('TWILIO_SEND_MAX_QUEUE_SIZE', '60'))
+        config.max_retries = int(os.getenv('TWILIO_SEND_MAX_RETRIES', '3'))
+        config.timeout = float(os.getenv('TWILIO_SEND_TIMEOUT', '10.0'))
+        return config
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the pooled API client, creating it on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=f"{TWILIO_API_URL}/Accounts/{self.account_sid}",
+                auth=httpx.BasicAuth(self.account_sid, self.auth_token),
+                timeout=self.config.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.config.max_concurrency,
+                    max_keepalive_connections=self.config.max_concurrency,
+                    keepalive_expiry=self.config.keepalive_expiry
+                )
+            )
+        return self._client
+
+    async def send(self, from_number: str, to_number: str, body: str) -> TwilioMessage:
+        """
+        Send one message, waiting for the sender number's rate allowance.
+
+        Args:
+            from_number: Sender number (format: whatsapp:+1234567890)
+            to_number: Recipient number (format: whatsapp:+1234567890)
+            body: Message text
+
+        Returns:
+            TwilioMessage: The accepted message
+
+        Raises:
+            OutboundQueueFullError: If max_queue_size messages are already queued
+            TwilioRestException: If Twilio rejects the message, or still
+                rate limits it after max_retries retries
+            httpx.RequestError: If the API cannot be reached
+        """
+        if self._queued >= self.config.max_queue_size:
+            self.stats['queue_full'] += 1
+            raise OutboundQueueFullError(
+                f"Outbound message queue is full ({self.config.max_queue_size} messages)"
+            )
+
+        self._queued += 1
+        self.stats['max_queued'] = max(self.stats['max_queued'], self._queued)
+        try:
+            attempt = 0
+            while True:
+                await self._acquire(from_number)
+                async with self._in_flight:
+                    response = await self._get_client().post(
+                        "/Messages.json", data={"From": from_number, "To": to_number, "Body": body}
+                    )
+                if response.status_code != 429:
+                    break
+                attempt += 1
+                self._record_rate_limited(from_number, to_number, response, attempt)
+                if attempt > self.config.max_retries:
+                    break
+        finally:
+            self._queued -= 1
+
+        return self._parse_response(response)
+
+    async def _acquire(self, from_number: str):
+        """Wait until the sender number may send one message, then take it."""
+        bucket = self._buckets.get(from_number)
+        if bucket is None:
+            bucket = _SenderBucket(self.config.messages_per_second, float(self.config.burst), self._clock())
+            self._buckets[from_number] = bucket
+
+        waited = 0.0
+        async with bucket.lock:
+            while True:
+                now = self._clock()
+                bucket.refill(now)
+                delay = bucket.wait_time(now)
+                if delay <= 0:
+                    break
+                await self._sleep(delay)
+                waited += delay
+            bucket.level -= 1.0
+
+        if waited:
+            self.stats['waits'] += 1
+            self.stats['wait_seconds'] += waited
+
+    def _record_rate_limited(self, from_number: str, to_number: str, response: httpx.Response, attempt: int):
+        """Pause the sender number after its attempt-th 429 response."""
+        backoff = self._jitter(0.0, min(self.config.backoff_max, self.config.backoff_base * 2 ** (attempt - 1)))
+        pause = max(parse_reset_duration(response.headers.get('retry-after')) or 0.0, backoff)
+
+        bucket = self._buckets[from_number]
+        now = self._clock()
+        bucket.refill(now)
+        bucket.level = min(bucket.level, 0.0)
+        bucket.paused_until = max(bucket.paused_until, now + pause)
+        self.stats['rate_limited'] += 1
+
+        log_with_context(
+            logger,
+            logging.WARNING,
+            "Twilio rate limit hit, pausing sender number",
+            to_number=sanitize_phone_number(to_number),
+            attempt=attempt,
+            pause_seconds=pause
+        )
+
+    def _parse_response(self, response: httpx.Response) -> TwilioMessage:
+        """Get the accepted message, or raise Twilio's error like the SDK does."""
+        try:
+            data = response.json()
+        except ValueError:
+            data = {}
+
+        if response.status_code >= 400:
+            self.stats['failed'] += 1
+            raise TwilioRestException(
+                response.status_code,
+                str(response.request.url),
+                msg=data.get('message') or response.text,
+                code=data.get('code'),
+                method="POST",
+                details=data.get('details')
+            )
+
+        self.stats['sent'] += 1
+        return TwilioMessage(sid=data.get('sid'), status=data.get('status'))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get sender statistics.
+
+        Returns:
+            Dictionary with the send rate, queue depth and send, wait and 429 counters
+        """
+        return {
+            'messages_per_second': self.config.messages_per_second,
+            'max_queue_size': self.config.max_queue_size,
+            'queued': self._queued,
+            'sender_numbers': len(self._buckets),
+            **self.stats
+        }
+
+    async def close(self):
+        """Close the pooled API client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# Global sender instances, one per Twilio account
+_twilio_senders: Dict[Tuple[str, str], TwilioSender] = {}
+
+
+def get_twilio_sender(account_sid: str, auth_token: str) -> TwilioSender:
+    """Get the global sender for a Twilio account."""
+    key = (account_sid, auth_token)
+    if key not in _twilio_senders:
+        _twilio_senders[key] = TwilioSender(account_sid, auth_token)
+    return _twilio_senders[key]
+
+
+def get_twilio_sender_stats() -> Dict[str, Any]:
+    """Get statistics of every global sender, keyed by account SID."""
+    return {account_sid: sender.get_stats() for (account_sid, _), sender in _twilio_senders.items()}
+
+
+async def cleanup_twilio_senders():
+    """Close the global senders' HTTP clients."""
+    for sender in list(_twilio_senders.values()):
+        await sender.close()
+    _twilio_senders.clear()
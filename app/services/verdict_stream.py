@@ -0,0 +1,82 @@
+"""
+Early verdict extraction from a streamed analysis completion.
+
+The analysis prompt asks the model to emit trust_score, classification and
+confidence before the reasons. VerdictStreamParser is fed the completion as
+it streams in and reports an EarlyVerdict as soon as those three fields are
+complete, so the verdict can be sent to the user while the reasons are still
+being generated. The full response is still parsed and validated by
+OpenAIAnalysisService.parse_analysis_response once the stream ends.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+from app.models.data_models import JobClassification
+
+
+# A number only counts once a delimiter follows it, so "8" is not read from "85"
+TRUST_SCORE_PATTERN = re.compile(r'"trust_score"\s*:\s*(\d{1,3})\s*[,}\s]')
+CLASSIFICATION_PATTERN = re.compile(r'"classification"\s*:\s*"([^"]*)"')
+CONFIDENCE_PATTERN = re.compile(r'"confidence"\s*:\s*(\d+(?:\.\d+)?)\s*[,}\s]')
+
+
+@dataclass(frozen=True)
+class EarlyVerdict:
+    """Verdict fields parsed before the full analysis response is complete."""
+    trust_score: int
+    classification: JobClassification
+    confidence: float
+
+    @property
+    def classification_text(self) -> str:
+        """Get the classification as a string."""
+        return self.classification.value
+
+
+class VerdictStreamParser:
+    """Incrementally parse the verdict fields of a streamed analysis response."""
+
+    def __init__(self):
+        self._chunks: List[str] = []
+        self.verdict: Optional[EarlyVerdict] = None
+
+    @property
+    def text(self) -> str:
+        """The response text received so far."""
+        return "".join(self._chunks)
+
+    def feed(self, chunk: str) -> Optional[EarlyVerdict]:
+        """
+        Add a chunk of the streamed response.
+
+        Args:
+            chunk: Next piece of completion text
+
+        Returns:
+            The EarlyVerdict the first time all verdict fields are complete
+            and valid, None otherwise
+        """
+        self._chunks.append(chunk)
+        if self.verdict is not None:
+            return None
+
+        text = self.text
+        trust_match = TRUST_SCORE_PATTERN.search(text)
+        classification_match = CLASSIFICATION_PATTERN.search(text)
+        confidence_match = CONFIDENCE_PATTERN.search(text)
+        if not (trust_match and classification_match and confidence_match):
+            return None
+
+        trust_score = int(trust_match.group(1))
+        confidence = float(confidence_match.group(1))
+        try:
+            classification = JobClassification(classification_match.group(1))
+        except ValueError:
+            return None
+        if not (0 <= trust_score <= 100 and 0.0 <= confidence <= 1.0):
+            return None
+
+        self.verdict = EarlyVerdict(trust_score, classification, confidence)
+        return self.verdict
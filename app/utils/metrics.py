@@ -78,6 +78,32 @@ class MetricsCollector:
             lambda: deque(maxlen=100)
         )
         
+        # User-perceived latency: message received to first verdict sent
+        self.first_verdict_times: Deque[float] = deque(maxlen=1000)
+        self.first_verdict_count = 0
+        self.early_verdict_count = 0
+        
+        # Prompt size per analysis prompt sent to OpenAI
+        self.prompt_token_counts: Deque[int] = deque(maxlen=1000)
+        self.prompt_count = 0
+        self.prompt_tokens_total = 0
+        self.prompt_tokens_saved = 0
+        self.compressed_prompt_count = 0
+        
+        # Analysis cascade runs per stage (rules, cheap model, primary model)
+        self.cascade_stage_latencies: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=1000))
+        self.cascade_stage_outcomes: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"accepted": 0, "escalated": 0, "failed": 0}
+        )
+        self.cascade_stage_tokens: Dict[str, int] = defaultdict(int)
+        self.cascade_stage_cost: Dict[str, float] = defaultdict(float)
+        
+        # PDF text extraction per engine (thread or process pool)
+        self.pdf_extraction_latencies: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=1000))
+        self.pdf_extraction_outcomes: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"success": 0, "timeout": 0, "failed": 0}
+        )
+        
         logger.info("Metrics collector initialized")
     
     def increment_counter(self, name: str, value: float = 1.0, labels: Optional[Dict[str, str]] = None):
@@ -214,6 +240,91 @@ class MetricsCollector:
             if not success:
                 self.increment_counter("service_calls_errors_total", labels=labels)
     
+    def record_time_to_first_verdict(self, message_type: str, early: bool, duration: float):
+        """
+        Record how long a user waited for the first verdict message.
+        
+        Args:
+            message_type: Message type (e.g., 'text', 'pdf')
+            early: Whether the verdict was sent from the stream, ahead of the findings
+            duration: Seconds from receiving the message to sending the verdict
+        """
+        with self._lock:
+            self.first_verdict_times.append(duration)
+            self.first_verdict_count += 1
+            if early:
+                self.early_verdict_count += 1
+            
+            labels = {
+                "message_type": message_type,
+                "early": str(early).lower()
+            }
+            self.record_histogram("time_to_first_verdict_seconds", duration, labels)
+    
+    def record_prompt_tokens(self, prompt_type: str, tokens: int, tokens_saved: int = 0):
+        """
+        Record the size of an analysis prompt.
+        
+        Args:
+            prompt_type: Prompt type (e.g., 'analysis', 'batch')
+            tokens: Estimated prompt tokens, system prompt included
+            tokens_saved: Job text tokens removed to fit the prompt budget
+        """
+        with self._lock:
+            self.prompt_token_counts.append(tokens)
+            self.prompt_count += 1
+            self.prompt_tokens_total += tokens
+            if tokens_saved > 0:
+                self.prompt_tokens_saved += tokens_saved
+                self.compressed_prompt_count += 1
+            
+            labels = {"prompt_type": prompt_type}
+            self.record_histogram("prompt_tokens", tokens, labels)
+            self.increment_counter("prompt_tokens_total", tokens, labels)
+            if tokens_saved > 0:
+                self.increment_counter("prompt_tokens_saved_total", tokens_saved, labels)
+    
+    def record_cascade_stage(self, stage: str, outcome: str, duration: float,
+                             tokens: int = 0, cost: float = 0.0):
+        """
+        Record one run of an analysis cascade stage.
+        
+        Args:
+            stage: Cascade stage ('rules', 'cheap_model' or 'primary_model')
+            outcome: 'accepted', 'escalated' (passed on to the next stage) or 'failed'
+            duration: Stage latency in seconds
+            tokens: Estimated prompt and completion tokens used
+            cost: Estimated cost in USD
+        """
+        with self._lock:
+            self.cascade_stage_latencies[stage].append(duration)
+            self.cascade_stage_outcomes[stage][outcome] += 1
+            self.cascade_stage_tokens[stage] += tokens
+            self.cascade_stage_cost[stage] += cost
+            
+            labels = {"stage": stage, "outcome": outcome}
+            self.record_histogram("cascade_stage_duration_seconds", duration, labels)
+            self.increment_counter("cascade_stage_total", 1.0, labels)
+            if cost > 0:
+                self.increment_counter("cascade_stage_cost_usd_total", cost, {"stage": stage})
+    
+    def record_pdf_extraction(self, engine: str, outcome: str, duration: float):
+        """
+        Record one PDF text extraction.
+        
+        Args:
+            engine: Extraction engine ('thread' or 'process')
+            outcome: 'success', 'timeout' or 'failed'
+            duration: Extraction latency in seconds
+        """
+        with self._lock:
+            self.pdf_extraction_latencies[engine].append(duration)
+            self.pdf_extraction_outcomes[engine][outcome] += 1
+            
+            labels = {"engine": engine, "outcome": outcome}
+            self.record_histogram("pdf_extraction_duration_seconds", duration, labels)
+            self.increment_counter("pdf_extraction_total", 1.0, labels)
+    
     def get_metric_summary(self, name: str, labels: Optional[Dict[str, str]] = None) -> Optional[MetricSummary]:
         """
         Get summary statistics for a metric.
@@ -295,6 +406,10 @@ class MetricsCollector:
                     "avg_response_time_seconds": round(avg_response_time, 3)
                 },
                 "services": service_health,
+                "time_to_first_verdict": self._time_to_first_verdict_summary(),
+                "prompt_tokens": self._prompt_tokens_summary(),
+                "analysis_cascade": self._cascade_summary(),
+                "pdf_extraction": self._pdf_extraction_summary(),
                 "counters": dict(self._counters),
                 "gauges": dict(self._gauges)
             }
@@ -316,6 +431,69 @@ class MetricsCollector:
             
             logger.info(f"Cleaned up metrics older than {max_age_hours} hours")
     
+    def _time_to_first_verdict_summary(self) -> Dict[str, Any]:
+        """Summarize recent time-to-first-verdict values."""
+        values = sorted(self.first_verdict_times)
+        return {
+            "total": self.first_verdict_count,
+            "early_percent": round(self.early_verdict_count / max(self.first_verdict_count, 1) * 100, 2),
+            "avg_seconds": round(sum(values) / len(values), 3) if values else 0,
+            "p50_seconds": round(self._percentile(values, 0.5), 3),
+            "p95_seconds": round(self._percentile(values, 0.95), 3)
+        }
+    
+    def _prompt_tokens_summary(self) -> Dict[str, Any]:
+        """Summarize recent analysis prompt sizes."""
+        values = sorted(self.prompt_token_counts)
+        return {
+            "prompts": self.prompt_count,
+            "tokens_total": self.prompt_tokens_total,
+            "tokens_saved": self.prompt_tokens_saved,
+            "compressed_percent": round(self.compressed_prompt_count / max(self.prompt_count, 1) * 100, 2),
+            "avg_tokens": round(sum(values) / len(values), 1) if values else 0,
+            "p95_tokens": self._percentile(values, 0.95)
+        }
+    
+    def _cascade_summary(self) -> Dict[str, Any]:
+        """Summarize analysis cascade stages: latency, cost and escalation rate."""
+        stages = {}
+        for stage, outcomes in self.cascade_stage_outcomes.items():
+            runs = sum(outcomes.values())
+            values = sorted(self.cascade_stage_latencies[stage])
+            stages[stage] = {
+                "runs": runs,
+                **outcomes,
+                "escalation_rate_percent": round(outcomes["escalated"] / max(runs, 1) * 100, 2),
+                "avg_seconds": round(sum(values) / len(values), 3) if values else 0,
+                "p95_seconds": round(self._percentile(values, 0.95), 3),
+                "tokens": self.cascade_stage_tokens[stage],
+                "cost_usd": round(self.cascade_stage_cost[stage], 6)
+            }
+        
+        # Every analysis that reaches the cascade starts at the rules stage
+        analyses = stages.get("rules", {}).get("runs", 0)
+        total_cost = sum(self.cascade_stage_cost.values())
+        return {
+            "stages": stages,
+            "analyses": analyses,
+            "cost_usd": round(total_cost, 6),
+            "cost_per_analysis_usd": round(total_cost / analyses, 6) if analyses else 0
+        }
+    
+    def _pdf_extraction_summary(self) -> Dict[str, Any]:
+        """Summarize recent PDF text extractions per engine."""
+        summary = {}
+        for engine, outcomes in self.pdf_extraction_outcomes.items():
+            values = sorted(self.pdf_extraction_latencies[engine])
+            summary[engine] = {
+                "extractions": sum(outcomes.values()),
+                **outcomes,
+                "avg_seconds": round(sum(values) / len(values), 3) if values else 0,
+                "p95_seconds": round(self._percentile(values, 0.95), 3),
+                "p99_seconds": round(self._percentile(values, 0.99), 3)
+            }
+        return summary
+    
     def _build_metric_key(self, name: str, labels: Optional[Dict[str, str]]) -> str:
         """Build a unique key for a metric with labels."""
         if not labels:
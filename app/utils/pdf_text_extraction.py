@@ -0,0 +1,224 @@
+"""
+PDF text extraction jobs for worker processes.
+
+This module holds the code that runs inside the PDF extraction engine's
+worker processes. It lives outside app.services on purpose: spawned workers
+import it by name, and app.services would pull the OpenAI, Twilio and Redis
+clients into every worker.
+
+Each job extracts one page range and runs under a CPU time limit, so a
+pathological document ends with PDFExtractionTimeoutError instead of
+holding a worker forever.
+
+The page helpers are shared with the thread extraction path. Pages are
+extracted lazily and extraction stops once a character budget of job text
+has been gathered, since the prompt only ever uses the start of a document.
+Pages that declare no fonts are skipped without parsing their content, and
+pages whose text layer spells out the spaces between words skip pdfplumber's
+word clustering.
+"""
+
+import logging
+import math
+import signal
+from contextlib import contextmanager
+from io import BytesIO
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import pdfplumber
+from pdfminer.pdftypes import resolve1
+from pdfminer.psparser import LIT
+from pdfplumber.page import Page
+from pdfplumber.pdf import PDF
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; jobs then only have the wall-clock timeout
+    resource = None
+
+
+logger = logging.getLogger(__name__)
+
+# A text layer with at least one space glyph per this many characters is
+# laid out in words already
+SPACE_GLYPH_RATIO = 20
+LITERAL_FORM = LIT('Form')
+
+
+class PDFExtractionTimeoutError(Exception):
+    """Exception raised when a PDF extraction job runs out of CPU or wall-clock time."""
+    pass
+
+
+class _CPUTimeExceeded(BaseException):
+    """
+    Raised from the SIGXCPU handler.
+
+    A BaseException so the page-level error handling in pdfplumber, pdfminer
+    and extract_page_range cannot swallow it.
+    """
+    pass
+
+
+def _raise_cpu_time_exceeded(signum, frame):
+    raise _CPUTimeExceeded()
+
+
+@contextmanager
+def cpu_time_limit(seconds: float) -> Iterator[None]:
+    """
+    Limit the CPU time the current process may spend in the block.
+
+    RLIMIT_CPU counts the CPU time of the whole process, so the soft limit is
+    set to the time already used plus the allowance and restored afterwards.
+
+    Args:
+        seconds: CPU seconds allowed; 0 or less disables the limit
+
+    Raises:
+        PDFExtractionTimeoutError: If the block uses more CPU time than allowed
+    """
+    if resource is None or seconds <= 0:
+        yield
+        return
+
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    limit = math.ceil(usage.ru_utime + usage.ru_stime + seconds)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+
+    previous_handler = signal.signal(signal.SIGXCPU, _raise_cpu_time_exceeded)
+    resource.setrlimit(resource.RLIMIT_CPU, (limit, hard))
+    try:
+        yield
+    except _CPUTimeExceeded:
+        raise PDFExtractionTimeoutError(f"PDF extraction exceeded its CPU time limit of {seconds}s")
+    finally:
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+        signal.signal(signal.SIGXCPU, previous_handler)
+
+
+def has_text_layer(page: Page) -> bool:
+    """
+    Check whether a page can contain text, without parsing its content.
+
+    A page without fonts in its resources has no text layer (e.g. a scanned
+    image). Form XObjects may carry their own fonts, so a page using one is
+    assumed to have text.
+
+    Args:
+        page: pdfplumber page
+
+    Returns:
+        bool: False if the page certainly has no text
+    """
+    resources = page.page_obj.resources or {}
+    if resolve1(resources.get('Font')):
+        return True
+    xobjects = resolve1(resources.get('XObject')) or {}
+    return any(resolve1(xobject).get('Subtype') is LITERAL_FORM for xobject in xobjects.values())
+
+
+def extract_page_text(page: Page) -> str:
+    """
+    Extract the text of one page.
+
+    Pages whose text layer already contains space glyphs are read line by
+    line with extract_text_simple; others need extract_text's word
+    clustering to put the spaces back.
+
+    Args:
+        page: pdfplumber page
+
+    Returns:
+        str: Raw page text
+    """
+    chars = page.chars
+    spaces = sum(1 for char in chars if char['text'] == ' ')
+    if chars and spaces * SPACE_GLYPH_RATIO >= len(chars):
+        return page.extract_text_simple() or ''
+    return page.extract_text() or ''
+
+
+def iter_page_texts(pdf: PDF, start: int = 0, end: Optional[int] = None) -> Iterator[str]:
+    """
+    Lazily extract the text of pages [start, end) of an open PDF.
+
+    Pages without a text layer and pages that fail to extract are yielded
+    as empty strings.
+
+    Args:
+        pdf: Open pdfplumber document
+        start: Index of the first page to extract
+        end: Index after the last page to extract, None for the last page
+
+    Yields:
+        str: Raw text per page, in page order
+    """
+    for page_num, page in enumerate(pdf.pages[start:end], start + 1):
+        try:
+            if has_text_layer(page):
+                page_text = extract_page_text(page)
+            else:
+                logger.debug(f"Page {page_num} has no text layer")
+                page_text = ''
+            logger.debug(f"Extracted text from page {page_num}: {len(page_text)} chars")
+        except Exception as e:
+            logger.warning(f"Failed to extract text from page {page_num}: {e}")
+            page_text = ''
+        # Parsed layout objects are not needed once the text is out
+        page.flush_cache()
+        yield page_text
+
+
+def take_within_budget(page_texts: Iterable[str], char_budget: int) -> List[str]:
+    """
+    Take page texts in order until they hold char_budget characters of text.
+
+    The page that reaches the budget is kept whole; later pages are never
+    requested from the iterable.
+
+    Args:
+        page_texts: Raw text per page, in page order
+        char_budget: Characters of text to gather; 0 or less takes every page
+
+    Returns:
+        List[str]: Raw text of the pages taken
+    """
+    taken = []
+    chars = 0
+    for page_text in page_texts:
+        taken.append(page_text)
+        chars += len(page_text.strip())
+        if 0 < char_budget <= chars:
+            break
+    return taken
+
+
+def extract_page_range(pdf_content: bytes, start: int, end: Optional[int],
+                       cpu_seconds: float, char_budget: int = 0) -> Tuple[List[str], int]:
+    """
+    Extract the text of pages [start, end) of a PDF.
+
+    Pages that fail to extract are logged and returned as empty strings, so
+    they are skipped like on the thread extraction path. Extraction stops
+    early once char_budget characters of text have been gathered.
+
+    Args:
+        pdf_content: Raw PDF content as bytes
+        start: Index of the first page to extract
+        end: Index after the last page to extract, None for the last page
+        cpu_seconds: CPU time limit for the job
+        char_budget: Characters of text to gather; 0 or less extracts the whole range
+
+    Returns:
+        Tuple[List[str], int]: Raw text per extracted page and the document's page count
+
+    Raises:
+        PDFExtractionTimeoutError: If the job exceeds its CPU time limit
+    """
+    with cpu_time_limit(cpu_seconds):
+        with pdfplumber.open(BytesIO(pdf_content)) as pdf:
+            page_texts = take_within_budget(iter_page_texts(pdf, start, end), char_budget)
+            return page_texts, len(pdf.pages)
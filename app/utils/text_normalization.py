@@ -0,0 +1,137 @@
+"""
+Canonical form of job advertisement text.
+
+Forwarded copies of one ad differ in ways that do not change its verdict:
+Unicode presentation forms, zero-width characters, emoji, spacing, case,
+tracking parameters on links and the contact details scammers rotate. This
+module provides normalize_job_text, which reduces text to one canonical form
+shared by the analysis cache, request coalescing, the similarity index,
+near-duplicate detection and the rule engine:
+
+- Unicode NFKC (full-width letters, ligatures and styled digits fold to ASCII)
+- zero-width and other invisible format characters are removed; emoji and
+  pictographs become spaces
+- URL query strings and fragments are dropped
+- email addresses and phone-shaped numbers are masked as <email> and <phone>
+- whitespace is collapsed and the text is casefolded
+
+The result is a NormalizedText carrying the canonical text and its digest.
+It is computed once per message and passed down, so later stages do not
+normalize again. The model is still prompted with the original text.
+"""
+
+import hashlib
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Union
+
+# Invisible characters used to split words past filters (soft hyphen,
+# zero-width spaces and joiners, bidi controls, variation selectors, tags)
+FORMAT_CHAR_PATTERN = re.compile(
+    "[\u00ad\u034f\u061c\u115f\u1160\u17b4\u17b5\u180b-\u180f\u200b-\u200f"
+    "\u202a-\u202e\u2060-\u206f\ufe00-\ufe0f\ufeff\U000e0000-\U000e0fff]"
+)
+# Arrows, dingbats, pictographs and emoji
+EMOJI_PATTERN = re.compile(
+    "[\u2190-\u21ff\u2300-\u23ff\u25a0-\u27bf\u2900-\u297f\u2b00-\u2bff"
+    "\u3030\u303d\u3297\u3299\U0001f000-\U0001faff]"
+)
+EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+URL_QUERY_PATTERN = re.compile(r"((?:https?://|www\.)[^\s?#]+)[?#]\S*")
+# 7 to 15 digits with optional separators; amounts ($1,500) and decimals are not
+# phones, and _mask_phone keeps runs that are not phone-shaped
+PHONE_PATTERN = re.compile(r"(?<![\w$.,])\+?\(?\d(?:[ ().-]{0,2}\d){6,14}(?!\w)")
+DIGIT_GROUP_PATTERN = re.compile(r"\d+")
+# Fewest digits for a number without a + or (area code) prefix to count as a
+# phone; dates and most amounts are shorter
+MIN_PLAIN_PHONE_DIGITS = 10
+# Cheap scan for a digit run long enough to be a phone number
+PHONE_CANDIDATE_PATTERN = re.compile(r"\d[\d ().-]{5,}\d")
+
+EMAIL_MASK = "<email>"
+PHONE_MASK = "<phone>"
+
+
+@dataclass(frozen=True)
+class NormalizedText:
+    """Job text together with its canonical form and digest."""
+    original: str
+    canonical: str
+    digest: str
+
+
+def _mask_phone(match: "re.Match[str]") -> str:
+    """
+    Mask a digit run if it is shaped like a phone number.
+
+    A leading + or parenthesized area code always counts; otherwise the run
+    needs MIN_PLAIN_PHONE_DIGITS digits and must not be a hyphenated range
+    such as a salary band (15000-20000).
+
+    Args:
+        match: PHONE_PATTERN match
+
+    Returns:
+        PHONE_MASK, or the matched text unchanged
+    """
+    number = match.group()
+    if number[0] in "+(":
+        return PHONE_MASK
+    groups = DIGIT_GROUP_PATTERN.findall(number)
+    if len(groups) == 2 and number[len(groups[0])] == "-":
+        return number
+    if sum(len(group) for group in groups) >= MIN_PLAIN_PHONE_DIGITS:
+        return PHONE_MASK
+    return number
+
+
+def canonicalize(text: str) -> str:
+    """
+    Reduce text to its canonical form.
+
+    Args:
+        text: Raw job advertisement text
+
+    Returns:
+        Canonical text (casefolded, single-spaced, contact details masked)
+    """
+    if not text.isascii():
+        text = unicodedata.normalize("NFKC", text)
+        text = FORMAT_CHAR_PATTERN.sub("", text)
+        text = EMOJI_PATTERN.sub(" ", text)
+
+    # Collapse first so the masking patterns scan less text
+    text = " ".join(text.split()).casefold()
+
+    # Each pattern only runs when a cheap check says it can match
+    if "@" in text:
+        text = EMAIL_PATTERN.sub(EMAIL_MASK, text)
+    if ("?" in text or "#" in text) and ("://" in text or "www." in text):
+        text = URL_QUERY_PATTERN.sub(r"\1", text)
+    if PHONE_CANDIDATE_PATTERN.search(text):
+        text = PHONE_PATTERN.sub(_mask_phone, text)
+    return text
+
+
+def normalize_job_text(text: Union[str, NormalizedText]) -> NormalizedText:
+    """
+    Normalize job text, reusing an existing normalization.
+
+    Args:
+        text: Raw job text, or a NormalizedText from an earlier stage
+
+    Returns:
+        NormalizedText for the text
+    """
+    if isinstance(text, NormalizedText):
+        return text
+
+    canonical = canonicalize(text or "")
+    digest = hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+    return NormalizedText(original=text or "", canonical=canonical, digest=digest)
+
+
+def text_digest(text: Union[str, NormalizedText]) -> str:
+    """Digest of the canonical form of job text."""
+    return normalize_job_text(text).digest
@@ -0,0 +1,137 @@
+"""
+Bounded in-memory cache with LRU eviction and per-entry TTL.
+
+This module provides the BoundedTTLCache class used for hot-path lookups that
+must never grow without bound, such as webhook validation results. Expiry uses
+the monotonic clock so wall-clock adjustments cannot resurrect or prematurely
+expire entries.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class BoundedTTLCache:
+    """
+    LRU cache with a size bound and a time-to-live per entry.
+
+    Entries live in an OrderedDict kept in recency order, so lookups, inserts
+    and evictions are all O(1). Expired entries are dropped when they are read
+    and opportunistically from the least recently used end on insert.
+    """
+
+    def __init__(self, max_size: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum number of entries kept
+            ttl: Default entry lifetime in seconds
+            clock: Monotonic time source (injectable for tests)
+        """
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Check for a live entry without touching recency or stats."""
+        item = self._entries.get(key)
+        return item is not None and item[0] > self._clock()
+
+    def __setitem__(self, key: Hashable, value: Any):
+        self.set(key, value)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a live entry and mark it most recently used.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            Cached value or default
+        """
+        item = self._entries.get(key)
+        if item is None:
+            self.misses += 1
+            return default
+
+        expires_at, value = item
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """
+        Insert or replace an entry, evicting the least recently used if full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Entry lifetime in seconds (default: cache TTL)
+        """
+        now = self._clock()
+        self._entries[key] = (now + (self.ttl if ttl is None else ttl), value)
+        self._entries.move_to_end(key)
+
+        self._purge_expired_head(now)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove an entry and return its value (expired or not)."""
+        item = self._entries.pop(key, None)
+        return default if item is None else item[1]
+
+    def clear(self):
+        """Remove all entries (stats are kept)."""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with size, bounds and hit/miss/eviction counters
+        """
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'ttl_seconds': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations
+        }
+
+    def _purge_expired_head(self, now: float):
+        """Drop expired entries from the least recently used end."""
+        while self._entries:
+            key, (expires_at, _) = next(iter(self._entries.items()))
+            if expires_at > now:
+                break
+            del self._entries[key]
+            self.expirations += 1
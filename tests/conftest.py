@@ -27,3 +27,17 @@ async def temp_db():
         yield session
 
     await engine.dispose()
+
+@pytest.fixture(autouse=True)
+def disable_pdf_result_cache(monkeypatch):
+    """Keep PDF text cached by one test from being returned in another."""
+    import app.services.pdf_result_cache as pdf_result_cache
+    monkeypatch.setenv("PDF_RESULT_CACHE_ENABLED", "false")
+    monkeypatch.setattr(pdf_result_cache, "_pdf_result_cache", None)
+
+@pytest.fixture(autouse=True)
+def isolate_task_fallback_journal(monkeypatch, tmp_path):
+    """Keep tasks journaled by one test from being restored in another."""
+    import app.services.background_task_processor as background_task_processor
+    monkeypatch.setenv("TASK_FALLBACK_JOURNAL_PATH", str(tmp_path / "task_queue_fallback.db"))
+    monkeypatch.setattr(background_task_processor, "_task_processor", None)
@@ -6,9 +6,13 @@ mock PDF responses, and various PDF-related error scenarios.
 """
 
 import base64
+import random
 from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
-from app.models.data_models import JobClassification
+from typing import List, Dict, Any, Optional, Set
+from app.models.data_models import JobAnalysisResult, JobClassification
+from app.services.pdf_processing import PDFDocument
+from app.services.pdf_result_cache import pdf_content_digest
+from app.utils.text_normalization import normalize_job_text
 
 
 @dataclass
@@ -364,6 +368,18 @@ class MockPDFResponses:
             "content": fake_pdf_content.encode('utf-8')
         }
     
+    @staticmethod
+    def create_pdf_document(extracted_text: str, analysis_result: Optional[JobAnalysisResult] = None) -> PDFDocument:
+        """Create the processed PDF that PDFProcessingService.load_pdf_url returns."""
+        content = extracted_text.encode('utf-8')
+        return PDFDocument(
+            digest=pdf_content_digest(content),
+            size=len(content),
+            text=normalize_job_text(extracted_text),
+            analysis_result=analysis_result,
+            cached=analysis_result is not None
+        )
+    
     @staticmethod
     def create_not_found_response() -> Dict[str, Any]:
         """Create a 404 not found response."""
@@ -407,6 +423,116 @@ class MockPDFResponses:
         }
 
 
+class PDFDocumentBuilder:
+    """Build real, minimal PDF documents for extraction tests and benchmarks."""
+    
+    FONT = b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"
+    
+    @staticmethod
+    def _escape(text: str) -> bytes:
+        encoded = text.encode("cp1252", errors="replace")
+        return encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+    
+    @classmethod
+    def _assemble(cls, content_streams: List[bytes], fontless_pages: Set[int] = frozenset()) -> bytes:
+        """Write a PDF with one page per content stream, all but fontless_pages using font /F1."""
+        objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, cls.FONT]
+        page_ids = []
+        for index, stream in enumerate(content_streams):
+            resources = b"<< >>" if index in fontless_pages else b"<< /Font << /F1 3 0 R >> >>"
+            objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+            objects.append(
+                b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                b"/Resources %s /Contents %d 0 R >>" % (resources, len(objects))
+            )
+            page_ids.append(len(objects))
+        kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+        objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+        
+        pdf = bytearray(b"%PDF-1.4\n")
+        offsets = []
+        for number, body in enumerate(objects, 1):
+            offsets.append(len(pdf))
+            pdf += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+        xref = len(pdf)
+        pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+        pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+        pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+        return bytes(pdf)
+    
+    @classmethod
+    def _text_stream(cls, text: str, font_size: int = 10) -> bytes:
+        lines = [line.strip() for line in text.strip().splitlines()]
+        stream = b"BT /F1 %d Tf %d TL 50 780 Td " % (font_size, font_size + 2)
+        return stream + b" ".join(b"(" + cls._escape(line) + b") Tj T*" for line in lines) + b" ET"
+    
+    @staticmethod
+    def _drawing_stream(rng: random.Random, shapes: int) -> bytes:
+        return b" ".join(
+            b"%d %d %d %d re f" % (rng.randint(0, 600), rng.randint(0, 780), rng.randint(1, 20), rng.randint(1, 20))
+            for _ in range(shapes)
+        )
+    
+    @classmethod
+    def build(cls, page_texts: List[str], font_size: int = 10) -> bytes:
+        """
+        Build a PDF with one page per text, one text line per line.
+        
+        Text is set in Helvetica with WinAnsiEncoding, so it is extracted
+        back by pdfplumber as written (up to leading whitespace).
+        """
+        return cls._assemble([cls._text_stream(text, font_size) for text in page_texts])
+    
+    @classmethod
+    def build_scattered(cls, pages: int, glyphs_per_page: int, seed: int = 42) -> bytes:
+        """
+        Build a PDF of individually positioned glyphs.
+        
+        Layout analysis has to group every glyph, so extraction time grows
+        with glyphs_per_page (about 1s per 10,000 glyphs per page).
+        """
+        rng = random.Random(seed)
+        streams = []
+        for _ in range(pages):
+            glyphs = b" ".join(
+                b"1 0 0 1 %d %d Tm (%c) Tj" % (rng.randint(0, 600), rng.randint(0, 780), rng.choice(b"abcdefgh"))
+                for _ in range(glyphs_per_page)
+            )
+            streams.append(b"BT /F1 6 Tf " + glyphs + b" ET")
+        return cls._assemble(streams)
+    
+    @classmethod
+    def build_drawing(cls, pages: int, shapes_per_page: int, seed: int = 42) -> bytes:
+        """
+        Build a PDF of vector artwork without any fonts, like a flattened brochure.
+        
+        The pages have no text layer, but parsing them still costs time
+        (about 1s per 10,000 shapes per page).
+        """
+        rng = random.Random(seed)
+        streams = [cls._drawing_stream(rng, shapes_per_page) for _ in range(pages)]
+        return cls._assemble(streams, fontless_pages=set(range(pages)))
+    
+    @classmethod
+    def build_brochure(cls, page_texts: List[str], artwork_every: int, shapes_per_artwork: int,
+                       seed: int = 42) -> bytes:
+        """Build a PDF of text pages with a page of vector artwork after every artwork_every pages."""
+        rng = random.Random(seed)
+        streams = []
+        fontless_pages = set()
+        for number, text in enumerate(page_texts, 1):
+            streams.append(cls._text_stream(text))
+            if artwork_every and number % artwork_every == 0:
+                fontless_pages.add(len(streams))
+                streams.append(cls._drawing_stream(rng, shapes_per_artwork))
+        return cls._assemble(streams, fontless_pages)
+    
+    @classmethod
+    def from_sample(cls, pdf_sample: PDFSample, pages: int = 1) -> bytes:
+        """Build a PDF of a sample's extracted text, repeated on each of the given pages."""
+        return cls.build([pdf_sample.extracted_text] * pages)
+
+
 class PDFExtractionMocks:
     """Mock PDF text extraction scenarios."""
     
@@ -415,7 +541,7 @@ class PDFExtractionMocks:
         """Create a mock for successful PDF text extraction."""
         from unittest.mock import Mock
         
-        mock_page = Mock()
+        mock_page = Mock(chars=[])
         mock_page.extract_text.return_value = extracted_text
         
         mock_pdf = Mock()
@@ -432,7 +558,7 @@ class PDFExtractionMocks:
         
         mock_pages = []
         for text in page_texts:
-            mock_page = Mock()
+            mock_page = Mock(chars=[])
             mock_page.extract_text.return_value = text
             mock_pages.append(mock_page)
         
@@ -448,7 +574,7 @@ class PDFExtractionMocks:
         """Create a mock for PDF with no extractable text."""
         from unittest.mock import Mock
         
-        mock_page = Mock()
+        mock_page = Mock(chars=[])
         mock_page.extract_text.return_value = ""
         
         mock_pdf = Mock()
@@ -0,0 +1,187 @@
+"""
+Cost and latency benchmark for the confidence-gated analysis cascade.
+
+This module runs the job ad fixtures through EnhancedAIAnalysisService with
+simulated completions. The primary model always returns the fixture's
+expected classification. The cheap model is right most of the time but
+less sure of itself: it answers with low confidence on a share of ads and
+with a wrong, neighbouring classification on others. Rule-based detection
+is the real one. Model latencies are drawn per call and summed per analysis
+instead of slept, and cost comes from the analysis_cascade metrics.
+
+Runs with the cascade off (as before) and on at several cheap model
+confidence thresholds are compared on primary model calls, latency, cost
+per analysis and agreement with the primary model's verdict.
+"""
+
+import asyncio
+import json
+import random
+import statistics
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from unittest.mock import AsyncMock, patch
+
+from app.models.data_models import AppConfig
+from app.services.analysis_cascade import AnalysisCascade, AnalysisCascadeConfig
+from app.services.analysis_coalescer import AnalysisCoalescer, AnalysisCoalescerConfig
+from app.services.enhanced_ai_analysis import EnhancedAIAnalysisService
+from app.utils.logging import get_logger
+from app.utils.metrics import get_metrics_collector, reset_metrics_collector
+from tests.fixtures.job_ad_samples import JobAdFixtures
+
+logger = get_logger(__name__)
+
+PRIMARY_MODEL = "gpt-4"
+CHEAP_MODEL = "gpt-3.5-turbo"
+TRUST_SCORES = {"Legit": 82, "Suspicious": 48, "Likely Scam": 11}
+NEIGHBOURS = {"Legit": "Suspicious", "Suspicious": "Likely Scam", "Likely Scam": "Suspicious"}
+
+
+@dataclass
+class CascadeBenchmarkConfig:
+    """Configuration for analysis cascade benchmarking."""
+    analyses: int = 600
+    cheap_wrong_share: float = 0.15
+    cheap_unsure_share: float = 0.25
+    cheap_latency: float = 1.2
+    primary_latency: float = 3.5
+    thresholds: List[float] = field(default_factory=lambda: [0.7, 0.8, 0.9])
+    seed: int = 42
+
+
+class CascadeBenchmark:
+    """Compare analysis cost and latency with and without the cascade."""
+
+    def __init__(self, config: CascadeBenchmarkConfig):
+        self.config = config
+        self.samples = JobAdFixtures.get_all_samples()
+
+    def _response(self, rng: random.Random, model: str, expected: str) -> str:
+        """Simulate a completion from the given model."""
+        classification = expected
+        if model == PRIMARY_MODEL:
+            confidence = rng.uniform(0.85, 0.95)
+        elif rng.random() < self.config.cheap_wrong_share:
+            classification = NEIGHBOURS[expected]
+            confidence = rng.uniform(0.5, 0.85)
+        elif rng.random() < self.config.cheap_unsure_share:
+            confidence = rng.uniform(0.55, 0.79)
+        else:
+            confidence = rng.uniform(0.8, 0.95)
+        return json.dumps({
+            "trust_score": TRUST_SCORES[classification],
+            "classification": classification,
+            "confidence": round(confidence, 2),
+            "reasons": [
+                "The pay offered is out of line with the duties described",
+                "The contact details cannot be verified independently",
+                "The application process skips any interview or screening"
+            ]
+        })
+
+    async def run_path(self, name: str, cascade_config: AnalysisCascadeConfig) -> Dict[str, Any]:
+        """Analyze the same ad sequence under one cascade configuration."""
+        rng = random.Random(self.config.seed)
+        reset_metrics_collector()
+        with patch('app.services.enhanced_ai_analysis.AsyncOpenAI'):
+            service = EnhancedAIAnalysisService(AppConfig(
+                openai_api_key="benchmark_key",
+                twilio_account_sid="benchmark_sid",
+                twilio_auth_token="benchmark_token",
+                twilio_phone_number="+1234567890",
+                openai_model=PRIMARY_MODEL,
+                openai_fallback_model=CHEAP_MODEL
+            ))
+        service.cascade = AnalysisCascade(cascade_config)
+        service.coalescer = AnalysisCoalescer(AnalysisCoalescerConfig(distributed=False))
+        service.near_duplicate_store.lookup = AsyncMock(return_value=None)
+        service.near_duplicate_store.record = AsyncMock()
+        service._check_similar_job_ads = AsyncMock(return_value=None)
+
+        latency = 0.0
+        calls = {PRIMARY_MODEL: 0, CHEAP_MODEL: 0}
+        expected = ""
+
+        async def request_completion(model, prompt, max_tokens, timeout):
+            nonlocal latency
+            calls[model] += 1
+            mean = self.config.primary_latency if model == PRIMARY_MODEL else self.config.cheap_latency
+            latency += rng.lognormvariate(0, 0.35) * mean
+            return self._response(rng, model, expected)
+
+        service._request_completion = request_completion
+
+        latencies: List[float] = []
+        agreed = 0
+        for index in range(self.config.analyses):
+            sample = self.samples[index % len(self.samples)]
+            expected = sample.expected_classification.value
+            latency = 0.0
+            result = await service.analyze_job_ad(f"{sample.content}\nRef {index}")
+            latencies.append(latency)
+            agreed += result.classification == sample.expected_classification
+
+        cascade = get_metrics_collector().get_current_metrics()["analysis_cascade"]
+        latencies.sort()
+        return {
+            "path": name,
+            "analyses": self.config.analyses,
+            "primary_calls": calls[PRIMARY_MODEL],
+            "cheap_calls": calls[CHEAP_MODEL],
+            "mean_model_seconds": statistics.mean(latencies),
+            "p95_model_seconds": latencies[int(0.95 * (len(latencies) - 1))],
+            "cost_per_analysis_usd": cascade["cost_per_analysis_usd"],
+            "agreement_with_primary_percent": agreed / self.config.analyses * 100,
+            "stages": cascade["stages"]
+        }
+
+    async def run_benchmark(self) -> Dict[str, Any]:
+        """Run the cascade off and at each cheap model threshold."""
+        results = [await self.run_path("primary_only", AnalysisCascadeConfig(enabled=False))]
+        for threshold in self.config.thresholds:
+            results.append(await self.run_path(
+                f"cascade@{threshold}",
+                AnalysisCascadeConfig(enabled=True, cheap_model_confidence_threshold=threshold)
+            ))
+        logger.info(f"Cascade benchmark: {self.config.analyses} analyses per path")
+
+        return {
+            "results": results,
+            "benchmark_config": {
+                "analyses": self.config.analyses,
+                "cheap_wrong_share": self.config.cheap_wrong_share,
+                "cheap_unsure_share": self.config.cheap_unsure_share,
+                "cheap_latency": self.config.cheap_latency,
+                "primary_latency": self.config.primary_latency
+            },
+            "timestamp": datetime.now().isoformat()
+        }
+
+
+async def run_cascade_benchmark(config: Optional[CascadeBenchmarkConfig] = None) -> Dict[str, Any]:
+    """Run analysis cascade benchmark and return results."""
+    if config is None:
+        config = CascadeBenchmarkConfig()
+
+    return await CascadeBenchmark(config).run_benchmark()
+
+
+if __name__ == "__main__":
+    async def main():
+        report = await run_cascade_benchmark()
+
+        print("\n" + "="*80)
+        print("ANALYSIS CASCADE BENCHMARK RESULTS")
+        print("="*80)
+        for result in report["results"]:
+            print(
+                f"{result['path']:>14}: {result['primary_calls']} primary calls, "
+                f"mean {result['mean_model_seconds']:.2f}s, P95 {result['p95_model_seconds']:.2f}s, "
+                f"${result['cost_per_analysis_usd']:.5f}/analysis, "
+                f"{result['agreement_with_primary_percent']:.1f}% agree with primary"
+            )
+        print(json.dumps(report, indent=2))
+
+    asyncio.run(main())
@@ -0,0 +1,161 @@
+"""
+Viral-forward burst benchmark for analysis request coalescing.
+
+This module replays a burst of forwarded messages through AnalysisCoalescer:
+a few viral scam ads are each forwarded many times within seconds (with
+case and spacing differences), mixed with unique ads. Every analysis takes
+a fixed simulated OpenAI latency and its result is only cached (under the
+exact text, like the analysis cache) once it completes, so without
+coalescing every forward that arrives during that window pays for its own
+call. Two paths run over the same arrival schedule:
+- uncoalesced: one analysis per request, as before
+- coalesced: AnalysisCoalescer in-process single flight
+
+The Redis lock variant needs a live Redis and is covered by unit tests.
+"""
+
+import asyncio
+import json
+import random
+import statistics
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.models.data_models import JobAnalysisResult, JobClassification
+from app.services.analysis_coalescer import AnalysisCoalescer, AnalysisCoalescerConfig
+from app.utils.logging import get_logger
+from tests.fixtures.job_ad_samples import JobAdFixtures
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class CoalescingBenchmarkConfig:
+    """Configuration for coalescing burst benchmarking."""
+    viral_ads: int = 3
+    forwards_per_viral_ad: int = 60
+    unique_ads: int = 40
+    burst_seconds: float = 5.0
+    analysis_latency: float = 2.0
+    seed: int = 42
+
+
+class CoalescingBenchmark:
+    """Benchmark OpenAI calls during a viral burst with and without coalescing."""
+
+    def __init__(self, config: CoalescingBenchmarkConfig):
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.samples = [sample.content for sample in JobAdFixtures.get_all_samples()]
+
+    def _forward(self, text: str) -> str:
+        """Vary case and spacing the way forwarded copies differ."""
+        if self.random.random() < 0.3:
+            text = text.upper()
+        return ("\n" if self.random.random() < 0.5 else "") + text.replace("\n", "\n" * self.random.randint(1, 2))
+
+    def _schedule(self) -> List[Tuple[float, str]]:
+        viral = [self.random.choice(self.samples) + f"\nRef {i}" for i in range(self.config.viral_ads)]
+        requests = [
+            self._forward(text) for text in viral for _ in range(self.config.forwards_per_viral_ad)
+        ] + [
+            self.random.choice(self.samples) + f"\nUnique {i}" for i in range(self.config.unique_ads)
+        ]
+        return sorted((self.random.uniform(0, self.config.burst_seconds), text) for text in requests)
+
+    async def run_path(self, name: str, schedule: List[Tuple[float, str]]) -> Dict[str, Any]:
+        """Replay the arrival schedule and count simulated OpenAI calls."""
+        coalescer = AnalysisCoalescer(AnalysisCoalescerConfig(enabled=(name == "coalesced"), distributed=False))
+        cache: Set[str] = set()
+        calls = 0
+        cache_hits = 0
+        latencies: List[float] = []
+        started = time.monotonic()
+
+        async def analyze(text: str) -> JobAnalysisResult:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(self.config.analysis_latency)
+            cache.add(text)  # exact-text key, as CacheKey.analysis_result
+            return JobAnalysisResult(
+                trust_score=10,
+                classification=JobClassification.LIKELY_SCAM,
+                reasons=["Simulated reason one", "Simulated reason two", "Simulated reason three"],
+                confidence=0.9
+            )
+
+        async def request(at: float, text: str):
+            nonlocal cache_hits
+            await asyncio.sleep(max(0.0, at - (time.monotonic() - started)))
+            arrived = time.monotonic()
+            if text in cache:
+                cache_hits += 1
+            else:
+                await coalescer.run(text, lambda: analyze(text))
+            latencies.append(time.monotonic() - arrived)
+
+        await asyncio.gather(*(request(at, text) for at, text in schedule))
+
+        return {
+            "path": name,
+            "requests": len(schedule),
+            "openai_calls": calls,
+            "cache_hits": cache_hits,
+            "saved_calls": coalescer.get_stats()["saved_calls"],
+            "p50_latency": statistics.median(latencies),
+            "max_latency": max(latencies)
+        }
+
+    async def run_benchmark(self) -> Dict[str, Any]:
+        """Run both paths over the same burst and compare them."""
+        schedule = self._schedule()
+        logger.info(f"Coalescing benchmark: {len(schedule)} requests over {self.config.burst_seconds}s")
+
+        uncoalesced = await self.run_path("uncoalesced", schedule)
+        coalesced = await self.run_path("coalesced", schedule)
+
+        return {
+            "results": [uncoalesced, coalesced],
+            "comparison": {
+                "calls_saved": uncoalesced["openai_calls"] - coalesced["openai_calls"],
+                "call_reduction_pct": (1 - coalesced["openai_calls"] / uncoalesced["openai_calls"]) * 100
+            },
+            "benchmark_config": {
+                "viral_ads": self.config.viral_ads,
+                "forwards_per_viral_ad": self.config.forwards_per_viral_ad,
+                "unique_ads": self.config.unique_ads,
+                "burst_seconds": self.config.burst_seconds,
+                "analysis_latency": self.config.analysis_latency
+            },
+            "timestamp": datetime.now().isoformat()
+        }
+
+
+async def run_coalescing_benchmark(config: Optional[CoalescingBenchmarkConfig] = None) -> Dict[str, Any]:
+    """Run coalescing burst benchmark and return results."""
+    if config is None:
+        config = CoalescingBenchmarkConfig()
+
+    return await CoalescingBenchmark(config).run_benchmark()
+
+
+if __name__ == "__main__":
+    async def main():
+        report = await run_coalescing_benchmark()
+
+        print("\n" + "="*80)
+        print("ANALYSIS COALESCING BURST BENCHMARK RESULTS")
+        print("="*80)
+        for result in report["results"]:
+            print(
+                f"{result['path']:>11}: {result['openai_calls']} OpenAI calls for {result['requests']} requests "
+                f"({result['cache_hits']} cache hits, {result['saved_calls']} coalesced), "
+                f"p50 latency {result['p50_latency']:.2f}s"
+            )
+        comparison = report["comparison"]
+        print(f"Calls saved: {comparison['calls_saved']} ({comparison['call_reduction_pct']:.0f}%)")
+        print(json.dumps(report, indent=2))
+
+    asyncio.run(main())
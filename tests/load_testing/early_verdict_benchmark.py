@@ -0,0 +1,156 @@
+"""
+Time-to-first-verdict benchmark for streamed analysis replies.
+
+This module replays simulated analysis completions for the job ad fixtures
+through VerdictStreamParser on a virtual clock. Each completion has a time
+to first token and a token rate drawn from a mix of normal and slow
+completions, and is streamed in small deltas. Three reply paths are timed
+from request to the first message that tells the user the verdict:
+- complete: wait for the whole completion, then send one message (as before)
+- streamed_old_order: stream, but with the old field order, where reasons
+  come before confidence so the verdict only parses near the end
+- streamed: stream with trust_score, classification and confidence first
+
+A fixed Twilio send latency is added to every path. Time to the findings
+is reported too: the streamed path sends them once the completion ends.
+"""
+
+import asyncio
+import json
+import random
+import statistics
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.services.verdict_stream import VerdictStreamParser
+from app.utils.logging import get_logger
+from tests.fixtures.job_ad_samples import JobAdFixtures
+
+logger = get_logger(__name__)
+
+CHARS_PER_TOKEN = 4
+
+
+@dataclass
+class EarlyVerdictBenchmarkConfig:
+    """Configuration for time-to-first-verdict benchmarking."""
+    completions: int = 500
+    time_to_first_token: float = 0.6
+    tokens_per_second: float = 30.0
+    slow_share: float = 0.2
+    slow_tokens_per_second: float = 8.0
+    send_latency: float = 0.4
+    seed: int = 42
+
+
+class EarlyVerdictBenchmark:
+    """Compare time to first verdict with and without streaming."""
+
+    def __init__(self, config: EarlyVerdictBenchmarkConfig):
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.samples = JobAdFixtures.get_all_samples()
+
+    def _response(self, sample, verdict_first: bool) -> str:
+        """Build a model response for a fixture in the given field order."""
+        classification = sample.expected_classification.value
+        trust_score = {"Legit": 82, "Suspicious": 48, "Likely Scam": 11}[classification]
+        reasons = [
+            "The duties and requirements are described in enough detail to verify",
+            "The contact details and application process can be checked independently",
+            "The pay and conditions are in line with similar roles in the area"
+        ]
+        fields = [("trust_score", trust_score), ("classification", classification)]
+        if verdict_first:
+            fields += [("confidence", 0.86), ("reasons", reasons)]
+        else:
+            fields += [("reasons", reasons), ("confidence", 0.86)]
+        return json.dumps(dict(fields), indent=4)
+
+    def _stream_times(self, response: str, tokens_per_second: float) -> Dict[str, Optional[float]]:
+        """Stream a response on a virtual clock; return verdict and completion times."""
+        parser = VerdictStreamParser()
+        chunk_chars = CHARS_PER_TOKEN
+        verdict_at = None
+        elapsed = self.config.time_to_first_token
+        for start in range(0, len(response), chunk_chars):
+            elapsed += 1 / tokens_per_second
+            if parser.feed(response[start:start + chunk_chars]) and verdict_at is None:
+                verdict_at = elapsed
+        return {"verdict": verdict_at, "complete": elapsed}
+
+    def run_benchmark(self) -> Dict[str, Any]:
+        """Time all three reply paths over the same simulated completions."""
+        send = self.config.send_latency
+        first_verdict: Dict[str, List[float]] = {"complete": [], "streamed_old_order": [], "streamed": []}
+        findings: List[float] = []
+
+        for _ in range(self.config.completions):
+            sample = self.random.choice(self.samples)
+            slow = self.random.random() < self.config.slow_share
+            rate = self.config.slow_tokens_per_second if slow else self.config.tokens_per_second
+
+            new_order = self._stream_times(self._response(sample, verdict_first=True), rate)
+            old_order = self._stream_times(self._response(sample, verdict_first=False), rate)
+
+            first_verdict["complete"].append(new_order["complete"] + send)
+            first_verdict["streamed_old_order"].append(old_order["verdict"] + send)
+            first_verdict["streamed"].append(new_order["verdict"] + send)
+            findings.append(max(new_order["complete"], new_order["verdict"] + send) + send)
+
+        def summarize(values: List[float]) -> Dict[str, float]:
+            values = sorted(values)
+            return {
+                "p50_seconds": statistics.median(values),
+                "p95_seconds": values[int(0.95 * (len(values) - 1))],
+                "max_seconds": values[-1]
+            }
+
+        results = {path: summarize(values) for path, values in first_verdict.items()}
+        logger.info(f"Early verdict benchmark: {self.config.completions} completions")
+        return {
+            "time_to_first_verdict": results,
+            "streamed_time_to_findings": summarize(findings),
+            "comparison": {
+                "p50_saved_seconds": results["complete"]["p50_seconds"] - results["streamed"]["p50_seconds"],
+                "p95_saved_seconds": results["complete"]["p95_seconds"] - results["streamed"]["p95_seconds"]
+            },
+            "benchmark_config": {
+                "completions": self.config.completions,
+                "tokens_per_second": self.config.tokens_per_second,
+                "slow_share": self.config.slow_share,
+                "slow_tokens_per_second": self.config.slow_tokens_per_second,
+                "send_latency": send
+            },
+            "timestamp": datetime.now().isoformat()
+        }
+
+
+async def run_early_verdict_benchmark(
+    config: Optional[EarlyVerdictBenchmarkConfig] = None
+) -> Dict[str, Any]:
+    """Run early verdict benchmark and return results."""
+    if config is None:
+        config = EarlyVerdictBenchmarkConfig()
+
+    return await asyncio.to_thread(EarlyVerdictBenchmark(config).run_benchmark)
+
+
+if __name__ == "__main__":
+    async def main():
+        report = await run_early_verdict_benchmark()
+
+        print("\n" + "="*80)
+        print("TIME TO FIRST VERDICT BENCHMARK RESULTS")
+        print("="*80)
+        for path, result in report["time_to_first_verdict"].items():
+            print(
+                f"{path:>20}: P50 {result['p50_seconds']:.2f}s, P95 {result['p95_seconds']:.2f}s, "
+                f"max {result['max_seconds']:.2f}s"
+            )
+        findings = report["streamed_time_to_findings"]
+        print(f"Streamed findings arrive at P50 {findings['p50_seconds']:.2f}s, P95 {findings['p95_seconds']:.2f}s")
+        print(json.dumps(report, indent=2))
+
+    asyncio.run(main())
@@ -0,0 +1,171 @@
+"""
+Task enqueue microbenchmark.
+
+This module measures the Redis round-trips (RTTs) and wall-clock cost of putting
+a task on the background queue. It compares three paths:
+- legacy: the previous per-command sequence (LLEN x3, LPUSH, SETEX, INCR)
+- single: BackgroundTaskProcessor.queue_task (one pipeline per task)
+- batch: BackgroundTaskProcessor.queue_tasks (one pipeline per batch)
+
+Each execute_command or execute_pipeline call is one round-trip, so RTTs are
+read from the connection manager's request counter.
+"""
+
+import asyncio
+import time
+import statistics
+import json
+from typing import List, Dict, Any, Optional
+from dataclasses import dataclass
+from datetime import datetime
+
+from app.services.redis_connection_manager import RedisConnectionManager, RedisConfig
+from app.services.background_task_processor import (
+    BackgroundTaskProcessor, TaskQueueConfig, ProcessingTask, TaskPriority, TaskStatus
+)
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class EnqueueBenchmarkConfig:
+    """Configuration for enqueue benchmarking."""
+    redis_url: str = "redis://localhost:6379/0"
+    task_count: int = 1000
+    batch_size: int = 50
+
+
+class EnqueueBenchmark:
+    """Benchmark Redis round-trips per enqueued task."""
+
+    def __init__(self, config: EnqueueBenchmarkConfig):
+        self.config = config
+        self.redis_manager: Optional[RedisConnectionManager] = None
+        self.processor: Optional[BackgroundTaskProcessor] = None
+
+    async def setup(self):
+        """Setup Redis connection manager and processor (workers are not started)."""
+        self.redis_manager = RedisConnectionManager(RedisConfig(primary_url=self.config.redis_url))
+        if not await self.redis_manager.initialize():
+            raise RuntimeError("Failed to initialize Redis connection manager")
+
+        self.processor = BackgroundTaskProcessor(TaskQueueConfig(
+            max_queue_size=self.config.task_count * 4
+        ))
+        self.processor.redis_manager = self.redis_manager
+
+    async def cleanup(self):
+        """Remove benchmark queues and close connections."""
+        if self.redis_manager:
+            for priority in TaskPriority:
+                await self.redis_manager.execute_command('delete', self.processor._get_queue_key(priority))
+            await self.redis_manager.execute_command('delete', self.processor.DEPTH_KEY, self.processor.WAKEUP_KEY)
+            await self.redis_manager.cleanup()
+
+    def _make_tasks(self, prefix: str) -> List[ProcessingTask]:
+        """Create benchmark tasks."""
+        return [
+            ProcessingTask(
+                task_id=f"{prefix}_{i}",
+                task_type="benchmark",
+                payload={"message_data": {"MessageSid": f"SM{i:032d}", "Body": "benchmark"}},
+                priority=TaskPriority.NORMAL
+            )
+            for i in range(self.config.task_count)
+        ]
+
+    async def _legacy_enqueue(self, task: ProcessingTask):
+        """Reproduce the pre-pipeline enqueue sequence for comparison."""
+        for priority in TaskPriority:
+            await self.redis_manager.execute_command('llen', self.processor._get_queue_key(priority))
+        await self.redis_manager.execute_command(
+            'lpush', self.processor._get_queue_key(task.priority), json.dumps(task.to_dict())
+        )
+        await self.redis_manager.execute_command(
+            'setex', f'task_queue:status:{task.task_id}', 3600, TaskStatus.PENDING.value
+        )
+        await self.redis_manager.execute_command('incr', 'task_queue:metrics:queued')
+
+    async def _measure(self, name: str, tasks: List[ProcessingTask], enqueue) -> Dict[str, Any]:
+        """Measure RTTs and latency for an enqueue strategy."""
+        requests_before = self.redis_manager.metrics.total_requests
+        latencies: List[float] = []
+
+        started = time.perf_counter()
+        for unit in enqueue(tasks):
+            unit_start = time.perf_counter()
+            await unit
+            latencies.append((time.perf_counter() - unit_start) * 1000)
+        elapsed = time.perf_counter() - started
+
+        round_trips = self.redis_manager.metrics.total_requests - requests_before
+        return {
+            "path": name,
+            "tasks": len(tasks),
+            "round_trips": round_trips,
+            "round_trips_per_task": round_trips / len(tasks),
+            "avg_call_latency_ms": statistics.mean(latencies) if latencies else 0.0,
+            "tasks_per_second": len(tasks) / elapsed if elapsed > 0 else 0.0
+        }
+
+    async def run_benchmark(self) -> Dict[str, Any]:
+        """Run all enqueue strategies."""
+        batch_size = self.config.batch_size
+
+        legacy = await self._measure(
+            "legacy", self._make_tasks("legacy"),
+            lambda tasks: (self._legacy_enqueue(task) for task in tasks)
+        )
+        single = await self._measure(
+            "single", self._make_tasks("single"),
+            lambda tasks: (self.processor.queue_task(task) for task in tasks)
+        )
+        batch = await self._measure(
+            "batch", self._make_tasks("batch"),
+            lambda tasks: (
+                self.processor.queue_tasks(tasks[i:i + batch_size])
+                for i in range(0, len(tasks), batch_size)
+            )
+        )
+
+        return {
+            "results": [legacy, single, batch],
+            "benchmark_config": {
+                "task_count": self.config.task_count,
+                "batch_size": batch_size
+            },
+            "timestamp": datetime.now().isoformat()
+        }
+
+
+async def run_enqueue_benchmark(config: Optional[EnqueueBenchmarkConfig] = None) -> Dict[str, Any]:
+    """Run enqueue benchmark and return results."""
+    if config is None:
+        config = EnqueueBenchmarkConfig()
+
+    benchmark = EnqueueBenchmark(config)
+
+    try:
+        await benchmark.setup()
+        return await benchmark.run_benchmark()
+    finally:
+        await benchmark.cleanup()
+
+
+if __name__ == "__main__":
+    async def main():
+        report = await run_enqueue_benchmark()
+
+        print("\n" + "="*80)
+        print("TASK ENQUEUE MICROBENCHMARK RESULTS")
+        print("="*80)
+        for result in report["results"]:
+            print(
+                f"{result['path']:>8}: {result['round_trips_per_task']:.2f} RTT/task, "
+                f"{result['avg_call_latency_ms']:.2f} ms/call, "
+                f"{result['tasks_per_second']:.0f} tasks/s"
+            )
+        print(json.dumps(report, indent=2))
+
+    asyncio.run(main())
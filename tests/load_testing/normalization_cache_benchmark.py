@@ -0,0 +1,197 @@
+"""
+Analysis cache hit rate on forwarded traffic, before and after normalization.
+
+This module replays sample traffic through two analysis cache key functions:
+- raw: MD5 of the exact text, as CacheKey.analysis_result used to hash it
+- normalized: CacheKey.analysis_result over the canonical text
+
+Traffic is built from the job ad fixtures. Each ad is first posted once, then
+forwarded many times with the edits forwarding and re-posting introduce:
+case and spacing, emoji, zero-width characters, full-width letters, tracking
+parameters on links and a rotated phone number or email. Unique ads are mixed
+in so the hit rate is not flattered by repeats alone. A key's first request
+misses and stores the verdict; later requests with the same key hit.
+
+Wrong-verdict collisions (two ads with different expected classifications
+sharing a key) are counted too and must stay at 0.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.services.caching_service import CacheKey
+from app.utils.logging import get_logger
+from tests.fixtures.job_ad_samples import JobAdFixtures, JobAdSample
+
+logger = get_logger(__name__)
+
+EMOJI = ["🔥", "💰", "✅", "🚀", "👉", "⭐", "📞", "💼"]
+ZERO_WIDTH = ["\u200b", "\u200c", "\u200d", "\u2060", "\ufeff"]
+
+
+@dataclass
+class NormalizationCacheBenchmarkConfig:
+    """Configuration for normalization cache hit rate benchmarking."""
+    forwards_per_sample: int = 40
+    unique_ads: int = 200
+    seed: int = 42
+
+
+class NormalizationCacheBenchmark:
+    """Compare analysis cache hit rates with raw and normalized keys."""
+
+    def __init__(self, config: NormalizationCacheBenchmarkConfig):
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.samples: List[JobAdSample] = JobAdFixtures.get_all_samples()
+        self.mutations: Dict[str, Callable[[str], str]] = {
+            "case_and_spacing": self._change_case_and_spacing,
+            "emoji": self._add_emoji,
+            "zero_width": self._add_zero_width,
+            "full_width": self._full_width,
+            "tracking_link": self._add_tracking_link,
+            "rotated_contact": self._add_contact,
+        }
+
+    def _change_case_and_spacing(self, text: str) -> str:
+        text = "\n\n".join(line.upper() if self.random.random() < 0.3 else line for line in text.split("\n"))
+        return ("  " if self.random.random() < 0.5 else "") + text + ("\n" if self.random.random() < 0.5 else "")
+
+    def _add_emoji(self, text: str) -> str:
+        words = text.split(" ")
+        for _ in range(self.random.randint(1, 4)):
+            words.insert(self.random.randrange(len(words) + 1), self.random.choice(EMOJI))
+        return " ".join(words)
+
+    def _add_zero_width(self, text: str) -> str:
+        chars = list(text)
+        for _ in range(self.random.randint(1, 5)):
+            chars.insert(self.random.randrange(len(chars) + 1), self.random.choice(ZERO_WIDTH))
+        return "".join(chars)
+
+    def _full_width(self, text: str) -> str:
+        # Styled headlines: the title line in full-width letters
+        lines = text.split("\n")
+        title = next(i for i, line in enumerate(lines) if line.strip())
+        lines[title] = "".join(chr(ord(c) + 0xFEE0) if "!" <= c <= "~" else c for c in lines[title])
+        return "\n".join(lines)
+
+    def _add_tracking_link(self, text: str) -> str:
+        return f"{text}\nApply here: https://jobs.example.com/apply?utm_source=whatsapp&ref={self.random.getrandbits(32):x}"
+
+    def _add_contact(self, text: str) -> str:
+        if self.random.random() < 0.5:
+            number = f"+1 ({self.random.randint(200, 999)}) {self.random.randint(200, 999)}-{self.random.randint(0, 9999):04d}"
+            return f"{text}\nWhatsApp {number}"
+        return f"{text}\nSend your CV to recruiter{self.random.randint(1, 9999)}@gmail.com"
+
+    def _traffic(self) -> List[Tuple[int, str, str]]:
+        """Build (source sample, mutation, text) requests in arrival order."""
+        requests = [(sample_id, "original", sample.content) for sample_id, sample in enumerate(self.samples)]
+        mutation_names = list(self.mutations)
+        for sample_id, sample in enumerate(self.samples):
+            for i in range(self.config.forwards_per_sample):
+                mutation = mutation_names[i % len(mutation_names)]
+                requests.append((sample_id, mutation, self.mutations[mutation](sample.content)))
+        for i in range(self.config.unique_ads):
+            sample_id = self.random.randrange(len(self.samples))
+            requests.append((sample_id, "unique", f"{self.samples[sample_id].content}\nPosition #{i} in branch {i * 7}"))
+
+        head, tail = requests[:len(self.samples)], requests[len(self.samples):]
+        self.random.shuffle(tail)
+        return head + tail
+
+    def run_path(self, name: str, key_function: Callable[[str], str],
+                 traffic: List[Tuple[int, str, str]]) -> Dict[str, Any]:
+        """Replay traffic against an empty cache keyed by key_function."""
+        cache: Dict[str, int] = {}
+        hits = wrong_verdicts = 0
+        per_mutation: Dict[str, Dict[str, int]] = defaultdict(lambda: {"requests": 0, "hits": 0})
+
+        started = time.perf_counter()
+        for sample_id, mutation, text in traffic:
+            key = key_function(text)
+            stats = per_mutation[mutation]
+            stats["requests"] += 1
+            if key in cache:
+                hits += 1
+                stats["hits"] += 1
+                if (self.samples[cache[key]].expected_classification
+                        != self.samples[sample_id].expected_classification):
+                    wrong_verdicts += 1
+            else:
+                cache[key] = sample_id
+        elapsed = time.perf_counter() - started
+
+        return {
+            "path": name,
+            "requests": len(traffic),
+            "hit_rate": hits / len(traffic),
+            "cache_entries": len(cache),
+            "wrong_verdicts": wrong_verdicts,
+            "key_us_per_request": elapsed / len(traffic) * 1e6,
+            "hit_rate_by_mutation": {
+                mutation: stats["hits"] / stats["requests"] for mutation, stats in per_mutation.items()
+            }
+        }
+
+    def run_benchmark(self) -> Dict[str, Any]:
+        """Replay the same traffic with raw and normalized keys and compare them."""
+        traffic = self._traffic()
+        logger.info(f"Normalization cache benchmark: {len(traffic)} requests")
+
+        raw = self.run_path(
+            "raw", lambda text: f"analysis:{hashlib.md5(text.encode()).hexdigest()}", traffic
+        )
+        normalized = self.run_path("normalized", CacheKey.analysis_result, traffic)
+
+        return {
+            "results": [raw, normalized],
+            "comparison": {
+                "hit_rate_gain": normalized["hit_rate"] - raw["hit_rate"],
+                "analyses_saved": raw["cache_entries"] - normalized["cache_entries"]
+            },
+            "benchmark_config": {
+                "samples": len(self.samples),
+                "forwards_per_sample": self.config.forwards_per_sample,
+                "unique_ads": self.config.unique_ads
+            },
+            "timestamp": datetime.now().isoformat()
+        }
+
+
+async def run_normalization_cache_benchmark(
+    config: Optional[NormalizationCacheBenchmarkConfig] = None
+) -> Dict[str, Any]:
+    """Run normalization cache benchmark and return results."""
+    if config is None:
+        config = NormalizationCacheBenchmarkConfig()
+
+    return await asyncio.to_thread(NormalizationCacheBenchmark(config).run_benchmark)
+
+
+if __name__ == "__main__":
+    async def main():
+        report = await run_normalization_cache_benchmark()
+
+        print("\n" + "="*80)
+        print("ANALYSIS CACHE NORMALIZATION BENCHMARK RESULTS")
+        print("="*80)
+        for result in report["results"]:
+            print(
+                f"{result['path']:>10}: hit rate {result['hit_rate']:.1%} over {result['requests']} requests, "
+                f"{result['cache_entries']} analyses, {result['wrong_verdicts']} wrong verdicts, "
+                f"{result['key_us_per_request']:.1f}us per key"
+            )
+        comparison = report["comparison"]
+        print(f"Hit rate gain: {comparison['hit_rate_gain']:.1%}, analyses saved: {comparison['analyses_saved']}")
+        print(json.dumps(report, indent=2))
+
+    asyncio.run(main())
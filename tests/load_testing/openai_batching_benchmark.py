@@ -0,0 +1,280 @@
+"""
+Bulk analysis throughput benchmark against a simulated rate-limited OpenAI.
+
+This module runs EnhancedAIAnalysisService over fixture-built job ads twice:
+- legacy: analyze_job_ad five at a time with a fixed one second sleep between
+  groups and no client-side limiter, as analyze_job_ads_batch worked before
+- batched: analyze_job_ads_batch packing short ads into shared completions,
+  paced by OpenAIRateLimiter from the simulated rate-limit headers
+
+The simulated endpoint enforces requests-per-minute and tokens-per-minute
+budgets the way OpenAI does (prompt plus max_tokens charged up front) and
+answers over the limit with 429 and retry-after. Time is virtual: the clock
+runs speedup times faster than wall time, so minutes of traffic take seconds.
+"""
+
+import asyncio
+import json
+import random
+import re
+import statistics
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import httpx
+import openai
+
+from app.models.data_models import AppConfig
+from app.services.enhanced_ai_analysis import EnhancedAIAnalysisService
+from app.services.near_duplicate_store import NearDuplicateStore, NearDuplicateConfig
+from app.services.openai_rate_limiter import OpenAIRateLimiter, OpenAIRateLimitConfig, estimate_tokens
+from app.utils.logging import get_logger
+from tests.fixtures.job_ad_samples import JobAdFixtures
+
+logger = get_logger(__name__)
+
+VERDICT = {
+    "trust_score": 80,
+    "classification": "Legit",
+    "reasons": [
+        "Employer details and contact channels look verifiable",
+        "Pay and duties are consistent with the stated role",
+        "No upfront fees or pressure tactics are present"
+    ],
+    "confidence": 0.9
+}
+
+
+@dataclass
+class OpenAIBatchingBenchmarkConfig:
+    """Configuration for bulk analysis throughput benchmarking."""
+    ad_count: int = 300
+    min_lines_per_ad: int = 3
+    max_lines_per_ad: int = 12
+    server_requests_per_minute: int = 500
+    server_tokens_per_minute: int = 40000
+    base_latency: float = 1.0  # virtual seconds per completion
+    latency_per_token: float = 0.01
+    speedup: float = 60.0  # virtual seconds per wall second
+    seed: int = 42
+
+
+class VirtualClock:
+    """Monotonic clock running speedup times faster than wall time."""
+
+    def __init__(self, speedup: float):
+        self.speedup = speedup
+        self.started = time.monotonic()
+
+    def __call__(self) -> float:
+        return (time.monotonic() - self.started) * self.speedup
+
+    async def sleep(self, seconds: float):
+        await asyncio.sleep(seconds / self.speedup)
+
+
+class SimulatedOpenAI:
+    """Chat completions endpoint with OpenAI-style rate limits and headers."""
+
+    def __init__(self, config: OpenAIBatchingBenchmarkConfig, clock: VirtualClock):
+        self.config = config
+        self.clock = clock
+        self.levels = {"requests": float(config.server_requests_per_minute),
+                       "tokens": float(config.server_tokens_per_minute)}
+        self.limits = dict(self.levels)
+        self.updated_at = clock()
+        self.stats = {"requests": 0, "rate_limited": 0, "prompt_tokens": 0, "completion_tokens": 0}
+
+    def _refill(self):
+        now = self.clock()
+        for kind, limit in self.limits.items():
+            self.levels[kind] = min(limit, self.levels[kind] + (now - self.updated_at) * limit / 60.0)
+        self.updated_at = now
+
+    def _headers(self) -> Dict[str, str]:
+        headers = {}
+        for kind, limit in self.limits.items():
+            headers[f"x-ratelimit-limit-{kind}"] = str(int(limit))
+            headers[f"x-ratelimit-remaining-{kind}"] = str(max(0, int(self.levels[kind])))
+            headers[f"x-ratelimit-reset-{kind}"] = f"{(limit - self.levels[kind]) * 60.0 / limit:.3f}s"
+        return headers
+
+    async def create(self, model: str, messages: List[Dict[str, str]], max_tokens: int, **kwargs):
+        self._refill()
+        prompt_tokens = sum(estimate_tokens(message["content"]) for message in messages)
+        cost = prompt_tokens + max_tokens
+        if self.levels["requests"] < 1 or self.levels["tokens"] < cost:
+            self.stats["rate_limited"] += 1
+            retry_after = max(
+                (1 - self.levels["requests"]) * 60.0 / self.limits["requests"],
+                (cost - self.levels["tokens"]) * 60.0 / self.limits["tokens"]
+            )
+            response = httpx.Response(
+                429,
+                headers={**self._headers(), "retry-after": f"{retry_after:.3f}"},
+                request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+            )
+            raise openai.RateLimitError("Rate limit reached", response=response, body=None)
+
+        self.levels["requests"] -= 1
+        self.levels["tokens"] -= cost
+        headers = self._headers()
+
+        numbers = re.findall(r"JOB ADVERTISEMENT (\d+):", messages[-1]["content"])
+        if numbers:
+            content = json.dumps({"results": [{"id": int(number), **VERDICT} for number in numbers]})
+        else:
+            content = json.dumps(VERDICT)
+        completion_tokens = estimate_tokens(content)
+        await self.clock.sleep(self.config.base_latency + self.config.latency_per_token * completion_tokens)
+
+        self.stats["requests"] += 1
+        self.stats["prompt_tokens"] += prompt_tokens
+        self.stats["completion_tokens"] += completion_tokens
+        response = SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(total_tokens=prompt_tokens + completion_tokens)
+        )
+        return SimpleNamespace(headers=headers, parse=lambda: response)
+
+
+class OpenAIBatchingBenchmark:
+    """Benchmark fixed-sleep single-ad analysis versus packed batch analysis."""
+
+    def __init__(self, config: OpenAIBatchingBenchmarkConfig):
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.lines = [
+            line.strip()
+            for sample in JobAdFixtures.get_all_samples()
+            for line in sample.content.splitlines()
+            if line.strip()
+        ]
+
+    def _make_ad(self, number: int) -> str:
+        count = self.random.randint(self.config.min_lines_per_ad, self.config.max_lines_per_ad)
+        return f"Posting #{number}\n" + "\n".join(self.random.choice(self.lines) for _ in range(count))
+
+    def _make_service(self, clock: VirtualClock, server: SimulatedOpenAI, limiter_enabled: bool) -> EnhancedAIAnalysisService:
+        service = EnhancedAIAnalysisService(AppConfig(
+            openai_api_key="benchmark_key",
+            twilio_account_sid="benchmark_sid",
+            twilio_auth_token="benchmark_token",
+            twilio_phone_number="benchmark_phone"
+        ))
+        service.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(
+            with_raw_response=SimpleNamespace(create=server.create)
+        )))
+        service.rate_limiter = OpenAIRateLimiter(
+            OpenAIRateLimitConfig(enabled=limiter_enabled), clock=clock, sleep=clock.sleep
+        )
+        service.near_duplicate_store = NearDuplicateStore(NearDuplicateConfig(enabled=False))
+        service.similarity_threshold = 1.01  # every ad is new; measure model traffic only
+        return service
+
+    async def _legacy(self, service: EnhancedAIAnalysisService, clock: VirtualClock, ads: List[str]):
+        results = []
+        for i in range(0, len(ads), 5):
+            group = await asyncio.gather(*(service.analyze_job_ad(ad) for ad in ads[i:i+5]), return_exceptions=True)
+            results.extend(group)
+            if i + 5 < len(ads):
+                await clock.sleep(1)
+        return results
+
+    async def run_path(self, name: str, ads: List[str]) -> Dict[str, Any]:
+        """Analyze every ad through one path and report throughput and token use."""
+        clock = VirtualClock(self.config.speedup)
+        server = SimulatedOpenAI(self.config, clock)
+        service = self._make_service(clock, server, limiter_enabled=(name == "batched"))
+
+        started = clock()
+        if name == "batched":
+            results = await service.analyze_job_ads_batch(ads)
+        else:
+            results = await self._legacy(service, clock, ads)
+        minutes = (clock() - started) / 60.0
+
+        model_verdicts = sum(
+            1 for result in results if not isinstance(result, Exception) and result.reasons == VERDICT["reasons"]
+        )
+        total_tokens = server.stats["prompt_tokens"] + server.stats["completion_tokens"]
+        return {
+            "path": name,
+            "ads": len(ads),
+            "virtual_minutes": minutes,
+            "model_verdicts": model_verdicts,
+            "degraded_results": len(ads) - sum(
+                1 for result in results if not isinstance(result, Exception) and result.confidence > 0.5
+            ),
+            "ads_per_minute": len(ads) / minutes if minutes else 0.0,
+            "model_verdicts_per_minute": model_verdicts / minutes if minutes else 0.0,
+            "tokens_per_model_verdict": total_tokens / model_verdicts if model_verdicts else 0.0,
+            "server": dict(server.stats),
+            "limiter": service.rate_limiter.get_stats()
+        }
+
+    async def run_benchmark(self) -> Dict[str, Any]:
+        """Run both paths over the same ads and compare them."""
+        ads = [self._make_ad(number) for number in range(self.config.ad_count)]
+        logger.info(f"OpenAI batching benchmark: {len(ads)} ads, avg {statistics.mean(map(len, ads)):.0f} chars")
+
+        legacy = await self.run_path("legacy", ads)
+        batched = await self.run_path("batched", ads)
+
+        return {
+            "results": [legacy, batched],
+            "comparison": {
+                "throughput_gain": (
+                    batched["model_verdicts_per_minute"] / legacy["model_verdicts_per_minute"]
+                    if legacy["model_verdicts_per_minute"] else 0.0
+                ),
+                "token_reduction_pct": (
+                    (1 - batched["tokens_per_model_verdict"] / legacy["tokens_per_model_verdict"]) * 100
+                    if legacy["tokens_per_model_verdict"] else 0.0
+                )
+            },
+            "benchmark_config": {
+                "ad_count": self.config.ad_count,
+                "avg_ad_length": statistics.mean(map(len, ads)),
+                "server_requests_per_minute": self.config.server_requests_per_minute,
+                "server_tokens_per_minute": self.config.server_tokens_per_minute
+            },
+            "timestamp": datetime.now().isoformat()
+        }
+
+
+async def run_openai_batching_benchmark(
+    config: Optional[OpenAIBatchingBenchmarkConfig] = None
+) -> Dict[str, Any]:
+    """Run bulk analysis throughput benchmark and return results."""
+    if config is None:
+        config = OpenAIBatchingBenchmarkConfig()
+
+    return await OpenAIBatchingBenchmark(config).run_benchmark()
+
+
+if __name__ == "__main__":
+    async def main():
+        report = await run_openai_batching_benchmark()
+
+        print("\n" + "="*80)
+        print("BULK ANALYSIS THROUGHPUT BENCHMARK RESULTS")
+        print("="*80)
+        for result in report["results"]:
+            print(
+                f"{result['path']:>8}: {result['model_verdicts_per_minute']:.0f} model verdicts/min, "
+                f"{result['tokens_per_model_verdict']:.0f} tokens/verdict, "
+                f"{result['server']['requests']} requests, {result['server']['rate_limited']} rate limited, "
+                f"{result['degraded_results']} degraded results"
+            )
+        comparison = report["comparison"]
+        print(
+            f"Throughput {comparison['throughput_gain']:.1f}x, "
+            f"token reduction {comparison['token_reduction_pct']:.0f}%"
+        )
+        print(json.dumps(report, indent=2))
+
+    asyncio.run(main())
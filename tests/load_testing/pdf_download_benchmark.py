@@ -0,0 +1,237 @@
+"""
+Memory and connection benchmark for PDF downloads.
+
+This module serves a mix of media from a local HTTP server: normal PDFs,
+oversized PDFs sent without a Content-Length header (so the size is only
+known while reading) and HTML error pages served with a 200 status in
+place of a PDF. The same concurrent download schedule is run through two
+paths:
+- buffered: a new httpx.AsyncClient per download and response.content
+  read in full before the size and header checks (as before)
+- streamed: PDFProcessingService.download_pdf on its pooled client,
+  streaming into a spooled buffer and aborting early
+
+Peak Python memory is measured with tracemalloc, and the server counts the
+connections it accepts (each one is a TLS handshake against a real media
+host) and the bytes it manages to send.
+"""
+
+import asyncio
+import json
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from app.models.data_models import AppConfig
+from app.services.pdf_processing import PDFProcessingService, PDFDownloadError
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+SEND_CHUNK = 64 * 1024
+
+
+@dataclass
+class PDFDownloadBenchmarkConfig:
+    """Configuration for PDF download benchmarking."""
+    downloads: int = 60
+    concurrency: int = 20
+    max_pdf_size_mb: int = 10
+    pdf_size_mb: float = 2.0
+    oversized_size_mb: float = 40.0
+    oversized_share: float = 0.2
+    non_pdf_share: float = 0.1
+
+
+class MediaServer:
+    """Minimal keep-alive HTTP/1.1 server for benchmark media."""
+
+    def __init__(self, config: PDFDownloadBenchmarkConfig):
+        self.config = config
+        self.bodies = {
+            "/pdf": b"%PDF-1.4\n" + b"0" * int(config.pdf_size_mb * 1024 * 1024),
+            "/oversized": b"%PDF-1.4\n" + b"0" * int(config.oversized_size_mb * 1024 * 1024),
+            "/html": b"<html><body>Media expired</body></html>" + b" " * (5 * 1024 * 1024)
+        }
+        self.connections = 0
+        self.bytes_sent = 0
+        self.server: Optional[asyncio.base_events.Server] = None
+
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                request = await reader.readuntil(b"\r\n\r\n")
+                path = request.split(b" ", 2)[1].decode()
+                body = self.bodies[path]
+                if path == "/oversized":
+                    # No Content-Length: the size is only known while reading
+                    writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/pdf\r\nTransfer-Encoding: chunked\r\n\r\n")
+                    for start in range(0, len(body), SEND_CHUNK):
+                        chunk = body[start:start + SEND_CHUNK]
+                        writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                        await writer.drain()
+                        self.bytes_sent += len(chunk)
+                    writer.write(b"0\r\n\r\n")
+                else:
+                    writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n" % len(body))
+                    for start in range(0, len(body), SEND_CHUNK):
+                        writer.write(body[start:start + SEND_CHUNK])
+                        await writer.drain()
+                        self.bytes_sent += min(SEND_CHUNK, len(body) - start)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+class PDFDownloadBenchmark:
+    """Compare buffered and streamed PDF downloads."""
+
+    def __init__(self, config: PDFDownloadBenchmarkConfig):
+        self.config = config
+        self.max_size_bytes = config.max_pdf_size_mb * 1024 * 1024
+
+    def _schedule(self) -> List[str]:
+        oversized = int(self.config.downloads * self.config.oversized_share)
+        non_pdf = int(self.config.downloads * self.config.non_pdf_share)
+        paths = ["/oversized"] * oversized + ["/html"] * non_pdf
+        paths += ["/pdf"] * (self.config.downloads - len(paths))
+        # Spread the bad media through the schedule
+        return [paths[(i * 7) % len(paths)] for i in range(len(paths))]
+
+    async def _buffered_download(self, url: str) -> bytes:
+        """The previous download path: a fresh client and a fully buffered body."""
+        async with httpx.AsyncClient(timeout=httpx.Timeout(30.0), follow_redirects=True) as client:
+            response = await client.get(url)
+            response.raise_for_status()
+            content_length = response.headers.get('content-length')
+            if content_length and int(content_length) > self.max_size_bytes:
+                raise PDFDownloadError("PDF file too large")
+            pdf_content = response.content
+            if len(pdf_content) > self.max_size_bytes:
+                raise PDFDownloadError("PDF file too large")
+            if not pdf_content.startswith(b'%PDF-'):
+                raise PDFDownloadError("Downloaded file is not a valid PDF")
+            return pdf_content
+
+    async def run_path(self, name: str, base_url: str, server: MediaServer) -> Dict[str, Any]:
+        """Download the schedule through one path and measure it."""
+        service = PDFProcessingService(AppConfig(
+            openai_api_key="benchmark_key",
+            twilio_account_sid="benchmark_sid",
+            twilio_auth_token="benchmark_token",
+            twilio_phone_number="+1234567890",
+            max_pdf_size_mb=self.config.max_pdf_size_mb
+        ))
+        download = service.download_pdf if name == "streamed" else self._buffered_download
+        semaphore = asyncio.Semaphore(self.config.concurrency)
+        latencies: List[float] = []
+        outcomes = {"ok": 0, "rejected": 0}
+        connections = server.connections
+        bytes_sent = server.bytes_sent
+
+        async def fetch(path: str):
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    await download(base_url + path)
+                    outcomes["ok"] += 1
+                except PDFDownloadError:
+                    outcomes["rejected"] += 1
+                latencies.append(time.perf_counter() - started)
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        await asyncio.gather(*(fetch(path) for path in self._schedule()))
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        await service.cleanup()
+
+        latencies.sort()
+        return {
+            "path": name,
+            "downloads": len(latencies),
+            **outcomes,
+            "connections_opened": server.connections - connections,
+            "mb_sent_by_server": (server.bytes_sent - bytes_sent) / (1024 * 1024),
+            "peak_memory_mb": peak / (1024 * 1024),
+            "p50_seconds": statistics.median(latencies),
+            "p95_seconds": latencies[int(0.95 * (len(latencies) - 1))],
+            "total_seconds": elapsed
+        }
+
+    async def run_benchmark(self) -> Dict[str, Any]:
+        """Run both paths against the same local media server."""
+        server = MediaServer(self.config)
+        port = await server.start()
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            buffered = await self.run_path("buffered", base_url, server)
+            streamed = await self.run_path("streamed", base_url, server)
+        finally:
+            await server.stop()
+        logger.info(f"PDF download benchmark: {self.config.downloads} downloads per path")
+
+        return {
+            "results": [buffered, streamed],
+            "comparison": {
+                "peak_memory_reduction_percent": (
+                    (1 - streamed["peak_memory_mb"] / buffered["peak_memory_mb"]) * 100
+                    if buffered["peak_memory_mb"] else 0.0
+                ),
+                "connections_saved": buffered["connections_opened"] - streamed["connections_opened"]
+            },
+            "benchmark_config": {
+                "downloads": self.config.downloads,
+                "concurrency": self.config.concurrency,
+                "max_pdf_size_mb": self.config.max_pdf_size_mb,
+                "oversized_share": self.config.oversized_share,
+                "non_pdf_share": self.config.non_pdf_share
+            },
+            "timestamp": datetime.now().isoformat()
+        }
+
+
+async def run_pdf_download_benchmark(
+    config: Optional[PDFDownloadBenchmarkConfig] = None
+) -> Dict[str, Any]:
+    """Run PDF download benchmark and return results."""
+    if config is None:
+        config = PDFDownloadBenchmarkConfig()
+
+    return await PDFDownloadBenchmark(config).run_benchmark()
+
+
+if __name__ == "__main__":
+    async def main():
+        report = await run_pdf_download_benchmark()
+
+        print("\n" + "="*80)
+        print("PDF DOWNLOAD BENCHMARK RESULTS")
+        print("="*80)
+        for result in report["results"]:
+            print(
+                f"{result['path']:>9}: peak {result['peak_memory_mb']:.1f} MB, "
+                f"{result['connections_opened']} connections, {result['mb_sent_by_server']:.0f} MB sent, "
+                f"P50 {result['p50_seconds'] * 1000:.0f}ms, P95 {result['p95_seconds'] * 1000:.0f}ms, "
+                f"{result['ok']} ok / {result['rejected']} rejected"
+            )
+        print(json.dumps(report, indent=2))
+
+    asyncio.run(main())
@@ -0,0 +1,192 @@
+"""
+Latency benchmark for early-stop PDF text extraction.
+
+This module builds multi-page brochures from the PDF fixtures: the job ad
+on the first page, followed by pages of company brochure copy with a
+full-page piece of vector artwork (no fonts) every few pages. Single-page
+ads are measured too. Every document goes through
+PDFProcessingService.process_pdf_bytes, the PDF branch of message handling
+without the download, in three modes:
+
+- previous: every page through page.extract_text(), as before
+- full: lazy extraction with the text-layer probe and simple extraction,
+  but no character budget
+- budgeted: the same, stopping at the character budget
+
+The prompt the model would be sent (the text fitted by PromptBudgeter) is
+compared with the previous mode, to show what the budget costs.
+"""
+
+import asyncio
+import json
+import random
+import statistics
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
+from io import BytesIO
+from typing import Any, Dict, List, Optional, Tuple
+
+import pdfplumber
+
+from app.models.data_models import AppConfig
+from app.services.pdf_extraction_engine import PDFExtractionEngine, PDFExtractionConfig
+from app.services.pdf_processing import PDFProcessingService
+from app.services.prompt_budget import PromptBudgeter, PromptBudgetConfig
+from app.utils.logging import get_logger
+from tests.fixtures.pdf_samples import PDFDocumentBuilder, PDFFixtures
+
+logger = get_logger(__name__)
+
+BROCHURE_COPY = [
+    "Our culture is built on collaboration, integrity and a shared commitment to excellence.",
+    "We partner with leading organizations across many industries to deliver customer-focused solutions.",
+    "Team members enjoy a supportive environment with mentoring and professional development.",
+    "Our offices are located in vibrant neighborhoods close to public transport and amenities.",
+    "We are proud of our award-winning workplace and our long history of community service.",
+    "Benefits include flexible hours, a wellness allowance and generous paid time off.",
+]
+MODES = ("previous", "full", "budgeted")
+
+
+def _extract_text_previous(service: PDFProcessingService, pdf_content: bytes) -> str:
+    """Extract every page with page.extract_text(), like the thread path used to."""
+    with pdfplumber.open(BytesIO(pdf_content)) as pdf:
+        page_texts = [page.extract_text() for page in pdf.pages]
+    return service._join_page_texts(page_texts)
+
+
+@dataclass
+class PDFEarlyStopBenchmarkConfig:
+    """Configuration for early-stop PDF extraction benchmarking."""
+    brochures: int = 8
+    single_page_ads: int = 8
+    brochure_pages: int = 40
+    lines_per_page: int = 45
+    artwork_every: int = 6
+    shapes_per_artwork: int = 5000
+    char_budget: int = 20000
+    job_text_token_budget: int = 1500
+    seed: int = 42
+
+
+class PDFEarlyStopBenchmark:
+    """Compare full and budgeted PDF text extraction latency."""
+
+    def __init__(self, config: PDFEarlyStopBenchmarkConfig):
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.samples = PDFFixtures.get_valid_samples()
+        self.budgeter = PromptBudgeter(PromptBudgetConfig(job_text_token_budget=config.job_text_token_budget))
+
+    def _brochure(self, sample) -> bytes:
+        """Build a brochure: the ad, then pages of copy with artwork pages between them."""
+        page_texts = [sample.extracted_text]
+        for _ in range(self.config.brochure_pages - 1):
+            page_texts.append("\n".join(self.random.choice(BROCHURE_COPY) for _ in range(self.config.lines_per_page)))
+        return PDFDocumentBuilder.build_brochure(page_texts, self.config.artwork_every, self.config.shapes_per_artwork)
+
+    def _documents(self) -> List[Tuple[str, bytes]]:
+        documents = []
+        for index in range(self.config.brochures):
+            documents.append(("brochure", self._brochure(self.samples[index % len(self.samples)])))
+        for index in range(self.config.single_page_ads):
+            documents.append(("single_page", PDFDocumentBuilder.from_sample(self.samples[index % len(self.samples)])))
+        return documents
+
+    async def run_mode(self, mode: str, documents: List[Tuple[str, bytes]]) -> Tuple[Dict[str, Any], List[str]]:
+        """Process every document in one mode, one at a time."""
+        service = PDFProcessingService(AppConfig(
+            openai_api_key="benchmark_key",
+            twilio_account_sid="benchmark_sid",
+            twilio_auth_token="benchmark_token",
+            twilio_phone_number="+1234567890"
+        ))
+        service.extraction_engine = PDFExtractionEngine(PDFExtractionConfig(
+            char_budget=self.config.char_budget if mode == "budgeted" else 0,
+            timeout=120.0
+        ))
+
+        if mode == "previous":
+            service._extract_text_sync = partial(_extract_text_previous, service)
+
+        latencies: Dict[str, List[float]] = {}
+        extracted_chars: Dict[str, List[int]] = {}
+        prompts = []
+        for kind, pdf_content in documents:
+            started = time.perf_counter()
+            text = await service.process_pdf_bytes(pdf_content)
+            latencies.setdefault(kind, []).append(time.perf_counter() - started)
+            extracted_chars.setdefault(kind, []).append(len(text))
+            prompts.append(self.budgeter.fit(text).text)
+
+        return {
+            "mode": mode,
+            "by_kind": {
+                kind: {
+                    "documents": len(values),
+                    "p50_seconds": statistics.median(values),
+                    "p95_seconds": sorted(values)[int(0.95 * (len(values) - 1))],
+                    "avg_extracted_chars": statistics.mean(extracted_chars[kind])
+                }
+                for kind, values in latencies.items()
+            }
+        }, prompts
+
+    async def run_benchmark(self) -> Dict[str, Any]:
+        """Run every mode on the same documents."""
+        documents = self._documents()
+        results = []
+        previous_prompts: List[str] = []
+        for mode in MODES:
+            result, prompts = await self.run_mode(mode, documents)
+            if mode == "previous":
+                previous_prompts = prompts
+            result["prompts_unchanged"] = sum(
+                prompt == previous for prompt, previous in zip(prompts, previous_prompts)
+            )
+            results.append(result)
+        logger.info(f"PDF early-stop benchmark: {len(documents)} documents per mode")
+
+        return {
+            "results": results,
+            "benchmark_config": {
+                "brochures": self.config.brochures,
+                "single_page_ads": self.config.single_page_ads,
+                "brochure_pages": self.config.brochure_pages,
+                "artwork_every": self.config.artwork_every,
+                "char_budget": self.config.char_budget,
+                "job_text_token_budget": self.config.job_text_token_budget
+            },
+            "timestamp": datetime.now().isoformat()
+        }
+
+
+async def run_pdf_early_stop_benchmark(
+    config: Optional[PDFEarlyStopBenchmarkConfig] = None
+) -> Dict[str, Any]:
+    """Run early-stop PDF extraction benchmark and return results."""
+    if config is None:
+        config = PDFEarlyStopBenchmarkConfig()
+
+    return await PDFEarlyStopBenchmark(config).run_benchmark()
+
+
+if __name__ == "__main__":
+    async def main():
+        report = await run_pdf_early_stop_benchmark()
+
+        print("\n" + "="*80)
+        print("PDF EARLY-STOP EXTRACTION BENCHMARK RESULTS")
+        print("="*80)
+        for result in report["results"]:
+            for kind, stats in result["by_kind"].items():
+                print(
+                    f"{result['mode']:>8} {kind:>11}: P50 {stats['p50_seconds'] * 1000:.0f}ms, "
+                    f"P95 {stats['p95_seconds'] * 1000:.0f}ms, {stats['avg_extracted_chars']:.0f} chars"
+                )
+            print(f"{result['mode']:>8}: {result['prompts_unchanged']} prompts unchanged")
+        print(json.dumps(report, indent=2))
+
+    asyncio.run(main())
@@ -0,0 +1,208 @@
+"""
+Throughput and latency benchmark for PDF text extraction.
+
+This module builds real PDFs from the PDF fixtures: most are single-page
+ads, some are long multi-page documents, and a few are pathological pages
+of individually positioned glyphs that take pdfplumber many seconds. The
+same concurrent schedule is extracted with PDFProcessingService.extract_text
+on the thread path (as before) and on the process-pool engine.
+
+Besides throughput and P50/P99 latency per document class, an event loop
+probe measures how late a 10ms timer fires while extraction runs; on the
+thread path that lag is GIL contention felt by every other request. Each
+path gets its own default thread pool, and the drain time also counts work
+that outlived its timeout: an abandoned thread keeps extracting, a worker
+job is stopped by its CPU time limit.
+"""
+
+import asyncio
+import json
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.models.data_models import AppConfig
+from app.services.pdf_extraction_engine import PDFExtractionEngine, PDFExtractionConfig
+from app.services.pdf_processing import PDFProcessingService, PDFExtractionError
+from app.utils.logging import get_logger
+from tests.fixtures.pdf_samples import PDFDocumentBuilder, PDFFixtures
+
+logger = get_logger(__name__)
+
+PROBE_INTERVAL = 0.01
+
+
+@dataclass
+class PDFExtractionBenchmarkConfig:
+    """Configuration for PDF extraction benchmarking."""
+    documents: int = 60
+    concurrency: int = 8
+    long_document_share: float = 0.2
+    long_document_pages: int = 12
+    pathological_documents: int = 2
+    pathological_pages: int = 8
+    pathological_glyphs_per_page: int = 20000
+    workers: int = min(4, os.cpu_count() or 1)
+    pages_per_job: int = 4
+    cpu_time_limit: float = 3.0
+    timeout: float = 10.0
+
+
+class PDFExtractionBenchmark:
+    """Compare thread and process-pool PDF extraction."""
+
+    def __init__(self, config: PDFExtractionBenchmarkConfig):
+        self.config = config
+        self.samples = PDFFixtures.get_valid_samples()
+
+    def _schedule(self) -> List[Tuple[str, bytes]]:
+        """Build the documents, spreading long and pathological ones through the schedule."""
+        long_every = max(1, round(1 / self.config.long_document_share)) if self.config.long_document_share else 0
+        documents = []
+        for index in range(self.config.documents):
+            sample = self.samples[index % len(self.samples)]
+            if long_every and index % long_every == long_every - 1:
+                documents.append(("long", PDFDocumentBuilder.from_sample(sample, self.config.long_document_pages)))
+            else:
+                documents.append(("single_page", PDFDocumentBuilder.from_sample(sample)))
+
+        pathological = PDFDocumentBuilder.build_scattered(
+            self.config.pathological_pages, self.config.pathological_glyphs_per_page
+        )
+        for number in range(self.config.pathological_documents):
+            position = (number + 1) * len(documents) // (self.config.pathological_documents + 1)
+            documents.insert(position, ("pathological", pathological))
+        return documents
+
+    async def _probe_event_loop(self, lags: List[float], stop: asyncio.Event):
+        """Record how late a short timer fires while extraction runs."""
+        while not stop.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(PROBE_INTERVAL)
+            lags.append(time.perf_counter() - started - PROBE_INTERVAL)
+
+    async def run_path(self, name: str, documents: List[Tuple[str, bytes]]) -> Dict[str, Any]:
+        """Extract the schedule on one path and measure it."""
+        service = PDFProcessingService(AppConfig(
+            openai_api_key="benchmark_key",
+            twilio_account_sid="benchmark_sid",
+            twilio_auth_token="benchmark_token",
+            twilio_phone_number="+1234567890"
+        ))
+        service.extraction_engine = PDFExtractionEngine(PDFExtractionConfig(
+            process_pool=name == "process",
+            max_workers=self.config.workers,
+            pages_per_job=self.config.pages_per_job,
+            cpu_time_limit=self.config.cpu_time_limit,
+            timeout=self.config.timeout
+        ))
+        loop = asyncio.get_running_loop()
+        thread_pool = ThreadPoolExecutor()
+        loop.set_default_executor(thread_pool)
+        if name == "process":
+            await service.extraction_engine.start()
+
+        semaphore = asyncio.Semaphore(self.config.concurrency)
+        latencies: Dict[str, List[float]] = {}
+        outcomes = {"ok": 0, "timed_out": 0}
+
+        async def extract(kind: str, pdf_content: bytes):
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    await service.extract_text(pdf_content)
+                    outcomes["ok"] += 1
+                except PDFExtractionError:
+                    outcomes["timed_out"] += 1
+                latencies.setdefault(kind, []).append(time.perf_counter() - started)
+
+        lags: List[float] = []
+        stop = asyncio.Event()
+        probe = asyncio.create_task(self._probe_event_loop(lags, stop))
+        started = time.perf_counter()
+        await asyncio.gather(*(extract(kind, pdf_content) for kind, pdf_content in documents))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await probe
+        await service.extraction_engine.shutdown()
+        # Wait for extractions abandoned after their timeout
+        thread_pool.shutdown(wait=True)
+        drain_seconds = time.perf_counter() - started
+        loop.set_default_executor(ThreadPoolExecutor())
+
+        all_latencies = sorted(value for values in latencies.values() for value in values)
+        lags.sort()
+        return {
+            "path": name,
+            "documents": len(documents),
+            **outcomes,
+            "throughput_docs_per_second": len(documents) / elapsed,
+            "p50_seconds": statistics.median(all_latencies),
+            "p99_seconds": all_latencies[int(0.99 * (len(all_latencies) - 1))],
+            "by_kind": {
+                kind: {
+                    "documents": len(values),
+                    "p50_seconds": statistics.median(values),
+                    "max_seconds": max(values)
+                }
+                for kind, values in latencies.items()
+            },
+            "event_loop_lag_p99_ms": lags[int(0.99 * (len(lags) - 1))] * 1000 if lags else 0.0,
+            "event_loop_lag_max_ms": lags[-1] * 1000 if lags else 0.0,
+            "total_seconds": elapsed,
+            "drain_seconds": drain_seconds
+        }
+
+    async def run_benchmark(self) -> Dict[str, Any]:
+        """Run the thread and process paths on the same documents."""
+        documents = self._schedule()
+        results = [await self.run_path("thread", documents), await self.run_path("process", documents)]
+        logger.info(f"PDF extraction benchmark: {len(documents)} documents per path")
+
+        return {
+            "results": results,
+            "benchmark_config": {
+                "documents": len(documents),
+                "concurrency": self.config.concurrency,
+                "long_document_pages": self.config.long_document_pages,
+                "pathological_documents": self.config.pathological_documents,
+                "workers": self.config.workers,
+                "pages_per_job": self.config.pages_per_job,
+                "cpu_time_limit": self.config.cpu_time_limit,
+                "timeout": self.config.timeout
+            },
+            "timestamp": datetime.now().isoformat()
+        }
+
+
+async def run_pdf_extraction_benchmark(
+    config: Optional[PDFExtractionBenchmarkConfig] = None
+) -> Dict[str, Any]:
+    """Run PDF extraction benchmark and return results."""
+    if config is None:
+        config = PDFExtractionBenchmarkConfig()
+
+    return await PDFExtractionBenchmark(config).run_benchmark()
+
+
+if __name__ == "__main__":
+    async def main():
+        report = await run_pdf_extraction_benchmark()
+
+        print("\n" + "="*80)
+        print("PDF EXTRACTION BENCHMARK RESULTS")
+        print("="*80)
+        for result in report["results"]:
+            print(
+                f"{result['path']:>8}: {result['throughput_docs_per_second']:.1f} docs/s, "
+                f"P50 {result['p50_seconds'] * 1000:.0f}ms, P99 {result['p99_seconds'] * 1000:.0f}ms, "
+                f"loop lag P99 {result['event_loop_lag_p99_ms']:.0f}ms / max {result['event_loop_lag_max_ms']:.0f}ms, "
+                f"{result['ok']} ok / {result['timed_out']} timed out, drained in {result['drain_seconds']:.1f}s"
+            )
+        print(json.dumps(report, indent=2))
+
+    asyncio.run(main())
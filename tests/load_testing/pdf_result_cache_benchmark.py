@@ -0,0 +1,154 @@
+"""
+Latency benchmark for the content-addressed PDF result cache.
+
+This module builds a handful of distinct multi-page PDFs from the PDF
+fixtures and forwards them many times, the most popular ones far more often
+than the rest, the way a scam PDF circulates. Every forward goes through
+PDFProcessingService.load_pdf_content, the PDF branch of message handling
+after the download, with and without the PDF result cache. After each
+document is processed a confident analysis result is cached, as the handler
+does, so the cached run also counts the analyses a repeated PDF skips.
+
+The cache writes through to a SQLite file in a temporary directory; Redis
+is used if it is reachable.
+"""
+
+import asyncio
+import json
+import random
+import statistics
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.models.data_models import AppConfig, JobAnalysisResult, JobClassification
+from app.services.pdf_extraction_engine import PDFExtractionEngine, PDFExtractionConfig
+from app.services.pdf_processing import PDFProcessingService
+from app.services.pdf_result_cache import PDFResultCache, PDFResultCacheConfig
+from app.utils.logging import get_logger
+from tests.fixtures.pdf_samples import PDFDocumentBuilder, PDFFixtures
+
+logger = get_logger(__name__)
+
+RESULT = JobAnalysisResult(
+    trust_score=10,
+    classification=JobClassification.LIKELY_SCAM,
+    reasons=["Upfront fee requested", "Unrealistic pay", "Urgent pressure to respond"],
+    confidence=0.9
+)
+
+
+@dataclass
+class PDFResultCacheBenchmarkConfig:
+    """Configuration for PDF result cache benchmarking."""
+    distinct_documents: int = 12
+    forwards: int = 200
+    pages: int = 6
+    popularity_exponent: float = 1.1  # Zipf exponent of document popularity
+    seed: int = 42
+
+
+class PDFResultCacheBenchmark:
+    """Compare repeated PDF processing with and without the result cache."""
+
+    def __init__(self, config: PDFResultCacheBenchmarkConfig):
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.samples = PDFFixtures.get_valid_samples()
+
+    def _forwards(self) -> List[bytes]:
+        """Build the distinct documents and draw the forwards by popularity."""
+        documents = []
+        for index in range(self.config.distinct_documents):
+            sample = self.samples[index % len(self.samples)]
+            # The same sample with a different page count is a different file
+            documents.append(PDFDocumentBuilder.from_sample(sample, pages=self.config.pages + index // len(self.samples)))
+        weights = [1 / (rank + 1) ** self.config.popularity_exponent for rank in range(len(documents))]
+        return self.random.choices(documents, weights=weights, k=self.config.forwards)
+
+    async def run_mode(self, mode: str, forwards: List[bytes], cache_path: str) -> Dict[str, Any]:
+        """Process every forward in one mode, one at a time."""
+        service = PDFProcessingService(AppConfig(
+            openai_api_key="benchmark_key",
+            twilio_account_sid="benchmark_sid",
+            twilio_auth_token="benchmark_token",
+            twilio_phone_number="+1234567890"
+        ))
+        service.extraction_engine = PDFExtractionEngine(PDFExtractionConfig(timeout=120.0))
+        service.result_cache = PDFResultCache(PDFResultCacheConfig(enabled=mode == "cached", disk_path=cache_path))
+
+        latencies = []
+        analyses = 0
+        for pdf_content in forwards:
+            started = time.perf_counter()
+            document = await service.load_pdf_content(pdf_content)
+            latencies.append(time.perf_counter() - started)
+            if document.analysis_result is None:
+                analyses += 1
+                await service.cache_analysis_result(document, RESULT)
+        service.result_cache.close()
+
+        latencies.sort()
+        stats = service.result_cache.get_stats()
+        return {
+            "mode": mode,
+            "forwards": len(forwards),
+            "p50_seconds": statistics.median(latencies),
+            "p95_seconds": latencies[int(0.95 * (len(latencies) - 1))],
+            "total_seconds": sum(latencies),
+            "analyses": analyses,
+            "hit_rate": stats["hit_rate"],
+            "bytes_saved": stats["bytes_saved"]
+        }
+
+    async def run_benchmark(self) -> Dict[str, Any]:
+        """Run the uncached and cached modes on the same forwards."""
+        forwards = self._forwards()
+        with tempfile.TemporaryDirectory() as directory:
+            results = [
+                await self.run_mode(mode, forwards, f"{directory}/pdf_result_cache.db")
+                for mode in ("uncached", "cached")
+            ]
+        logger.info(f"PDF result cache benchmark: {len(forwards)} forwards per mode")
+
+        return {
+            "results": results,
+            "benchmark_config": {
+                "distinct_documents": self.config.distinct_documents,
+                "forwards": self.config.forwards,
+                "pages": self.config.pages,
+                "popularity_exponent": self.config.popularity_exponent
+            },
+            "timestamp": datetime.now().isoformat()
+        }
+
+
+async def run_pdf_result_cache_benchmark(
+    config: Optional[PDFResultCacheBenchmarkConfig] = None
+) -> Dict[str, Any]:
+    """Run PDF result cache benchmark and return results."""
+    if config is None:
+        config = PDFResultCacheBenchmarkConfig()
+
+    return await PDFResultCacheBenchmark(config).run_benchmark()
+
+
+if __name__ == "__main__":
+    async def main():
+        report = await run_pdf_result_cache_benchmark()
+
+        print("\n" + "="*80)
+        print("PDF RESULT CACHE BENCHMARK RESULTS")
+        print("="*80)
+        for result in report["results"]:
+            print(
+                f"{result['mode']:>8}: P50 {result['p50_seconds'] * 1000:.1f}ms, "
+                f"P95 {result['p95_seconds'] * 1000:.1f}ms, total {result['total_seconds']:.1f}s, "
+                f"{result['analyses']} analyses, hit rate {result['hit_rate']:.0%}, "
+                f"{result['bytes_saved'] / 1024:.0f} KiB not re-parsed"
+            )
+        print(json.dumps(report, indent=2))
+
+    asyncio.run(main())
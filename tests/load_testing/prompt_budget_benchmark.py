@@ -0,0 +1,182 @@
+"""
+Prompt token benchmark for job text budgeting.
+
+This module builds long, PDF-like ads from the job ad fixtures: each fixture
+is spread over several pages, with a repeated page header and legal footer
+and paragraphs of generic company boilerplate between its lines. Every ad
+is run through build_analysis_prompt with and without the prompt budget and
+the analysis prompt tokens (system prompt included) are compared. Signal
+retention is checked with ScamRuleEngine: a rule that matches the full ad
+should still match the text the model is sent. The fixtures themselves are
+measured too, to confirm short ads are sent unchanged.
+"""
+
+import asyncio
+import json
+import random
+import statistics
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from unittest.mock import patch
+
+from app.models.data_models import AppConfig
+from app.services.openai_analysis import OpenAIAnalysisService, ANALYSIS_SYSTEM_PROMPT
+from app.services.prompt_budget import PromptBudgeter, PromptBudgetConfig, count_tokens
+from app.services.scam_rule_engine import ScamRuleEngine
+from app.utils.logging import get_logger
+from tests.fixtures.job_ad_samples import JobAdFixtures
+
+logger = get_logger(__name__)
+
+PAGE_HEADER = "{company} | Careers | Job Reference {reference} | Page {page} of {pages}"
+LEGAL_FOOTER = (
+    "© 2024 {company}. All rights reserved. {company} is an equal opportunity employer and "
+    "considers all qualified applicants without regard to race, color, religion, sex, national "
+    "origin, disability or veteran status. See our Privacy Policy and Terms of Use."
+)
+BOILERPLATE = [
+    "Our culture is built on collaboration, integrity and a shared commitment to excellence in everything we do.",
+    "We believe diverse teams make better decisions, and we invest in the growth of every team member.",
+    "Team members enjoy a supportive environment with opportunities for mentoring and professional development.",
+    "We partner with leading organizations across many industries to deliver innovative, customer-focused solutions.",
+    "Our leadership team is dedicated to transparency, open communication and continuous improvement.",
+    "We are proud of our award-winning workplace and our long history of serving the communities where we operate.",
+]
+
+
+@dataclass
+class PromptBudgetBenchmarkConfig:
+    """Configuration for prompt token benchmarking."""
+    pages: int = 12
+    boilerplate_per_page: int = 5
+    job_text_token_budget: int = 1500
+    seed: int = 42
+
+
+class PromptBudgetBenchmark:
+    """Compare analysis prompt tokens with and without the prompt budget."""
+
+    def __init__(self, config: PromptBudgetBenchmarkConfig):
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.samples = JobAdFixtures.get_all_samples()
+        self.rule_engine = ScamRuleEngine()
+        with patch('app.services.openai_analysis.AsyncOpenAI'):
+            self.service = OpenAIAnalysisService(AppConfig(
+                openai_api_key="benchmark_key",
+                twilio_account_sid="benchmark_sid",
+                twilio_auth_token="benchmark_token",
+                twilio_phone_number="+1234567890"
+            ))
+
+    def _long_ad(self, sample) -> str:
+        """Spread a fixture over PDF-like pages of boilerplate."""
+        company = f"{sample.title.split(' - ')[-1].strip() or 'Acme'} Group"
+        reference = self.random.randint(10000, 99999)
+        lines = [line.strip() for line in sample.content.splitlines() if line.strip()]
+        per_page = max(1, -(-len(lines) // self.config.pages))
+
+        pages = []
+        for page in range(self.config.pages):
+            body = [PAGE_HEADER.format(company=company, reference=reference, page=page + 1, pages=self.config.pages)]
+            body += lines[page * per_page:(page + 1) * per_page]
+            body += self.random.sample(BOILERPLATE, self.config.boilerplate_per_page)
+            body.append(LEGAL_FOOTER.format(company=company))
+            pages.append("\n".join(body))
+        return f"{sample.title}\n" + "\n\n".join(pages)
+
+    def _prompt_tokens(self, job_text: str, budgeter: PromptBudgeter) -> Dict[str, Any]:
+        """Build the analysis prompt under a budgeter and measure it."""
+        with patch('app.services.openai_analysis.get_prompt_budgeter', return_value=budgeter):
+            started = time.perf_counter()
+            prompt = self.service.build_analysis_prompt(job_text)
+            elapsed = time.perf_counter() - started
+        return {
+            "prompt": prompt,
+            "tokens": count_tokens(ANALYSIS_SYSTEM_PROMPT) + count_tokens(prompt),
+            "seconds": elapsed
+        }
+
+    def _measure(self, texts: List[str]) -> Dict[str, Any]:
+        """Measure prompt tokens and rule retention over a set of ads."""
+        unbudgeted = PromptBudgeter(PromptBudgetConfig(enabled=False))
+        budgeted = PromptBudgeter(PromptBudgetConfig(job_text_token_budget=self.config.job_text_token_budget))
+        before: List[int] = []
+        after: List[int] = []
+        fit_seconds: List[float] = []
+        rules_matched = 0
+        rules_kept = 0
+        unchanged = 0
+
+        for text in texts:
+            full = self._prompt_tokens(text, unbudgeted)
+            fitted = self._prompt_tokens(text, budgeted)
+            before.append(full["tokens"])
+            after.append(fitted["tokens"])
+            fit_seconds.append(fitted["seconds"])
+            unchanged += fitted["prompt"] == full["prompt"]
+
+            _, original_rules = self.rule_engine.match(text)
+            _, fitted_rules = self.rule_engine.match(fitted["prompt"])
+            rules_matched += len(original_rules)
+            rules_kept += len(set(original_rules) & set(fitted_rules))
+
+        return {
+            "ads": len(texts),
+            "unchanged_prompts": unchanged,
+            "prompt_tokens_before": {"mean": statistics.mean(before), "max": max(before)},
+            "prompt_tokens_after": {"mean": statistics.mean(after), "max": max(after)},
+            "tokens_saved_percent": (1 - sum(after) / sum(before)) * 100,
+            "rule_signals_kept_percent": (rules_kept / rules_matched * 100) if rules_matched else 100.0,
+            "mean_build_ms": statistics.mean(fit_seconds) * 1000
+        }
+
+    def run_benchmark(self) -> Dict[str, Any]:
+        """Measure long PDF-like ads and the original fixtures."""
+        long_ads = [self._long_ad(sample) for sample in self.samples]
+        results = {
+            "long_ads": self._measure(long_ads),
+            "fixtures": self._measure([sample.content for sample in self.samples])
+        }
+        logger.info(f"Prompt budget benchmark: {len(long_ads)} long ads")
+        return {
+            "results": results,
+            "benchmark_config": {
+                "pages": self.config.pages,
+                "boilerplate_per_page": self.config.boilerplate_per_page,
+                "job_text_token_budget": self.config.job_text_token_budget
+            },
+            "timestamp": datetime.now().isoformat()
+        }
+
+
+async def run_prompt_budget_benchmark(
+    config: Optional[PromptBudgetBenchmarkConfig] = None
+) -> Dict[str, Any]:
+    """Run prompt budget benchmark and return results."""
+    if config is None:
+        config = PromptBudgetBenchmarkConfig()
+
+    return await asyncio.to_thread(PromptBudgetBenchmark(config).run_benchmark)
+
+
+if __name__ == "__main__":
+    async def main():
+        report = await run_prompt_budget_benchmark()
+
+        print("\n" + "="*80)
+        print("PROMPT TOKEN BUDGET BENCHMARK RESULTS")
+        print("="*80)
+        for name, result in report["results"].items():
+            print(
+                f"{name:>10}: {result['prompt_tokens_before']['mean']:.0f} -> "
+                f"{result['prompt_tokens_after']['mean']:.0f} prompt tokens "
+                f"({result['tokens_saved_percent']:.1f}% saved), "
+                f"{result['rule_signals_kept_percent']:.1f}% rule signals kept, "
+                f"{result['unchanged_prompts']}/{result['ads']} unchanged"
+            )
+        print(json.dumps(report, indent=2))
+
+    asyncio.run(main())
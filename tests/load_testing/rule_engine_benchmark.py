@@ -0,0 +1,149 @@
+"""
+Rule-based detection microbenchmark.
+
+This module measures the per-ad cost of scoring job ads against the scam
+detection patterns (default 10k ads):
+- legacy: re.search(pattern, text_lower, re.IGNORECASE) for every pattern,
+  as _apply_rule_based_detection worked before
+- compiled: ScamRuleEngine with precompiled patterns and literal prefilters
+
+Ads are built from the job ad fixtures: each one joins a few random fixture
+lines, so ads differ in length and in which rules they trigger. Both paths
+must produce identical scores and matched descriptions for every ad.
+"""
+
+import asyncio
+import json
+import random
+import re
+import statistics
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.services.scam_rule_engine import ScamRuleEngine, ScamRuleEngineConfig, DEFAULT_SCAM_PATTERNS, RULE_CATEGORIES
+from app.utils.logging import get_logger
+from tests.fixtures.job_ad_samples import JobAdFixtures
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class RuleEngineBenchmarkConfig:
+    """Configuration for rule-based detection benchmarking."""
+    ad_count: int = 10000
+    min_lines_per_ad: int = 5
+    max_lines_per_ad: int = 40
+    rounds: int = 3
+    seed: int = 42
+
+
+class RuleEngineBenchmark:
+    """Benchmark per-pattern regex search versus the compiled rule engine."""
+
+    def __init__(self, config: RuleEngineBenchmarkConfig):
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.lines = [
+            line.strip()
+            for sample in JobAdFixtures.get_all_samples()
+            for line in sample.content.splitlines()
+            if line.strip()
+        ]
+        self.engine = ScamRuleEngine(ScamRuleEngineConfig())
+
+    def _make_ad(self) -> str:
+        count = self.random.randint(self.config.min_lines_per_ad, self.config.max_lines_per_ad)
+        return "\n".join(self.random.choice(self.lines) for _ in range(count))
+
+    @staticmethod
+    def _legacy_match(job_text: str) -> Tuple[float, List[str]]:
+        """Reproduce the pre-compilation scoring loop."""
+        text_lower = job_text.lower()
+        total_score = 0.0
+        matched_patterns = []
+        for category in RULE_CATEGORIES:
+            for pattern_info in DEFAULT_SCAM_PATTERNS[category]:
+                if re.search(pattern_info["pattern"], text_lower, re.IGNORECASE):
+                    total_score += pattern_info["weight"]
+                    matched_patterns.append(pattern_info["description"])
+        return total_score, matched_patterns
+
+    def run_path(self, name: str, match: Callable[[str], Tuple[float, List[str]]],
+                 ads: List[str]) -> Dict[str, Any]:
+        """Score every ad and report the per-ad cost of the best round."""
+        round_us = []
+        results = []
+        for _ in range(self.config.rounds):
+            started = time.perf_counter()
+            results = [match(ad) for ad in ads]
+            round_us.append((time.perf_counter() - started) / len(ads) * 1_000_000)
+
+        return {
+            "path": name,
+            "ads": len(ads),
+            "us_per_ad": min(round_us),
+            "avg_us_per_ad": statistics.mean(round_us),
+            "matches_per_ad": statistics.mean(len(matched) for _, matched in results),
+            "results": results
+        }
+
+    def run_benchmark(self) -> Dict[str, Any]:
+        """Run both scoring paths over the same ads and compare them."""
+        ads = [self._make_ad() for _ in range(self.config.ad_count)]
+        logger.info(f"Rule engine benchmark: {len(ads)} ads, avg {statistics.mean(map(len, ads)):.0f} chars")
+
+        legacy = self.run_path("legacy", self._legacy_match, ads)
+        compiled = self.run_path("compiled", self.engine.match, ads)
+        mismatches = sum(
+            legacy_matched != compiled_matched or abs(legacy_score - compiled_score) > 1e-9
+            for (legacy_score, legacy_matched), (compiled_score, compiled_matched)
+            in zip(legacy.pop("results"), compiled.pop("results"))
+        )
+
+        return {
+            "results": [legacy, compiled],
+            "comparison": {
+                "speedup": legacy["us_per_ad"] / compiled["us_per_ad"] if compiled["us_per_ad"] else 0.0,
+                "cost_reduction_pct": (1 - compiled["us_per_ad"] / legacy["us_per_ad"]) * 100,
+                "mismatched_ads": mismatches
+            },
+            "engine_stats": self.engine.get_stats(),
+            "benchmark_config": {
+                "ad_count": self.config.ad_count,
+                "avg_ad_length": statistics.mean(map(len, ads)),
+                "rounds": self.config.rounds
+            },
+            "timestamp": datetime.now().isoformat()
+        }
+
+
+async def run_rule_engine_benchmark(config: Optional[RuleEngineBenchmarkConfig] = None) -> Dict[str, Any]:
+    """Run rule-based detection benchmark and return results."""
+    if config is None:
+        config = RuleEngineBenchmarkConfig()
+
+    return await asyncio.to_thread(RuleEngineBenchmark(config).run_benchmark)
+
+
+if __name__ == "__main__":
+    async def main():
+        report = await run_rule_engine_benchmark()
+
+        print("\n" + "="*80)
+        print("RULE-BASED DETECTION MICROBENCHMARK RESULTS")
+        print("="*80)
+        for result in report["results"]:
+            print(
+                f"{result['path']:>9}: {result['us_per_ad']:.1f} us/ad "
+                f"({result['matches_per_ad']:.1f} matched rules per ad)"
+            )
+        comparison = report["comparison"]
+        print(
+            f"Speedup {comparison['speedup']:.1f}x, cost reduction {comparison['cost_reduction_pct']:.0f}%, "
+            f"{comparison['mismatched_ads']} mismatched ads"
+        )
+        print(json.dumps(report, indent=2))
+
+    asyncio.run(main())
@@ -0,0 +1,215 @@
+"""
+Webhook signature validation microbenchmark.
+
+This module compares the two ways the webhook has validated X-Twilio-Signature:
+- legacy: Starlette form parsing, a rebuilt subset dict, and a freshly keyed
+  HMAC-SHA1 wrapped in asyncio.wait_for
+- fast: one raw-body read parsed with parse_webhook_form and a
+  TwilioSignatureValidator with a precomputed key
+
+Requests arrive open-loop at a fixed rate (default 1k req/s), so queueing delay
+shows up in the acknowledgment latency. Metrics reported for each path:
+- CPU time per request (process time)
+- p50/p99 latency from scheduled arrival to validated request
+
+Bodies are signed over every parameter, as Twilio signs them. The legacy path
+only signs its rebuilt subset, so its valid_signatures count shows how many
+genuine requests it would have rejected.
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import statistics
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlencode
+
+from starlette.requests import Request
+
+from app.api.optimized_webhook import TwilioSignatureValidator, parse_webhook_form
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+LEGACY_VALIDATION_TIMEOUT = 0.05  # the legacy path's asyncio.wait_for timeout
+
+
+@dataclass
+class SignatureBenchmarkConfig:
+    """Configuration for signature validation benchmarking."""
+    auth_token: str = "benchmark_auth_token_0123456789ab"
+    webhook_url: str = "http://localhost:8000/webhook/whatsapp"
+    request_rate: int = 1000  # requests per second
+    duration: float = 5.0  # seconds per path
+
+
+class SignatureBenchmark:
+    """Benchmark legacy versus fast-path webhook signature validation."""
+
+    def __init__(self, config: SignatureBenchmarkConfig):
+        self.config = config
+        self.validator = TwilioSignatureValidator(config.auth_token)
+
+    def _make_body(self, i: int) -> bytes:
+        """Create a realistic signed Twilio webhook body."""
+        params = {
+            'MessageSid': f"SM{i:032x}",
+            'AccountSid': "AC" + "0" * 32,
+            'From': f"whatsapp:+1555{i % 10000000:07d}",
+            'To': "whatsapp:+14155238886",
+            'Body': "Remote data entry job, $45/hour, no experience needed. Reply with your bank details.",
+            'NumMedia': '0',
+            'ProfileName': "Benchmark User",
+            'WaId': f"1555{i % 10000000:07d}",
+            'SmsStatus': 'received',
+            'ApiVersion': '2010-04-01'
+        }
+        return urlencode(params).encode('utf-8')
+
+    def _make_request(self, body: bytes) -> Request:
+        """Build a Starlette request that streams body like the ASGI server would."""
+        signature = self.validator.compute_signature(self.config.webhook_url, parse_webhook_form(body))
+        scope = {
+            'type': 'http',
+            'method': 'POST',
+            'scheme': 'http',
+            'server': ('localhost', 8000),
+            'path': '/webhook/whatsapp',
+            'query_string': b'',
+            'headers': [
+                (b'host', b'localhost:8000'),
+                (b'content-type', b'application/x-www-form-urlencoded'),
+                (b'content-length', str(len(body)).encode('ascii')),
+                (b'x-twilio-signature', signature.encode('ascii'))
+            ]
+        }
+
+        async def receive():
+            return {'type': 'http.request', 'body': body, 'more_body': False}
+
+        return Request(scope, receive)
+
+    async def _legacy_validate(self, request: Request) -> bool:
+        """Reproduce the pre-fast-path validation sequence."""
+        form = await request.form()
+        form_data = {
+            "MessageSid": form["MessageSid"],
+            "From": form["From"],
+            "To": form["To"],
+            "Body": form.get("Body", ""),
+            "NumMedia": str(int(form.get("NumMedia", 0)))
+        }
+
+        async def validate_sync() -> bool:
+            signature = request.headers.get('X-Twilio-Signature')
+            data_string = str(request.url) + urlencode(sorted(form_data.items()))
+            expected = base64.b64encode(
+                hmac.new(
+                    self.config.auth_token.encode('utf-8'),
+                    data_string.encode('utf-8'),
+                    hashlib.sha1
+                ).digest()
+            ).decode('utf-8')
+            return hmac.compare_digest(signature, expected)
+
+        try:
+            return await asyncio.wait_for(validate_sync(), timeout=LEGACY_VALIDATION_TIMEOUT)
+        except asyncio.TimeoutError:
+            return True
+
+    async def _fast_validate(self, request: Request) -> bool:
+        """Validate through the raw-body fast path."""
+        form = parse_webhook_form(await request.body())
+        return self.validator.validate(str(request.url), form, request.headers.get('X-Twilio-Signature'))
+
+    async def run_path(self, name: str, validate) -> Dict[str, Any]:
+        """Drive one validation path open-loop at the configured rate."""
+        total = int(self.config.request_rate * self.config.duration)
+        interval = 1.0 / self.config.request_rate
+        requests = [self._make_request(self._make_body(i)) for i in range(total)]
+        latencies: List[float] = []
+        valid = 0
+
+        async def handle(request: Request, scheduled_at: float):
+            nonlocal valid
+            if await validate(request):
+                valid += 1
+            latencies.append((time.perf_counter() - scheduled_at) * 1000)
+
+        tasks = []
+        cpu_start = time.process_time()
+        started = time.perf_counter()
+        for i, request in enumerate(requests):
+            scheduled_at = started + i * interval
+            delay = scheduled_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(handle(request, scheduled_at)))
+        await asyncio.gather(*tasks)
+        cpu_time = time.process_time() - cpu_start
+
+        ordered = sorted(latencies)
+        return {
+            "path": name,
+            "requests": total,
+            "valid_signatures": valid,
+            "cpu_us_per_request": cpu_time / total * 1_000_000,
+            "p50_latency_ms": ordered[len(ordered) // 2],
+            "p99_latency_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))],
+            "avg_latency_ms": statistics.mean(ordered)
+        }
+
+    async def run_benchmark(self) -> Dict[str, Any]:
+        """Run both validation paths and compare them."""
+        legacy = await self.run_path("legacy", self._legacy_validate)
+        fast = await self.run_path("fast", self._fast_validate)
+
+        return {
+            "results": [legacy, fast],
+            "comparison": {
+                "cpu_reduction_pct": (
+                    (1 - fast["cpu_us_per_request"] / legacy["cpu_us_per_request"]) * 100
+                    if legacy["cpu_us_per_request"] else 0.0
+                ),
+                "p99_latency_reduction_pct": (
+                    (1 - fast["p99_latency_ms"] / legacy["p99_latency_ms"]) * 100
+                    if legacy["p99_latency_ms"] else 0.0
+                )
+            },
+            "benchmark_config": {
+                "request_rate": self.config.request_rate,
+                "duration": self.config.duration
+            },
+            "timestamp": datetime.now().isoformat()
+        }
+
+
+async def run_signature_benchmark(config: Optional[SignatureBenchmarkConfig] = None) -> Dict[str, Any]:
+    """Run signature validation benchmark and return results."""
+    if config is None:
+        config = SignatureBenchmarkConfig()
+
+    return await SignatureBenchmark(config).run_benchmark()
+
+
+if __name__ == "__main__":
+    async def main():
+        report = await run_signature_benchmark()
+
+        print("\n" + "="*80)
+        print("WEBHOOK SIGNATURE VALIDATION MICROBENCHMARK RESULTS")
+        print("="*80)
+        for result in report["results"]:
+            print(
+                f"{result['path']:>8}: {result['cpu_us_per_request']:.1f} us CPU/request, "
+                f"p50 {result['p50_latency_ms']:.2f} ms, p99 {result['p99_latency_ms']:.2f} ms "
+                f"({result['valid_signatures']}/{result['requests']} valid)"
+            )
+        print(json.dumps(report, indent=2))
+
+    asyncio.run(main())
@@ -0,0 +1,199 @@
+"""
+Near-duplicate similarity lookup benchmark.
+
+This module measures the cost of the similar-job-ad lookup that runs before
+every OpenAI call, at several history sizes (default 1k, 10k and 100k ads):
+- index: HashedSimilarityIndex (incremental hashed features, inverted index)
+- legacy: TF-IDF refit + transform of the whole history + dense cosine, as
+  the lookup worked before (refit is forced by every history eviction)
+
+Synthetic ads mix a few lines from the job ad fixtures with words drawn from a
+Zipf-distributed vocabulary, so term frequencies look like a real corpus and
+every historical ad is distinct. Half of the queries are light edits of
+an indexed ad (expected hits), half are fresh ads (expected misses).
+"""
+
+import asyncio
+import itertools
+import json
+import random
+import statistics
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.services.similarity_index import HashedSimilarityIndex
+from app.utils.logging import get_logger
+from tests.fixtures.job_ad_samples import JobAdFixtures
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class SimilarityBenchmarkConfig:
+    """Configuration for similarity lookup benchmarking."""
+    history_sizes: List[int] = field(default_factory=lambda: [1000, 10000, 100000])
+    query_count: int = 500
+    similarity_threshold: float = 0.75
+    vocabulary_size: int = 50000
+    zipf_exponent: float = 1.1
+    fixture_lines_per_ad: int = 3
+    vocabulary_words_per_ad: int = 40
+    legacy_max_history: int = 10000  # legacy path is too slow to run beyond this
+    legacy_query_count: int = 5
+    seed: int = 42
+
+
+class SimilarityBenchmark:
+    """Benchmark incremental index versus refit-per-query TF-IDF lookup."""
+
+    def __init__(self, config: SimilarityBenchmarkConfig):
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.lines = [
+            line.strip()
+            for sample in JobAdFixtures.get_all_samples()
+            for line in sample.content.splitlines()
+            if len(line.strip()) > 15
+        ]
+        self.vocabulary = [f"term{i}" for i in range(config.vocabulary_size)]
+        self.cumulative_weights = list(itertools.accumulate(
+            1.0 / (rank ** config.zipf_exponent) for rank in range(1, config.vocabulary_size + 1)
+        ))
+
+    def _make_ad(self) -> str:
+        """Build a distinct synthetic job ad."""
+        lines = self.random.sample(self.lines, self.config.fixture_lines_per_ad)
+        words = self.random.choices(
+            self.vocabulary, cum_weights=self.cumulative_weights, k=self.config.vocabulary_words_per_ad
+        )
+        return "\n".join(lines) + "\n" + " ".join(words)
+
+    def _edit_ad(self, text: str) -> str:
+        """Lightly edit an ad, as scammers re-post variants."""
+        words = text.split()
+        for _ in range(max(1, len(words) // 25)):
+            words[self.random.randrange(len(words))] = self.random.choices(
+                self.vocabulary, cum_weights=self.cumulative_weights
+            )[0]
+        return " ".join(words)
+
+    @staticmethod
+    def _percentiles(samples_ms: List[float]) -> Dict[str, float]:
+        ordered = sorted(samples_ms)
+        return {
+            "avg_ms": statistics.mean(ordered),
+            "p50_ms": ordered[len(ordered) // 2],
+            "p99_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        }
+
+    def run_index(self, history: List[str], queries: List[str]) -> Dict[str, Any]:
+        """Measure add, query and evict on the incremental index."""
+        index = HashedSimilarityIndex()
+
+        started = time.perf_counter()
+        for i, text in enumerate(history):
+            index.add(i, text)
+        add_us = (time.perf_counter() - started) / len(history) * 1_000_000
+
+        query_ms = []
+        hits = 0
+        for text in queries:
+            started = time.perf_counter()
+            matches = index.query(text, k=1, min_similarity=self.config.similarity_threshold)
+            query_ms.append((time.perf_counter() - started) * 1000)
+            hits += bool(matches)
+
+        # Steady state: evict the oldest ad and add a new one
+        evict_samples = min(1000, len(history))
+        started = time.perf_counter()
+        for i in range(evict_samples):
+            index.remove(i)
+            index.add(len(history) + i, history[i])
+        evict_add_us = (time.perf_counter() - started) / evict_samples * 1_000_000
+
+        return {
+            "add_us_per_ad": add_us,
+            "evict_and_add_us": evict_add_us,
+            "query": self._percentiles(query_ms),
+            "hits": hits,
+            "queries": len(queries),
+            "index_stats": index.get_stats()
+        }
+
+    def run_legacy(self, history: List[str], queries: List[str]) -> Dict[str, Any]:
+        """Measure the previous TF-IDF refit + dense cosine lookup."""
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.metrics.pairwise import cosine_similarity
+
+        query_ms = []
+        hits = 0
+        for text in queries:
+            started = time.perf_counter()
+            texts = [text] + history
+            vectorizer = TfidfVectorizer(stop_words='english')
+            vectors = vectorizer.fit(texts).transform(texts)
+            scores = cosine_similarity(vectors[0:1], vectors[1:]).flatten()
+            query_ms.append((time.perf_counter() - started) * 1000)
+            hits += bool(scores.max() > self.config.similarity_threshold)
+
+        return {"query": self._percentiles(query_ms), "hits": hits, "queries": len(queries)}
+
+    def run_benchmark(self) -> Dict[str, Any]:
+        """Run the benchmark at every configured history size."""
+        results = []
+        for size in self.config.history_sizes:
+            logger.info(f"Similarity benchmark: {size} historical ads")
+            history = [self._make_ad() for _ in range(size)]
+            queries = []
+            for i in range(self.config.query_count):
+                if i % 2 == 0:
+                    queries.append(self._edit_ad(self.random.choice(history)))
+                else:
+                    queries.append(self._make_ad())
+
+            result = {"history_size": size, "index": self.run_index(history, queries)}
+            if size <= self.config.legacy_max_history:
+                result["legacy"] = self.run_legacy(history, queries[:self.config.legacy_query_count])
+            results.append(result)
+
+        return {
+            "results": results,
+            "benchmark_config": {
+                "history_sizes": self.config.history_sizes,
+                "query_count": self.config.query_count,
+                "similarity_threshold": self.config.similarity_threshold
+            },
+            "timestamp": datetime.now().isoformat()
+        }
+
+
+async def run_similarity_benchmark(config: Optional[SimilarityBenchmarkConfig] = None) -> Dict[str, Any]:
+    """Run similarity lookup benchmark and return results."""
+    if config is None:
+        config = SimilarityBenchmarkConfig()
+
+    return await asyncio.to_thread(SimilarityBenchmark(config).run_benchmark)
+
+
+if __name__ == "__main__":
+    async def main():
+        report = await run_similarity_benchmark()
+
+        print("\n" + "="*80)
+        print("NEAR-DUPLICATE SIMILARITY LOOKUP BENCHMARK RESULTS")
+        print("="*80)
+        for result in report["results"]:
+            index = result["index"]
+            line = (
+                f"{result['history_size']:>7} ads: index p50 {index['query']['p50_ms']:.3f} ms, "
+                f"p99 {index['query']['p99_ms']:.3f} ms, add {index['add_us_per_ad']:.0f} us, "
+                f"evict+add {index['evict_and_add_us']:.0f} us"
+            )
+            if "legacy" in result:
+                line += f" | legacy p50 {result['legacy']['query']['p50_ms']:.1f} ms"
+            print(line)
+        print(json.dumps(report, indent=2))
+
+    asyncio.run(main())
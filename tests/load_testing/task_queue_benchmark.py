@@ -0,0 +1,209 @@
+"""
+Background task queue consumption benchmark.
+
+This module compares the legacy polling worker loop (RPOP on each priority
+queue followed by a sleep) with blocking consumption (atomic claim into a
+per-worker processing list plus a blocking wake-up pop).
+
+Metrics reported for each mode:
+- Idle Redis operations per second issued by the worker pool
+- Enqueue-to-start latency (time from queue_task to handler invocation)
+"""
+
+import asyncio
+import time
+import statistics
+import json
+from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from app.services.redis_connection_manager import RedisConnectionManager, RedisConfig
+from app.services.background_task_processor import (
+    BackgroundTaskProcessor, TaskQueueConfig, ProcessingTask, TaskPriority
+)
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class TaskQueueBenchmarkConfig:
+    """Configuration for task queue benchmarking."""
+    redis_url: str = "redis://localhost:6379/0"
+    worker_count: int = 5
+    queue_check_interval: float = 0.1
+    blocking_pop_timeout: float = 1.0
+
+    # Test parameters
+    idle_duration: float = 10.0  # seconds
+    latency_samples: int = 200
+    enqueue_interval: float = 0.05  # seconds between enqueues
+
+
+@dataclass
+class ConsumptionModeResults:
+    """Benchmark results for a single consumption mode."""
+    mode: str
+    idle_redis_ops: int = 0
+    idle_ops_per_second: float = 0.0
+    latency_samples_ms: List[float] = field(default_factory=list)
+
+    def latency_summary(self) -> Dict[str, float]:
+        """Summarize enqueue-to-start latency."""
+        if not self.latency_samples_ms:
+            return {}
+
+        ordered = sorted(self.latency_samples_ms)
+        return {
+            "avg_ms": statistics.mean(ordered),
+            "p50_ms": ordered[len(ordered) // 2],
+            "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+            "p99_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))],
+            "max_ms": ordered[-1]
+        }
+
+
+class TaskQueueBenchmark:
+    """Benchmark polling versus blocking task consumption."""
+
+    def __init__(self, config: TaskQueueBenchmarkConfig):
+        self.config = config
+        self.redis_manager: Optional[RedisConnectionManager] = None
+
+    async def setup(self):
+        """Setup Redis connection manager."""
+        self.redis_manager = RedisConnectionManager(RedisConfig(
+            primary_url=self.config.redis_url,
+            command_timeout=max(2.0, self.config.blocking_pop_timeout * 2)
+        ))
+        if not await self.redis_manager.initialize():
+            raise RuntimeError("Failed to initialize Redis connection manager")
+
+    async def cleanup(self):
+        """Cleanup Redis connections."""
+        if self.redis_manager:
+            await self.redis_manager.cleanup()
+
+    def _create_processor(self, blocking: bool) -> BackgroundTaskProcessor:
+        """Create a processor configured for the requested consumption mode."""
+        processor = BackgroundTaskProcessor(TaskQueueConfig(
+            worker_count=self.config.worker_count,
+            queue_check_interval=self.config.queue_check_interval,
+            blocking_consumption=blocking,
+            blocking_pop_timeout=self.config.blocking_pop_timeout,
+            health_check_interval=3600,
+            metrics_interval=3600
+        ))
+        processor.redis_manager = self.redis_manager
+        return processor
+
+    async def run_mode(self, blocking: bool) -> ConsumptionModeResults:
+        """Run idle and latency measurements for one consumption mode."""
+        results = ConsumptionModeResults(mode="blocking" if blocking else "polling")
+        processor = self._create_processor(blocking)
+
+        started_at: Dict[str, float] = {}
+
+        async def benchmark_handler(payload: Dict[str, Any]):
+            started_at[payload["task_id"]] = time.perf_counter()
+            return {"ok": True}
+
+        processor.register_handler("benchmark", benchmark_handler)
+        await processor.start()
+
+        try:
+            # Idle phase: count Redis commands issued with empty queues
+            await asyncio.sleep(0.5)
+            ops_before = self.redis_manager.metrics.total_requests
+            await asyncio.sleep(self.config.idle_duration)
+            results.idle_redis_ops = self.redis_manager.metrics.total_requests - ops_before
+            results.idle_ops_per_second = results.idle_redis_ops / self.config.idle_duration
+
+            # Latency phase: sparse enqueues so workers are idle when tasks land
+            enqueued_at: Dict[str, float] = {}
+            for i in range(self.config.latency_samples):
+                task_id = f"bench_{results.mode}_{i}"
+                enqueued_at[task_id] = time.perf_counter()
+                await processor.queue_task(ProcessingTask(
+                    task_id=task_id,
+                    task_type="benchmark",
+                    payload={"task_id": task_id},
+                    priority=TaskPriority.NORMAL
+                ))
+                await asyncio.sleep(self.config.enqueue_interval)
+
+            await asyncio.sleep(self.config.blocking_pop_timeout + self.config.queue_check_interval)
+
+            results.latency_samples_ms = [
+                (started_at[task_id] - enqueued) * 1000
+                for task_id, enqueued in enqueued_at.items()
+                if task_id in started_at
+            ]
+        finally:
+            await processor.stop()
+
+        return results
+
+    def generate_report(self, polling: ConsumptionModeResults, blocking: ConsumptionModeResults) -> Dict[str, Any]:
+        """Generate comparison report."""
+        def summarize(results: ConsumptionModeResults) -> Dict[str, Any]:
+            return {
+                "idle_redis_ops": results.idle_redis_ops,
+                "idle_ops_per_second": results.idle_ops_per_second,
+                "tasks_measured": len(results.latency_samples_ms),
+                "enqueue_to_start_latency": results.latency_summary()
+            }
+
+        polling_latency = polling.latency_summary().get("p50_ms", 0.0)
+        blocking_latency = blocking.latency_summary().get("p50_ms", 0.0)
+
+        return {
+            "polling": summarize(polling),
+            "blocking": summarize(blocking),
+            "comparison": {
+                "idle_ops_reduction_pct": (
+                    (1 - blocking.idle_ops_per_second / polling.idle_ops_per_second) * 100
+                    if polling.idle_ops_per_second else 0.0
+                ),
+                "p50_latency_reduction_pct": (
+                    (1 - blocking_latency / polling_latency) * 100 if polling_latency else 0.0
+                )
+            },
+            "benchmark_config": {
+                "worker_count": self.config.worker_count,
+                "queue_check_interval": self.config.queue_check_interval,
+                "blocking_pop_timeout": self.config.blocking_pop_timeout,
+                "idle_duration": self.config.idle_duration,
+                "latency_samples": self.config.latency_samples
+            },
+            "timestamp": datetime.now().isoformat()
+        }
+
+
+async def run_task_queue_benchmark(config: Optional[TaskQueueBenchmarkConfig] = None) -> Dict[str, Any]:
+    """Run task queue consumption benchmark and return results."""
+    if config is None:
+        config = TaskQueueBenchmarkConfig()
+
+    benchmark = TaskQueueBenchmark(config)
+
+    try:
+        await benchmark.setup()
+        polling = await benchmark.run_mode(blocking=False)
+        blocking = await benchmark.run_mode(blocking=True)
+        return benchmark.generate_report(polling, blocking)
+    finally:
+        await benchmark.cleanup()
+
+
+if __name__ == "__main__":
+    async def main():
+        report = await run_task_queue_benchmark()
+
+        print("\n" + "="*80)
+        print("TASK QUEUE CONSUMPTION BENCHMARK RESULTS")
+        print("="*80)
+        print(json.dumps(report, indent=2))
+
+    asyncio.run(main())
@@ -0,0 +1,205 @@
+"""
+Spike benchmark for outbound WhatsApp sends.
+
+This module sends a spike of replies through a simulated Twilio Messages
+API that answers after a fixed latency and rejects sends above its
+per-number rate with a 429, the way WhatsApp throttles a sender. Every send
+runs under the 3 second timeout the reply paths use, in two modes:
+
+- thread: the synchronous SDK call in asyncio.to_thread, as before
+- sender: TwilioSender, with the per-number governor, 429 backoff and the
+  bounded outbound queue
+
+Besides messages delivered, timed out and rejected, the number of 429s the
+API returned (what counts towards a throttling ban) and the most executor
+threads in use at once are reported.
+"""
+
+import asyncio
+import json
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from app.services.twilio_sender import TWILIO_API_URL, TwilioSender, TwilioSenderConfig
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+FROM_NUMBER = "whatsapp:+1234567890"
+SEND_TIMEOUT = 3.0
+
+
+class SimulatedTwilioAPI:
+    """Messages API that rejects sends above a per-number rate."""
+
+    def __init__(self, rate_limit: int, latency: float):
+        self.rate_limit = rate_limit
+        self.latency = latency
+        self.accepted = deque()
+        self.rejected = 0
+        self.lock = threading.Lock()
+
+    def admit(self) -> bool:
+        """Admit a send if fewer than rate_limit were accepted in the last second."""
+        with self.lock:
+            now = time.monotonic()
+            while self.accepted and self.accepted[0] <= now - 1.0:
+                self.accepted.popleft()
+            if len(self.accepted) >= self.rate_limit:
+                self.rejected += 1
+                return False
+            self.accepted.append(now)
+            return True
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(self.latency)
+        if not self.admit():
+            return httpx.Response(429, json={"code": 20429, "message": "Too Many Requests"})
+        return httpx.Response(201, json={"sid": "SM" + "0" * 32, "status": "queued"})
+
+    def create_message(self):
+        """The SDK's blocking messages.create()."""
+        time.sleep(self.latency)
+        if not self.admit():
+            raise RuntimeError("HTTP 429 error: Too Many Requests")
+        return "SM" + "0" * 32
+
+
+@dataclass
+class TwilioSenderBenchmarkConfig:
+    """Configuration for outbound send benchmarking."""
+    messages: int = 300
+    spike_seconds: float = 2.0  # messages arrive evenly over this time
+    api_rate_limit: int = 25  # messages per second per number before 429
+    api_latency: float = 0.15
+    messages_per_second: float = 20.0
+    burst: int = 5
+    max_queue_size: int = 60
+
+
+class TwilioSenderBenchmark:
+    """Compare thread-based and governed async sends during a spike."""
+
+    def __init__(self, config: TwilioSenderBenchmarkConfig):
+        self.config = config
+
+    async def run_mode(self, mode: str) -> Dict[str, Any]:
+        """Send the spike in one mode."""
+        api = SimulatedTwilioAPI(self.config.api_rate_limit, self.config.api_latency)
+        loop = asyncio.get_running_loop()
+        thread_pool = ThreadPoolExecutor()
+        loop.set_default_executor(thread_pool)
+        sender = TwilioSender("AC0", "token", TwilioSenderConfig(
+            messages_per_second=self.config.messages_per_second, burst=self.config.burst,
+            max_queue_size=self.config.max_queue_size
+        ))
+        sender._client = httpx.AsyncClient(
+            base_url=f"{TWILIO_API_URL}/Accounts/AC0", transport=httpx.MockTransport(api.handle)
+        )
+
+        outcomes = {"delivered": 0, "timed_out": 0, "failed": 0}
+        latencies: List[float] = []
+        threads = {"busy": 0, "peak": 0}
+
+        def create_message():
+            threads["busy"] += 1
+            threads["peak"] = max(threads["peak"], threads["busy"])
+            try:
+                return api.create_message()
+            finally:
+                threads["busy"] -= 1
+
+        async def reply(delay: float, index: int):
+            await asyncio.sleep(delay)
+            started = time.perf_counter()
+            try:
+                if mode == "thread":
+                    await asyncio.wait_for(asyncio.to_thread(create_message), timeout=SEND_TIMEOUT)
+                else:
+                    await asyncio.wait_for(
+                        sender.send(FROM_NUMBER, f"whatsapp:+1555{index:07d}", "Trust Score: 12/100"),
+                        timeout=SEND_TIMEOUT
+                    )
+                outcomes["delivered"] += 1
+                latencies.append(time.perf_counter() - started)
+            except asyncio.TimeoutError:
+                outcomes["timed_out"] += 1
+            except Exception:
+                outcomes["failed"] += 1
+
+        interval = self.config.spike_seconds / self.config.messages
+        started = time.perf_counter()
+        await asyncio.gather(*(reply(index * interval, index) for index in range(self.config.messages)))
+        elapsed = time.perf_counter() - started
+        await sender.close()
+        thread_pool.shutdown(wait=True)
+        loop.set_default_executor(ThreadPoolExecutor())
+
+        latencies.sort()
+        return {
+            "mode": mode,
+            "messages": self.config.messages,
+            **outcomes,
+            "api_429s": api.rejected,
+            "peak_executor_threads": threads["peak"],
+            "p50_seconds": statistics.median(latencies) if latencies else 0.0,
+            "p95_seconds": latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0,
+            "total_seconds": elapsed,
+            "sender_stats": sender.get_stats() if mode == "sender" else None
+        }
+
+    async def run_benchmark(self) -> Dict[str, Any]:
+        """Run both modes on the same spike."""
+        results = [await self.run_mode("thread"), await self.run_mode("sender")]
+        logger.info(f"Twilio sender benchmark: {self.config.messages} messages per mode")
+
+        return {
+            "results": results,
+            "benchmark_config": {
+                "messages": self.config.messages,
+                "spike_seconds": self.config.spike_seconds,
+                "api_rate_limit": self.config.api_rate_limit,
+                "api_latency": self.config.api_latency,
+                "messages_per_second": self.config.messages_per_second,
+                "burst": self.config.burst,
+                "max_queue_size": self.config.max_queue_size
+            },
+            "timestamp": datetime.now().isoformat()
+        }
+
+
+async def run_twilio_sender_benchmark(
+    config: Optional[TwilioSenderBenchmarkConfig] = None
+) -> Dict[str, Any]:
+    """Run outbound send benchmark and return results."""
+    if config is None:
+        config = TwilioSenderBenchmarkConfig()
+
+    return await TwilioSenderBenchmark(config).run_benchmark()
+
+
+if __name__ == "__main__":
+    async def main():
+        report = await run_twilio_sender_benchmark()
+
+        print("\n" + "="*80)
+        print("TWILIO SENDER BENCHMARK RESULTS")
+        print("="*80)
+        for result in report["results"]:
+            print(
+                f"{result['mode']:>6}: {result['delivered']} delivered, {result['timed_out']} timed out, "
+                f"{result['failed']} failed, {result['api_429s']} API 429s, "
+                f"peak {result['peak_executor_threads']} threads, "
+                f"P50 {result['p50_seconds'] * 1000:.0f}ms, P95 {result['p95_seconds'] * 1000:.0f}ms"
+            )
+        print(json.dumps(report, indent=2))
+
+    asyncio.run(main())
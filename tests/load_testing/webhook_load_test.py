@@ -10,6 +10,10 @@ Requirements tested:
 - 4.3: Performance threshold alerts for critical metrics
 - 5.1: Connection pool management under load
 - 5.2: Connection pool utilization monitoring
+
+The retry storm phase replays every MessageSid several times concurrently, as
+Twilio does when acknowledgments are slow, and checks that only the first
+delivery was accepted for processing.
 """
 
 import asyncio
@@ -22,7 +26,6 @@ from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from concurrent.futures import ThreadPoolExecutor
-import urllib.parse
 import hmac
 import hashlib
 import base64
@@ -58,6 +61,13 @@ class LoadTestConfig:
     enable_burst_testing: bool = True
     burst_intensity: int = 100  # concurrent requests in burst
     burst_duration: int = 5     # seconds
+    
+    # Retry storm: each MessageSid is delivered several times concurrently
+    enable_retry_storm: bool = True
+    retry_storm_messages: int = 20
+    retry_storm_deliveries: int = 5
+    stats_endpoint: str = "/api/performance/webhook-ingestion"
+    stats_token: Optional[str] = None  # Bearer token used to read dedup counters
 
 
 @dataclass
@@ -100,6 +110,9 @@ class LoadTestResults:
     
     # Detailed results
     request_results: List[RequestResult] = field(default_factory=list)
+    
+    # Retry storm (idempotent ingestion) results
+    retry_storm: Dict[str, Any] = field(default_factory=dict)
 
 
 class WebhookLoadTester:
@@ -167,7 +180,7 @@ class WebhookLoadTester:
         """Create Twilio signature for webhook validation."""
         # Sort parameters and create data string
         sorted_params = sorted(form_data.items())
-        data_string = url + urllib.parse.urlencode(sorted_params)
+        data_string = url + ''.join(key + value for key, value in sorted_params)
         
         # Create HMAC signature
         signature = base64.b64encode(
@@ -180,33 +193,36 @@ class WebhookLoadTester:
         
         return signature
     
-    async def send_webhook_request(self, message_type: str = "text", user_id: int = 0) -> RequestResult:
-        """Send a single webhook request with realistic Twilio data."""
+    def generate_form_data(self, message_type: str = "text") -> Dict[str, str]:
+        """Generate realistic Twilio webhook form data."""
+        form_data = {
+            'MessageSid': self.generate_message_sid(),
+            'From': self.generate_phone_number(),
+            'To': self.config.twilio_phone_number,
+            'Body': self.generate_message_body(message_type),
+            'NumMedia': '0'
+        }
+        
+        # Add media data for PDF tests
+        if message_type == "pdf":
+            form_data.update({
+                'NumMedia': '1',
+                'MediaUrl0': 'https://api.twilio.com/2010-04-01/Accounts/test/Messages/test/Media/test',
+                'MediaContentType0': 'application/pdf'
+            })
+        
+        return form_data
+    
+    async def send_webhook_request(self, message_type: str = "text", user_id: int = 0,
+                                   form_data: Optional[Dict[str, str]] = None) -> RequestResult:
+        """Send a single webhook request with realistic Twilio data (or replay form_data)."""
         request_id = f"user_{user_id}_{int(time.time() * 1000)}"
         start_time = time.time()
         
         try:
             # Generate realistic webhook data
-            message_sid = self.generate_message_sid()
-            from_number = self.generate_phone_number()
-            body = self.generate_message_body(message_type)
-            
-            # Prepare form data
-            form_data = {
-                'MessageSid': message_sid,
-                'From': from_number,
-                'To': self.config.twilio_phone_number,
-                'Body': body,
-                'NumMedia': '0'
-            }
-            
-            # Add media data for PDF tests
-            if message_type == "pdf":
-                form_data.update({
-                    'NumMedia': '1',
-                    'MediaUrl0': 'https://api.twilio.com/2010-04-01/Accounts/test/Messages/test/Media/test',
-                    'MediaContentType0': 'application/pdf'
-                })
+            if form_data is None:
+                form_data = self.generate_form_data(message_type)
             
             # Create webhook URL and signature
             webhook_url = f"{self.config.base_url}{self.config.webhook_endpoint}"
@@ -328,6 +344,74 @@ class WebhookLoadTester:
         logger.info(f"Burst test completed: {len(valid_results)} results")
         return valid_results
     
+    async def fetch_dedup_stats(self) -> Optional[Dict[str, Any]]:
+        """Read the server's MessageSid dedup counters (requires stats_token)."""
+        if not self.config.stats_token:
+            return None
+        
+        try:
+            async with self.session.get(
+                f"{self.config.base_url}{self.config.stats_endpoint}",
+                headers={'Authorization': f'Bearer {self.config.stats_token}'}
+            ) as response:
+                if response.status != 200:
+                    logger.warning(f"Dedup stats unavailable: HTTP {response.status}")
+                    return None
+                payload = await response.json()
+                return payload["data"]["dedup"]
+        except Exception as e:
+            logger.warning(f"Failed to fetch dedup stats: {e}")
+            return None
+    
+    async def run_retry_storm_test(self) -> Tuple[List[RequestResult], Dict[str, Any]]:
+        """
+        Deliver each MessageSid several times concurrently, like Twilio retries.
+        
+        With stats_token configured, the server's dedup counters are read before
+        and after the storm. No duplicate processing means exactly one accepted
+        message per MessageSid and every other delivery suppressed.
+        """
+        messages = self.config.retry_storm_messages
+        deliveries = self.config.retry_storm_deliveries
+        logger.info(f"Starting retry storm: {messages} messages x {deliveries} deliveries")
+        
+        stats_before = await self.fetch_dedup_stats()
+        
+        tasks = []
+        for i in range(messages):
+            form_data = self.generate_form_data("text")
+            for attempt in range(deliveries):
+                tasks.append(asyncio.create_task(
+                    self.send_webhook_request("text", f"retry_{i}_{attempt}", form_data=form_data)
+                ))
+        
+        results = [r for r in await asyncio.gather(*tasks, return_exceptions=True) if isinstance(r, RequestResult)]
+        
+        stats_after = await self.fetch_dedup_stats()
+        
+        summary: Dict[str, Any] = {
+            "messages": messages,
+            "deliveries_per_message": deliveries,
+            "deliveries_sent": len(tasks),
+            "deliveries_acknowledged": sum(1 for r in results if r.success),
+            "expected_accepted": messages,
+            "expected_suppressed": messages * (deliveries - 1),
+            "verified": None
+        }
+        
+        if stats_before is not None and stats_after is not None:
+            accepted = stats_after["messages_accepted"] - stats_before["messages_accepted"]
+            suppressed = stats_after["duplicates_suppressed"] - stats_before["duplicates_suppressed"]
+            summary.update({
+                "accepted": accepted,
+                "suppressed": suppressed,
+                "duplicate_processing": max(0, accepted - messages),
+                "verified": accepted == messages and suppressed == summary["expected_suppressed"]
+            })
+        
+        logger.info(f"Retry storm completed: {summary}")
+        return results, summary
+    
     async def run_load_test(self) -> LoadTestResults:
         """Run comprehensive load test."""
         logger.info(f"Starting load test with {self.config.concurrent_users} users")
@@ -361,10 +445,18 @@ class WebhookLoadTester:
             burst_results = await self.run_burst_test()
             all_results.extend(burst_results)
         
+        # Phase 3: Retry storm (if enabled)
+        retry_storm_summary: Dict[str, Any] = {}
+        if self.config.enable_retry_storm:
+            logger.info("Phase 3: Retry storm test")
+            retry_results, retry_storm_summary = await self.run_retry_storm_test()
+            all_results.extend(retry_results)
+        
         test_duration = time.time() - test_start_time
         
         # Calculate results
         self.results = self._calculate_results(all_results, test_duration)
+        self.results.retry_storm = retry_storm_summary
         
         logger.info(f"Load test completed in {test_duration:.1f}s")
         logger.info(f"Total requests: {self.results.total_requests}")
@@ -457,6 +549,12 @@ class WebhookLoadTester:
             performance_grade = "FAIL"
             issues.append(f"P99 response time {self.results.p99_response_time_ms:.1f}ms exceeds maximum {self.config.max_response_time_ms}ms")
         
+        if self.results.retry_storm.get("verified") is False:
+            performance_grade = "FAIL"
+            issues.append(
+                f"Retry storm processed {self.results.retry_storm.get('duplicate_processing', 0)} duplicate messages"
+            )
+        
         # Requirements validation
         requirements_status = {
             "4.1": {
@@ -536,6 +634,7 @@ class WebhookLoadTester:
                 "burst_intensity": self.config.burst_intensity if self.config.enable_burst_testing else 0
             },
             "requirements_validation": requirements_status,
+            "retry_storm": self.results.retry_storm,
             "timestamp": datetime.now().isoformat()
         }
 
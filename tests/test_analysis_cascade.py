@@ -0,0 +1,219 @@
+"""
+Tests for the confidence-gated analysis cascade.
+
+Covers AnalysisCascade's gates and the rules, cheap model and primary model
+stages of EnhancedAIAnalysisService, including their metrics.
+"""
+
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.models.data_models import AppConfig, JobAnalysisResult, JobClassification
+from app.services.analysis_cascade import AnalysisCascade, AnalysisCascadeConfig
+from app.services.analysis_coalescer import AnalysisCoalescer, AnalysisCoalescerConfig
+from app.services.enhanced_ai_analysis import EnhancedAIAnalysisService
+from app.services.verdict_stream import EarlyVerdict, VerdictStreamParser
+from app.utils.metrics import get_metrics_collector, reset_metrics_collector
+
+
+SCAM_AD = """
+Earn $400 a day reposting ads from home! No experience needed.
+Message our recruiter on Telegram to get started today.
+"""
+
+PRIMARY = "gpt-4"
+CHEAP = "gpt-3.5-turbo"
+
+
+def response(trust_score: int, classification: str, confidence: float) -> str:
+    """Create a model response in the analysis prompt's format."""
+    return json.dumps({
+        "trust_score": trust_score,
+        "classification": classification,
+        "confidence": confidence,
+        "reasons": [
+            "Unrealistic daily pay for unskilled work",
+            "Recruitment only through Telegram",
+            "No company name or verifiable details"
+        ]
+    })
+
+
+def rule_result(classification=JobClassification.LIKELY_SCAM, confidence: float = 0.75) -> JobAnalysisResult:
+    """Create a rule-based result below the default rule threshold."""
+    return JobAnalysisResult(
+        trust_score={"Legit": 80, "Suspicious": 45, "Likely Scam": 10}[classification.value],
+        classification=classification,
+        reasons=["Rule 1", "Rule 2", "Rule 3"],
+        confidence=confidence
+    )
+
+
+@pytest.fixture
+def service():
+    reset_metrics_collector()
+    config = AppConfig(
+        openai_api_key="test_key",
+        twilio_account_sid="test_sid",
+        twilio_auth_token="test_token",
+        twilio_phone_number="+1234567890",
+        openai_model=PRIMARY,
+        openai_fallback_model=CHEAP
+    )
+    with patch('app.services.enhanced_ai_analysis.AsyncOpenAI'):
+        service = EnhancedAIAnalysisService(config)
+    service.cascade = AnalysisCascade(AnalysisCascadeConfig(enabled=True))
+    service.coalescer = AnalysisCoalescer(AnalysisCoalescerConfig(distributed=False))
+    service.near_duplicate_store.lookup = AsyncMock(return_value=None)
+    service.near_duplicate_store.record = AsyncMock()
+    service._check_similar_job_ads = AsyncMock(return_value=None)
+    service._apply_rule_based_detection = MagicMock(return_value=None)
+    return service
+
+
+def answer(service, responses):
+    """Answer completion requests per model; an Exception response is raised."""
+    async def request_completion(model, prompt, max_tokens, timeout):
+        if isinstance(responses[model], Exception):
+            raise responses[model]
+        return responses[model]
+
+    service._request_completion = AsyncMock(side_effect=request_completion)
+
+
+def models_called(service):
+    return [call.args[0] for call in service._request_completion.call_args_list]
+
+
+class TestAnalysisCascadeGates:
+    """Test AnalysisCascade decisions."""
+
+    def test_rule_threshold(self):
+        """Test rule results are final only at or above the rule threshold."""
+        cascade = AnalysisCascade(AnalysisCascadeConfig(rule_confidence_threshold=0.8))
+
+        assert cascade.accepts_rules(rule_result(confidence=0.8))
+        assert not cascade.accepts_rules(rule_result(confidence=0.79))
+        assert not cascade.accepts_rules(None)
+
+    def test_escalation_reasons(self):
+        """Test low confidence and disagreement with the rules escalate."""
+        cascade = AnalysisCascade(AnalysisCascadeConfig(cheap_model_confidence_threshold=0.8))
+        verdict = EarlyVerdict(12, JobClassification.LIKELY_SCAM, 0.85)
+
+        assert cascade.escalation_reason(verdict, None) is None
+        assert cascade.escalation_reason(verdict, rule_result()) is None
+        assert cascade.escalation_reason(verdict, rule_result(JobClassification.SUSPICIOUS)) == "disagreement"
+        assert cascade.escalation_reason(EarlyVerdict(12, JobClassification.LIKELY_SCAM, 0.6), None) == "low_confidence"
+
+        cascade.config.escalate_on_disagreement = False
+        assert cascade.escalation_reason(verdict, rule_result(JobClassification.SUSPICIOUS)) is None
+
+
+class TestCascadeStages:
+    """Test the cascade in EnhancedAIAnalysisService.analyze_job_ad."""
+
+    @pytest.mark.asyncio
+    async def test_confident_rules_skip_models(self, service):
+        """Test a rule result at the configured threshold needs no model call."""
+        service.cascade.config.rule_confidence_threshold = 0.7
+        service._apply_rule_based_detection.return_value = rule_result(confidence=0.75)
+        answer(service, {})
+
+        result = await service.analyze_job_ad(SCAM_AD)
+
+        assert result.confidence == 0.75
+        service._request_completion.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_confident_cheap_model_is_accepted(self, service):
+        """Test a confident cheap model result is final."""
+        answer(service, {CHEAP: response(10, "Likely Scam", 0.9), PRIMARY: response(8, "Likely Scam", 0.95)})
+
+        result = await service.analyze_job_ad(SCAM_AD)
+
+        assert models_called(service) == [CHEAP]
+        assert result.trust_score == 10
+        assert service._request_completion.call_args.kwargs["timeout"] == service.cascade.config.cheap_model_timeout
+
+    @pytest.mark.asyncio
+    async def test_low_confidence_escalates(self, service):
+        """Test a low-confidence cheap model result is escalated to the primary model."""
+        answer(service, {CHEAP: response(40, "Suspicious", 0.6), PRIMARY: response(8, "Likely Scam", 0.95)})
+
+        result = await service.analyze_job_ad(SCAM_AD)
+
+        assert models_called(service) == [CHEAP, PRIMARY]
+        assert result.trust_score == 8
+
+    @pytest.mark.asyncio
+    async def test_disagreement_with_rules_escalates(self, service):
+        """Test a cheap model result that contradicts the rules is escalated."""
+        service._apply_rule_based_detection.return_value = rule_result()
+        answer(service, {CHEAP: response(80, "Legit", 0.9), PRIMARY: response(8, "Likely Scam", 0.95)})
+
+        result = await service.analyze_job_ad(SCAM_AD)
+
+        assert models_called(service) == [CHEAP, PRIMARY]
+        assert result.classification == JobClassification.LIKELY_SCAM
+
+    @pytest.mark.asyncio
+    async def test_primary_failure_uses_escalated_result(self, service):
+        """Test the cheap model result stands if the primary model fails after escalation."""
+        answer(service, {CHEAP: response(40, "Suspicious", 0.6), PRIMARY: Exception("Primary model down")})
+
+        result = await service.analyze_job_ad(SCAM_AD)
+
+        assert models_called(service) == [CHEAP, PRIMARY]
+        assert result.trust_score == 40
+
+    @pytest.mark.asyncio
+    async def test_disabled_cascade_uses_primary_model(self, service):
+        """Test the primary model analyzes every ad when the cascade is off."""
+        service.cascade.config.enabled = False
+        answer(service, {CHEAP: response(10, "Likely Scam", 0.9), PRIMARY: response(8, "Likely Scam", 0.95)})
+
+        await service.analyze_job_ad(SCAM_AD)
+
+        assert models_called(service) == [PRIMARY]
+
+    @pytest.mark.asyncio
+    async def test_only_verdicts_that_stand_are_streamed(self, service):
+        """Test an escalated cheap model verdict is not reported, the primary one is."""
+        responses = {CHEAP: response(40, "Suspicious", 0.6), PRIMARY: response(8, "Likely Scam", 0.95)}
+
+        async def request_streaming_completion(model, prompt, max_tokens, timeout, on_verdict):
+            parser = VerdictStreamParser()
+            await on_verdict(parser.feed(responses[model]))
+            return responses[model]
+
+        service._request_streaming_completion = AsyncMock(side_effect=request_streaming_completion)
+        reported = []
+
+        async def on_verdict(verdict):
+            reported.append(verdict)
+
+        result = await service.analyze_job_ad(SCAM_AD, on_verdict=on_verdict)
+
+        assert [verdict.trust_score for verdict in reported] == [8]
+        assert result.trust_score == 8
+
+    @pytest.mark.asyncio
+    async def test_stage_metrics(self, service):
+        """Test per-stage escalation rate, latency and cost are recorded."""
+        answer(service, {CHEAP: response(10, "Likely Scam", 0.9), PRIMARY: response(8, "Likely Scam", 0.95)})
+        await service.analyze_job_ad(SCAM_AD)
+        answer(service, {CHEAP: response(40, "Suspicious", 0.6), PRIMARY: response(8, "Likely Scam", 0.95)})
+        await service.analyze_job_ad(SCAM_AD + " Apply now.")
+
+        summary = get_metrics_collector().get_current_metrics()["analysis_cascade"]
+        stages = summary["stages"]
+
+        assert summary["analyses"] == 2
+        assert stages["rules"]["escalation_rate_percent"] == 100.0
+        assert (stages["cheap_model"]["accepted"], stages["cheap_model"]["escalated"]) == (1, 1)
+        assert stages["cheap_model"]["escalation_rate_percent"] == 50.0
+        assert stages["primary_model"]["runs"] == 1
+        assert stages["primary_model"]["cost_usd"] > stages["cheap_model"]["cost_usd"] > 0
+        assert abs(summary["cost_per_analysis_usd"] - summary["cost_usd"] / 2) < 1e-6
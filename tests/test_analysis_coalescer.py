@@ -0,0 +1,238 @@
+"""
+Tests for single-flight coalescing of identical analysis requests.
+
+Redis is replaced by a small in-memory manager supporting the lock and
+result commands, so two coalescer instances stand in for two workers.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import patch, AsyncMock
+
+from app.services.analysis_coalescer import AnalysisCoalescer, AnalysisCoalescerConfig, text_digest
+from app.services.enhanced_ai_analysis import EnhancedAIAnalysisService
+from app.services.near_duplicate_store import NearDuplicateStore, NearDuplicateConfig
+from app.models.data_models import AppConfig, JobAnalysisResult, JobClassification
+
+
+VIRAL_AD = """
+Earn $400 a day reposting ads from home! No experience needed.
+Message our recruiter on Telegram to get started today.
+"""
+
+
+class InMemoryRedisManager:
+    """Dict-backed stand-in for RedisConnectionManager lock commands."""
+
+    def __init__(self):
+        self.values = {}
+
+    def is_available(self) -> bool:
+        return True
+
+    async def execute_command(self, command, *args, **kwargs):
+        return getattr(self, command)(*args, **kwargs)
+
+    async def execute_pipeline(self, commands, transaction=True):
+        return [getattr(self, command)(*args) for command, *args in commands]
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    def setex(self, key, ttl, value):
+        self.values[key] = value
+        return True
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def exists(self, key):
+        return int(key in self.values)
+
+    def eval(self, script, numkeys, key, token):
+        if self.values.get(key) == token:
+            del self.values[key]
+            return 1
+        return 0
+
+
+def make_result() -> JobAnalysisResult:
+    """Create an analysis verdict."""
+    return JobAnalysisResult(
+        trust_score=12,
+        classification=JobClassification.LIKELY_SCAM,
+        reasons=["Unrealistic daily pay", "Recruiting over Telegram", "No experience required"],
+        confidence=0.9
+    )
+
+
+def make_coalescer(redis_manager, **overrides) -> AnalysisCoalescer:
+    """Create a coalescer bound to the given Redis manager."""
+    overrides.setdefault('poll_interval', 0.01)
+    with patch('app.services.analysis_coalescer.get_redis_manager', return_value=redis_manager):
+        return AnalysisCoalescer(AnalysisCoalescerConfig(**overrides))
+
+
+def slow_analysis(delay: float = 0.05, result=None):
+    """Create an analyze callable that counts its calls."""
+    calls = []
+
+    async def analyze():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return result or make_result()
+
+    return analyze, calls
+
+
+@pytest.fixture
+def redis_manager():
+    return InMemoryRedisManager()
+
+
+class TestLocalCoalescing:
+    """Test callers in one process share an in-flight analysis."""
+
+    def test_digest_ignores_case_and_whitespace(self):
+        """Test forwarded copies with different spacing share a key."""
+        assert text_digest(VIRAL_AD) == text_digest("  " + VIRAL_AD.upper().replace("\n", "  \n "))
+        assert text_digest(VIRAL_AD) != text_digest(VIRAL_AD.replace("$400", "$500"))
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_requests_share_one_call(self):
+        """Test twenty concurrent copies cost one analysis and report nineteen saved calls."""
+        coalescer = make_coalescer(InMemoryRedisManager(), distributed=False)
+        analyze, calls = slow_analysis()
+
+        results = await asyncio.gather(*(
+            coalescer.run(VIRAL_AD if i % 2 else VIRAL_AD.upper(), analyze) for i in range(20)
+        ))
+
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+        assert coalescer.get_stats()['saved_calls'] == 19
+        assert coalescer.get_stats()['in_flight'] == 0
+
+    @pytest.mark.asyncio
+    async def test_different_texts_are_not_coalesced(self):
+        """Test distinct ads each get their own analysis."""
+        coalescer = make_coalescer(InMemoryRedisManager(), distributed=False)
+        analyze, calls = slow_analysis()
+
+        await asyncio.gather(coalescer.run("first ad text", analyze), coalescer.run("second ad text", analyze))
+
+        assert len(calls) == 2
+        assert coalescer.get_stats()['saved_calls'] == 0
+
+    @pytest.mark.asyncio
+    async def test_leader_failure_reaches_followers_and_clears_entry(self):
+        """Test followers see the leader's error and the next request retries."""
+        coalescer = make_coalescer(InMemoryRedisManager(), distributed=False)
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("OpenAI unavailable")
+
+        results = await asyncio.gather(*(coalescer.run(VIRAL_AD, failing) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+        analyze, calls = slow_analysis(delay=0)
+        await coalescer.run(VIRAL_AD, analyze)
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_leader_cancellation_does_not_cancel_followers(self):
+        """Test followers of a cancelled leader get a result from a new leader."""
+        coalescer = make_coalescer(InMemoryRedisManager(), distributed=False)
+        analyze, calls = slow_analysis()
+
+        leader = asyncio.create_task(coalescer.run(VIRAL_AD, analyze))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(coalescer.run(VIRAL_AD, analyze)) for _ in range(3)]
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        results = await asyncio.gather(*followers)
+        assert leader.cancelled()
+        assert all(result.classification == JobClassification.LIKELY_SCAM for result in results)
+        assert len(calls) == 2
+        assert coalescer.get_stats()['local_joins'] == 2
+
+    @pytest.mark.asyncio
+    async def test_disabled_coalescer_runs_every_request(self):
+        """Test disabling coalescing restores one analysis per request."""
+        coalescer = make_coalescer(InMemoryRedisManager(), enabled=False)
+        analyze, calls = slow_analysis()
+
+        await asyncio.gather(*(coalescer.run(VIRAL_AD, analyze) for _ in range(3)))
+
+        assert len(calls) == 3
+
+
+class TestDistributedCoalescing:
+    """Test workers coordinate through the Redis lock."""
+
+    @pytest.mark.asyncio
+    async def test_second_worker_reuses_published_result(self, redis_manager):
+        """Test a worker that loses the lock waits for the holder's result."""
+        worker_a, worker_b = make_coalescer(redis_manager), make_coalescer(redis_manager)
+        analyze, calls = slow_analysis(delay=0.1)
+
+        result_a, result_b = await asyncio.gather(worker_a.run(VIRAL_AD, analyze), worker_b.run(VIRAL_AD, analyze))
+
+        assert len(calls) == 1
+        assert result_b.trust_score == result_a.trust_score
+        assert result_b.classification == result_a.classification
+        assert worker_a.get_stats()['saved_calls'] + worker_b.get_stats()['saved_calls'] == 1
+        assert not any(key.startswith("singleflight:lock:") for key in redis_manager.values)
+
+    @pytest.mark.asyncio
+    async def test_waiter_analyzes_itself_when_holder_fails(self, redis_manager):
+        """Test a failed holder releases the lock and the waiter falls back."""
+        worker_a, worker_b = make_coalescer(redis_manager), make_coalescer(redis_manager)
+
+        async def failing():
+            await asyncio.sleep(0.05)
+            raise RuntimeError("OpenAI unavailable")
+
+        analyze, calls = slow_analysis(delay=0)
+        results = await asyncio.gather(
+            worker_a.run(VIRAL_AD, failing), worker_b.run(VIRAL_AD, analyze), return_exceptions=True
+        )
+
+        assert isinstance(results[0], RuntimeError)
+        assert results[1].classification == JobClassification.LIKELY_SCAM
+        assert len(calls) == 1
+        assert worker_b.get_stats()['remote_hits'] == 0
+
+
+class TestAnalysisIntegration:
+    """Test EnhancedAIAnalysisService coalesces identical concurrent requests."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_ads_call_model_once(self):
+        config = AppConfig(
+            openai_api_key="test_key",
+            twilio_account_sid="test_sid",
+            twilio_auth_token="test_token",
+            twilio_phone_number="test_phone"
+        )
+        with patch('app.services.enhanced_ai_analysis.AsyncOpenAI'):
+            service = EnhancedAIAnalysisService(config)
+        service.coalescer = make_coalescer(InMemoryRedisManager(), distributed=False)
+        service.near_duplicate_store = NearDuplicateStore(NearDuplicateConfig(enabled=False))
+
+        async def analyze_with_model(job_text, model):
+            await asyncio.sleep(0.05)
+            return make_result()
+
+        service._analyze_with_model = AsyncMock(side_effect=analyze_with_model)
+
+        results = await asyncio.gather(*(service.analyze_job_ad(VIRAL_AD) for _ in range(10)))
+
+        assert service._analyze_with_model.await_count == 1
+        assert all(result.classification == JobClassification.LIKELY_SCAM for result in results)
+        assert service.coalescer.get_stats()['saved_calls'] == 9
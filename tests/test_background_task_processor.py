@@ -8,13 +8,16 @@ dead letter queue, and resource management.
 import pytest
 import asyncio
 import json
-from datetime import datetime, timezone
+import time
+from datetime import datetime, timezone, timedelta
 from unittest.mock import Mock, AsyncMock, patch
 
 from app.services.background_task_processor import (
     BackgroundTaskProcessor, ProcessingTask, TaskPriority, TaskStatus, 
-    TaskQueueConfig, TaskResult, QueueStatus
+    TaskQueueConfig, TaskResult, QueueStatus, WeightedPriorityScheduler
 )
+from app.services.local_task_queue import LocalTaskQueue, LocalQueueEntry, LocalQueueFull
+from app.utils.circuit_breaker import CircuitState
 from app.services.task_handlers import (
     create_message_processing_task, create_timeout_notification_task,
     create_interaction_recording_task
@@ -125,17 +128,21 @@ class TestBackgroundTaskProcessor:
         # Mock Redis as available
         processor.redis_manager.is_available.return_value = True
         processor.redis_manager.execute_command = AsyncMock()
+        processor.redis_manager.execute_pipeline = AsyncMock(return_value=[1, True, 1, 1, 1, True])
         processor._get_queue_depth = AsyncMock(return_value=0)
-        processor._set_task_status = AsyncMock()
         
         task_id = await processor.queue_task(sample_task)
         
         assert task_id == sample_task.task_id
         assert processor.metrics['tasks_queued'] == 1
         
-        # Verify Redis operations were called
-        processor.redis_manager.execute_command.assert_called()
-        processor._set_task_status.assert_called_with(sample_task.task_id, TaskStatus.PENDING)
+        # Verify all Redis writes went out in a single pipeline
+        processor.redis_manager.execute_pipeline.assert_called_once()
+        processor.redis_manager.execute_command.assert_not_called()
+        commands = processor.redis_manager.execute_pipeline.call_args[0][0]
+        assert ('lpush', 'task_queue:normal', json.dumps(sample_task.to_dict())) in commands
+        assert ('setex', f'task_queue:status:{sample_task.task_id}', 3600, TaskStatus.PENDING.value) in commands
+        assert processor.metrics['queue_depth'] == 1
     
     @pytest.mark.asyncio
     async def test_queue_full_rejection(self, processor, sample_task):
@@ -144,7 +151,37 @@ class TestBackgroundTaskProcessor:
         
         with pytest.raises(Exception, match="Task queue is full"):
             await processor.queue_task(sample_task)
-    
+
+    @pytest.mark.asyncio
+    async def test_immediate_tasks_do_not_fill_queue(self, processor):
+        """Test tasks processed immediately without Redis are not counted as queued."""
+        processor._process_task_immediate = AsyncMock()
+        tasks = [
+            ProcessingTask(task_id=f"immediate_{i}", task_type="test_handler", payload={})
+            for i in range(processor.config.max_queue_size * 2)
+        ]
+
+        for task in tasks[:-2]:
+            await processor.queue_task(task)
+        await processor.queue_tasks(tasks[-2:])
+        await asyncio.sleep(0)
+
+        assert processor._process_task_immediate.await_count == len(tasks)
+        assert processor.metrics['queue_depth'] == 0
+
+    @pytest.mark.asyncio
+    async def test_queue_depth_reread_when_redis_returns(self, processor, sample_task):
+        """Test the cached depth is refreshed from Redis after an outage."""
+        processor._process_task_immediate = AsyncMock()
+        await processor.queue_task(sample_task)
+
+        processor.redis_manager.is_available.return_value = True
+        processor.redis_manager.execute_command = AsyncMock(return_value="7")
+
+        assert await processor._get_queue_depth() == 7
+        assert await processor._get_queue_depth() == 7
+        processor.redis_manager.execute_command.assert_called_once_with('get', processor.DEPTH_KEY)
+
     @pytest.mark.asyncio
     async def test_task_processing_success(self, processor):
         """Test successful task processing."""
@@ -302,6 +339,530 @@ class TestBackgroundTaskProcessor:
         assert processor.metrics['tasks_processed'] == initial_processed + 1
         assert processor.metrics['average_processing_time'] > 0
 
+    
+    @pytest.mark.asyncio
+    async def test_claim_next_task_moves_into_processing_list(self, processor, sample_task):
+        """Test atomic claim checks priority queues in order with one script call."""
+        task_data = json.dumps(sample_task.to_dict())
+        processor.redis_manager.is_available.return_value = True
+        processor.redis_manager.execute_command = AsyncMock(return_value=task_data)
+        
+        task, raw = await processor._claim_next_task("worker-0")
+        
+        assert task.task_id == sample_task.task_id
+        assert raw == task_data
+        
+        call_args = processor.redis_manager.execute_command.call_args_list[0][0]
+        assert call_args[0] == 'eval'
+        assert call_args[2] == 6
+        assert list(call_args[3:9]) == [
+            "task_queue:high",
+            "task_queue:normal",
+            "task_queue:low",
+            processor._get_processing_key("worker-0"),
+            processor.DEPTH_KEY,
+            processor.LEASES_KEY
+        ]
+        # Lease expiry is passed so the claim and lease are atomic
+        assert call_args[9] > time.time()
+    
+    @pytest.mark.asyncio
+    async def test_claim_next_task_blocks_when_queues_empty(self, processor, sample_task):
+        """Test empty queues block on the wake-up list instead of polling."""
+        task_data = json.dumps(sample_task.to_dict())
+        processor.redis_manager.is_available.return_value = True
+        processor.redis_manager.execute_command = AsyncMock(
+            side_effect=[None, ["task_queue:wakeup", "1"], task_data]
+        )
+        
+        task, raw = await processor._claim_next_task("worker-0")
+        
+        assert task.task_id == sample_task.task_id
+        commands = [c[0][0] for c in processor.redis_manager.execute_command.call_args_list]
+        assert commands == ['eval', 'brpop', 'eval']
+    
+    @pytest.mark.asyncio
+    async def test_worker_acknowledges_claimed_task(self, processor, sample_task):
+        """Test processed tasks are removed from the worker's processing list."""
+        task_data = json.dumps(sample_task.to_dict())
+        processor.redis_manager.is_available.return_value = True
+        processor.is_running = True
+        
+        async def process_and_stop(task, worker_id):
+            processor.is_running = False
+        
+        processor._claim_next_task = AsyncMock(return_value=(sample_task, task_data))
+        processor._process_task = AsyncMock(side_effect=process_and_stop)
+        processor._acknowledge_task = AsyncMock()
+        
+        await processor._worker_loop("worker-0")
+        
+        processor._process_task.assert_called_once_with(sample_task, "worker-0")
+        processor._acknowledge_task.assert_called_once_with("worker-0", task_data)
+    
+    @pytest.mark.asyncio
+    async def test_restarted_process_gets_its_own_processing_lists(self, processor):
+        """Test a restart with the same hostname and PID never reuses the crashed lists."""
+        with patch('app.services.background_task_processor.socket.gethostname', return_value="web-1"), \
+                patch('app.services.background_task_processor.os.getpid', return_value=1):
+            crashed = BackgroundTaskProcessor(processor.config)
+            restarted = BackgroundTaskProcessor(processor.config)
+        restarted.redis_manager = Mock()
+        restarted.redis_manager.execute_pipeline = AsyncMock(return_value=[1, 1])
+        
+        crashed_key = crashed._get_processing_key("worker-0")
+        restarted_key = restarted._get_processing_key("worker-0")
+        assert crashed_key != restarted_key
+        assert crashed_key.startswith("task_queue:processing:web-1:1:")
+        
+        # Acking on the new worker leaves the old lease for the reaper
+        await restarted._acknowledge_task("worker-0", "task-data")
+        for command in restarted.redis_manager.execute_pipeline.call_args[0][0]:
+            assert crashed_key not in command
+    
+    @pytest.mark.asyncio
+    async def test_delayed_task_goes_to_delayed_set(self, processor, sample_task):
+        """Test future tasks are parked in the delayed ZSET instead of a queue."""
+        processor.redis_manager.is_available.return_value = True
+        processor.redis_manager.execute_pipeline = AsyncMock(return_value=[1, True, 1])
+        processor._get_queue_depth = AsyncMock(return_value=0)
+        
+        sample_task.scheduled_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+        await processor.queue_task(sample_task)
+        
+        commands = processor.redis_manager.execute_pipeline.call_args[0][0]
+        names = [c[0] for c in commands]
+        assert 'zadd' in names
+        assert 'lpush' not in names
+        
+        zadd_command = next(c for c in commands if c[0] == 'zadd')
+        assert zadd_command[1] == processor.DELAYED_KEY
+        score = list(zadd_command[2].values())[0]
+        assert score == pytest.approx(sample_task.scheduled_at.timestamp())
+    
+    @pytest.mark.asyncio
+    async def test_promote_due_tasks(self, processor):
+        """Test due tasks are promoted with a single script call."""
+        processor.redis_manager.is_available.return_value = True
+        processor.redis_manager.execute_command = AsyncMock(return_value=3)
+        
+        promoted = await processor._promote_due_tasks()
+        
+        assert promoted == 3
+        assert processor.metrics['tasks_promoted'] == 3
+        call_args = processor.redis_manager.execute_command.call_args[0]
+        assert call_args[0] == 'eval'
+        assert call_args[3:9] == (
+            processor.DELAYED_KEY,
+            "task_queue:low",
+            "task_queue:normal",
+            "task_queue:high",
+            processor.WAKEUP_KEY,
+            processor.DEPTH_KEY
+        )
+    
+    @pytest.mark.asyncio
+    async def test_retry_is_scheduled_not_requeued(self, processor, sample_task):
+        """Test failed tasks are retried through the delayed set."""
+        processor.redis_manager.is_available.return_value = True
+        processor.redis_manager.execute_pipeline = AsyncMock(return_value=[1, True, 1])
+        processor._get_queue_depth = AsyncMock(return_value=0)
+        
+        await processor._handle_task_failure(sample_task, "boom", "corr")
+        
+        commands = [c[0] for c in processor.redis_manager.execute_pipeline.call_args[0][0]]
+        assert 'zadd' in commands
+        assert 'lpush' not in commands
+        assert processor.metrics['tasks_retried'] == 1
+
+    
+    @pytest.mark.asyncio
+    async def test_queue_tasks_single_pipeline(self, processor):
+        """Test bulk enqueue sends every task in one pipeline."""
+        processor.redis_manager.is_available.return_value = True
+        processor.redis_manager.execute_pipeline = AsyncMock(
+            return_value=[2, 1, True, True, True, 3, 3, 1, True]
+        )
+        
+        tasks = [
+            ProcessingTask(task_id=f"bulk_{i}", task_type="test_handler", payload={"i": i},
+                           priority=TaskPriority.HIGH if i == 0 else TaskPriority.NORMAL)
+            for i in range(3)
+        ]
+        
+        task_ids = await processor.queue_tasks(tasks)
+        
+        assert task_ids == ["bulk_0", "bulk_1", "bulk_2"]
+        assert processor.metrics['tasks_queued'] == 3
+        processor.redis_manager.execute_pipeline.assert_called_once()
+        
+        commands = processor.redis_manager.execute_pipeline.call_args[0][0]
+        lpushes = [c for c in commands if c[0] == 'lpush' and c[1].startswith('task_queue:') and c[1] != processor.WAKEUP_KEY]
+        assert len(lpushes) == 2
+        assert ('incrby', processor.DEPTH_KEY, 3) in commands
+    
+    @pytest.mark.asyncio
+    async def test_queue_tasks_rejects_oversized_batch(self, processor):
+        """Test bulk enqueue is rejected when the batch does not fit."""
+        processor.metrics['queue_depth'] = processor.config.max_queue_size - 1
+        tasks = [
+            ProcessingTask(task_id=f"bulk_{i}", task_type="test_handler", payload={})
+            for i in range(2)
+        ]
+        
+        with pytest.raises(Exception, match="Task queue is full"):
+            await processor.queue_tasks(tasks)
+    
+    @pytest.mark.asyncio
+    async def test_queue_task_raises_when_pipeline_fails(self, processor, sample_task):
+        """Test a failed pipeline is surfaced instead of silently dropping the task."""
+        processor.redis_manager.is_available.return_value = True
+        processor.redis_manager.execute_pipeline = AsyncMock(return_value=None)
+        
+        with pytest.raises(Exception, match="pipeline failed"):
+            await processor.queue_task(sample_task)
+    
+    @pytest.mark.asyncio
+    async def test_task_queued_locally_while_running_without_redis(self, processor, sample_task):
+        """Test running workers serve a bounded local queue instead of spawning tasks."""
+        processor.is_running = True
+        processor._process_task_immediate = AsyncMock()
+        
+        await processor.queue_task(sample_task)
+        
+        processor._process_task_immediate.assert_not_called()
+        assert len(processor.local_queue) == 1
+        assert processor.metrics['tasks_fallback_queued'] == 1
+        
+        task, entry = await processor._get_local_task()
+        assert task.task_id == sample_task.task_id
+        assert entry.task_id == sample_task.task_id
+    
+    @pytest.mark.asyncio
+    async def test_drain_local_queue_to_redis(self, processor, sample_task):
+        """Test fallback tasks are pipelined back into Redis on recovery."""
+        processor.is_running = True
+        await processor.queue_task(sample_task)
+        
+        processor.redis_manager.is_available.return_value = True
+        processor.redis_manager.execute_pipeline = AsyncMock(return_value=[1, True, 1, 1, 1, True])
+        
+        drained = await processor._drain_local_queue()
+        
+        assert drained == 1
+        assert len(processor.local_queue) == 0
+        assert processor.metrics['tasks_drained'] == 1
+        commands = processor.redis_manager.execute_pipeline.call_args[0][0]
+        assert commands[0][:2] == ('lpush', 'task_queue:normal')
+    
+    @pytest.mark.asyncio
+    async def test_drain_keeps_tasks_when_redis_fails(self, processor, sample_task):
+        """Test a failed drain leaves tasks on the local queue."""
+        processor.is_running = True
+        await processor.queue_task(sample_task)
+        
+        processor.redis_manager.is_available.return_value = True
+        processor.redis_manager.execute_pipeline = AsyncMock(return_value=None)
+        
+        assert await processor._drain_local_queue() == 0
+        assert len(processor.local_queue) == 1
+    
+    @pytest.mark.asyncio
+    async def test_local_task_kept_when_retry_does_not_fit(self, processor, sample_task):
+        """Test a failed local task is requeued, not acknowledged, when its retry hits a full queue."""
+        processor.is_running = True
+        processor.config.fallback_put_timeout = 0
+        processor.local_queue = LocalTaskQueue(max_size=1)
+        await processor.queue_task(sample_task)
+        processor.local_queue.ack = AsyncMock()
+        
+        async def fail_and_stop(task, worker_id):
+            await processor.queue_task(ProcessingTask(task_id="filler", task_type="test_handler", payload={}))
+            try:
+                await processor._handle_task_failure(task, "boom", None)
+            finally:
+                processor.is_running = False
+        
+        processor._process_task = AsyncMock(side_effect=fail_and_stop)
+        
+        await processor._worker_loop("worker-0")
+        
+        processor.local_queue.ack.assert_not_called()
+        queued = sorted(entry.task_id for entry in processor.local_queue.pop_batch(10))
+        assert queued == ["filler", sample_task.task_id]
+
+    
+    def test_weighted_scheduler_shares_claims_by_weight(self):
+        """Test every priority is preferred in proportion to its weight."""
+        scheduler = WeightedPriorityScheduler(
+            {'high': 6, 'normal': 3, 'low': 1},
+            BackgroundTaskProcessor.PRIORITY_ORDER
+        )
+        
+        orders = [scheduler.next_order() for _ in range(100)]
+        preferred = [order[0] for order in orders]
+        
+        assert preferred.count(TaskPriority.HIGH) == 60
+        assert preferred.count(TaskPriority.NORMAL) == 30
+        assert preferred.count(TaskPriority.LOW) == 10
+        # Remaining queues are still tried so claims are work-conserving
+        assert all(len(set(order)) == 3 for order in orders)
+    
+    @pytest.mark.asyncio
+    async def test_task_type_cap_defers_claimed_task(self, processor, sample_task):
+        """Test a task over its type's concurrency cap goes back to the claim end of its queue."""
+        processor.config.task_type_concurrency = {sample_task.task_type: 1}
+        processor.config.concurrency_defer_delay = 0
+        processor.task_type_in_flight[sample_task.task_type] = 1
+        processor.redis_manager.is_available.return_value = True
+        processor._claim_next_task = AsyncMock(return_value=(sample_task, "raw"))
+        processor._process_task = AsyncMock()
+        
+        async def stop_after_defer(*args, **kwargs):
+            processor.is_running = False
+            return [1, 1, 1, 1]
+        
+        processor.redis_manager.execute_pipeline = AsyncMock(side_effect=stop_after_defer)
+        processor.is_running = True
+        
+        await processor._worker_loop("worker-0")
+        
+        processor._process_task.assert_not_called()
+        processing_key = processor._get_processing_key("worker-0")
+        processor.redis_manager.execute_pipeline.assert_called_once_with([
+            ('rpush', "task_queue:normal", "raw"),
+            ('incr', processor.DEPTH_KEY),
+            ('lrem', processing_key, 1, "raw"),
+            ('zrem', processor.LEASES_KEY, processing_key)
+        ])
+        assert processor.metrics['tasks_deferred'] == 1
+    
+    @pytest.mark.asyncio
+    async def test_claim_skips_capped_task_types(self, processor):
+        """Test claims name the capped task types so the script leaves those tasks queued."""
+        processor.config.task_type_concurrency = {"process_media_message": 1, "process_message": 5}
+        processor.task_type_in_flight["process_media_message"] = 1
+        processor.redis_manager.execute_command = AsyncMock(return_value=None)
+        
+        await processor._claim_task_data("worker-0")
+        
+        call_args = processor.redis_manager.execute_command.call_args[0]
+        assert list(call_args[-2:]) == [processor.config.claim_scan_depth, "process_media_message"]
+    
+    @pytest.mark.asyncio
+    async def test_queue_status_reports_in_flight_by_type(self, processor):
+        """Test per-type in-flight counts are exposed and released after processing."""
+        assert processor._acquire_type_slot("process_message")
+        assert processor._acquire_type_slot("process_message")
+        assert processor._acquire_type_slot("record_interaction")
+        
+        status = await processor.get_queue_status()
+        assert status.in_flight_by_type == {"process_message": 2, "record_interaction": 1}
+        assert status.processing_tasks == 3
+        
+        processor._release_type_slot("record_interaction")
+        status = await processor.get_queue_status()
+        assert status.in_flight_by_type == {"process_message": 2}
+
+    
+    @pytest.mark.asyncio
+    async def test_autoscaler_grows_pool_for_backlog(self, processor):
+        """Test a backlog scales the pool up to drain within the target time."""
+        processor.config.autoscale_enabled = False
+        processor.max_workers = 6
+        processor.performance_monitor = Mock()
+        await processor.start()
+        
+        processor.metrics['queue_depth'] = 50
+        processor.metrics['average_processing_time'] = 1.0
+        
+        assert await processor._autoscale() == 3
+        assert processor.get_active_worker_count() == 5
+        assert processor.metrics['scale_ups'] == 1
+        name, value, unit, tags = processor.performance_monitor.record_metric.call_args[0]
+        assert name == "task_worker_scaling"
+        assert value == 5
+        assert tags["direction"] == "up"
+        
+        await processor.stop()
+    
+    @pytest.mark.asyncio
+    async def test_autoscaler_shrinks_after_cooldown(self, processor):
+        """Test idle workers are retired one at a time after the cooldown."""
+        processor.config.autoscale_enabled = False
+        processor.config.autoscale_cooldown = 0
+        processor.performance_monitor = Mock()
+        await processor.start()
+        
+        assert await processor._autoscale() == -1
+        assert processor._retiring_workers == {"worker-1"}
+        assert processor.get_active_worker_count() == 1
+        
+        # Never shrink below the minimum
+        assert await processor._autoscale() == 0
+        
+        await processor.stop()
+    
+    def test_autoscaler_holds_minimum_when_openai_circuit_open(self, processor):
+        """Test an open OpenAI circuit keeps the pool at its minimum."""
+        processor.metrics['queue_depth'] = 100
+        processor.metrics['average_processing_time'] = 2.0
+        
+        with patch.object(processor, '_get_openai_circuit_state', return_value=CircuitState.OPEN):
+            desired, reason = processor._compute_desired_workers()
+        
+        assert desired == processor.min_workers
+        assert reason == "openai_circuit_open"
+
+    
+    @pytest.mark.asyncio
+    async def test_acknowledge_releases_lease(self, processor):
+        """Test acknowledging removes the task and its lease in one pipeline."""
+        processor.redis_manager.execute_pipeline = AsyncMock(return_value=[1, 1])
+        
+        await processor._acknowledge_task("worker-0", "task-data")
+        
+        processing_key = processor._get_processing_key("worker-0")
+        processor.redis_manager.execute_pipeline.assert_called_once_with([
+            ('lrem', processing_key, 1, "task-data"),
+            ('zrem', processor.LEASES_KEY, processing_key)
+        ])
+    
+    @pytest.mark.asyncio
+    async def test_lease_heartbeat_extends_existing_lease(self, processor):
+        """Test heartbeats only extend leases the reaper has not taken back."""
+        processor.config.visibility_timeout = 0.3
+        processor.redis_manager.execute_command = AsyncMock(return_value=0)
+        
+        heartbeat = asyncio.create_task(processor._lease_heartbeat("worker-0"))
+        await asyncio.sleep(0.15)
+        heartbeat.cancel()
+        
+        args, kwargs = processor.redis_manager.execute_command.call_args
+        assert args[:2] == ('zadd', processor.LEASES_KEY)
+        assert kwargs == {'xx': True}
+    
+    @pytest.mark.asyncio
+    async def test_reap_expired_leases(self, processor):
+        """Test expired leases are reclaimed by one script call and counted."""
+        processor.redis_manager.is_available.return_value = True
+        processor.redis_manager.execute_command = AsyncMock(return_value=[2, 1])
+        
+        assert await processor.reap_expired_leases() == (2, 1)
+        
+        call_args = processor.redis_manager.execute_command.call_args[0]
+        assert call_args[0] == 'eval'
+        assert list(call_args[3:10]) == [
+            processor.LEASES_KEY,
+            "task_queue:low",
+            "task_queue:normal",
+            "task_queue:high",
+            processor.DEAD_LETTER_KEY,
+            processor.WAKEUP_KEY,
+            processor.DEPTH_KEY
+        ]
+        assert processor.metrics['tasks_reaped_requeued'] == 2
+        assert processor.metrics['tasks_reaped_dead_lettered'] == 1
+
+
+class TestLocalTaskQueue:
+    """Test cases for the local fallback task queue."""
+    
+    @pytest.mark.asyncio
+    async def test_priority_order(self):
+        """Test higher priority entries are served first, FIFO within a priority."""
+        queue = LocalTaskQueue(max_size=10)
+        await queue.put("low", TaskPriority.LOW.value, "{}")
+        await queue.put("normal_1", TaskPriority.NORMAL.value, "{}")
+        await queue.put("high", TaskPriority.HIGH.value, "{}")
+        await queue.put("normal_2", TaskPriority.NORMAL.value, "{}")
+        
+        order = [(await queue.get(timeout=0.1)).task_id for _ in range(4)]
+        
+        assert order == ["high", "normal_1", "normal_2", "low"]
+        assert await queue.get(timeout=0.01) is None
+    
+    @pytest.mark.asyncio
+    async def test_backpressure_when_full(self):
+        """Test put waits for space and gives up after its timeout."""
+        queue = LocalTaskQueue(max_size=1)
+        await queue.put("first", TaskPriority.NORMAL.value, "{}")
+        
+        with pytest.raises(LocalQueueFull):
+            await queue.put("second", TaskPriority.NORMAL.value, "{}", timeout=0.01)
+        
+        async def consume():
+            await asyncio.sleep(0.01)
+            await queue.get(timeout=0.1)
+        
+        consumer = asyncio.create_task(consume())
+        await queue.put("second", TaskPriority.NORMAL.value, "{}", timeout=1.0)
+        await consumer
+        assert len(queue) == 1
+    
+    @pytest.mark.asyncio
+    async def test_delayed_entry_not_served_early(self):
+        """Test entries scheduled in the future wait until they are due."""
+        queue = LocalTaskQueue(max_size=10)
+        await queue.put("later", TaskPriority.HIGH.value, "{}", due_at=time_now() + 60)
+        
+        assert await queue.get(timeout=0.01) is None
+        assert len(queue) == 1
+    
+    @pytest.mark.asyncio
+    async def test_journal_survives_restart(self, tmp_path):
+        """Test unacknowledged entries are restored from the journal."""
+        journal_path = str(tmp_path / "fallback.db")
+        
+        queue = LocalTaskQueue(max_size=10, journal_path=journal_path)
+        await queue.open()
+        await queue.put("done", TaskPriority.NORMAL.value, '{"n": 1}')
+        await queue.put("pending", TaskPriority.HIGH.value, '{"n": 2}')
+        await queue.ack([await queue.get(timeout=0.1)])  # acknowledges "pending"
+        queue.close()
+        
+        restarted = LocalTaskQueue(max_size=10, journal_path=journal_path)
+        assert await restarted.open() == 1
+        entry = await restarted.get(timeout=0.1)
+        assert entry.task_id == "done"
+        assert entry.task_data == '{"n": 1}'
+        restarted.close()
+    
+    def test_restore_keeps_original_order(self):
+        """Test entries put back after a failed drain are served in their original order."""
+        queue = LocalTaskQueue(max_size=10)
+        for task_id in ("first", "second", "third"):
+            queue._push(LocalQueueEntry(task_id=task_id, priority=TaskPriority.NORMAL.value, task_data="{}"))
+        
+        queue.restore(queue.pop_batch(2))
+        
+        assert [entry.task_id for entry in queue.pop_batch(3)] == ["first", "second", "third"]
+    
+    @pytest.mark.asyncio
+    async def test_shared_journal_replays_only_orphaned_rows(self, tmp_path):
+        """Test processes sharing a journal replay each row once, and only after its owner exits."""
+        journal_path = str(tmp_path / "fallback.db")
+        
+        first = LocalTaskQueue(max_size=10, journal_path=journal_path)
+        await first.open()
+        await first.put("owned", TaskPriority.NORMAL.value, "{}")
+        
+        second = LocalTaskQueue(max_size=10, journal_path=journal_path)
+        assert await second.open() == 0
+        
+        first.close()
+        third = LocalTaskQueue(max_size=10, journal_path=journal_path)
+        assert await third.open() == 1
+        assert (await third.get(timeout=0.1)).task_id == "owned"
+        
+        second.close()
+        third.close()
+
+
+def time_now() -> float:
+    """Current epoch time for scheduling local queue entries."""
+    return datetime.now(timezone.utc).timestamp()
+
 
 class TestTaskHandlers:
     """Test cases for task handlers."""
@@ -330,6 +891,22 @@ class TestTaskHandlers:
         assert task.payload['message_data']['From'] == "whatsapp:+1234567890"
         assert task.payload['message_data']['Body'] == "Test message"
     
+    def test_create_media_message_processing_task(self):
+        """Test messages with media get their own task type for concurrency caps."""
+        twilio_request = TwilioWebhookRequest(
+            MessageSid="media_sid",
+            From="whatsapp:+1234567890",
+            To="whatsapp:+0987654321",
+            Body="",
+            NumMedia=1,
+            MediaUrl0="https://api.twilio.com/media/123",
+            MediaContentType0="application/pdf"
+        )
+        
+        task = asyncio.run(create_message_processing_task(twilio_request))
+        
+        assert task.task_type == "process_media_message"
+    
     def test_create_timeout_notification_task(self):
         """Test timeout notification task creation."""
         task = asyncio.run(create_timeout_notification_task(
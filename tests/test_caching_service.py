@@ -0,0 +1,212 @@
+"""
+Tests for the tiered analysis result cache.
+
+Redis is replaced by a small in-memory manager whose PUBLISH delivers to the
+other CachingService instances directly, so two instances stand in for two
+workers sharing L2.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import patch
+
+from app.services.caching_service import CachingService, AnalysisCacheConfig, CacheKey
+from app.models.data_models import JobAnalysisResult, JobClassification
+from app.utils.ttl_cache import BoundedTTLCache
+
+
+SCAM_AD = """
+Earn $400 a day reposting ads from home! No experience needed.
+Message our recruiter on Telegram to get started today.
+"""
+
+
+class InMemoryRedisManager:
+    """Dict-backed stand-in for RedisConnectionManager with fan-out PUBLISH."""
+
+    def __init__(self):
+        self.values = {}
+        self.ttls = {}
+        self.commands = []
+        self.subscribers = []
+
+    def is_available(self) -> bool:
+        return True
+
+    async def execute_command(self, command, *args, **kwargs):
+        self.commands.append(command)
+        return getattr(self, command)(*args, **kwargs)
+
+    async def execute_pipeline(self, commands, transaction=True):
+        return [await self.execute_command(command, *args) for command, *args in commands]
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def pttl(self, key):
+        if key not in self.values:
+            return -2
+        return int(self.ttls[key] * 1000)
+
+    def setex(self, key, ttl, value):
+        self.values[key] = value
+        self.ttls[key] = ttl
+        return True
+
+    def delete(self, key):
+        self.ttls.pop(key, None)
+        return int(self.values.pop(key, None) is not None)
+
+    def publish(self, channel, message):
+        for subscriber in self.subscribers:
+            subscriber.handle_invalidation(message.encode())
+        return len(self.subscribers)
+
+
+def make_result(trust_score: int = 12) -> JobAnalysisResult:
+    """Create an analysis verdict."""
+    return JobAnalysisResult(
+        trust_score=trust_score,
+        classification=JobClassification.LIKELY_SCAM,
+        reasons=["Unrealistic daily pay", "Recruiting over Telegram", "No experience required"],
+        confidence=0.9
+    )
+
+
+def make_service(redis_manager, **overrides) -> CachingService:
+    """Create a caching service bound to the given Redis manager."""
+    service = CachingService(AnalysisCacheConfig(**overrides))
+    service.redis_manager = redis_manager
+    service._get_graceful_handler = lambda: None
+    redis_manager.subscribers.append(service)
+    return service
+
+
+@pytest.fixture
+def redis_manager():
+    return InMemoryRedisManager()
+
+
+class TestAnalysisCacheTiers:
+    """Test L1 in front of Redis for analysis results."""
+
+    @pytest.mark.asyncio
+    async def test_l1_serves_repeat_lookups_without_redis(self, redis_manager):
+        """Test the second lookup is answered in process."""
+        writer = make_service(redis_manager)
+        reader = make_service(redis_manager)
+        await writer.cache_analysis_result(SCAM_AD, make_result())
+
+        first = await reader.get_cached_analysis_result(SCAM_AD)
+        gets = redis_manager.commands.count("get")
+        second = await reader.get_cached_analysis_result(SCAM_AD)
+
+        assert first.trust_score == second.trust_score == 12
+        assert redis_manager.commands.count("get") == gets
+        assert reader.tier_stats["l2_hits"] == 1
+        assert reader.tier_stats["l1_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_l1_entry_expires_with_redis_entry(self, redis_manager):
+        """Test an L2 hit is kept in L1 no longer than Redis keeps it."""
+        now = [1000.0]
+        writer = make_service(redis_manager)
+        reader = make_service(redis_manager)
+        reader.analysis_l1 = BoundedTTLCache(100, reader.analysis_config.ttl, clock=lambda: now[0])
+        await writer.cache_analysis_result(SCAM_AD, make_result())
+        redis_manager.ttls[CacheKey.analysis_result(SCAM_AD)] = 2.0
+
+        assert await reader.get_cached_analysis_result(SCAM_AD) is not None
+        assert redis_manager.commands.count("pttl") == 1
+        now[0] += 1.5
+        assert CacheKey.analysis_result(SCAM_AD) in reader.analysis_l1
+        now[0] += 1.0
+        assert CacheKey.analysis_result(SCAM_AD) not in reader.analysis_l1
+
+    @pytest.mark.asyncio
+    async def test_l1_hits_return_copies(self, redis_manager):
+        """Test callers mutating a result cannot corrupt the L1 entry."""
+        service = make_service(redis_manager)
+        await service.cache_analysis_result(SCAM_AD, make_result())
+
+        result = await service.get_cached_analysis_result(SCAM_AD)
+        result.reasons[0] = "Mutated"
+        result.trust_score = 99
+
+        cached = await service.get_cached_analysis_result(SCAM_AD)
+        assert cached.reasons[0] == "Unrealistic daily pay"
+        assert cached.trust_score == 12
+
+    @pytest.mark.asyncio
+    async def test_negative_entry_skips_redis_until_it_expires(self, redis_manager):
+        """Test a known miss is not re-read from Redis within the negative TTL."""
+        service = make_service(redis_manager, negative_ttl=0.05)
+
+        assert await service.get_cached_analysis_result(SCAM_AD) is None
+        assert await service.get_cached_analysis_result(SCAM_AD) is None
+        assert redis_manager.commands.count("get") == 1
+        assert service.tier_stats["l1_negative_hits"] == 1
+
+        await asyncio.sleep(0.06)
+        assert await service.get_cached_analysis_result(SCAM_AD) is None
+        assert redis_manager.commands.count("get") == 2
+
+    @pytest.mark.asyncio
+    async def test_write_in_one_worker_clears_negative_entry_in_another(self, redis_manager):
+        """Test pub/sub invalidation lets other workers see a new result at once."""
+        reader = make_service(redis_manager, negative_ttl=60)
+        writer = make_service(redis_manager)
+
+        assert await reader.get_cached_analysis_result(SCAM_AD) is None
+        await writer.cache_analysis_result(SCAM_AD, make_result())
+
+        cached = await reader.get_cached_analysis_result(SCAM_AD)
+        assert cached is not None and cached.trust_score == 12
+        assert reader.tier_stats["invalidations_received"] == 1
+        assert writer.tier_stats["invalidations_received"] == 0
+
+    @pytest.mark.asyncio
+    async def test_invalidate_removes_result_everywhere(self, redis_manager):
+        """Test invalidate_analysis_result drops L2 and every worker's L1."""
+        first = make_service(redis_manager)
+        second = make_service(redis_manager)
+        await first.cache_analysis_result(SCAM_AD, make_result())
+        await second.get_cached_analysis_result(SCAM_AD)
+
+        await first.invalidate_analysis_result(SCAM_AD)
+
+        assert CacheKey.analysis_result(SCAM_AD) not in redis_manager.values
+        assert await first.get_cached_analysis_result(SCAM_AD) is None
+        assert await second.get_cached_analysis_result(SCAM_AD) is None
+
+    @pytest.mark.asyncio
+    async def test_disabled_l1_always_reads_redis(self, redis_manager):
+        """Test the L1 tier can be switched off."""
+        service = make_service(redis_manager, enabled=False)
+        await service.cache_analysis_result(SCAM_AD, make_result())
+
+        await service.get_cached_analysis_result(SCAM_AD)
+        await service.get_cached_analysis_result(SCAM_AD)
+
+        assert redis_manager.commands.count("get") == 2
+        assert len(service.analysis_l1) == 0
+
+    @pytest.mark.asyncio
+    async def test_cache_stats_report_each_tier(self, redis_manager):
+        """Test get_cache_stats breaks analysis lookups down by tier."""
+        service = make_service(redis_manager)
+        await service.cache_analysis_result(SCAM_AD, make_result())
+        service.analysis_l1.clear()
+
+        await service.get_cached_analysis_result(SCAM_AD)
+        await service.get_cached_analysis_result(SCAM_AD)
+        await service.get_cached_analysis_result("An unrelated job ad that was never analyzed")
+
+        with patch.object(service, '_get_redis_manager', side_effect=Exception("no metrics")):
+            tiers = (await service.get_cache_stats())["analysis_tiers"]
+
+        assert tiers["l1"]["hits"] == 1
+        assert tiers["l2"]["hits"] == 1
+        assert tiers["l2"]["misses"] == 1
+        assert tiers["l1"]["hit_rate"] == pytest.approx(100 / 3)
+        assert tiers["invalidations_published"] == 1
@@ -8,11 +8,12 @@ from receiving a message to sending the analysis response.
 import pytest
 import json
 import asyncio
-from unittest.mock import Mock, AsyncMock, patch
+from unittest.mock import Mock, AsyncMock, patch, ANY
 from fastapi.testclient import TestClient
 
 from app.main import app
 from app.models.data_models import JobAnalysisResult, JobClassification
+from app.utils.text_normalization import normalize_job_text
 from tests.fixtures.job_ad_samples import JobAdFixtures, WebhookDataFixtures, TestPhoneNumbers
 from tests.fixtures.pdf_samples import PDFFixtures, MockPDFResponses, PDFExtractionMocks
 
@@ -131,7 +132,7 @@ class TestCompleteUserWorkflows:
         # Setup PDF service mock
         mock_pdf_service = AsyncMock()
         pdf_sample = PDFFixtures.VALID_PDF_SAMPLES[0]
-        mock_pdf_service.process_pdf_url.return_value = pdf_sample.extracted_text
+        mock_pdf_service.load_pdf_url.return_value = MockPDFResponses.create_pdf_document(pdf_sample.extracted_text)
         mock_pdf_service_class.return_value = mock_pdf_service
         
         # Setup OpenAI service mock
@@ -168,10 +169,10 @@ class TestCompleteUserWorkflows:
         assert response.status_code == 200
         
         # Verify PDF processing was called
-        mock_pdf_service.process_pdf_url.assert_called_once_with(pdf_sample.url)
+        mock_pdf_service.load_pdf_url.assert_called_once_with(pdf_sample.url)
         
         # Verify analysis was called with extracted text
-        mock_openai_service.analyze_job_ad.assert_called_once_with(pdf_sample.extracted_text)
+        mock_openai_service.analyze_job_ad.assert_called_once_with(pdf_sample.extracted_text, normalized=normalize_job_text(pdf_sample.extracted_text))
         
         # Verify response was sent
         mock_twilio_service.send_analysis_result.assert_called_once_with(
@@ -222,7 +223,7 @@ class TestCompleteUserWorkflows:
         assert response.status_code == 200
         
         # Verify analysis and response
-        mock_openai_service.analyze_job_ad.assert_called_once_with(job_sample.content)
+        mock_openai_service.analyze_job_ad.assert_called_once_with(job_sample.content, normalized=normalize_job_text(job_sample.content), on_verdict=ANY)
         mock_twilio_service.send_analysis_result.assert_called_once_with(
             TestPhoneNumbers.SUSPICIOUS_USER, suspicious_analysis
         )
@@ -271,7 +272,7 @@ class TestCompleteUserWorkflows:
         assert response.status_code == 200
         
         # Verify analysis and response
-        mock_openai_service.analyze_job_ad.assert_called_once_with(job_sample.content)
+        mock_openai_service.analyze_job_ad.assert_called_once_with(job_sample.content, normalized=normalize_job_text(job_sample.content), on_verdict=ANY)
         mock_twilio_service.send_analysis_result.assert_called_once_with(
             TestPhoneNumbers.SCAM_VICTIM, scam_analysis
         )
@@ -287,7 +288,7 @@ class TestCompleteUserWorkflows:
         
         # Setup PDF service mock
         mock_pdf_service = AsyncMock()
-        mock_pdf_service.process_pdf_url.side_effect = Exception("PDF processing failed")
+        mock_pdf_service.load_pdf_url.side_effect = Exception("PDF processing failed")
         mock_pdf_service_class.return_value = mock_pdf_service
         
         # Setup Twilio service mock
@@ -310,7 +311,7 @@ class TestCompleteUserWorkflows:
         assert response.status_code == 200
         
         # Verify PDF processing was called
-        mock_pdf_service.process_pdf_url.assert_called_once_with(pdf_sample.url)
+        mock_pdf_service.load_pdf_url.assert_called_once_with(pdf_sample.url)
         
         # Verify error message was sent
         mock_twilio_service.send_error_message.assert_called_once()
@@ -350,7 +351,7 @@ class TestCompleteUserWorkflows:
         assert response.status_code == 200
         
         # Verify OpenAI service was called
-        mock_openai_service.analyze_job_ad.assert_called_once_with(job_sample.content)
+        mock_openai_service.analyze_job_ad.assert_called_once_with(job_sample.content, normalized=normalize_job_text(job_sample.content), on_verdict=ANY)
         
         # Verify error message was sent
         mock_twilio_service.send_error_message.assert_called_once()
@@ -474,9 +475,9 @@ class TestErrorRecoveryWorkflows:
         
         # Setup PDF service mock to fail first, then succeed
         mock_pdf_service = AsyncMock()
-        mock_pdf_service.process_pdf_url.side_effect = [
+        mock_pdf_service.load_pdf_url.side_effect = [
             Exception("PDF processing failed"),  # First call fails
-            PDFFixtures.VALID_PDF_SAMPLES[0].extracted_text  # Second call succeeds
+            MockPDFResponses.create_pdf_document(PDFFixtures.VALID_PDF_SAMPLES[0].extracted_text)  # Second call succeeds
         ]
         mock_pdf_service_class.return_value = mock_pdf_service
         
@@ -529,7 +530,7 @@ class TestErrorRecoveryWorkflows:
         assert response2.status_code == 200
         
         # Verify analysis was called and response was sent
-        mock_openai_service.analyze_job_ad.assert_called_once_with(pdf_sample2.extracted_text)
+        mock_openai_service.analyze_job_ad.assert_called_once_with(pdf_sample2.extracted_text, normalized=normalize_job_text(pdf_sample2.extracted_text))
         assert mock_twilio_service.send_analysis_result.call_count == 1
     
     @patch('app.api.webhook.get_config')
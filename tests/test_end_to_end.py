@@ -13,6 +13,8 @@ from fastapi.testclient import TestClient
 
 from app.main import app
 from app.models.data_models import JobAnalysisResult, JobClassification
+from app.utils.text_normalization import normalize_job_text
+from tests.fixtures.pdf_samples import MockPDFResponses
 
 
 @pytest.fixture
@@ -202,7 +204,7 @@ class TestEndToEndWhatsAppFlow:
         # Setup PDF service mock
         mock_pdf_service = AsyncMock()
         extracted_text = "Software Engineer position at TechCorp. We are looking for a skilled developer to join our team. Salary: $100,000-$130,000. Requirements: 5+ years experience, Python, JavaScript. Contact: jobs@techcorp.com"
-        mock_pdf_service.process_pdf_url.return_value = extracted_text
+        mock_pdf_service.load_pdf_url.return_value = MockPDFResponses.create_pdf_document(extracted_text)
         mock_pdf_service_class.return_value = mock_pdf_service
         
         # Setup OpenAI service mock
@@ -243,10 +245,10 @@ class TestEndToEndWhatsAppFlow:
         assert response.status_code == 200
         
         # Verify PDF processing was called
-        mock_pdf_service.process_pdf_url.assert_called_once_with("https://api.twilio.com/media/test-job-posting.pdf")
+        mock_pdf_service.load_pdf_url.assert_called_once_with("https://api.twilio.com/media/test-job-posting.pdf")
         
         # Verify analysis was called with extracted text
-        mock_openai_service.analyze_job_ad.assert_called_once_with(extracted_text)
+        mock_openai_service.analyze_job_ad.assert_called_once_with(extracted_text, normalized=normalize_job_text(extracted_text))
         
         # Verify response was sent
         mock_twilio_service.send_analysis_result.assert_called_once_with(
@@ -369,7 +371,7 @@ class TestEndToEndErrorScenarios:
         
         # Setup PDF service mock to fail
         mock_pdf_service = AsyncMock()
-        mock_pdf_service.process_pdf_url.side_effect = Exception("PDF processing failed")
+        mock_pdf_service.load_pdf_url.side_effect = Exception("PDF processing failed")
         mock_pdf_service_class.return_value = mock_pdf_service
         
         # Setup Twilio service mock
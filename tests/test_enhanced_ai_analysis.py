@@ -13,6 +13,7 @@ from typing import Dict, List, Any
 
 from app.services.enhanced_ai_analysis import EnhancedAIAnalysisService
 from app.models.data_models import AppConfig, JobAnalysisResult, JobClassification
+from app.utils.text_normalization import canonicalize
 
 
 class TestEnhancedAIAnalysisService:
@@ -112,7 +113,7 @@ class TestInitialization:
         assert service.models["primary"] == config.openai_model
         assert service.models["fallback"] == config.openai_fallback_model
         assert service.analysis_history_max_size == config.analysis_history_max_size
-        assert service.vectorizer is not None
+        assert service.similarity_index is not None
         assert service.scam_patterns is not None
         assert isinstance(service.feedback_data, dict)
     
@@ -235,8 +236,9 @@ class TestAnalysisHistory:
         service._add_to_analysis_history(sample_job_text, sample_analysis_result)
         
         assert len(service.analysis_history) == 1
-        assert sample_job_text[:1000] in service.analysis_history
-        assert len(service.analysis_history[sample_job_text[:1000]]) == 1
+        text_key = canonicalize(sample_job_text)[:1000]
+        assert text_key in service.analysis_history
+        assert len(service.analysis_history[text_key]) == 1
     
     def test_history_size_limit(self, service):
         """Test that history size is limited."""
@@ -272,7 +274,7 @@ class TestAnalysisHistory:
         service._add_to_analysis_history(sample_job_text, feedback_result, is_feedback=True)
         
         # Should have both results
-        history = service.analysis_history[sample_job_text[:1000]]
+        history = service.analysis_history[canonicalize(sample_job_text)[:1000]]
         assert len(history) == 2
         assert history[-1] == feedback_result  # Feedback should be last
 
@@ -32,6 +32,11 @@ def mock_config():
     )
 
 
+def mock_http_client(handler) -> httpx.AsyncClient:
+    """Create an HTTP client whose requests are answered by handler."""
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
 class TestOpenAIIntegration:
     """Integration tests for OpenAI service."""
     
@@ -225,12 +230,11 @@ class TestPDFProcessingIntegration:
         service = PDFProcessingService(mock_config)
         
         # Mock successful HTTP response with PDF content
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.headers = {"content-type": "application/pdf", "content-length": "1024"}
-        mock_response.content = b"%PDF-1.4 fake pdf content"
+        mock_get = Mock(return_value=httpx.Response(
+            200, headers={"content-type": "application/pdf"}, content=b"%PDF-1.4 fake pdf content"
+        ))
         
-        with patch('httpx.AsyncClient.get', new_callable=AsyncMock, return_value=mock_response) as mock_get:
+        with patch.object(service, '_get_client', return_value=mock_http_client(mock_get)):
             result = await service.download_pdf("https://example.com/test.pdf")
             
             # Verify HTTP request was made correctly (check call was made)
@@ -244,11 +248,11 @@ class TestPDFProcessingIntegration:
         service = PDFProcessingService(mock_config)
         
         # Mock response with oversized content
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.headers = {"content-type": "application/pdf", "content-length": str(15 * 1024 * 1024)}  # 15MB
+        mock_response = httpx.Response(
+            200, headers={"content-type": "application/pdf", "content-length": str(15 * 1024 * 1024)}  # 15MB
+        )
         
-        with patch('httpx.AsyncClient.get', new_callable=AsyncMock, return_value=mock_response):
+        with patch.object(service, '_get_client', return_value=mock_http_client(lambda request: mock_response)):
             with pytest.raises(Exception, match="PDF file too large"):
                 await service.download_pdf("https://example.com/large.pdf")
     
@@ -257,7 +261,10 @@ class TestPDFProcessingIntegration:
         """Test PDF download network error handling."""
         service = PDFProcessingService(mock_config)
         
-        with patch('httpx.AsyncClient.get', new_callable=AsyncMock, side_effect=httpx.NetworkError("Connection failed")):
+        def handler(request):
+            raise httpx.NetworkError("Connection failed", request=request)
+        
+        with patch.object(service, '_get_client', return_value=mock_http_client(handler)):
             with pytest.raises(Exception, match="Network error downloading PDF"):
                 await service.download_pdf("https://example.com/test.pdf")
     
@@ -270,7 +277,7 @@ class TestPDFProcessingIntegration:
         fake_pdf_content = b"%PDF-1.4 fake pdf with text content"
         
         # Mock pdfplumber extraction
-        mock_page = Mock()
+        mock_page = Mock(chars=[])
         mock_page.extract_text.return_value = "Software Engineer position at TechCorp. Requirements: Python, 3+ years experience."
         
         mock_pdf = Mock()
@@ -289,13 +296,12 @@ class TestPDFProcessingIntegration:
         service = PDFProcessingService(mock_config)
         
         # Mock HTTP response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.headers = {"content-type": "application/pdf", "content-length": "2048"}
-        mock_response.content = b"%PDF-1.4 fake pdf content"
+        mock_response = httpx.Response(
+            200, headers={"content-type": "application/pdf"}, content=b"%PDF-1.4 fake pdf content"
+        )
         
         # Mock PDF extraction
-        mock_page = Mock()
+        mock_page = Mock(chars=[])
         mock_page.extract_text.return_value = "Data Analyst position at Analytics Corp. Salary: $80,000. Requirements: SQL, Python, statistics background."
         
         mock_pdf = Mock()
@@ -303,7 +309,7 @@ class TestPDFProcessingIntegration:
         mock_pdf.__enter__ = Mock(return_value=mock_pdf)
         mock_pdf.__exit__ = Mock(return_value=None)
         
-        with patch('httpx.AsyncClient.get', new_callable=AsyncMock, return_value=mock_response), \
+        with patch.object(service, '_get_client', return_value=mock_http_client(lambda request: mock_response)), \
              patch('pdfplumber.open', return_value=mock_pdf):
             
             result = await service.process_pdf_url("https://example.com/job.pdf")
@@ -321,12 +327,11 @@ class TestServiceIntegrationChain:
         openai_service = OpenAIAnalysisService(mock_config)
         
         # Mock PDF processing
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.headers = {"content-type": "application/pdf", "content-length": "1024"}
-        mock_response.content = b"%PDF-1.4 fake pdf content"
+        mock_response = httpx.Response(
+            200, headers={"content-type": "application/pdf"}, content=b"%PDF-1.4 fake pdf content"
+        )
         
-        mock_page = Mock()
+        mock_page = Mock(chars=[])
         extracted_text = "Marketing Manager position at StartupCorp. Salary: $70,000-$90,000. Requirements: 2+ years marketing experience, social media expertise."
         mock_page.extract_text.return_value = extracted_text
         
@@ -352,7 +357,7 @@ class TestServiceIntegrationChain:
         mock_choice.message = mock_message
         mock_openai_response.choices = [mock_choice]
         
-        with patch('httpx.AsyncClient.get', new_callable=AsyncMock, return_value=mock_response), \
+        with patch.object(pdf_service, '_get_client', return_value=mock_http_client(lambda request: mock_response)), \
              patch('pdfplumber.open', return_value=mock_pdf), \
              patch.object(openai_service.client.chat.completions, 'create', new_callable=AsyncMock, return_value=mock_openai_response):
             
@@ -6,12 +6,14 @@ including input validation, error handling, and service orchestration.
 """
 
 import pytest
-from unittest.mock import AsyncMock, Mock, patch
+from unittest.mock import AsyncMock, Mock, patch, ANY
 from dataclasses import dataclass
 
 from app.services.message_handler import MessageHandlerService
 from app.models.data_models import TwilioWebhookRequest, JobAnalysisResult, JobClassification, AppConfig
 from app.services.pdf_processing import PDFProcessingError, PDFDownloadError, PDFExtractionError
+from app.utils.text_normalization import normalize_job_text
+from tests.fixtures.pdf_samples import MockPDFResponses
 
 
 @pytest.fixture
@@ -89,6 +91,9 @@ class TestMessageHandlerService:
             self.mock_user_service.is_user_blocked = AsyncMock(return_value=False)
             self.mock_user_service.record_interaction = AsyncMock()
             
+            # Setup default PDF result cache behavior
+            self.mock_pdf_service.cache_analysis_result = AsyncMock(return_value=True)
+            
             self.handler = MessageHandlerService(mock_config)
             yield
     
@@ -104,7 +109,7 @@ class TestMessageHandlerService:
         
         # Verify
         assert result is True
-        self.mock_openai_service.analyze_job_ad.assert_called_once_with(text_webhook_request.Body)
+        self.mock_openai_service.analyze_job_ad.assert_called_once_with(text_webhook_request.Body, normalized=normalize_job_text(text_webhook_request.Body), on_verdict=ANY)
         self.mock_twilio_service.send_analysis_result.assert_called_once_with(
             text_webhook_request.From, sample_analysis_result
         )
@@ -115,7 +120,7 @@ class TestMessageHandlerService:
         extracted_text = "Software Engineer job at TechCorp..."
         
         # Setup mocks
-        self.mock_pdf_service.process_pdf_url = AsyncMock(return_value=extracted_text)
+        self.mock_pdf_service.load_pdf_url = AsyncMock(return_value=MockPDFResponses.create_pdf_document(extracted_text))
         self.mock_openai_service.analyze_job_ad = AsyncMock(return_value=sample_analysis_result)
         self.mock_twilio_service.send_analysis_result = Mock(return_value=True)
         
@@ -124,8 +129,8 @@ class TestMessageHandlerService:
         
         # Verify
         assert result is True
-        self.mock_pdf_service.process_pdf_url.assert_called_once_with(pdf_webhook_request.MediaUrl0)
-        self.mock_openai_service.analyze_job_ad.assert_called_once_with(extracted_text)
+        self.mock_pdf_service.load_pdf_url.assert_called_once_with(pdf_webhook_request.MediaUrl0)
+        self.mock_openai_service.analyze_job_ad.assert_called_once_with(extracted_text, normalized=normalize_job_text(extracted_text))
         self.mock_twilio_service.send_analysis_result.assert_called_once_with(
             pdf_webhook_request.From, sample_analysis_result
         )
@@ -145,7 +150,7 @@ class TestMessageHandlerService:
         
         # Verify
         assert result is True
-        self.mock_openai_service.analyze_job_ad.assert_called_once_with(text)
+        self.mock_openai_service.analyze_job_ad.assert_called_once_with(text, normalized=normalize_job_text(text), on_verdict=ANY)
         self.mock_twilio_service.send_analysis_result.assert_called_once_with(from_number, sample_analysis_result)
     
     @pytest.mark.asyncio
@@ -221,7 +226,7 @@ class TestMessageHandlerService:
         extracted_text = "Software Engineer job posting..."
         
         # Setup mocks
-        self.mock_pdf_service.process_pdf_url = AsyncMock(return_value=extracted_text)
+        self.mock_pdf_service.load_pdf_url = AsyncMock(return_value=MockPDFResponses.create_pdf_document(extracted_text))
         self.mock_openai_service.analyze_job_ad = AsyncMock(return_value=sample_analysis_result)
         self.mock_twilio_service.send_analysis_result = Mock(return_value=True)
         
@@ -230,8 +235,8 @@ class TestMessageHandlerService:
         
         # Verify
         assert result is True
-        self.mock_pdf_service.process_pdf_url.assert_called_once_with(media_url)
-        self.mock_openai_service.analyze_job_ad.assert_called_once_with(extracted_text)
+        self.mock_pdf_service.load_pdf_url.assert_called_once_with(media_url)
+        self.mock_openai_service.analyze_job_ad.assert_called_once_with(extracted_text, normalized=normalize_job_text(extracted_text))
         self.mock_twilio_service.send_analysis_result.assert_called_once_with(from_number, sample_analysis_result)
     
     @pytest.mark.asyncio
@@ -252,7 +257,7 @@ class TestMessageHandlerService:
         
         # Verify
         assert result is True
-        self.mock_pdf_service.process_pdf_url.assert_not_called()
+        self.mock_pdf_service.load_pdf_url.assert_not_called()
         self.mock_twilio_service.client.messages.create.assert_called_once()
     
     @pytest.mark.asyncio
@@ -263,7 +268,7 @@ class TestMessageHandlerService:
         from_number = "whatsapp:+1987654321"
         
         # Setup mocks
-        self.mock_pdf_service.process_pdf_url = AsyncMock(side_effect=PDFProcessingError("PDF processing failed"))
+        self.mock_pdf_service.load_pdf_url = AsyncMock(side_effect=PDFProcessingError("PDF processing failed"))
         
         # Mock the client and messages creation for error handling
         mock_message = Mock()
@@ -292,7 +297,7 @@ class TestMessageHandlerService:
         extracted_text = "Software Engineer job posting..."
         
         # Setup mocks
-        self.mock_pdf_service.process_pdf_url = AsyncMock(return_value=extracted_text)
+        self.mock_pdf_service.load_pdf_url = AsyncMock(return_value=MockPDFResponses.create_pdf_document(extracted_text))
         self.mock_openai_service.analyze_job_ad = AsyncMock(side_effect=Exception("OpenAI API error"))
         
         # Mock the client and messages creation for error handling
@@ -439,7 +444,7 @@ class TestMessageHandlerServiceIntegration:
         handler = MessageHandlerService(mock_config)
         
         # Mock external service calls
-        with patch.object(handler.pdf_service, 'process_pdf_url') as mock_pdf, \
+        with patch.object(handler.pdf_service, 'load_pdf_url') as mock_pdf, \
              patch.object(handler.openai_service, 'analyze_job_ad') as mock_analyze, \
              patch.object(handler.twilio_service, 'send_analysis_result') as mock_send:
             
@@ -451,7 +456,7 @@ class TestMessageHandlerServiceIntegration:
                 reasons=["Vague job description", "No company details", "Unrealistic promises"],
                 confidence=0.7
             )
-            mock_pdf.return_value = extracted_text
+            mock_pdf.return_value = MockPDFResponses.create_pdf_document(extracted_text)
             mock_analyze.return_value = analysis_result
             mock_send.return_value = True
             
@@ -472,5 +477,37 @@ class TestMessageHandlerServiceIntegration:
             # Verify
             assert result is True
             mock_pdf.assert_called_once_with("https://api.twilio.com/media/test.pdf")
-            mock_analyze.assert_called_once_with(extracted_text)
-            mock_send.assert_called_once_with("whatsapp:+1987654321", analysis_result)
\ No newline at end of file
+            mock_analyze.assert_called_once_with(extracted_text, normalized=normalize_job_text(extracted_text))
+            mock_send.assert_called_once_with("whatsapp:+1987654321", analysis_result)    
+    @pytest.mark.asyncio
+    async def test_repeated_pdf_workflow_reuses_cached_analysis(self, mock_config):
+        """Test a PDF whose analysis is cached is answered without analyzing it again."""
+        handler = MessageHandlerService(mock_config)
+        
+        with patch.object(handler.pdf_service, 'load_pdf_url') as mock_pdf, \
+             patch.object(handler.pdf_service, 'cache_analysis_result') as mock_cache, \
+             patch.object(handler.openai_service, 'analyze_job_ad') as mock_analyze, \
+             patch.object(handler.twilio_service, 'send_analysis_result') as mock_send:
+            
+            # Setup mock responses
+            cached_result = JobAnalysisResult(
+                trust_score=10,
+                classification=JobClassification.LIKELY_SCAM,
+                reasons=["Upfront registration fee", "Guaranteed income", "Pressure to act now"],
+                confidence=0.9
+            )
+            mock_pdf.return_value = MockPDFResponses.create_pdf_document(
+                "Earn $500 a day from home, pay a small registration fee to start", cached_result
+            )
+            mock_send.return_value = True
+            
+            # Execute
+            result = await handler.handle_media_message(
+                "https://api.twilio.com/media/forwarded.pdf", "application/pdf", "whatsapp:+1987654321"
+            )
+            
+            # Verify
+            assert result is True
+            mock_analyze.assert_not_called()
+            mock_cache.assert_not_called()
+            mock_send.assert_called_once_with("whatsapp:+1987654321", cached_result)
@@ -0,0 +1,265 @@
+"""
+Tests for the shared MinHash near-duplicate verdict store.
+
+Redis is replaced by a small in-memory manager that executes the same
+pipelined commands, so two store instances stand in for two workers.
+"""
+
+import pytest
+from unittest.mock import patch, AsyncMock
+
+from app.services.near_duplicate_store import NearDuplicateStore, NearDuplicateConfig
+from app.services.enhanced_ai_analysis import EnhancedAIAnalysisService
+from app.models.data_models import AppConfig, JobAnalysisResult, JobClassification
+from tests.fixtures.job_ad_samples import JobAdFixtures
+
+
+SCAM_AD = """
+URGENT!!! Work from home and earn $5000 per week guaranteed. No experience
+needed, no interview. Send a $99 registration fee via Western Union to secure
+your position today. Call 555-123-4567 now, only 3 spots left!
+"""
+
+HOURLY_AD = """
+Warehouse associate wanted at our regional distribution centre. Pay is $18 per
+hour for full-time day shifts, Monday to Friday, with paid holidays and a
+company pension. Apply through the careers page on our website with your CV.
+"""
+
+
+class InMemoryRedisManager:
+    """Dict-backed stand-in for RedisConnectionManager pipelines."""
+
+    def __init__(self):
+        self.values = {}
+        self.sorted_sets = {}
+        self.pipelines = 0
+
+    def is_available(self) -> bool:
+        return True
+
+    async def execute_pipeline(self, commands, transaction=True):
+        self.pipelines += 1
+        return [getattr(self, command)(*args) for command, *args in commands]
+
+    def setex(self, key, ttl, value):
+        self.values[key] = value
+        return True
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def zadd(self, key, mapping):
+        self.sorted_sets.setdefault(key, {}).update(mapping)
+        return len(mapping)
+
+    def zremrangebyscore(self, key, low, high):
+        members = self.sorted_sets.get(key, {})
+        stale = [member for member, score in members.items() if score <= float(high)]
+        for member in stale:
+            del members[member]
+        return len(stale)
+
+    def zrevrangebyscore(self, key, high, low, start, num):
+        members = self.sorted_sets.get(key, {})
+        live = sorted(
+            (member for member, score in members.items() if score >= float(low)),
+            key=lambda member: -members[member]
+        )
+        return live[start:start + num]
+
+    def expire(self, key, ttl):
+        return True
+
+
+def make_result(classification: JobClassification = JobClassification.LIKELY_SCAM) -> JobAnalysisResult:
+    """Create a verdict to share."""
+    return JobAnalysisResult(
+        trust_score=90 if classification == JobClassification.LEGIT else 10,
+        classification=classification,
+        reasons=["Upfront fee requested", "Unrealistic pay", "Urgency pressure"],
+        confidence=0.95
+    )
+
+
+@pytest.fixture
+def redis_manager():
+    return InMemoryRedisManager()
+
+
+def make_store(redis_manager, **overrides) -> NearDuplicateStore:
+    """Create a store bound to the in-memory Redis manager."""
+    with patch('app.services.near_duplicate_store.get_redis_manager', return_value=redis_manager):
+        return NearDuplicateStore(NearDuplicateConfig(**overrides))
+
+
+class TestFingerprint:
+    """Test shingling and MinHash signatures."""
+
+    def test_volatile_details_do_not_change_fingerprint(self, redis_manager):
+        """Test phone numbers, amounts, URLs and emoji are normalized away."""
+        store = make_store(redis_manager)
+        edited = (
+            SCAM_AD.replace("555-123-4567", "+44 7700 900123")
+            .replace("$5000", "$7500")
+            .replace("today.", "today 🔥💰 https://bit.ly/abc123")
+        )
+
+        assert store.fingerprint_id(store.fingerprint(SCAM_AD)) == store.fingerprint_id(store.fingerprint(edited))
+
+    def test_signature_is_stable_across_instances(self, redis_manager):
+        """Test every worker derives the same signature and band keys."""
+        first = make_store(redis_manager)
+        second = make_store(InMemoryRedisManager())
+
+        assert (first.fingerprint(SCAM_AD) == second.fingerprint(SCAM_AD)).all()
+        assert first.band_keys(first.fingerprint(SCAM_AD)) == second.band_keys(second.fingerprint(SCAM_AD))
+        assert len(first.band_keys(first.fingerprint(SCAM_AD))) == first.config.bands
+
+    def test_short_text_is_not_fingerprinted(self, redis_manager):
+        """Test texts below min_words are skipped."""
+        store = make_store(redis_manager)
+
+        assert store.fingerprint("Hiring now, apply today") is None
+
+    def test_estimated_similarity_tracks_edits(self, redis_manager):
+        """Test a one-word edit stays above the threshold and unrelated ads fall below it."""
+        store = make_store(redis_manager)
+        original = store.fingerprint(SCAM_AD)
+        legitimate = JobAdFixtures.get_all_samples()[0].content
+
+        assert store.estimate_similarity(original, store.fingerprint(SCAM_AD.replace("secure", "reserve"))) >= store.config.similarity_threshold
+        assert store.estimate_similarity(original, store.fingerprint(legitimate)) < 0.2
+
+    def test_permutations_must_divide_into_bands(self, redis_manager):
+        """Test an invalid banding configuration is rejected."""
+        with pytest.raises(ValueError):
+            make_store(redis_manager, num_permutations=128, bands=10)
+
+
+class TestSharedLookup:
+    """Test verdicts are shared between store instances through Redis."""
+
+    @pytest.mark.asyncio
+    async def test_other_worker_finds_near_duplicate(self, redis_manager):
+        """Test a verdict recorded by one worker is found by another in two pipelines."""
+        await make_store(redis_manager).record(SCAM_AD, make_result())
+        other_worker = make_store(redis_manager)
+        redis_manager.pipelines = 0
+
+        match = await other_worker.lookup(SCAM_AD.replace("555-123-4567", "555-987-6543"))
+
+        assert match is not None
+        result, similarity = match
+        assert result.classification == JobClassification.LIKELY_SCAM
+        assert result.reasons == make_result().reasons
+        assert similarity == pytest.approx(1.0)
+        assert redis_manager.pipelines == 2
+        assert other_worker.get_stats()['hit_rate'] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_unrelated_ad_misses(self, redis_manager):
+        """Test a different ad does not reuse the verdict."""
+        store = make_store(redis_manager)
+        await store.record(SCAM_AD, make_result())
+
+        assert await store.lookup(JobAdFixtures.get_all_samples()[0].content) is None
+
+        stats = store.get_stats()
+        assert stats['lookups'] == 1
+        assert stats['misses'] == 1
+        assert stats['hit_rate'] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_bucket_collision_below_threshold_is_false_match(self, redis_manager):
+        """Test candidates that share a band but fail verification are counted and rejected."""
+        store = make_store(redis_manager, similarity_threshold=1.0)
+        await store.record(SCAM_AD, make_result())
+
+        assert await store.lookup(SCAM_AD.replace("secure", "reserve")) is None
+
+        stats = store.get_stats()
+        assert stats['candidates'] == 1
+        assert stats['false_matches'] == 1
+        assert stats['false_match_rate'] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_expired_bucket_entries_are_trimmed(self, redis_manager):
+        """Test expired fingerprints are skipped on read and removed on write."""
+        store = make_store(redis_manager)
+        edited = SCAM_AD.replace("secure", "reserve")
+        with patch('app.services.near_duplicate_store.time.time', return_value=1000.0):
+            await store.record(SCAM_AD, make_result(), ttl=60)
+
+        with patch('app.services.near_duplicate_store.time.time', return_value=2000.0):
+            assert await store.lookup(edited) is None
+            await store.record(edited, make_result())
+
+        expired_id = store.fingerprint_id(store.fingerprint(SCAM_AD))
+        shared_keys = set(store.band_keys(store.fingerprint(SCAM_AD))) & set(store.band_keys(store.fingerprint(edited)))
+        assert shared_keys
+        assert all(expired_id not in redis_manager.sorted_sets[key] for key in shared_keys)
+
+    @pytest.mark.asyncio
+    async def test_disabled_store_is_a_no_op(self, redis_manager):
+        """Test a disabled store neither records nor looks up."""
+        store = make_store(redis_manager, enabled=False)
+
+        assert await store.record(SCAM_AD, make_result()) is False
+        assert await store.lookup(SCAM_AD) is None
+        assert redis_manager.pipelines == 0
+
+
+class TestAnalysisIntegration:
+    """Test EnhancedAIAnalysisService consults and feeds the shared store."""
+
+    @pytest.fixture
+    def service(self, redis_manager):
+        config = AppConfig(
+            openai_api_key="test_key",
+            twilio_account_sid="test_sid",
+            twilio_auth_token="test_token",
+            twilio_phone_number="test_phone"
+        )
+        with patch('app.services.enhanced_ai_analysis.AsyncOpenAI'):
+            service = EnhancedAIAnalysisService(config)
+        service.near_duplicate_store = make_store(redis_manager)
+        service._analyze_with_model = AsyncMock(return_value=make_result(JobClassification.LEGIT))
+        return service
+
+    @pytest.mark.asyncio
+    async def test_shared_verdict_skips_model_call(self, service, redis_manager):
+        """Test a near-duplicate seen by another worker is answered without OpenAI."""
+        await make_store(redis_manager).record(SCAM_AD, make_result())
+
+        result = await service.analyze_job_ad(SCAM_AD.replace("555-123-4567", "555-000-1111"))
+
+        assert result.classification == JobClassification.LIKELY_SCAM
+        assert result.confidence == pytest.approx(0.95 * 0.9)
+        service._analyze_with_model.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_model_verdict_is_shared(self, service, redis_manager):
+        """Test a confident model verdict is recorded for other workers."""
+        job_ad = JobAdFixtures.get_all_samples()[0].content
+
+        result = await service.analyze_job_ad(job_ad)
+
+        service._analyze_with_model.assert_awaited()
+        match = await make_store(redis_manager).lookup(job_ad)
+        assert match is not None
+        assert match[0].classification == result.classification
+        assert match[0].trust_score == result.trust_score
+
+    @pytest.mark.asyncio
+    async def test_rules_veto_contradicting_shared_verdict(self, service, redis_manager):
+        """Test a near-duplicate differing only in unrealistic pay is not given the legit verdict."""
+        await make_store(redis_manager).record(HOURLY_AD, make_result(JobClassification.LEGIT))
+        daily_ad = HOURLY_AD.replace("$18 per\nhour", "$5000 per\nday")
+        assert await make_store(redis_manager).lookup(daily_ad) is not None
+        service._analyze_with_model.return_value = make_result()
+
+        result = await service.analyze_job_ad(daily_ad)
+
+        service._analyze_with_model.assert_awaited()
+        assert result.classification == JobClassification.LIKELY_SCAM
@@ -0,0 +1,265 @@
+"""
+Tests for the adaptive OpenAI rate limiter and packed batch analysis.
+
+The limiter runs on a fake clock whose sleep advances time, so waits are
+asserted exactly. Batch tests replace the OpenAI client with a mock that
+returns raw responses carrying rate-limit headers.
+"""
+
+import json
+import re
+import httpx
+import openai
+import pytest
+from unittest.mock import patch, AsyncMock, MagicMock
+
+from app.services.openai_rate_limiter import OpenAIRateLimiter, OpenAIRateLimitConfig, parse_reset_duration
+from app.services.enhanced_ai_analysis import EnhancedAIAnalysisService, BATCH_MAX_AD_CHARS
+from app.services.near_duplicate_store import NearDuplicateStore, NearDuplicateConfig
+from app.models.data_models import AppConfig, JobClassification
+
+
+class FakeClock:
+    """Monotonic clock advanced by the limiter's own sleeps."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def make_limiter(clock: FakeClock, **overrides) -> OpenAIRateLimiter:
+    """Create a limiter on the fake clock."""
+    return OpenAIRateLimiter(OpenAIRateLimitConfig(**overrides), clock=clock, sleep=clock.sleep)
+
+
+class TestParseResetDuration:
+    """Test parsing of x-ratelimit-reset-* and retry-after values."""
+
+    @pytest.mark.parametrize("value,expected", [
+        ("1s", 1.0), ("20ms", 0.02), ("6m0s", 360.0), ("1h2m3.5s", 3723.5), ("2", 2.0), ("0.5", 0.5)
+    ])
+    def test_valid_durations(self, value, expected):
+        assert parse_reset_duration(value) == pytest.approx(expected)
+
+    @pytest.mark.parametrize("value", [None, "", "soon", "5x", "1s later"])
+    def test_invalid_durations(self, value):
+        assert parse_reset_duration(value) is None
+
+
+class TestOpenAIRateLimiter:
+    """Test bucket accounting and adaptation to response headers."""
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.mark.asyncio
+    async def test_acquire_within_capacity_does_not_wait(self, clock):
+        """Test requests inside both budgets go out immediately."""
+        limiter = make_limiter(clock, requests_per_minute=10, tokens_per_minute=10000)
+
+        for _ in range(10):
+            assert await limiter.acquire(500) == 0.0
+        assert clock.sleeps == []
+
+    @pytest.mark.asyncio
+    async def test_acquire_waits_for_refill(self, clock):
+        """Test an exhausted bucket waits exactly until enough has refilled."""
+        limiter = make_limiter(clock, requests_per_minute=60, tokens_per_minute=6000)
+
+        await limiter.acquire(6000)
+        waited = await limiter.acquire(1000)
+
+        assert waited == pytest.approx(10.0)
+        assert limiter.get_stats()['waits'] == 1
+
+    @pytest.mark.asyncio
+    async def test_headers_resize_and_clamp_buckets(self, clock):
+        """Test reported limits replace the defaults and remaining caps the level."""
+        limiter = make_limiter(clock)
+
+        limiter.update_from_headers({
+            'x-ratelimit-limit-requests': '3500',
+            'x-ratelimit-limit-tokens': '90000',
+            'x-ratelimit-remaining-requests': '3499',
+            'x-ratelimit-remaining-tokens': '1200'
+        })
+        stats = limiter.get_stats()
+
+        assert stats['requests_per_minute'] == 3500
+        assert stats['tokens_per_minute'] == 90000
+        assert stats['tokens_available'] == pytest.approx(1200)
+
+    @pytest.mark.asyncio
+    async def test_exhausted_headers_pause_until_reset(self, clock):
+        """Test zero remaining tokens holds callers until the reported reset."""
+        limiter = make_limiter(clock)
+
+        limiter.update_from_headers({'x-ratelimit-remaining-tokens': '0', 'x-ratelimit-reset-tokens': '2s'})
+        waited = await limiter.acquire(10)
+
+        assert waited == pytest.approx(2.0)
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_response_pauses_for_retry_after(self, clock):
+        """Test a 429 pauses every caller for retry-after seconds."""
+        limiter = make_limiter(clock, requests_per_minute=6000, tokens_per_minute=600000)
+
+        limiter.record_rate_limited({'retry-after': '5'})
+        waited = await limiter.acquire(10)
+
+        assert waited >= 5.0
+        assert limiter.get_stats()['rate_limited'] == 1
+
+    @pytest.mark.asyncio
+    async def test_usage_does_not_refund_reservation(self, clock):
+        """Test actual usage is reported without returning reserved tokens, as the API does."""
+        limiter = make_limiter(clock, tokens_per_minute=10000)
+
+        await limiter.acquire(4000)
+        limiter.record_usage(1500)
+
+        assert limiter.get_stats()['tokens_available'] == pytest.approx(6000)
+        assert limiter.get_stats()['tokens_used'] == 1500
+
+    @pytest.mark.asyncio
+    async def test_disabled_limiter_never_waits(self, clock):
+        """Test a disabled limiter ignores budgets and headers."""
+        limiter = make_limiter(clock, enabled=False, requests_per_minute=1)
+        limiter.update_from_headers({'x-ratelimit-remaining-requests': '0', 'x-ratelimit-reset-requests': '1m'})
+
+        for _ in range(5):
+            assert await limiter.acquire(100000) == 0.0
+
+
+def make_raw_response(content: str, headers=None, total_tokens: int = 400) -> MagicMock:
+    """Create a with_raw_response result wrapping a chat completion."""
+    response = MagicMock()
+    response.choices = [MagicMock()]
+    response.choices[0].message.content = content
+    response.usage.total_tokens = total_tokens
+    raw_response = MagicMock()
+    raw_response.headers = headers or {}
+    raw_response.parse.return_value = response
+    return raw_response
+
+
+def make_entry(number: int) -> dict:
+    """Create a valid analysis entry whose trust score identifies the ad."""
+    return {
+        "id": number,
+        "trust_score": 70 + number,
+        "classification": "Legit",
+        "reasons": ["Verifiable employer details", "Realistic pay for the role", "Standard hiring process"],
+        "confidence": 0.9
+    }
+
+
+def make_ad(number: int, length: int = 300) -> str:
+    """Create a benign job ad of roughly the given length."""
+    text = f"Job {number}: warehouse associate, day shift, apply through our careers page. "
+    return (text * (length // len(text) + 1))[:length]
+
+
+class TestBatchAnalysis:
+    """Test analyze_job_ads_batch packs short ads into shared completions."""
+
+    @pytest.fixture
+    def service(self):
+        config = AppConfig(
+            openai_api_key="test_key",
+            twilio_account_sid="test_sid",
+            twilio_auth_token="test_token",
+            twilio_phone_number="test_phone",
+            batch_analysis_size=5
+        )
+        with patch('app.services.enhanced_ai_analysis.AsyncOpenAI'):
+            service = EnhancedAIAnalysisService(config)
+        service.client = MagicMock()
+        service.rate_limiter = OpenAIRateLimiter(OpenAIRateLimitConfig())
+        service.near_duplicate_store = NearDuplicateStore(NearDuplicateConfig(enabled=False))
+        service._check_similar_job_ads = AsyncMock(return_value=None)
+        return service
+
+    def respond(self, service, drop_ids=(), headers=None):
+        """Answer batch prompts with one entry per ad and single prompts with one result."""
+        async def create(**kwargs):
+            prompt = kwargs["messages"][1]["content"]
+            numbers = [int(n) for n in re.findall(r"JOB ADVERTISEMENT (\d+):", prompt)]
+            if numbers:
+                entries = [make_entry(n) for n in reversed(numbers) if n not in drop_ids]
+                return make_raw_response(json.dumps({"results": entries}), headers)
+            return make_raw_response(json.dumps({**make_entry(0), "trust_score": 99}), headers)
+
+        service.client.chat.completions.with_raw_response.create = AsyncMock(side_effect=create)
+        return service.client.chat.completions.with_raw_response.create
+
+    @pytest.mark.asyncio
+    async def test_short_ads_share_one_request(self, service):
+        """Test five short ads cost one completion and map back by id."""
+        create = self.respond(service)
+
+        results = await service.analyze_job_ads_batch([make_ad(n) for n in range(5)])
+
+        assert create.await_count == 1
+        assert [result.trust_score for result in results] == [71, 72, 73, 74, 75]
+        assert all(result.classification == JobClassification.LEGIT for result in results)
+
+    @pytest.mark.asyncio
+    async def test_missing_entries_are_analyzed_individually(self, service):
+        """Test an ad left out of the batch response gets its own request."""
+        create = self.respond(service, drop_ids={2})
+
+        results = await service.analyze_job_ads_batch([make_ad(n) for n in range(3)])
+
+        assert create.await_count == 2
+        assert [result.trust_score for result in results] == [71, 99, 73]
+
+    @pytest.mark.asyncio
+    async def test_long_and_lone_ads_are_not_packed(self, service):
+        """Test long ads and a single leftover ad use the single-ad prompt."""
+        create = self.respond(service)
+        job_texts = [make_ad(n) for n in range(6)] + [make_ad(6, BATCH_MAX_AD_CHARS + 1)]
+
+        results = await service.analyze_job_ads_batch(job_texts)
+
+        assert create.await_count == 3
+        assert [result.trust_score for result in results] == [71, 72, 73, 74, 75, 99, 99]
+
+    @pytest.mark.asyncio
+    async def test_response_headers_adapt_limiter(self, service):
+        """Test the batch request feeds rate-limit headers and usage to the limiter."""
+        self.respond(service, headers={'x-ratelimit-limit-tokens': '150000', 'x-ratelimit-limit-requests': '5000'})
+
+        await service.analyze_job_ads_batch([make_ad(n) for n in range(5)])
+        stats = service.rate_limiter.get_stats()
+
+        assert stats['tokens_per_minute'] == 150000
+        assert stats['requests_per_minute'] == 5000
+        assert stats['tokens_used'] == 400
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_error_pauses_limiter(self, service):
+        """Test a 429 pauses the limiter and the ads fall back to a suspicious verdict."""
+        service.rate_limiter = OpenAIRateLimiter(
+            OpenAIRateLimitConfig(requests_per_minute=60000, tokens_per_minute=60000000)
+        )
+        response = httpx.Response(
+            429, headers={'retry-after': '0.01'}, request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+        )
+        service.client.chat.completions.with_raw_response.create = AsyncMock(
+            side_effect=openai.RateLimitError("Rate limit reached", response=response, body=None)
+        )
+
+        results = await service.analyze_job_ads_batch([make_ad(n) for n in range(2)])
+
+        assert service.rate_limiter.get_stats()['rate_limited'] >= 1
+        assert all(result.classification == JobClassification.SUSPICIOUS for result in results)
+        assert all(result.confidence <= 0.5 for result in results)
@@ -0,0 +1,253 @@
+"""
+Tests for the process-pool PDF extraction engine.
+
+Covers page fan-out, CPU and wall-clock timeouts, worker recycling and
+recovery from a broken pool, early stopping at the character budget and
+the text-layer probe, plus both extraction paths of
+PDFProcessingService.extract_text. Documents are real PDFs built from the
+PDF fixtures.
+"""
+
+import asyncio
+import os
+import time
+import pytest
+from unittest.mock import patch
+from concurrent.futures.process import BrokenProcessPool
+
+from app.models.data_models import AppConfig
+from app.services.pdf_extraction_engine import PDFExtractionEngine, PDFExtractionConfig
+from app.services.pdf_processing import PDFProcessingService, PDFExtractionError
+from app.utils.metrics import get_metrics_collector, reset_metrics_collector
+from app.utils.pdf_text_extraction import PDFExtractionTimeoutError, cpu_time_limit, take_within_budget
+from tests.fixtures.pdf_samples import PDFDocumentBuilder, PDFFixtures
+
+
+@pytest.fixture
+def engine():
+    engine = PDFExtractionEngine(PDFExtractionConfig(process_pool=True, max_workers=2, pages_per_job=4))
+    yield engine
+    asyncio.run(engine.shutdown())
+
+
+@pytest.fixture
+def pdf_service(engine):
+    reset_metrics_collector()
+    service = PDFProcessingService(AppConfig(
+        openai_api_key="test-key",
+        twilio_account_sid="test-sid",
+        twilio_auth_token="test-token",
+        twilio_phone_number="+1234567890"
+    ))
+    service.extraction_engine = engine
+    return service
+
+
+def numbered_pages(count: int) -> bytes:
+    return PDFDocumentBuilder.build([f"Page {number}\nJob description continued" for number in range(1, count + 1)])
+
+
+class TestPDFExtractionEngine:
+    """Test PDFExtractionEngine."""
+
+    @pytest.mark.asyncio
+    async def test_small_document_is_one_job(self, engine):
+        """Test a document within pages_per_job is extracted by a single job."""
+        with patch.object(engine, '_run_job', wraps=engine._run_job) as run_job:
+            page_texts = await engine.extract_pages(numbered_pages(3))
+
+        assert [text.split("\n")[0] for text in page_texts] == ["Page 1", "Page 2", "Page 3"]
+        assert run_job.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_large_document_fans_out_in_page_order(self, engine):
+        """Test a large document is split into page ranges and reassembled in order."""
+        with patch.object(engine, '_run_job', wraps=engine._run_job) as run_job:
+            page_texts = await engine.extract_pages(numbered_pages(18))
+
+        assert [text.split("\n")[0] for text in page_texts] == [f"Page {number}" for number in range(1, 19)]
+        assert [call.args[1:3] for call in run_job.call_args_list] == [(0, 4), (4, 8), (8, 12), (12, 16), (16, 20)]
+
+    @pytest.mark.asyncio
+    async def test_wall_clock_timeout(self, engine):
+        """Test a document that outlives the wall-clock timeout is abandoned."""
+        engine.config.timeout = 0.001
+
+        with pytest.raises(PDFExtractionTimeoutError, match="wall-clock"):
+            await engine.extract_pages(numbered_pages(12))
+
+    def test_cpu_time_limit(self):
+        """Test a job that uses more CPU time than allowed is interrupted."""
+        started = time.monotonic()
+
+        with pytest.raises(PDFExtractionTimeoutError, match="CPU time"):
+            with cpu_time_limit(1):
+                while time.monotonic() - started < 10:
+                    pass
+
+        assert time.monotonic() - started < 5
+
+    @pytest.mark.asyncio
+    async def test_workers_are_recycled(self, engine):
+        """Test a worker is replaced after max_jobs_per_worker jobs."""
+        engine.config.max_workers = 1
+        engine.config.max_jobs_per_worker = 2
+
+        pids = [await engine._submit(os.getpid) for _ in range(6)]
+
+        assert len(set(pids)) == 3
+        assert pids[0] == pids[1] != pids[2] == pids[3]
+
+    @pytest.mark.asyncio
+    async def test_recycling_with_queued_jobs(self, engine):
+        """Test jobs queued when a pool is retired still complete."""
+        engine.config.max_workers = 1
+        engine.config.max_jobs_per_worker = 2
+
+        results = await asyncio.wait_for(
+            asyncio.gather(*(engine.extract_pages(numbered_pages(1)) for _ in range(7))), timeout=60
+        )
+
+        assert all(page_texts[0].startswith("Page 1") for page_texts in results)
+
+    @pytest.mark.asyncio
+    async def test_broken_pool_is_replaced(self, engine):
+        """Test a pool whose worker died is replaced for the next document."""
+        await engine.start()
+        for process in engine._get_executor()._processes.values():
+            process.kill()
+
+        with pytest.raises(BrokenProcessPool):
+            await engine.extract_pages(numbered_pages(2))
+        page_texts = await engine.extract_pages(numbered_pages(2))
+
+        assert len(page_texts) == 2
+
+
+    @pytest.mark.asyncio
+    async def test_budget_met_by_first_job_skips_fan_out(self, engine):
+        """Test a document whose first pages fill the budget is not fanned out."""
+        engine.config.char_budget = 60
+
+        with patch.object(engine, '_run_job', wraps=engine._run_job) as run_job:
+            page_texts = await engine.extract_pages(numbered_pages(18))
+
+        # Each page holds 32 characters
+        assert [text.split("\n")[0] for text in page_texts] == ["Page 1", "Page 2"]
+        assert run_job.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_fan_out_jobs_get_remaining_budget(self, engine):
+        """Test fanned out jobs stop at the budget still missing and pages are trimmed in order."""
+        engine.config.char_budget = 200
+
+        with patch.object(engine, '_run_job', wraps=engine._run_job) as run_job:
+            page_texts = await engine.extract_pages(numbered_pages(18))
+
+        assert [text.split("\n")[0] for text in page_texts] == [f"Page {number}" for number in range(1, 8)]
+        assert [call.args[3] for call in run_job.call_args_list] == [200, 72, 72, 72, 72]
+
+
+class TestPageExtraction:
+    """Test lazy page extraction on the thread path."""
+
+    @pytest.fixture
+    def service(self):
+        service = PDFProcessingService(AppConfig(
+            openai_api_key="test-key",
+            twilio_account_sid="test-sid",
+            twilio_auth_token="test-token",
+            twilio_phone_number="+1234567890"
+        ))
+        service.extraction_engine = PDFExtractionEngine(PDFExtractionConfig(char_budget=60))
+        return service
+
+    def test_stops_at_budget(self, service):
+        """Test pages after the one that fills the budget are never extracted."""
+        with patch('app.utils.pdf_text_extraction.extract_page_text',
+                   side_effect=lambda page: page.extract_text()) as extract_page_text:
+            text = service._extract_text_sync(numbered_pages(12))
+
+        assert text.startswith("Page 1") and "Page 2" in text and "Page 3" not in text
+        assert extract_page_text.call_count == 2
+
+    def test_unlimited_budget(self, service):
+        """Test a budget of 0 extracts every page."""
+        service.extraction_engine.config.char_budget = 0
+
+        text = service._extract_text_sync(numbered_pages(12))
+
+        assert "Page 12" in text
+
+    def test_pages_without_text_layer_are_not_parsed(self, service):
+        """Test pages without fonts are skipped without parsing their content."""
+        with patch('app.utils.pdf_text_extraction.extract_page_text') as extract_page_text:
+            with pytest.raises(PDFExtractionError, match="No text content found"):
+                service._extract_text_sync(PDFDocumentBuilder.build_drawing(3, 5000))
+
+        extract_page_text.assert_not_called()
+
+    def test_simple_extraction_for_spaced_text(self, service):
+        """Test word clustering is skipped for text layers with space glyphs only."""
+        spaced = PDFDocumentBuilder.from_sample(PDFFixtures.get_valid_samples()[0])
+        scattered = PDFDocumentBuilder.build_scattered(1, 200)
+
+        with patch('pdfplumber.page.Page.extract_text', autospec=True, return_value="clustered") as extract_text:
+            assert "Senior Software Engineer Position" in service._extract_text_sync(spaced)
+            extract_text.assert_not_called()
+            assert service._extract_text_sync(scattered) == "clustered"
+
+    def test_take_within_budget_is_lazy(self):
+        """Test pages are only requested until the budget is met."""
+        requested = []
+
+        def pages():
+            for text in ["a" * 10, "b" * 10, "c" * 10]:
+                requested.append(text)
+                yield text
+
+        assert take_within_budget(pages(), 15) == ["a" * 10, "b" * 10]
+        assert len(requested) == 2
+
+
+class TestExtractTextPaths:
+    """Test PDFProcessingService.extract_text on the thread and process paths."""
+
+    @pytest.mark.asyncio
+    async def test_process_path_matches_thread_path(self, pdf_service):
+        """Test both paths extract the same text from a fixture document."""
+        pdf_content = PDFDocumentBuilder.from_sample(PDFFixtures.get_valid_samples()[0], pages=10)
+
+        process_text = await pdf_service.extract_text(pdf_content)
+        pdf_service.extraction_engine.config.process_pool = False
+        thread_text = await pdf_service.extract_text(pdf_content)
+
+        assert process_text == thread_text
+        assert "Senior Software Engineer Position" in process_text
+        summary = get_metrics_collector().get_current_metrics()["pdf_extraction"]
+        assert summary["process"]["success"] == 1
+        assert summary["thread"]["success"] == 1
+
+    @pytest.mark.asyncio
+    async def test_process_path_timeout(self, pdf_service):
+        """Test a process path timeout is reported as an extraction error."""
+        pdf_service.extraction_engine.config.timeout = 0.001
+
+        with pytest.raises(PDFExtractionError, match="timed out"):
+            await pdf_service.extract_text(numbered_pages(12))
+
+        summary = get_metrics_collector().get_current_metrics()["pdf_extraction"]
+        assert summary["process"]["timeout"] == 1
+
+    @pytest.mark.asyncio
+    async def test_thread_path_timeout(self, pdf_service):
+        """Test the thread path stops waiting for a hung extraction."""
+        pdf_service.extraction_engine.config.process_pool = False
+        pdf_service.extraction_engine.config.timeout = 0.05
+
+        with patch.object(pdf_service, '_extract_text_sync', side_effect=lambda content: time.sleep(1)):
+            with pytest.raises(PDFExtractionError, match="timed out"):
+                await pdf_service.extract_text(b'%PDF-test')
+
+        summary = get_metrics_collector().get_current_metrics()["pdf_extraction"]
+        assert summary["thread"]["timeout"] == 1
@@ -7,7 +7,7 @@ with various edge cases and mock scenarios.
 
 import pytest
 import asyncio
-from unittest.mock import Mock, patch, AsyncMock
+from unittest.mock import Mock, patch
 from io import BytesIO
 
 import httpx
@@ -23,6 +23,20 @@ from app.services.pdf_processing import (
 from app.models.data_models import AppConfig
 
 
+def mock_http_client(handler) -> httpx.AsyncClient:
+    """Create an HTTP client whose requests are answered by handler."""
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def streamed_body(chunks, sent):
+    """Create a streamed response body that records the size of each chunk it sends."""
+    async def body():
+        for chunk in chunks:
+            sent.append(len(chunk))
+            yield chunk
+    return body()
+
+
 @pytest.fixture
 def mock_config():
     """Create a mock configuration for testing."""
@@ -86,18 +100,13 @@ class TestPDFProcessingService:
     @pytest.mark.asyncio
     async def test_download_pdf_success(self, pdf_service, sample_pdf_content):
         """Test successful PDF download."""
-        mock_response = Mock()
-        mock_response.content = sample_pdf_content
-        mock_response.headers = {'content-length': str(len(sample_pdf_content))}
-        mock_response.raise_for_status = Mock()
+        handler = Mock(return_value=httpx.Response(200, content=sample_pdf_content))
+        pdf_service._client = mock_http_client(handler)
         
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(return_value=mock_response)
-            
-            result = await pdf_service.download_pdf("https://example.com/test.pdf")
-            
-            assert result == sample_pdf_content
-            mock_response.raise_for_status.assert_called_once()
+        result = await pdf_service.download_pdf("https://example.com/test.pdf")
+        
+        assert result == sample_pdf_content
+        handler.assert_called_once()
     
     @pytest.mark.asyncio
     async def test_download_pdf_empty_url(self, pdf_service):
@@ -108,80 +117,117 @@ class TestPDFProcessingService:
     @pytest.mark.asyncio
     async def test_download_pdf_too_large_header(self, pdf_service):
         """Test download failure when content-length header indicates file too large."""
-        mock_response = Mock()
-        mock_response.headers = {'content-length': str(10 * 1024 * 1024)}  # 10MB
+        sent = []
+        pdf_service._client = mock_http_client(lambda request: httpx.Response(
+            200,
+            headers={'content-length': str(10 * 1024 * 1024)},  # 10MB
+            content=streamed_body([b'%PDF-1.4'] + [b'x' * 1024] * 10, sent)
+        ))
         
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(return_value=mock_response)
-            
-            with pytest.raises(PDFDownloadError, match="PDF file too large"):
-                await pdf_service.download_pdf("https://example.com/large.pdf")
+        with pytest.raises(PDFDownloadError, match="PDF file too large"):
+            await pdf_service.download_pdf("https://example.com/large.pdf")
+        assert sent == []
     
     @pytest.mark.asyncio
     async def test_download_pdf_too_large_content(self, pdf_service):
-        """Test download failure when actual content is too large."""
-        large_content = b'%PDF-1.4' + b'x' * (6 * 1024 * 1024)  # 6MB+ content
-        mock_response = Mock()
-        mock_response.content = large_content
-        mock_response.headers = {}
-        mock_response.raise_for_status = Mock()
+        """Test download is aborted once the size cap is crossed without a content-length."""
+        chunk = b'x' * (1024 * 1024)
+        sent = []
+        pdf_service._client = mock_http_client(lambda request: httpx.Response(
+            200, content=streamed_body([b'%PDF-1.4'] + [chunk] * 20, sent)  # 20MB+, no content-length
+        ))
         
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(return_value=mock_response)
-            
-            with pytest.raises(PDFDownloadError, match="PDF file too large"):
-                await pdf_service.download_pdf("https://example.com/large.pdf")
+        with pytest.raises(PDFDownloadError, match="PDF file too large"):
+            await pdf_service.download_pdf("https://example.com/large.pdf")
+        assert sum(sent) <= pdf_service.max_size_bytes + len(chunk) + 8
+    
+    @pytest.mark.asyncio
+    async def test_download_pdf_lying_content_length(self, pdf_service):
+        """Test a body larger than its content-length header is still capped."""
+        sent = []
+        pdf_service._client = mock_http_client(lambda request: httpx.Response(
+            200,
+            headers={'content-length': '1024'},
+            content=streamed_body([b'%PDF-1.4'] + [b'x' * (1024 * 1024)] * 20, sent)
+        ))
+        
+        with pytest.raises(PDFDownloadError):
+            await pdf_service.download_pdf("https://example.com/large.pdf")
+        assert sum(sent) < 20 * 1024 * 1024
     
     @pytest.mark.asyncio
     async def test_download_pdf_invalid_format(self, pdf_service):
-        """Test download failure when file is not a valid PDF."""
-        invalid_content = b'This is not a PDF file'
-        mock_response = Mock()
-        mock_response.content = invalid_content
-        mock_response.headers = {}
-        mock_response.raise_for_status = Mock()
+        """Test download is aborted on the first chunk when the file is not a PDF."""
+        sent = []
+        pdf_service._client = mock_http_client(lambda request: httpx.Response(
+            200, content=streamed_body([b'This is not a PDF file'] + [b'x' * 1024] * 100, sent)
+        ))
         
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(return_value=mock_response)
-            
-            with pytest.raises(PDFDownloadError, match="not a valid PDF"):
-                await pdf_service.download_pdf("https://example.com/invalid.pdf")
+        with pytest.raises(PDFDownloadError, match="not a valid PDF"):
+            await pdf_service.download_pdf("https://example.com/invalid.pdf")
+        assert len(sent) == 1
+    
+    @pytest.mark.asyncio
+    async def test_download_pdf_header_split_across_chunks(self, pdf_service, sample_pdf_content):
+        """Test the PDF header is recognised when it arrives in pieces."""
+        pdf_service._client = mock_http_client(lambda request: httpx.Response(
+            200, content=streamed_body([sample_pdf_content[:2], sample_pdf_content[2:]], [])
+        ))
+        
+        assert await pdf_service.download_pdf("https://example.com/test.pdf") == sample_pdf_content
     
     @pytest.mark.asyncio
     async def test_download_pdf_http_error(self, pdf_service):
         """Test download failure with HTTP error."""
-        mock_response = Mock()
-        mock_response.status_code = 404
+        pdf_service._client = mock_http_client(lambda request: httpx.Response(404, text="Not found"))
         
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(
-                side_effect=httpx.HTTPStatusError("Not found", request=Mock(), response=mock_response)
-            )
-            
-            with pytest.raises(PDFDownloadError, match="HTTP 404"):
-                await pdf_service.download_pdf("https://example.com/notfound.pdf")
+        with pytest.raises(PDFDownloadError, match="HTTP 404"):
+            await pdf_service.download_pdf("https://example.com/notfound.pdf")
     
     @pytest.mark.asyncio
     async def test_download_pdf_timeout(self, pdf_service):
         """Test download failure with timeout."""
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(
-                side_effect=httpx.TimeoutException("Timeout")
-            )
-            
-            with pytest.raises(PDFDownloadError, match="timed out"):
-                await pdf_service.download_pdf("https://example.com/slow.pdf")
+        def handler(request):
+            raise httpx.ReadTimeout("Timeout", request=request)
+        pdf_service._client = mock_http_client(handler)
+        
+        with pytest.raises(PDFDownloadError, match="timed out"):
+            await pdf_service.download_pdf("https://example.com/slow.pdf")
     
     @pytest.mark.asyncio
     async def test_download_pdf_network_error(self, pdf_service):
         """Test download failure with network error."""
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(
-                side_effect=httpx.RequestError("Connection failed")
-            )
-            
-            with pytest.raises(PDFDownloadError, match="Network error"):
-                await pdf_service.download_pdf("https://example.com/unreachable.pdf")
+        def handler(request):
+            raise httpx.ConnectError("Connection failed", request=request)
+        pdf_service._client = mock_http_client(handler)
+        
+        with pytest.raises(PDFDownloadError, match="Network error"):
+            await pdf_service.download_pdf("https://example.com/unreachable.pdf")
+    
+    @pytest.mark.asyncio
+    async def test_download_pdf_cdn_retries_with_auth(self, pdf_service, sample_pdf_content):
+        """Test Twilio CDN downloads retry with credentials after a 401."""
+        def handler(request):
+            if 'authorization' not in request.headers:
+                return httpx.Response(401, text="Unauthorized")
+            return httpx.Response(200, content=sample_pdf_content)
+        pdf_service._client = mock_http_client(handler)
+        
+        result = await pdf_service.download_pdf("https://media.twiliocdn.com/AC123/test.pdf")
+        
+        assert result == sample_pdf_content
+    
+    @pytest.mark.asyncio
+    async def test_download_client_is_pooled(self, pdf_service):
+        """Test downloads share one client until cleanup closes it."""
+        client = pdf_service._get_client()
+        
+        assert pdf_service._get_client() is client
+        
+        await pdf_service.cleanup()
+        assert client.is_closed
+        assert pdf_service._get_client() is not client
+        await pdf_service.cleanup()
     
     @pytest.mark.asyncio
     async def test_extract_text_success(self, pdf_service, sample_pdf_content, sample_job_text):
@@ -205,7 +251,7 @@ class TestPDFProcessingService:
     
     def test_extract_text_sync_success(self, pdf_service, sample_job_text):
         """Test synchronous text extraction success."""
-        mock_page = Mock()
+        mock_page = Mock(chars=[])
         mock_page.extract_text.return_value = sample_job_text
         
         mock_pdf = Mock()
@@ -230,7 +276,7 @@ class TestPDFProcessingService:
     
     def test_extract_text_sync_no_text(self, pdf_service):
         """Test synchronous text extraction with no extractable text."""
-        mock_page = Mock()
+        mock_page = Mock(chars=[])
         mock_page.extract_text.return_value = None
         
         mock_pdf = Mock()
@@ -244,9 +290,9 @@ class TestPDFProcessingService:
     
     def test_extract_text_sync_multiple_pages(self, pdf_service):
         """Test synchronous text extraction with multiple pages."""
-        mock_page1 = Mock()
+        mock_page1 = Mock(chars=[])
         mock_page1.extract_text.return_value = "Page 1 content"
-        mock_page2 = Mock()
+        mock_page2 = Mock(chars=[])
         mock_page2.extract_text.return_value = "Page 2 content"
         
         mock_pdf = Mock()
@@ -260,11 +306,11 @@ class TestPDFProcessingService:
     
     def test_extract_text_sync_page_error(self, pdf_service):
         """Test synchronous text extraction with page extraction error."""
-        mock_page1 = Mock()
+        mock_page1 = Mock(chars=[])
         mock_page1.extract_text.return_value = "Page 1 content"
-        mock_page2 = Mock()
+        mock_page2 = Mock(chars=[])
         mock_page2.extract_text.side_effect = Exception("Page error")
-        mock_page3 = Mock()
+        mock_page3 = Mock(chars=[])
         mock_page3.extract_text.return_value = "Page 3 content"
         
         mock_pdf = Mock()
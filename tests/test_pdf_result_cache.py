@@ -0,0 +1,240 @@
+"""
+Tests for the content-addressed PDF result cache.
+
+Redis is replaced by a small in-memory manager, and every cache writes
+through to its own SQLite file, so two cache instances on one file stand in
+for a restart. Documents are real PDFs built from the PDF fixtures.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import patch, AsyncMock, Mock
+
+from app.models.data_models import AppConfig, JobAnalysisResult, JobClassification
+from app.services.message_handler import MessageHandlerService
+from app.services.pdf_extraction_engine import PDFExtractionEngine, PDFExtractionConfig
+from app.services.pdf_processing import PDFProcessingService
+from app.services.pdf_result_cache import PDFResultCache, PDFResultCacheConfig, pdf_content_digest
+from app.utils.text_normalization import normalize_job_text
+from tests.fixtures.pdf_samples import PDFDocumentBuilder, PDFFixtures
+
+
+DIGEST = pdf_content_digest(b"%PDF-1.4 test")
+
+
+class InMemoryRedisManager:
+    """Dict-backed stand-in for RedisConnectionManager commands."""
+
+    def __init__(self):
+        self.values = {}
+        self.available = True
+        self.commands = []
+
+    def is_available(self) -> bool:
+        return self.available
+
+    async def execute_command(self, command, *args):
+        self.commands.append(command)
+        if command == "mget":
+            return [self.values.get(key) for key in args]
+        if command == "setex":
+            key, ttl, value = args
+            self.values[key] = value
+            return True
+        raise ValueError(command)
+
+
+def make_cache(tmp_path, redis_manager=None, **overrides) -> PDFResultCache:
+    """Create a cache on a SQLite file in tmp_path."""
+    cache = PDFResultCache(PDFResultCacheConfig(disk_path=str(tmp_path / "pdf_results.db"), **overrides))
+    cache.redis_manager = redis_manager or InMemoryRedisManager()
+    return cache
+
+
+def make_result(confidence: float = 0.9) -> JobAnalysisResult:
+    return JobAnalysisResult(
+        trust_score=8,
+        classification=JobClassification.LIKELY_SCAM,
+        reasons=["Upfront registration fee", "Guaranteed income", "Pressure to act now"],
+        confidence=confidence
+    )
+
+
+def verdict(result: JobAnalysisResult):
+    """The fields of a result that are cached; the timestamp is not."""
+    return result.trust_score, result.classification, result.reasons, result.confidence
+
+
+class TestPDFResultCache:
+    """Test PDFResultCache."""
+
+    @pytest.mark.asyncio
+    async def test_text_and_result_round_trip(self, tmp_path):
+        """Test cached text and result are returned in one Redis round trip."""
+        redis_manager = InMemoryRedisManager()
+        cache = make_cache(tmp_path, redis_manager)
+        text = normalize_job_text("Software Engineer\nSalary: $120,000")
+
+        assert await cache.lookup(DIGEST, 2048) is None
+        await cache.store_text(DIGEST, text)
+        assert (await cache.lookup(DIGEST, 2048)).result is None
+        await cache.store_result(DIGEST, make_result())
+        redis_manager.commands.clear()
+        entry = await cache.lookup(DIGEST, 2048)
+
+        assert entry.text == text
+        assert verdict(entry.result) == verdict(make_result())
+        assert redis_manager.commands == ["mget"]
+        stats = cache.get_stats()
+        assert stats["lookups"] == 3
+        assert stats["misses"] == 1
+        assert stats["result_hits"] == 1
+        assert stats["bytes_saved"] == 4096
+        assert stats["disk_hits"] == 0
+
+    @pytest.mark.asyncio
+    async def test_low_confidence_result_is_not_cached(self, tmp_path):
+        """Test a result below min_confidence is never reused."""
+        cache = make_cache(tmp_path)
+        await cache.store_text(DIGEST, normalize_job_text("Warehouse associate, night shift"))
+
+        assert await cache.store_result(DIGEST, make_result(confidence=0.4)) is False
+        assert (await cache.lookup(DIGEST, 100)).result is None
+        assert cache.get_stats()["skipped_low_confidence"] == 1
+
+    @pytest.mark.asyncio
+    async def test_disk_serves_when_redis_is_unavailable(self, tmp_path):
+        """Test entries written through to disk are read during a Redis outage."""
+        redis_manager = InMemoryRedisManager()
+        cache = make_cache(tmp_path, redis_manager)
+        text = normalize_job_text("Data analyst, remote, $85,000")
+        await cache.store_text(DIGEST, text)
+        await cache.store_result(DIGEST, make_result())
+
+        redis_manager.available = False
+        entry = await cache.lookup(DIGEST, 100)
+
+        assert entry.text == text
+        assert verdict(entry.result) == verdict(make_result())
+        assert cache.get_stats()["disk_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_disk_survives_restart(self, tmp_path):
+        """Test a new cache instance on the same file finds earlier entries."""
+        cache = make_cache(tmp_path)
+        await cache.store_text(DIGEST, normalize_job_text("Nurse, day shift"))
+        cache.close()
+
+        restarted = make_cache(tmp_path)
+
+        assert (await restarted.lookup(DIGEST, 100)).text.original == "Nurse, day shift"
+        restarted.close()
+
+    @pytest.mark.asyncio
+    async def test_expired_disk_entries_are_ignored(self, tmp_path):
+        """Test text and results past their TTL are not read from disk."""
+        redis_manager = InMemoryRedisManager()
+        redis_manager.available = False
+        cache = make_cache(tmp_path, redis_manager, result_ttl=0)
+        await cache.store_text(DIGEST, normalize_job_text("Accountant"))
+        await cache.store_result(DIGEST, make_result())
+
+        assert (await cache.lookup(DIGEST, 100)).result is None
+
+        cache.config.text_ttl = 0
+        await cache.store_text(DIGEST, normalize_job_text("Accountant"))
+        assert await cache.lookup(DIGEST, 100) is None
+
+    @pytest.mark.asyncio
+    async def test_disk_is_trimmed_least_recently_used_first(self, tmp_path):
+        """Test the file keeps at most disk_max_entries entries."""
+        redis_manager = InMemoryRedisManager()
+        redis_manager.available = False
+        cache = make_cache(tmp_path, redis_manager, disk_max_entries=2)
+        digests = [pdf_content_digest(bytes([number])) for number in range(3)]
+
+        for digest in digests[:2]:
+            await cache.store_text(digest, normalize_job_text(digest))
+        await cache.lookup(digests[0], 100)
+        await cache.store_text(digests[2], normalize_job_text(digests[2]))
+
+        assert await cache.lookup(digests[0], 100) is not None
+        assert await cache.lookup(digests[1], 100) is None
+        assert await cache.lookup(digests[2], 100) is not None
+
+    @pytest.mark.asyncio
+    async def test_disabled(self, tmp_path):
+        """Test a disabled cache neither stores nor looks up."""
+        cache = make_cache(tmp_path, enabled=False)
+
+        assert await cache.store_text(DIGEST, normalize_job_text("Chef")) is False
+        assert await cache.lookup(DIGEST, 100) is None
+        assert cache.get_stats()["lookups"] == 0
+
+
+class TestRepeatedPDFs:
+    """Test repeated PDFs skip extraction and analysis."""
+
+    @pytest.fixture
+    def config(self):
+        return AppConfig(
+            openai_api_key="test-key",
+            twilio_account_sid="test-sid",
+            twilio_auth_token="test-token",
+            twilio_phone_number="+1234567890"
+        )
+
+    @pytest.fixture
+    def pdf_service(self, config, tmp_path):
+        service = PDFProcessingService(config)
+        service.extraction_engine = PDFExtractionEngine(PDFExtractionConfig())
+        service.result_cache = make_cache(tmp_path)
+        return service
+
+    @pytest.fixture
+    def pdf_content(self):
+        return PDFDocumentBuilder.from_sample(PDFFixtures.get_valid_samples()[0])
+
+    @pytest.mark.asyncio
+    async def test_repeated_pdf_is_extracted_once(self, pdf_service, pdf_content):
+        """Test the second copy of a PDF gets the cached text without extraction."""
+        with patch.object(pdf_service, 'extract_text', wraps=pdf_service.extract_text) as extract_text:
+            first = await pdf_service.load_pdf_content(pdf_content)
+            second = await pdf_service.load_pdf_content(pdf_content)
+
+        assert extract_text.call_count == 1
+        assert second.cached and not first.cached
+        assert second.text == first.text
+        assert second.digest == pdf_content_digest(pdf_content)
+        assert "Senior Software Engineer Position" in second.text.original
+
+    @pytest.mark.asyncio
+    async def test_repeated_pdf_is_analyzed_once(self, config, pdf_service, pdf_content):
+        """Test a handler reuses the analysis of a PDF forwarded by another user."""
+        twilio_service = Mock()
+        twilio_service.send_analysis_result = AsyncMock(return_value=True)
+        user_service = Mock()
+        user_service.is_user_blocked = AsyncMock(return_value=False)
+        user_service.record_interaction = AsyncMock()
+        openai_service = Mock()
+        openai_service.analyze_job_ad = AsyncMock(return_value=make_result())
+        handler = MessageHandlerService(
+            config, twilio_service=twilio_service, pdf_service=pdf_service,
+            openai_service=openai_service, user_service=user_service
+        )
+
+        with patch.object(pdf_service, 'download_pdf', AsyncMock(return_value=pdf_content)) as download_pdf:
+            for from_number in ["whatsapp:+1987654321", "whatsapp:+1555000111"]:
+                assert await handler.handle_media_message(
+                    "https://api.twilio.com/media/1", "application/pdf", from_number
+                ) is True
+            await asyncio.sleep(0)
+
+        assert download_pdf.await_count == 2
+        openai_service.analyze_job_ad.assert_awaited_once()
+        assert openai_service.analyze_job_ad.await_args.kwargs["normalized"].original == \
+            openai_service.analyze_job_ad.await_args.args[0]
+        from_number, result = twilio_service.send_analysis_result.await_args.args
+        assert from_number == "whatsapp:+1555000111"
+        assert verdict(result) == verdict(make_result())
+        assert pdf_service.result_cache.get_stats()["result_hits"] == 1
@@ -368,20 +368,20 @@ class TestServicePerformance:
         assert concurrent_throughput > sequential_throughput, "Concurrent processing should be faster than sequential"
         assert concurrent_throughput >= 10.0, f"Concurrent throughput ({concurrent_throughput:.2f} req/s) below threshold (10.0 req/s)"
     
-    @patch('app.services.pdf_processing.httpx.AsyncClient.get')
+    @patch('app.services.pdf_processing.PDFProcessingService._get_client')
     @patch('app.services.pdf_processing.pdfplumber.open')
     @pytest.mark.asyncio
-    async def test_pdf_processing_performance(self, mock_pdf_open, mock_httpx_get):
+    async def test_pdf_processing_performance(self, mock_pdf_open, mock_get_client):
         """Test PDF processing service performance."""
+        import httpx
         from app.services.pdf_processing import PDFProcessingService
         from app.models.data_models import AppConfig
         from tests.fixtures.pdf_samples import PDFFixtures, PDFExtractionMocks
         
         # Setup mock HTTP response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.content = b"%PDF-1.4\nTest PDF content"
-        mock_httpx_get.return_value = mock_response
+        mock_get_client.return_value = httpx.AsyncClient(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, content=b"%PDF-1.4\nTest PDF content")
+        ))
         
         # Setup mock PDF extraction
         pdf_sample = PDFFixtures.VALID_PDF_SAMPLES[0]
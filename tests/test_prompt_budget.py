@@ -0,0 +1,159 @@
+"""
+Tests for fitting job text into the analysis prompt token budget.
+"""
+
+import pytest
+from unittest.mock import patch
+
+from app.models.data_models import AppConfig
+from app.services.openai_analysis import OpenAIAnalysisService
+from app.services.prompt_budget import (
+    PromptBudgeter, PromptBudgetConfig, GAP_MARKER, count_tokens
+)
+from app.utils.metrics import get_metrics_collector, reset_metrics_collector
+
+
+HEADER = "ACME Staffing Solutions | Careers Portal"
+FILLER = (
+    "The successful candidate will collaborate with cross-functional teams to deliver "
+    "outcomes aligned with our strategic objectives and values."
+)
+FOOTER = (
+    "© 2024 ACME Staffing Solutions. All rights reserved. ACME is an equal opportunity "
+    "employer and considers all applicants without regard to race, color or religion."
+)
+PAYMENT = "To secure your position, pay a refundable $150 equipment deposit with gift cards."
+CONTACT = "Contact our recruiter on WhatsApp +1 (555) 010-2233 to start today."
+
+
+def long_ad(pages: int = 10) -> str:
+    """Create PDF-like text with repeated headers, footers and filler."""
+    body = []
+    for page in range(pages):
+        body += [HEADER, f"Section {page + 1}: {FILLER.replace('teams', f'team {page}')}"]
+        if page == 4:
+            body.append(PAYMENT)
+        if page == 7:
+            body.append(CONTACT)
+        body.append(FOOTER)
+    return "Remote Data Entry Clerk - ACME Staffing\n" + "\n".join(body)
+
+
+def make_budgeter(budget: int) -> PromptBudgeter:
+    return PromptBudgeter(PromptBudgetConfig(job_text_token_budget=budget))
+
+
+class TestCountTokens:
+    """Test the local token estimate."""
+
+    def test_words_numbers_and_punctuation(self):
+        """Test common pieces count as one token each."""
+        assert count_tokens("Earn $400 a day!") == 6
+        assert count_tokens("") == 0
+
+    def test_long_words_and_other_scripts_count_more(self):
+        """Test long words and non-Latin characters are not undercounted."""
+        assert count_tokens("internationalization") == 3
+        assert count_tokens("高薪工作") == 4
+
+
+class TestPromptBudgeter:
+    """Test PromptBudgeter.fit."""
+
+    def test_text_within_budget_is_unchanged(self):
+        """Test short ads are passed through as they are."""
+        text = "Warehouse associate, $18/hour, apply at acme.example.com"
+        budgeted = make_budgeter(100).fit(text)
+
+        assert budgeted.text == text
+        assert not budgeted.compressed
+
+    def test_disabled_budget_is_unchanged(self):
+        """Test the budget can be switched off."""
+        text = long_ad()
+        budgeter = PromptBudgeter(PromptBudgetConfig(enabled=False, job_text_token_budget=10))
+
+        assert budgeter.fit(text).text == text
+
+    def test_repeated_boilerplate_is_kept_once(self):
+        """Test repeated page headers and footers are removed first."""
+        text = long_ad()
+        budget = count_tokens(text) - 50
+        budgeted = make_budgeter(budget).fit(text)
+
+        assert budgeted.tokens <= budget
+        assert budgeted.text.count(HEADER) == 1
+        assert budgeted.text.count(FOOTER) == 1
+        assert budgeted.duplicates_removed == 18
+        assert budgeted.footers_removed == 0
+
+    def test_footers_are_dropped_unless_they_mention_payment(self):
+        """Test legal footers go, but a footer asking for a fee is kept."""
+        fee_footer = "All rights reserved. Applicants must pay a $50 processing fee."
+        text = long_ad() + "\n" + fee_footer
+        deduplicated = count_tokens(text) - count_tokens("\n".join([HEADER, FOOTER] * 9))
+        budget = deduplicated - 10
+        budgeted = make_budgeter(budget).fit(text)
+
+        assert FOOTER not in budgeted.text
+        assert fee_footer in budgeted.text
+        assert budgeted.footers_removed == 1
+        assert budgeted.segments_dropped == 0
+
+    def test_tight_budget_keeps_scam_signals_in_order(self):
+        """Test payment, pay and contact details survive a tight budget."""
+        budgeted = make_budgeter(80).fit(long_ad())
+        lines = budgeted.text.splitlines()
+
+        assert budgeted.tokens <= 80
+        assert budgeted.segments_dropped > 0
+        assert lines[0] == "Remote Data Entry Clerk - ACME Staffing"
+        assert lines.index(PAYMENT) < lines.index(CONTACT)
+        assert GAP_MARKER in lines
+        assert all(lines[i] != GAP_MARKER or lines[i + 1] != GAP_MARKER for i in range(len(lines) - 1))
+
+    def test_long_lines_are_split_into_sentences(self):
+        """Test one long PDF line is not kept or dropped as a whole."""
+        text = " ".join([FILLER.replace("teams", f"team {i}") for i in range(20)] + [PAYMENT])
+        budgeted = make_budgeter(60).fit(text)
+
+        assert PAYMENT in budgeted.text
+        assert budgeted.tokens <= 60
+
+
+class TestAnalysisPromptBudget:
+    """Test build_analysis_prompt applies the budget and records tokens."""
+
+    @pytest.fixture
+    def service(self):
+        reset_metrics_collector()
+        config = AppConfig(
+            openai_api_key="test_key",
+            twilio_account_sid="test_sid",
+            twilio_auth_token="test_token",
+            twilio_phone_number="+1234567890"
+        )
+        with patch('app.services.openai_analysis.AsyncOpenAI'):
+            return OpenAIAnalysisService(config)
+
+    def test_long_ad_prompt_is_compressed(self, service):
+        """Test a long ad's prompt is smaller and the saving is recorded."""
+        text = long_ad()
+        with patch('app.services.openai_analysis.get_prompt_budgeter', return_value=make_budgeter(120)):
+            prompt = service.build_analysis_prompt(text)
+
+        assert PAYMENT in prompt and CONTACT in prompt
+        assert count_tokens(prompt) < count_tokens(service._format_analysis_prompt(text))
+        summary = get_metrics_collector().get_current_metrics()["prompt_tokens"]
+        assert summary["prompts"] == 1
+        assert summary["tokens_saved"] > 0
+        assert summary["compressed_percent"] == 100.0
+
+    def test_short_ad_prompt_is_unchanged(self, service):
+        """Test short ads get the same prompt as before."""
+        text = "Warehouse associate, $18/hour, apply at acme.example.com"
+        with patch('app.services.openai_analysis.get_prompt_budgeter', return_value=make_budgeter(1500)):
+            prompt = service.build_analysis_prompt(text)
+
+        assert prompt == service._format_analysis_prompt(text)
+        assert get_metrics_collector().get_current_metrics()["prompt_tokens"]["tokens_saved"] == 0
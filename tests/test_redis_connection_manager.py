@@ -238,6 +238,32 @@ class TestRedisConnectionManager:
         assert redis_manager.metrics.failed_requests == 1
         assert redis_manager._fallback_mode is True
     
+    @pytest.mark.asyncio
+    async def test_execute_pipeline_single_round_trip(self, redis_manager):
+        """Test pipelined commands are sent with one execute call."""
+        redis_manager._initialized = True
+        redis_manager._fallback_mode = False
+        
+        mock_pipe = MagicMock()
+        mock_pipe.execute = AsyncMock(return_value=[1, True])
+        mock_redis = AsyncMock()
+        mock_redis.ping = AsyncMock(return_value=True)
+        mock_redis.pipeline = MagicMock(return_value=mock_pipe)
+        redis_manager.primary_client = mock_redis
+        
+        result = await redis_manager.execute_pipeline([
+            ('lpush', 'queue', 'item'),
+            ('setex', 'status', 60, 'pending')
+        ])
+        
+        assert result == [1, True]
+        mock_redis.pipeline.assert_called_once_with(transaction=True)
+        mock_pipe.lpush.assert_called_once_with('queue', 'item')
+        mock_pipe.setex.assert_called_once_with('status', 60, 'pending')
+        mock_pipe.execute.assert_awaited_once()
+        assert redis_manager.metrics.total_requests == 1
+        assert redis_manager.metrics.successful_requests == 1
+    
     @pytest.mark.asyncio
     async def test_execute_command_fallback_mode(self, redis_manager):
         """Test command execution in fallback mode."""
@@ -0,0 +1,140 @@
+"""
+Tests for the compiled scam detection rule engine.
+
+Covers literal prefilter derivation, equivalence with per-pattern re.search
+scoring, rule set validation and hot reloading from a patterns file.
+"""
+
+import json
+import os
+import re
+import pytest
+
+from app.services.scam_rule_engine import (
+    ScamRuleEngine, ScamRuleEngineConfig, CompiledRuleSet, DEFAULT_SCAM_PATTERNS,
+    RULE_CATEGORIES, required_literals
+)
+from tests.fixtures.job_ad_samples import JobAdFixtures
+
+
+def legacy_match(patterns, text):
+    """Score text the way _apply_rule_based_detection did before compilation."""
+    text_lower = text.lower()
+    total_score = 0.0
+    matched = []
+    for category in RULE_CATEGORIES:
+        for pattern_info in patterns.get(category, []):
+            if re.search(pattern_info["pattern"], text_lower, re.IGNORECASE):
+                total_score += pattern_info["weight"]
+                matched.append(pattern_info["description"])
+    return total_score, matched
+
+
+class TestRequiredLiterals:
+    """Test literal prefilter derivation."""
+
+    def test_alternation_literals(self):
+        """Test every branch contributes its most selective literal."""
+        assert set(required_literals(r"(?:urgent|immediate|asap|right\s+away|start\s+today)")) == {
+            "urgent", "immediate", "asap", "right", "start"
+        }
+
+    def test_longest_required_run_is_chosen(self):
+        """Test the most selective required literal is used, not the prefix."""
+        assert required_literals(r"earn\s+\$\d{3,4}\+?\s*(?:per\s+hour|hourly|/hour)") == ("earn",)
+        assert "money" in required_literals(r"(?:alot|a\s+lot\s+of\s+money|guarenteed|guarentee)")
+
+    def test_optional_parts_are_not_required(self):
+        """Test optional or unconstrained patterns get no prefilter."""
+        assert required_literals(r"(?:foo)?\d+") is None
+        assert required_literals(r"[a-z]+\s\d") is None
+
+
+class TestCompiledRuleSet:
+    """Test compiled matching against the per-pattern baseline."""
+
+    @pytest.mark.parametrize("text", [
+        sample.content for sample in JobAdFixtures.get_all_samples()
+    ] + [
+        "Earn $5000 per week from home!",
+        "Great opportunity! Just pay $199 training fee to start.",
+        "Bachelor's degree required. Health insurance and 401k provided.",
+        "LEARN $500 PER HOUR, WhatsApp ONLY, visit WWW.EXAMPLE.COM",
+        ""
+    ])
+    def test_matches_per_pattern_search(self, text):
+        """Test scores and matched descriptions equal the uncompiled loop."""
+        score, matched = CompiledRuleSet(DEFAULT_SCAM_PATTERNS).match(text.lower())
+        legacy_score, legacy_matched = legacy_match(DEFAULT_SCAM_PATTERNS, text)
+
+        assert matched == legacy_matched
+        assert score == pytest.approx(legacy_score)
+
+    def test_uppercase_patterns_keep_ignorecase(self):
+        """Test patterns written with uppercase literals still match lowercased text."""
+        rule_set = CompiledRuleSet({"high_risk_indicators": [
+            {"pattern": r"Western\s+Union", "weight": 0.9, "description": "Wire transfer"},
+            {"pattern": r"[A-Z]{3}\d", "weight": 0.1, "description": "Code"}
+        ]})
+
+        assert rule_set.match("pay via western union abc1") == (pytest.approx(1.0), ["Wire transfer", "Code"])
+
+    def test_invalid_rules_are_rejected(self):
+        """Test bad regexes, missing keys and unknown categories raise ValueError."""
+        with pytest.raises(ValueError):
+            CompiledRuleSet({"high_risk_indicators": [{"pattern": "(", "weight": 1, "description": "x"}]})
+        with pytest.raises(ValueError):
+            CompiledRuleSet({"high_risk_indicators": [{"pattern": "x", "description": "x"}]})
+        with pytest.raises(ValueError):
+            CompiledRuleSet({"critical_indicators": []})
+
+
+class TestHotReload:
+    """Test rule sets reload from a patterns file without a restart."""
+
+    @pytest.fixture
+    def patterns_file(self, tmp_path):
+        path = tmp_path / "scam_patterns.json"
+        path.write_text(json.dumps({"high_risk_indicators": [
+            {"pattern": r"gift\s+cards?", "weight": 0.9, "description": "Gift card payment"}
+        ]}))
+        return path
+
+    def bump(self, path, content):
+        """Rewrite a file with a strictly newer modification time."""
+        mtime = os.stat(path).st_mtime
+        path.write_text(content)
+        os.utime(path, (mtime + 1, mtime + 1))
+
+    def test_loads_patterns_file(self, patterns_file):
+        """Test the configured file replaces the default rules."""
+        engine = ScamRuleEngine(ScamRuleEngineConfig(patterns_path=str(patterns_file)))
+
+        assert engine.match("Pay with GIFT CARDS") == (pytest.approx(0.9), ["Gift card payment"])
+        assert engine.match("Urgent start today")[1] == []
+
+    def test_changed_file_is_reloaded(self, patterns_file):
+        """Test an edited file takes effect on the next check."""
+        engine = ScamRuleEngine(ScamRuleEngineConfig(patterns_path=str(patterns_file), reload_interval=0))
+        self.bump(patterns_file, json.dumps({"medium_risk_indicators": [
+            {"pattern": r"crypto\s+wallet", "weight": 0.5, "description": "Crypto wallet"}
+        ]}))
+
+        assert engine.match("send to my crypto wallet")[1] == ["Crypto wallet"]
+        assert engine.get_stats()['reloads'] == 2
+
+    def test_invalid_file_keeps_active_rules(self, patterns_file):
+        """Test a broken edit is reported once and the previous rules stay active."""
+        engine = ScamRuleEngine(ScamRuleEngineConfig(patterns_path=str(patterns_file), reload_interval=0))
+        self.bump(patterns_file, json.dumps({"high_risk_indicators": [{"pattern": "(", "weight": 1, "description": "x"}]}))
+
+        assert engine.match("gift card")[1] == ["Gift card payment"]
+        assert engine.match("gift card")[1] == ["Gift card payment"]
+        assert engine.get_stats()['reload_errors'] == 1
+
+    def test_missing_file_falls_back_to_defaults(self, tmp_path):
+        """Test a missing patterns file leaves the default rules active."""
+        engine = ScamRuleEngine(ScamRuleEngineConfig(patterns_path=str(tmp_path / "missing.json")))
+
+        assert engine.patterns is DEFAULT_SCAM_PATTERNS
+        assert engine.get_stats()['reload_errors'] == 1
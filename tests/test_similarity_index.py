@@ -0,0 +1,150 @@
+"""
+Tests for the incremental near-duplicate similarity index.
+
+Covers hashed vectorization, add/remove bookkeeping, posting compaction,
+threshold queries and the EnhancedAIAnalysisService history integration.
+"""
+
+import pytest
+from unittest.mock import patch
+
+from app.services.similarity_index import HashedSimilarityIndex, MIN_COMPACTION_SIZE
+from app.services.enhanced_ai_analysis import EnhancedAIAnalysisService
+from app.models.data_models import AppConfig, JobAnalysisResult, JobClassification
+
+
+JOB_AD = """
+Senior Software Engineer Position. We are seeking a qualified software engineer
+with Python experience, distributed systems background and strong communication
+skills. Competitive salary, health insurance and remote flexibility.
+"""
+
+SCAM_AD = """
+URGENT!!! Work from home and earn $5000 per week guaranteed. No experience
+needed. Send a $99 registration fee via Western Union to secure your position.
+"""
+
+
+def make_result(trust_score: int = 85) -> JobAnalysisResult:
+    """Create an analysis result for history tests."""
+    return JobAnalysisResult(
+        trust_score=trust_score,
+        classification=JobClassification.LEGIT,
+        reasons=["Reason 1", "Reason 2", "Reason 3"],
+        confidence=0.9
+    )
+
+
+class TestHashedSimilarityIndex:
+    """Test HashedSimilarityIndex behavior."""
+
+    def test_vectorize_is_normalized_and_stable(self):
+        """Test vectors are unit length and identical across instances."""
+        vector = HashedSimilarityIndex().vectorize(JOB_AD)
+
+        assert vector == HashedSimilarityIndex().vectorize(JOB_AD)
+        assert sum(weight * weight for weight in vector.values()) == pytest.approx(1.0)
+        assert HashedSimilarityIndex().vectorize("the and of") == {}
+
+    def test_query_finds_near_duplicate(self):
+        """Test a lightly edited ad matches its original above the threshold."""
+        index = HashedSimilarityIndex()
+        index.add("job", JOB_AD)
+        index.add("scam", SCAM_AD)
+
+        matches = index.query(JOB_AD.replace("Senior", "Junior"), k=1, min_similarity=0.75)
+
+        assert [key for key, _ in matches] == ["job"]
+        assert 0.75 <= matches[0][1] <= 1.0
+        assert index.query("Completely different posting about cooking pasta", min_similarity=0.75) == []
+
+    def test_query_orders_top_k(self):
+        """Test results are ordered by similarity and limited to k."""
+        index = HashedSimilarityIndex()
+        index.add("exact", JOB_AD)
+        index.add("partial", JOB_AD[:len(JOB_AD) // 2])
+        index.add("scam", SCAM_AD)
+
+        matches = index.query(JOB_AD, k=2)
+
+        assert [key for key, _ in matches] == ["exact", "partial"]
+        assert matches[0][1] == pytest.approx(1.0, abs=1e-5)
+        assert matches[1][1] < matches[0][1]
+
+    def test_remove_and_slot_reuse(self):
+        """Test removed documents never match, even after their slot is reused."""
+        index = HashedSimilarityIndex()
+        index.add("job", JOB_AD)
+        assert index.remove("job") is True
+        assert index.remove("job") is False
+
+        index.add("scam", SCAM_AD)
+
+        assert "job" not in index
+        assert len(index) == 1
+        assert index.query(JOB_AD, min_similarity=0.5) == []
+        assert [key for key, _ in index.query(SCAM_AD)] == ["scam"]
+
+    def test_replacing_key_reindexes(self):
+        """Test adding an existing key replaces its vector."""
+        index = HashedSimilarityIndex()
+        index.add("ad", JOB_AD)
+        index.add("ad", SCAM_AD)
+
+        assert len(index) == 1
+        assert index.query(JOB_AD, min_similarity=0.5) == []
+        assert [key for key, _ in index.query(SCAM_AD)] == ["ad"]
+
+    def test_stale_postings_are_compacted(self):
+        """Test evictions do not let posting lists grow without bound."""
+        index = HashedSimilarityIndex()
+        for i in range(MIN_COMPACTION_SIZE * 10):
+            index.add(i, f"{JOB_AD} posting number{i}")
+            if i >= MIN_COMPACTION_SIZE:
+                index.remove(i - MIN_COMPACTION_SIZE)
+
+        stats = index.get_stats()
+        assert stats['documents'] == MIN_COMPACTION_SIZE
+        assert stats['postings'] - stats['stale_postings'] == sum(
+            len(index.vectorize(f"{JOB_AD} posting number{i}"))
+            for i in range(MIN_COMPACTION_SIZE * 9, MIN_COMPACTION_SIZE * 10)
+        )
+        assert stats['stale_postings'] <= stats['postings'] // 2
+
+
+class TestAnalysisHistoryIndex:
+    """Test the analysis history keeps the similarity index in sync."""
+
+    @pytest.fixture
+    def service(self):
+        config = AppConfig(
+            openai_api_key="test_key",
+            twilio_account_sid="test_sid",
+            twilio_auth_token="test_token",
+            twilio_phone_number="test_phone"
+        )
+        with patch('app.services.enhanced_ai_analysis.AsyncOpenAI'):
+            return EnhancedAIAnalysisService(config)
+
+    @pytest.mark.asyncio
+    async def test_similar_ad_uses_history(self, service):
+        """Test a near-duplicate returns the latest historical result."""
+        service._add_to_analysis_history(JOB_AD, make_result(80))
+        service._add_to_analysis_history(JOB_AD, make_result(90))
+
+        result = await service._check_similar_job_ads(JOB_AD.replace("Senior", "Junior"))
+
+        assert result is not None
+        assert result[0].trust_score == 90
+        assert result[1] >= service.similarity_threshold
+
+    @pytest.mark.asyncio
+    async def test_eviction_removes_from_index(self, service):
+        """Test evicted history entries are removed from the index without a refit."""
+        service.analysis_history_max_size = 1
+        service._add_to_analysis_history(JOB_AD, make_result())
+        service._add_to_analysis_history(SCAM_AD, make_result(10))
+
+        assert len(service.similarity_index) == 1
+        assert await service._check_similar_job_ads(JOB_AD) is None
+        assert (await service._check_similar_job_ads(SCAM_AD))[0].trust_score == 10
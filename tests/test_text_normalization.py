@@ -0,0 +1,160 @@
+"""
+Tests for job text normalization.
+
+Covers the canonical form (Unicode, invisible characters, emoji, URLs,
+contact masking), digest reuse, the analysis cache key and the way
+EnhancedAIAnalysisService threads one normalization through its stages.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.utils.text_normalization import NormalizedText, canonicalize, normalize_job_text, text_digest
+from app.services.caching_service import CacheKey
+from app.services.analysis_coalescer import AnalysisCoalescer, AnalysisCoalescerConfig
+from app.services.enhanced_ai_analysis import EnhancedAIAnalysisService
+from app.models.data_models import AppConfig, JobAnalysisResult, JobClassification
+
+
+SCAM_AD = """
+URGENT!!! Work from home and earn $5000 per week guaranteed. No experience
+needed. Pay the $99 training fee today. WhatsApp only: +1 (555) 123-4567
+Apply: https://bit.ly/job-offer?utm_source=whatsapp&ref=8812
+"""
+
+
+class TestCanonicalize:
+    """Test the canonical form of job text."""
+
+    def test_collapses_whitespace_and_case(self):
+        """Test spacing and case differences disappear."""
+        assert canonicalize("  Data ENTRY\n\n\tClerk  ") == "data entry clerk"
+
+    def test_folds_unicode_and_strips_invisible_characters(self):
+        """Test full-width letters fold and zero-width characters vanish."""
+        assert canonicalize("\uff35\uff32\uff27\uff25\uff2e\uff34 up\u200bfront\u2060 fee") == "urgent upfront fee"
+
+    def test_emoji_become_spaces(self):
+        """Test emoji never glue neighbouring words together."""
+        assert canonicalize("Work\U0001f3e0from home \U0001f4b0\U0001f4b0 now \u2705") == "work from home now"
+
+    def test_strips_url_query_and_fragment(self):
+        """Test tracking parameters are dropped but the link path is kept."""
+        assert canonicalize("Apply https://jobs.example.com/apply?utm_source=wa#top now") == \
+            "apply https://jobs.example.com/apply now"
+        assert canonicalize("Interested? Reply today") == "interested? reply today"
+
+    def test_masks_phone_numbers_and_emails(self):
+        """Test rotated contact details map to the same text."""
+        first = canonicalize("Call +1 (555) 123-4567 or email hr.team@gmail.com")
+        second = canonicalize("Call 0791 112 3456 or email jobs99@yahoo.co.uk")
+
+        assert first == second == "call <phone> or email <email>"
+
+    def test_keeps_amounts_and_short_numbers(self):
+        """Test salaries, decimals and benefit names are not mistaken for phones."""
+        text = "Earn $1,250,000 yearly, 3.5% bonus, 401k and 40 hours"
+
+        assert canonicalize(text) == text.lower()
+
+    def test_masks_long_digit_runs_and_grouped_numbers(self):
+        """Test unseparated and locally grouped phone numbers are masked."""
+        assert canonicalize("WhatsApp 08031234567 or 555-123-4567") == "whatsapp <phone> or <phone>"
+
+    @pytest.mark.parametrize("text", [
+        "Salary 15000-20000 per month",
+        "Earn 1500000 naira monthly",
+        "ref 2024-10-16, start 16.10.2024",
+        "Bonus of 1 500 000 paid yearly"
+    ])
+    def test_keeps_ranges_dates_and_plain_amounts(self, text):
+        """Test salary ranges, dates and amounts are not mistaken for phones."""
+        assert canonicalize(text) == text.lower()
+
+    def test_ads_differing_in_pay_stay_distinct(self):
+        """Test ads that differ only in salary do not share a canonical form."""
+        assert canonicalize("Salary 15000-20000 per month") != canonicalize("Salary 150000-200000 per month")
+
+
+class TestNormalizeJobText:
+    """Test NormalizedText construction and reuse."""
+
+    def test_digest_is_shared_by_forwarded_copies(self):
+        """Test surface edits of one ad share a digest and other ads do not."""
+        forwarded = "\U0001f525 " + SCAM_AD.upper().replace("8812", "4410").replace("123-4567", "987-6543")
+
+        assert text_digest(forwarded) == text_digest(SCAM_AD)
+        assert text_digest(SCAM_AD.replace("$99", "$199")) != text_digest(SCAM_AD)
+
+    def test_existing_normalization_is_returned_unchanged(self):
+        """Test stages reuse the caller's normalization instead of recomputing it."""
+        normalized = normalize_job_text(SCAM_AD)
+
+        assert normalize_job_text(normalized) is normalized
+        assert normalized.original == SCAM_AD
+        assert normalize_job_text(None) == NormalizedText(original="", canonical="", digest=text_digest(""))
+
+    def test_cache_key_uses_canonical_text(self):
+        """Test the analysis cache key ignores surface differences."""
+        assert CacheKey.analysis_result(SCAM_AD) == CacheKey.analysis_result("  " + SCAM_AD.lower())
+        assert CacheKey.analysis_result(normalize_job_text(SCAM_AD)) == CacheKey.analysis_result(SCAM_AD)
+        assert CacheKey.analysis_result(SCAM_AD).startswith("analysis:")
+
+
+class TestEnhancedServiceNormalization:
+    """Test EnhancedAIAnalysisService uses one normalization per message."""
+
+    @pytest.fixture
+    def service(self):
+        config = AppConfig(
+            openai_api_key="test_key",
+            twilio_account_sid="test_sid",
+            twilio_auth_token="test_token",
+            twilio_phone_number="test_phone"
+        )
+        with patch('app.services.enhanced_ai_analysis.AsyncOpenAI'):
+            service = EnhancedAIAnalysisService(config)
+        service.coalescer = AnalysisCoalescer(AnalysisCoalescerConfig(distributed=False))
+        service.near_duplicate_store.lookup = AsyncMock(return_value=None)
+        service.near_duplicate_store.record = AsyncMock()
+        return service
+
+    @pytest.mark.asyncio
+    async def test_model_sees_original_text_and_lookups_see_canonical(self, service):
+        """Test the prompt keeps contact details while lookups use the canonical form."""
+        result = JobAnalysisResult(
+            trust_score=10,
+            classification=JobClassification.LIKELY_SCAM,
+            reasons=["Upfront fee", "Urgency", "Messaging-only contact"],
+            confidence=0.9
+        )
+        service._analyze_with_model = AsyncMock(return_value=result)
+        service.rule_engine.match = MagicMock(return_value=(0.0, []))
+        normalized = normalize_job_text(SCAM_AD)
+
+        with patch('app.services.enhanced_ai_analysis.normalize_job_text', wraps=normalize_job_text) as normalize:
+            await service.analyze_job_ad(SCAM_AD, normalized=normalized)
+
+        assert service._analyze_with_model.call_args[0][0] == SCAM_AD
+        service.rule_engine.match.assert_called_once_with(normalized.canonical)
+        service.near_duplicate_store.lookup.assert_called_once_with(normalized.canonical)
+        assert all(call.args[0] is normalized for call in normalize.call_args_list)
+        assert list(service.analysis_history) == [normalized.canonical[:1000]]
+
+    @pytest.mark.asyncio
+    async def test_forwarded_copy_hits_history(self, service):
+        """Test an emoji-laden copy with a new phone number reuses the verdict."""
+        result = JobAnalysisResult(
+            trust_score=15,
+            classification=JobClassification.LIKELY_SCAM,
+            reasons=["Reason 1", "Reason 2", "Reason 3"],
+            confidence=0.9
+        )
+        service._add_to_analysis_history(SCAM_AD, result)
+
+        similar = await service._check_similar_job_ads(
+            "\u2705\u2705 " + SCAM_AD.replace("123-4567", "765-4321") + " \U0001f4b0"
+        )
+
+        assert similar is not None
+        assert similar[1] == pytest.approx(1.0)
@@ -213,6 +213,17 @@ class TestTwilioResponseService:
         assert "Requests personal financial information" in message
         assert "may be a scam" in message
     
+    def test_format_revision_message(self, mock_config, scam_analysis_result):
+        """Test a revised verdict is framed as a correction rather than a new result."""
+        service = TwilioResponseService(mock_config)
+        message = service._format_revision_message(scam_analysis_result)
+        
+        assert message.startswith("🔄 *Verdict Revised*")
+        assert "Job Analysis Result" not in message
+        assert "*Trust Score:* 15/100" in message
+        assert "*Classification:* Likely Scam" in message
+        assert "Requests personal financial information" in message
+    
     def test_get_error_message_pdf_processing(self, mock_config):
         """Test PDF processing error message."""
         service = TwilioResponseService(mock_config)
@@ -0,0 +1,240 @@
+"""
+Tests for the async outbound Twilio sender.
+
+The Twilio API is replaced by an httpx MockTransport, and time by a fake
+clock advanced by the sender's own sleeps, so governor waits and 429
+backoff are exact.
+"""
+
+import asyncio
+import pytest
+from urllib.parse import parse_qs
+from unittest.mock import patch
+
+import httpx
+from twilio.base.exceptions import TwilioRestException
+
+from app.models.data_models import AppConfig, JobAnalysisResult, JobClassification
+from app.services.twilio_response import TwilioResponseService
+from app.services.twilio_sender import (
+    TWILIO_API_URL, OutboundQueueFullError, TwilioSender, TwilioSenderConfig
+)
+
+
+FROM_NUMBER = "whatsapp:+1234567890"
+TO_NUMBER = "whatsapp:+1987654321"
+
+
+class FakeClock:
+    """Monotonic clock advanced by the sender's own sleeps."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def accepted(request: httpx.Request) -> httpx.Response:
+    """Twilio's response to an accepted message."""
+    return httpx.Response(201, json={"sid": f"SM{len(request.content):032d}", "status": "queued"})
+
+
+def make_sender(handler, clock: FakeClock, **overrides) -> TwilioSender:
+    """Create a sender on the fake clock whose requests go to handler."""
+    sender = TwilioSender(
+        "AC123", "token", TwilioSenderConfig(**overrides),
+        clock=clock, sleep=clock.sleep, jitter=lambda low, high: high
+    )
+    sender._client = httpx.AsyncClient(
+        base_url=f"{TWILIO_API_URL}/Accounts/AC123",
+        auth=httpx.BasicAuth("AC123", "token"),
+        transport=httpx.MockTransport(handler)
+    )
+    return sender
+
+
+class TestTwilioSender:
+    """Test TwilioSender."""
+
+    @pytest.mark.asyncio
+    async def test_send_posts_message(self):
+        """Test a message is posted as a form to the account's Messages resource."""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return accepted(request)
+
+        sender = make_sender(handler, FakeClock())
+        message = await sender.send(FROM_NUMBER, TO_NUMBER, "Trust Score: 12/100")
+
+        assert message.sid.startswith("SM")
+        assert message.status == "queued"
+        request = requests[0]
+        assert request.method == "POST"
+        assert str(request.url) == f"{TWILIO_API_URL}/Accounts/AC123/Messages.json"
+        assert request.headers["authorization"].startswith("Basic ")
+        assert parse_qs(request.content.decode()) == {
+            "From": [FROM_NUMBER], "To": [TO_NUMBER], "Body": ["Trust Score: 12/100"]
+        }
+        assert sender.get_stats()["sent"] == 1
+
+    @pytest.mark.asyncio
+    async def test_sender_number_is_held_to_its_rate(self):
+        """Test sends beyond the burst wait for the sender number's bucket only."""
+        clock = FakeClock()
+        sender = make_sender(accepted, clock, messages_per_second=2.0, burst=2)
+
+        for _ in range(3):
+            await sender.send(FROM_NUMBER, TO_NUMBER, "Hello")
+        await sender.send("whatsapp:+1555000111", TO_NUMBER, "Hello")
+
+        assert clock.sleeps == [0.5]
+        stats = sender.get_stats()
+        assert stats["waits"] == 1
+        assert stats["wait_seconds"] == 0.5
+        assert stats["sender_numbers"] == 2
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_send_is_retried_with_backoff(self):
+        """Test a 429 is retried after the larger of Retry-After and the jittered backoff."""
+        clock = FakeClock()
+        responses = [
+            httpx.Response(429, headers={"retry-after": "1"}, json={"code": 20429, "message": "Too Many Requests"}),
+            httpx.Response(429, json={"code": 20429, "message": "Too Many Requests"}),
+        ]
+
+        def handler(request):
+            return responses.pop(0) if responses else accepted(request)
+
+        sender = make_sender(handler, clock, backoff_base=0.25)
+        message = await sender.send(FROM_NUMBER, TO_NUMBER, "Hello")
+
+        assert message.sid.startswith("SM")
+        assert clock.sleeps == [1.0, 0.5]
+        stats = sender.get_stats()
+        assert stats["rate_limited"] == 2
+        assert stats["sent"] == 1
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_pauses_the_sender_number(self):
+        """Test the next message from a rate limited number waits for the pause."""
+        clock = FakeClock()
+        responses = [httpx.Response(429, headers={"retry-after": "2"})]
+
+        def handler(request):
+            return responses.pop(0) if responses else accepted(request)
+
+        sender = make_sender(handler, clock, max_retries=0)
+        with pytest.raises(TwilioRestException):
+            await sender.send(FROM_NUMBER, TO_NUMBER, "First")
+        await sender.send(FROM_NUMBER, TO_NUMBER, "Second")
+
+        assert clock.sleeps == [2.0]
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_retries_are_bounded(self):
+        """Test a message still rate limited after max_retries fails with the 429."""
+        clock = FakeClock()
+        sender = make_sender(lambda request: httpx.Response(429, json={"code": 20429}), clock, max_retries=2)
+
+        with pytest.raises(TwilioRestException) as exc_info:
+            await sender.send(FROM_NUMBER, TO_NUMBER, "Hello")
+
+        assert exc_info.value.status == 429
+        assert len(clock.sleeps) == 2
+        assert sender.get_stats()["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_rejected_message_raises_twilio_error(self):
+        """Test API errors are raised like the SDK raises them."""
+        sender = make_sender(lambda request: httpx.Response(
+            400, json={"code": 21211, "message": "Invalid 'To' Phone Number", "status": 400}
+        ), FakeClock())
+
+        with pytest.raises(TwilioRestException) as exc_info:
+            await sender.send(FROM_NUMBER, "whatsapp:+1", "Hello")
+
+        assert exc_info.value.status == 400
+        assert exc_info.value.code == 21211
+
+    @pytest.mark.asyncio
+    async def test_full_queue_fails_fast(self):
+        """Test sends beyond max_queue_size fail without waiting."""
+        release = asyncio.Event()
+
+        async def slow_api(request):
+            await release.wait()
+            return accepted(request)
+
+        sender = make_sender(None, FakeClock(), max_queue_size=1)
+        sender._client = httpx.AsyncClient(
+            base_url=f"{TWILIO_API_URL}/Accounts/AC123", transport=httpx.MockTransport(slow_api)
+        )
+        first = asyncio.create_task(sender.send(FROM_NUMBER, TO_NUMBER, "First"))
+        await asyncio.sleep(0.01)
+
+        with pytest.raises(OutboundQueueFullError):
+            await sender.send(FROM_NUMBER, TO_NUMBER, "Second")
+        release.set()
+        await first
+
+        stats = sender.get_stats()
+        assert stats["queue_full"] == 1
+        assert stats["queued"] == 0
+
+
+class TestTwilioResponseServiceSends:
+    """Test TwilioResponseService sends through the sender."""
+
+    @pytest.fixture
+    def service(self):
+        service = TwilioResponseService(AppConfig(
+            openai_api_key="test-key",
+            twilio_account_sid="AC123",
+            twilio_auth_token="token",
+            twilio_phone_number="+1234567890"
+        ))
+        self.bodies = []
+
+        def handler(request):
+            self.bodies.append(parse_qs(request.content.decode())["Body"][0])
+            return accepted(request)
+
+        service.sender = make_sender(handler, FakeClock())
+        return service
+
+    @pytest.mark.asyncio
+    async def test_sends_do_not_use_threads(self, service):
+        """Test every send goes through the async sender, not the thread pool."""
+        result = JobAnalysisResult(
+            trust_score=12,
+            classification=JobClassification.LIKELY_SCAM,
+            reasons=["Upfront fee", "Unrealistic pay", "Pressure to act now"],
+            confidence=0.9
+        )
+
+        with patch('asyncio.to_thread', side_effect=AssertionError("thread used")):
+            assert await service.send_analysis_result(TO_NUMBER, result) is True
+            assert await service.send_error_message(TO_NUMBER, "pdf_processing") is True
+            assert await service.send_welcome_message(TO_NUMBER) is True
+
+        assert "*Trust Score:* 12/100" in self.bodies[0]
+        assert "PDF Processing Error" in self.bodies[1]
+        assert "Welcome to Reality Checker" in self.bodies[2]
+
+    @pytest.mark.asyncio
+    async def test_rejected_send_returns_false(self, service):
+        """Test a rejected message is reported as a failed send."""
+        service.sender._client = httpx.AsyncClient(
+            base_url=f"{TWILIO_API_URL}/Accounts/AC123",
+            transport=httpx.MockTransport(lambda request: httpx.Response(401, json={"code": 20003}))
+        )
+
+        assert await service.send_error_message(TO_NUMBER) is False
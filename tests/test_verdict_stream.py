@@ -0,0 +1,270 @@
+"""
+Tests for early verdicts from streamed analysis completions.
+
+Covers incremental verdict parsing, the streaming path of
+EnhancedAIAnalysisService and the early reply in MessageHandlerService.
+"""
+
+import asyncio
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+from app.models.data_models import AppConfig, JobAnalysisResult, JobClassification
+from app.services.verdict_stream import EarlyVerdict, VerdictStreamParser
+from app.services.analysis_coalescer import AnalysisCoalescer, AnalysisCoalescerConfig
+from app.services.enhanced_ai_analysis import EnhancedAIAnalysisService
+from app.services.message_handler import MessageHandlerService
+from app.utils.metrics import get_metrics_collector, reset_metrics_collector
+
+
+SCAM_AD = """
+Earn $400 a day reposting ads from home! No experience needed.
+Message our recruiter on Telegram to get started today.
+"""
+
+RESPONSE = json.dumps({
+    "trust_score": 12,
+    "classification": "Likely Scam",
+    "confidence": 0.88,
+    "reasons": [
+        "Unrealistic daily pay for unskilled work",
+        "Recruitment only through Telegram",
+        "No company name or verifiable details"
+    ]
+}, indent=4)
+
+
+@pytest.fixture
+def config():
+    return AppConfig(
+        openai_api_key="test_key",
+        twilio_account_sid="test_sid",
+        twilio_auth_token="test_token",
+        twilio_phone_number="+1234567890"
+    )
+
+
+def make_result(trust_score: int = 12, classification=JobClassification.LIKELY_SCAM) -> JobAnalysisResult:
+    """Create the complete analysis result for RESPONSE."""
+    return JobAnalysisResult(
+        trust_score=trust_score,
+        classification=classification,
+        reasons=json.loads(RESPONSE)["reasons"],
+        confidence=0.88
+    )
+
+
+def make_stream(text: str, chunk_size: int = 7):
+    """Create a streamed raw response that yields text in small deltas."""
+    async def chunks():
+        for start in range(0, len(text), chunk_size):
+            chunk = MagicMock()
+            chunk.choices = [MagicMock()]
+            chunk.choices[0].delta.content = text[start:start + chunk_size]
+            streamed.append(start + chunk_size)
+            yield chunk
+
+    streamed = []
+    raw_response = MagicMock()
+    raw_response.headers = {}
+    raw_response.parse.return_value = chunks()
+    return raw_response, streamed
+
+
+class TestVerdictStreamParser:
+    """Test incremental parsing of the verdict fields."""
+
+    def test_verdict_is_reported_before_reasons(self):
+        """Test the verdict arrives once confidence is complete, before any reason."""
+        parser = VerdictStreamParser()
+        verdicts = [(len(parser.text), verdict) for verdict in
+                    (parser.feed(RESPONSE[i:i + 5]) for i in range(0, len(RESPONSE), 5)) if verdict]
+
+        assert len(verdicts) == 1
+        offset, verdict = verdicts[0]
+        assert verdict == EarlyVerdict(12, JobClassification.LIKELY_SCAM, 0.88)
+        assert offset < RESPONSE.index("Unrealistic")
+        assert parser.text == RESPONSE
+
+    def test_incomplete_number_is_not_reported(self):
+        """Test a trust score cut mid-number does not produce a verdict."""
+        parser = VerdictStreamParser()
+
+        assert parser.feed('{"classification": "Legit", "confidence": 0.9, "trust_score": 8') is None
+        verdict = parser.feed('5,')
+
+        assert verdict.trust_score == 85
+
+    def test_invalid_fields_are_not_reported(self):
+        """Test unknown classifications and out-of-range scores are ignored."""
+        parser = VerdictStreamParser()
+
+        assert parser.feed('{"trust_score": 12, "classification": "Scam", "confidence": 0.9,') is None
+        assert parser.feed('{"trust_score": 150, "classification": "Legit", "confidence": 0.9,') is None
+
+
+class TestStreamingAnalysis:
+    """Test EnhancedAIAnalysisService with an on_verdict callback."""
+
+    @pytest.fixture
+    def service(self, config):
+        with patch('app.services.enhanced_ai_analysis.AsyncOpenAI'):
+            service = EnhancedAIAnalysisService(config)
+        service.client = MagicMock()
+        service.coalescer = AnalysisCoalescer(AnalysisCoalescerConfig(distributed=False))
+        service.near_duplicate_store.lookup = AsyncMock(return_value=None)
+        service.near_duplicate_store.record = AsyncMock()
+        return service
+
+    @pytest.mark.asyncio
+    async def test_verdict_reported_while_stream_is_open(self, service):
+        """Test on_verdict runs before the reasons are streamed."""
+        raw_response, streamed = make_stream(RESPONSE)
+        service.client.chat.completions.with_raw_response.create = AsyncMock(return_value=raw_response)
+        service.rule_engine.match = MagicMock(return_value=(0.0, []))
+        reported = []
+
+        async def on_verdict(verdict):
+            reported.append((verdict, streamed[-1]))
+
+        result = await service.analyze_job_ad(SCAM_AD, on_verdict=on_verdict)
+
+        assert len(reported) == 1
+        verdict, streamed_chars = reported[0]
+        assert (verdict.trust_score, verdict.classification) == (result.trust_score, result.classification)
+        assert streamed_chars < RESPONSE.index("Unrealistic")
+        assert service.client.chat.completions.with_raw_response.create.call_args.kwargs["stream"] is True
+
+    @pytest.mark.asyncio
+    async def test_verdict_is_combined_with_rule_result(self, service):
+        """Test the early verdict matches the final result after rule weighting."""
+        raw_response, _ = make_stream(
+            RESPONSE.replace('"trust_score": 12', '"trust_score": 40').replace('"Likely Scam"', '"Suspicious"')
+        )
+        service.client.chat.completions.with_raw_response.create = AsyncMock(return_value=raw_response)
+        service._apply_rule_based_detection = MagicMock(return_value=JobAnalysisResult(
+            trust_score=5,
+            classification=JobClassification.LIKELY_SCAM,
+            reasons=["Rule 1", "Rule 2", "Rule 3"],
+            confidence=0.8
+        ))
+        reported = []
+
+        async def on_verdict(verdict):
+            reported.append(verdict)
+
+        result = await service.analyze_job_ad(SCAM_AD, on_verdict=on_verdict)
+
+        assert (reported[0].trust_score, reported[0].classification) == (result.trust_score, result.classification)
+        assert result.classification == JobClassification.LIKELY_SCAM
+
+    @pytest.mark.asyncio
+    async def test_without_callback_request_is_not_streamed(self, service):
+        """Test callers that do not ask for a verdict keep the single response path."""
+        service._request_completion = AsyncMock(return_value=RESPONSE)
+        service._request_streaming_completion = AsyncMock()
+        service.rule_engine.match = MagicMock(return_value=(0.0, []))
+
+        await service.analyze_job_ad(SCAM_AD)
+
+        service._request_completion.assert_awaited_once()
+        service._request_streaming_completion.assert_not_called()
+
+
+class TestEarlyReply:
+    """Test MessageHandlerService sends the verdict before the findings."""
+
+    @pytest.fixture
+    def handler(self, config):
+        reset_metrics_collector()
+        twilio_service = Mock()
+        twilio_service.send_verdict = AsyncMock(return_value=True)
+        twilio_service.send_analysis_details = AsyncMock(return_value=True)
+        twilio_service.send_analysis_result = AsyncMock(return_value=True)
+        twilio_service.send_verdict_revision = AsyncMock(return_value=True)
+        twilio_service.create_message = AsyncMock()
+        user_service = Mock()
+        user_service.is_user_blocked = AsyncMock(return_value=False)
+        user_service.record_interaction = AsyncMock()
+        return MessageHandlerService(
+            config, twilio_service=twilio_service, pdf_service=Mock(),
+            openai_service=Mock(), user_service=user_service
+        )
+
+    def analyze_with_verdict(self, verdict, result):
+        async def analyze_job_ad(text, normalized=None, on_verdict=None):
+            await on_verdict(verdict)
+            await asyncio.sleep(0.01)  # reasons still streaming
+            return result
+        return analyze_job_ad
+
+    @pytest.mark.asyncio
+    async def test_verdict_then_findings(self, handler):
+        """Test a streamed verdict is sent first and only the findings follow."""
+        result = make_result()
+        handler.openai_service.analyze_job_ad = self.analyze_with_verdict(
+            EarlyVerdict(12, JobClassification.LIKELY_SCAM, 0.88), result
+        )
+
+        assert await handler.handle_text_message(SCAM_AD, "whatsapp:+1987654321") is True
+
+        handler.twilio_service.send_verdict.assert_awaited_once()
+        handler.twilio_service.send_analysis_details.assert_awaited_once_with("whatsapp:+1987654321", result)
+        handler.twilio_service.send_analysis_result.assert_not_called()
+        summary = get_metrics_collector().get_current_metrics()["time_to_first_verdict"]
+        assert summary["total"] == 1
+        assert summary["early_percent"] == 100.0
+
+    @pytest.mark.asyncio
+    async def test_changed_verdict_sends_revision(self, handler):
+        """Test a final verdict that differs from the early one is sent as a revision, not a second verdict."""
+        result = make_result(trust_score=40, classification=JobClassification.SUSPICIOUS)
+        handler.openai_service.analyze_job_ad = self.analyze_with_verdict(
+            EarlyVerdict(12, JobClassification.LIKELY_SCAM, 0.88), result
+        )
+
+        await handler.handle_text_message(SCAM_AD, "whatsapp:+1987654321")
+
+        handler.twilio_service.send_verdict_revision.assert_awaited_once_with("whatsapp:+1987654321", result)
+        handler.twilio_service.send_analysis_result.assert_not_called()
+        handler.twilio_service.send_analysis_details.assert_not_called()
+        assert get_metrics_collector().get_current_metrics()["time_to_first_verdict"]["total"] == 1
+
+    @pytest.mark.asyncio
+    async def test_timeout_after_verdict_skips_apology(self, handler):
+        """Test a timeout after the verdict went out waits for it and sends no apology."""
+        async def analyze_job_ad(text, normalized=None, on_verdict=None):
+            await on_verdict(EarlyVerdict(12, JobClassification.LIKELY_SCAM, 0.88))
+            raise asyncio.TimeoutError()
+
+        handler.openai_service.analyze_job_ad = analyze_job_ad
+
+        assert await handler.handle_text_message(SCAM_AD, "whatsapp:+1987654321") is True
+
+        handler.twilio_service.send_verdict.assert_awaited_once()
+        handler.twilio_service.create_message.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_timeout_without_verdict_sends_apology(self, handler):
+        """Test a timeout before any verdict still tells the user to retry."""
+        handler.openai_service.analyze_job_ad = AsyncMock(side_effect=asyncio.TimeoutError())
+
+        await handler.handle_text_message(SCAM_AD, "whatsapp:+1987654321")
+
+        handler.twilio_service.create_message.assert_awaited_once()
+        assert "Taking Too Long" in handler.twilio_service.create_message.call_args[0][1]
+
+    @pytest.mark.asyncio
+    async def test_no_verdict_sends_full_result(self, handler):
+        """Test cached or rule-based results are sent as one message."""
+        result = make_result()
+        handler.openai_service.analyze_job_ad = AsyncMock(return_value=result)
+
+        await handler.handle_text_message(SCAM_AD, "whatsapp:+1987654321")
+
+        handler.twilio_service.send_verdict.assert_not_called()
+        handler.twilio_service.send_analysis_result.assert_awaited_once_with("whatsapp:+1987654321", result)
+        summary = get_metrics_collector().get_current_metrics()["time_to_first_verdict"]
+        assert summary["total"] == 1
+        assert summary["early_percent"] == 0.0
@@ -10,7 +10,6 @@ import hashlib
 import hmac
 import base64
 from unittest.mock import Mock, AsyncMock, patch
-from urllib.parse import urlencode
 
 from fastapi.testclient import TestClient
 from app.main import app
@@ -78,7 +77,7 @@ def create_twilio_signature(url: str, params: dict, auth_token: str) -> str:
     """
     # Sort parameters by key as Twilio does
     sorted_params = sorted(params.items())
-    data_string = url + urlencode(sorted_params)
+    data_string = url + ''.join(key + value for key, value in sorted_params)
     
     # Create HMAC-SHA1 signature
     signature = base64.b64encode(
@@ -351,7 +350,7 @@ class TestSignatureValidation:
         # Create valid signature
         url = str(request.url)
         sorted_params = sorted(body_data.items())
-        data_string = url + urlencode(sorted_params)
+        data_string = url + ''.join(key + value for key, value in sorted_params)
         expected_signature = base64.b64encode(
             hmac.new(
                 config.twilio_auth_token.encode('utf-8'),
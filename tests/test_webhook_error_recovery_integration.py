@@ -71,10 +71,9 @@ class TestWebhookErrorRecoveryIntegration:
         import hashlib
         import hmac
         import base64
-        from urllib.parse import urlencode
         
         sorted_params = sorted(params.items())
-        data_string = url + urlencode(sorted_params)
+        data_string = url + ''.join(key + value for key, value in sorted_params)
         
         signature = base64.b64encode(
             hmac.new(
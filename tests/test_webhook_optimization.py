@@ -11,10 +11,13 @@ import time
 from unittest.mock import Mock, AsyncMock, patch
 from datetime import datetime
 
-from app.api.optimized_webhook import OptimizedWebhookProcessor, ValidationCacheEntry
+from app.api.optimized_webhook import (
+    OptimizedWebhookProcessor, ValidationCacheEntry, TwilioSignatureValidator, parse_webhook_form
+)
 from app.services.redis_connection_manager import RedisConnectionManager
 from app.services.performance_monitor import PerformanceMonitor
 from app.services.background_task_processor import BackgroundTaskProcessor
+from app.utils.ttl_cache import BoundedTTLCache
 
 
 class TestOptimizedWebhookProcessor:
@@ -84,39 +87,6 @@ class TestOptimizedWebhookProcessor:
         assert result is None
         assert elapsed < 0.05  # Should be much faster than Redis call
     
-    @pytest.mark.asyncio
-    async def test_fast_signature_validation_timeout(self, processor):
-        """Test signature validation respects timeout limits."""
-        from fastapi import Request
-        
-        # Mock request and config
-        mock_request = Mock(spec=Request)
-        mock_request.headers.get.return_value = "test_signature"
-        mock_request.url = "http://test.com/webhook"
-        
-        # Mock config object
-        config = Mock()
-        config.webhook_validation = True
-        config.twilio_auth_token = "test_token"
-        
-        body_data = {"test": "data"}
-        
-        # Mock slow validation
-        async def slow_validation(*args, **kwargs):
-            await asyncio.sleep(0.2)  # Longer than timeout
-            return True
-        
-        processor._validate_signature_sync = slow_validation
-        
-        # Test with timeout
-        start_time = time.time()
-        result = await processor.fast_signature_validation(mock_request, body_data, config)
-        elapsed = time.time() - start_time
-        
-        # Should timeout and allow request
-        assert result == True  # Allows request on timeout
-        assert elapsed < 0.1  # Should respect timeout
-    
     @pytest.mark.asyncio
     async def test_cache_key_generation(self, processor):
         """Test cache key generation is consistent and unique."""
@@ -135,6 +105,218 @@ class TestOptimizedWebhookProcessor:
         key5 = processor.create_cache_key("MSG123", "whatsapp:+1234567890", "hash456")
         assert key1 != key5
 
+    
+    @pytest.mark.asyncio
+    async def test_claim_message_suppresses_retry(self, processor):
+        """Test a retried MessageSid is claimed only once."""
+        processor.redis_manager.execute_command.return_value = None
+        
+        assert await processor.claim_message("SM_retry_test_0001") is True
+        assert await processor.claim_message("SM_retry_test_0001") is False
+        
+        # Local retries are answered without a second Redis round-trip
+        processor.redis_manager.execute_command.assert_called_once()
+        call = processor.redis_manager.execute_command.call_args
+        assert call.args[:2] == ('set', "webhook_dedup:SM_retry_test_0001")
+        assert call.kwargs == {'nx': True, 'ex': 3600, 'get': True}
+        assert processor.dedup_stats['duplicates_suppressed'] == 1
+        assert processor.dedup_stats['redis_claims'] == 1
+    
+    @pytest.mark.asyncio
+    async def test_claim_message_duplicate_from_other_process(self, processor):
+        """Test a MessageSid already claimed in Redis by another worker is suppressed."""
+        processor.redis_manager.execute_command.return_value = "other-correlation-id"
+        
+        assert await processor.claim_message("SM_other_process_01") is False
+        assert processor.dedup_stats['duplicates_suppressed'] == 1
+        assert processor.dedup_stats['messages_accepted'] == 0
+    
+    @pytest.mark.asyncio
+    async def test_claim_message_memory_fallback(self, processor):
+        """Test the in-memory gate is used when Redis is unavailable."""
+        processor.redis_manager.is_available.return_value = False
+        
+        assert await processor.claim_message("SM_memory_gate_001") is True
+        assert await processor.claim_message("SM_memory_gate_001") is False
+        
+        processor.redis_manager.execute_command.assert_not_called()
+        assert processor.dedup_stats['memory_claims'] == 1
+        assert processor.get_ingestion_stats()['dedup']['duplicates_suppressed'] == 1
+    
+    @pytest.mark.asyncio
+    async def test_claim_message_retry_storm(self, processor):
+        """Test concurrent deliveries of the same MessageSid yield exactly one claim."""
+        async def slow_set_nx(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return None
+        
+        processor.redis_manager.execute_command.side_effect = slow_set_nx
+        
+        claims = await asyncio.gather(*[
+            processor.claim_message("SM_retry_storm_0001") for _ in range(50)
+        ])
+        
+        assert claims.count(True) == 1
+        assert processor.dedup_stats['duplicates_suppressed'] == 49
+    
+    @pytest.mark.asyncio
+    async def test_validation_cache_is_bounded(self, processor):
+        """Test unique MessageSids cannot grow the validation cache without bound."""
+        processor.validation_cache = BoundedTTLCache(max_size=100, ttl=300)
+        processor.redis_manager.is_available.return_value = False
+        
+        for i in range(1000):
+            await processor.cache_validation_result(f"SM{i:032d}", ValidationCacheEntry(True, datetime.now()))
+        
+        assert len(processor.validation_cache) == 100
+        assert await processor.get_cached_validation(f"SM{999:032d}") is not None
+        assert await processor.get_cached_validation(f"SM{0:032d}") is None
+        
+        stats = processor.get_ingestion_stats()['validation_cache']
+        assert stats['evictions'] == 900
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+    
+    def test_cache_key_is_stable_digest(self, processor):
+        """Test cache keys do not depend on per-process hash randomization."""
+        key = processor.create_cache_key("MSG123", "whatsapp:+1234567890", "hash123")
+        
+        assert key == f"MSG123:{OptimizedWebhookProcessor.stable_digest('whatsapp:+1234567890')}:hash123"
+        assert OptimizedWebhookProcessor.stable_digest("whatsapp:+1234567890") == "b6010778f2416b07"
+
+
+class TestSignatureFastPath:
+    """Test raw-body parsing and precomputed-key signature validation."""
+    
+    URL = "https://example.com/webhook/whatsapp"
+    PARAMS = {
+        "MessageSid": "SM1234567890abcdef1234567890abcdef",
+        "AccountSid": "AC1234567890abcdef1234567890abcdef",
+        "From": "whatsapp:+1234567890",
+        "To": "whatsapp:+0987654321",
+        "Body": "Job offer: earn $500/day & work from home!",
+        "NumMedia": "0",
+        "ProfileName": "Test User"
+    }
+    
+    @staticmethod
+    def reference_signature(url, params, auth_token):
+        import base64, hashlib, hmac
+        data_string = url + ''.join(key + value for key, value in sorted(params.items()))
+        return base64.b64encode(
+            hmac.new(auth_token.encode('utf-8'), data_string.encode('utf-8'), hashlib.sha1).digest()
+        ).decode('utf-8')
+    
+    def test_parse_webhook_form(self):
+        """Test URL-encoded bodies are decoded once into a flat dict."""
+        from urllib.parse import urlencode
+        
+        form = parse_webhook_form(urlencode(self.PARAMS).encode('utf-8') + b"&MediaUrl0=")
+        
+        assert form == {**self.PARAMS, "MediaUrl0": ""}
+    
+    def test_signature_matches_reference(self):
+        """Test the precomputed-key HMAC matches a freshly keyed HMAC."""
+        validator = TwilioSignatureValidator("test_auth_token")
+        expected = self.reference_signature(self.URL, self.PARAMS, "test_auth_token")
+        
+        assert validator.compute_signature(self.URL, self.PARAMS) == expected
+        assert validator.validate(self.URL, self.PARAMS, expected)
+        # The keyed state is copied, not consumed
+        assert validator.validate(self.URL, self.PARAMS, expected)
+        assert not validator.validate(self.URL, self.PARAMS, None)
+    
+    def test_signature_matches_twilio_sdk(self):
+        """Test signatures match the ones Twilio's own RequestValidator computes."""
+        from twilio.request_validator import RequestValidator
+    
+        sdk_validator = RequestValidator("test_auth_token")
+        validator = TwilioSignatureValidator("test_auth_token")
+        expected = sdk_validator.compute_signature(self.URL, self.PARAMS)
+    
+        assert validator.compute_signature(self.URL, self.PARAMS) == expected
+        assert validator.validate(self.URL, self.PARAMS, expected)
+        assert sdk_validator.validate(self.URL, self.PARAMS, validator.compute_signature(self.URL, self.PARAMS))
+    
+    def test_signature_covers_all_params(self):
+        """Test tampering with a parameter outside the core fields is detected."""
+        validator = TwilioSignatureValidator("test_auth_token")
+        signature = validator.compute_signature(self.URL, self.PARAMS)
+        
+        tampered = {**self.PARAMS, "ProfileName": "Someone Else"}
+        
+        assert not validator.validate(self.URL, tampered, signature)
+    
+    def test_processor_reuses_validator_until_token_changes(self):
+        """Test the keyed validator is built once per auth token."""
+        processor = OptimizedWebhookProcessor()
+        request = Mock()
+        request.url = self.URL
+        request.headers = {"X-Twilio-Signature": self.reference_signature(self.URL, self.PARAMS, "token_a")}
+        config = Mock(webhook_validation=True, twilio_auth_token="token_a")
+        
+        assert processor.validate_signature(request, self.PARAMS, config)
+        validator = processor.signature_validator
+        assert processor.validate_signature(request, self.PARAMS, config)
+        assert processor.signature_validator is validator
+        
+        config.twilio_auth_token = "token_b"
+        assert not processor.validate_signature(request, self.PARAMS, config)
+        assert processor.signature_validator is not validator
+
+
+class TestBoundedTTLCache:
+    """Test the bounded LRU/TTL cache."""
+    
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted when full."""
+        cache = BoundedTTLCache(max_size=2, ttl=60)
+        cache["a"] = 1
+        cache["b"] = 2
+        assert cache.get("a") == 1  # "b" is now least recently used
+        cache["c"] = 3
+        
+        assert "b" not in cache
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.evictions == 1
+    
+    def test_ttl_uses_monotonic_clock(self):
+        """Test entries expire by the injected monotonic clock."""
+        now = [100.0]
+        cache = BoundedTTLCache(max_size=10, ttl=5, clock=lambda: now[0])
+        cache["a"] = 1
+        
+        now[0] = 104.9
+        assert cache.get("a") == 1
+        
+        now[0] = 105.0
+        assert cache.get("a") is None
+        assert len(cache) == 0
+        assert cache.get_stats() == {
+            'size': 0,
+            'max_size': 10,
+            'ttl_seconds': 5,
+            'hits': 1,
+            'misses': 1,
+            'hit_rate': 0.5,
+            'evictions': 0,
+            'expirations': 1
+        }
+    
+    def test_expired_entries_purged_on_insert(self):
+        """Test expired entries are dropped without being read."""
+        now = [0.0]
+        cache = BoundedTTLCache(max_size=10, ttl=1, clock=lambda: now[0])
+        for key in range(5):
+            cache[key] = key
+        
+        now[0] = 2.0
+        cache["fresh"] = True
+        
+        assert len(cache) == 1
+        assert cache.expirations == 5
+
 
 class TestWebhookPerformanceRequirements:
     """Test webhook performance requirements."""
@@ -178,34 +360,10 @@ class TestWebhookPerformanceRequirements:
         print(f"First call: {first_call_time:.3f}s, Second call: {second_call_time:.3f}s")
         assert first_call_time > 0.01  # First call should take some time
     
-    @pytest.mark.asyncio
-    async def test_signature_validation_timeout_protection(self):
-        """Test signature validation timeout protection."""
-        from app.api.optimized_webhook import SIGNATURE_VALIDATION_TIMEOUT
-        
-        processor = OptimizedWebhookProcessor()
-        
-        # Mock slow signature validation
-        async def slow_validation(*args, **kwargs):
-            await asyncio.sleep(SIGNATURE_VALIDATION_TIMEOUT * 2)  # Exceed timeout
-            return True
-        
-        processor._validate_signature_sync = slow_validation
-        
-        # Test timeout protection
-        start_time = time.time()
-        result = await processor.fast_signature_validation(Mock(), {}, Mock())
-        elapsed = time.time() - start_time
-        
-        # Should timeout and return True (allow request)
-        assert result == True
-        assert elapsed <= SIGNATURE_VALIDATION_TIMEOUT * 1.5  # Some tolerance for test execution
-    
     def test_performance_constants_meet_requirements(self):
         """Test that performance constants meet the requirements."""
         from app.api.optimized_webhook import (
             WEBHOOK_TIMEOUT_MS, 
-            SIGNATURE_VALIDATION_TIMEOUT,
             FAST_VALIDATION_TIMEOUT
         )
         
@@ -215,8 +373,6 @@ class TestWebhookPerformanceRequirements:
         # Requirement 2.2: 500ms target for validation and queuing
         assert WEBHOOK_TIMEOUT_MS <= 500, "Webhook timeout should be <= 500ms for Requirement 2.2"
         
-        # Requirement 2.6: Optimized signature validation with timeout protection
-        assert SIGNATURE_VALIDATION_TIMEOUT <= 0.1, "Signature validation timeout should be <= 100ms"
         assert FAST_VALIDATION_TIMEOUT <= 0.1, "Fast validation timeout should be <= 100ms"
 
 
@@ -22,7 +22,6 @@ import hmac
 import base64
 from typing import Dict, List, Any, Optional
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
-from urllib.parse import urlencode
 from datetime import datetime, timedelta
 from concurrent.futures import ThreadPoolExecutor
 import threading
@@ -65,7 +64,7 @@ class TestWebhookPerformanceIntegration:
     def create_twilio_signature(self, url: str, params: Dict[str, str], auth_token: str) -> str:
         """Create a valid Twilio signature for testing."""
         sorted_params = sorted(params.items())
-        data_string = url + urlencode(sorted_params)
+        data_string = url + ''.join(key + value for key, value in sorted_params)
         
         signature = base64.b64encode(
             hmac.new(